@@ -1,12 +1,12 @@
 from OpenGL.arrays import vbo
-from OpenGL.GL.ARB import vertex_buffer_object
-from OpenGL.GL.ARB import uniform_buffer_object
-from OpenGL.GL.ARB import texture_buffer_object
-from OpenGL.GL.ARB import enhanced_layouts
 
 class Implementation( vbo.Implementation ):
     """OpenGL ARB extension-based implementation of VBO interfaces"""
     def __init__( self ):
+        from OpenGL.GL.ARB import vertex_buffer_object
+        from OpenGL.GL.ARB import uniform_buffer_object
+        from OpenGL.GL.ARB import texture_buffer_object
+        from OpenGL.GL.ARB import enhanced_layouts
         for name in self.EXPORTED_NAMES:
             source = name
             if name.startswith( 'GL_'):
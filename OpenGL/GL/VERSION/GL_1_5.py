@@ -62,8 +62,28 @@ glGetBufferPointerv=wrapper.wrapper(glGetBufferPointerv).setOutput(
 ### END AUTOGENERATED SECTION
 from OpenGL.lazywrapper import lazy as _lazy
 from OpenGL.arrays import ArrayDatatype
+from OpenGL.arrays.arraydatatype import HandlerCache as _HandlerCache
 from OpenGL._bytes import long, integer_types
 
+def _dataArrayAndSize( data, sourceHandlers, arrayHandlers ):
+    """Convert data to an array, return (array, byte count)
+
+    sourceHandlers caches the handler of the incoming data, arrayHandlers
+    the handler of what that converts it to (usually the same type)
+    """
+    entry = sourceHandlers.entry
+    if data.__class__ is entry[0]:
+        handler = entry[1]
+    else:
+        handler = sourceHandlers.lookup( data )
+    data = handler.asArray( data )
+    entry = arrayHandlers.entry
+    if data.__class__ is entry[0]:
+        handler = entry[1]
+    else:
+        handler = arrayHandlers.lookup( data )
+    return data, handler.arrayByteCount( data )
+
 @_lazy( glBufferData )
 def glBufferData( baseOperation, target, size, data=None, usage=None ):
     """Copy given data into the currently bound vertex-buffer-data object
@@ -83,10 +103,12 @@ def glBufferData( baseOperation, target, size, data=None, usage=None ):
         usage = data
         data = size
         size = None
-    data = ArrayDatatype.asArray( data )
+    data, byteCount = _dataArrayAndSize( data, _bufferDataSources, _bufferDataArrays )
     if size is None:
-        size = ArrayDatatype.arrayByteCount( data )
+        size = byteCount
     return baseOperation( target, size, data, usage )
+_bufferDataSources = _HandlerCache()
+_bufferDataArrays = _HandlerCache()
 
 @_lazy( glBufferSubData )
 def glBufferSubData( baseOperation, target, offset, size=None, data=None ):
@@ -119,10 +141,12 @@ def glBufferSubData( baseOperation, target, offset, size=None, data=None ):
             )
         data = size
         size = None
-    data = ArrayDatatype.asArray( data )
+    data, byteCount = _dataArrayAndSize( data, _bufferSubDataSources, _bufferSubDataArrays )
     if size is None:
-        size = ArrayDatatype.arrayByteCount( data )
+        size = byteCount
     return baseOperation( target, offset, size, data )
+_bufferSubDataSources = _HandlerCache()
+_bufferSubDataArrays = _HandlerCache()
 
 glGetBufferParameteriv = wrapper.wrapper(glGetBufferParameteriv).setOutput(
     "params",(1,), orPassIn=True
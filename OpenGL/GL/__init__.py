@@ -1,47 +1,72 @@
-"""OpenGL.GL, the core GL library and extensions to it"""
+"""OpenGL.GL, the core GL library and extensions to it
+
+The entry points are bound lazily, on first access, see OpenGL.lazynamespace
+"""
 # early import of our modules to prevent import loops...
 from OpenGL import error as _error
-from OpenGL.GL.VERSION.GL_1_1 import *
-from OpenGL.GL.pointers import *
-from OpenGL.GL.images import *
-
-from OpenGL.GL.exceptional import *
+from OpenGL import lazynamespace as _lazynamespace
 
-from OpenGL.GL.glget import *
-
-from OpenGL.GL.VERSION.GL_1_2 import *
-from OpenGL.GL.VERSION.GL_1_3 import *
-from OpenGL.GL.VERSION.GL_1_4 import *
-from OpenGL.GL.VERSION.GL_1_5 import *
-from OpenGL.GL.VERSION.GL_2_0 import *
-from OpenGL.GL.VERSION.GL_2_1 import *
-from OpenGL.GL.VERSION.GL_3_0 import *
-from OpenGL.GL.VERSION.GL_3_1 import *
-from OpenGL.GL.VERSION.GL_3_2 import *
-from OpenGL.GL.VERSION.GL_3_3 import *
-from OpenGL.GL.VERSION.GL_4_0 import *
-from OpenGL.GL.VERSION.GL_4_1 import *
-from OpenGL.GL.VERSION.GL_4_2 import *
-from OpenGL.GL.VERSION.GL_4_3 import *
-from OpenGL.GL.VERSION.GL_4_4 import *
+# the modules this namespace is made of, in the order they used to be
+# star-imported (later ones win)
+_SOURCES = (
+    'OpenGL.GL.VERSION.GL_1_1',
+    'OpenGL.GL.pointers',
+    'OpenGL.GL.images',
+    'OpenGL.GL.exceptional',
+    'OpenGL.GL.glget',
+    'OpenGL.GL.VERSION.GL_1_2',
+    'OpenGL.GL.VERSION.GL_1_3',
+    'OpenGL.GL.VERSION.GL_1_4',
+    'OpenGL.GL.VERSION.GL_1_5',
+    'OpenGL.GL.VERSION.GL_2_0',
+    'OpenGL.GL.VERSION.GL_2_1',
+    'OpenGL.GL.VERSION.GL_3_0',
+    'OpenGL.GL.VERSION.GL_3_1',
+    'OpenGL.GL.VERSION.GL_3_2',
+    'OpenGL.GL.VERSION.GL_3_3',
+    'OpenGL.GL.VERSION.GL_4_0',
+    'OpenGL.GL.VERSION.GL_4_1',
+    'OpenGL.GL.VERSION.GL_4_2',
+    'OpenGL.GL.VERSION.GL_4_3',
+    'OpenGL.GL.VERSION.GL_4_4',
+)
 
 from OpenGL.error import *
 GLerror = GLError
 
 # Now the aliases...
-glRotate = glRotated
-glTranslate = glTranslated
-glLight = glLightfv
-glTexCoord = glTexCoord2d
-glScale = glScaled
-#glColor = glColor3f
-glNormal = glNormal3d
+_ALIASES = {
+    'glRotate': 'glRotated',
+    'glTranslate': 'glTranslated',
+    'glLight': 'glLightfv',
+    'glTexCoord': 'glTexCoord2d',
+    'glScale': 'glScaled',
+    #'glColor': 'glColor3f',
+    'glNormal': 'glNormal3d',
+
+    'glGetBoolean': 'glGetBooleanv',
+    'glGetDouble': 'glGetDoublev',
+    'glGetFloat': 'glGetFloatv',
+    'glGetInteger': 'glGetIntegerv',
+    'glGetPolygonStippleub': 'glGetPolygonStipple',
+}
 
-glGetBoolean = glGetBooleanv
-glGetDouble = glGetDoublev
-glGetFloat = glGetFloatv
-glGetInteger = glGetIntegerv 
-glGetPolygonStippleub = glGetPolygonStipple
+try:
+    from OpenGL.GL import _index
+except ImportError:
+    _index = None
+_namespace = _lazynamespace.LazyNamespace(
+    globals(), _SOURCES, _index,
+    dict(
+        (name, _lazynamespace.alias( globals(), target ))
+        for name, target in _ALIASES.items()
+    ),
+)
+__getattr__ = _namespace.resolve
+__dir__ = _namespace.dir
+__all__ = _namespace.names()
 
+# registers the VBO implementations (their GL entry points are only
+# looked up once a VBO is used)
 from OpenGL.GL import vboimplementation as _core_implementation
 from OpenGL.GL.ARB import vboimplementation as _arb_implementation
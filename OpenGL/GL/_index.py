@@ -0,0 +1,3136 @@
+"""Generated by OpenGL.lazynamespace from OpenGL.GL._SOURCES, do not edit"""
+SOURCES = (
+    'OpenGL.GL.VERSION.GL_1_1',
+    'OpenGL.GL.pointers',
+    'OpenGL.GL.images',
+    'OpenGL.GL.exceptional',
+    'OpenGL.GL.glget',
+    'OpenGL.GL.VERSION.GL_1_2',
+    'OpenGL.GL.VERSION.GL_1_3',
+    'OpenGL.GL.VERSION.GL_1_4',
+    'OpenGL.GL.VERSION.GL_1_5',
+    'OpenGL.GL.VERSION.GL_2_0',
+    'OpenGL.GL.VERSION.GL_2_1',
+    'OpenGL.GL.VERSION.GL_3_0',
+    'OpenGL.GL.VERSION.GL_3_1',
+    'OpenGL.GL.VERSION.GL_3_2',
+    'OpenGL.GL.VERSION.GL_3_3',
+    'OpenGL.GL.VERSION.GL_4_0',
+    'OpenGL.GL.VERSION.GL_4_1',
+    'OpenGL.GL.VERSION.GL_4_2',
+    'OpenGL.GL.VERSION.GL_4_3',
+    'OpenGL.GL.VERSION.GL_4_4',
+)
+INDEX = {
+    'ARRAY_TYPE_TO_CONSTANT': 0,
+    'ArrayDatatype': 8,
+    'Constant': 0,
+    'GLDEBUGPROC': 0,
+    'GLDEBUGPROCAMD': 0,
+    'GLDEBUGPROCARB': 0,
+    'GLDEBUGPROCKHR': 0,
+    'GL_2D': 0,
+    'GL_2_BYTES': 0,
+    'GL_3D': 0,
+    'GL_3D_COLOR': 0,
+    'GL_3D_COLOR_TEXTURE': 0,
+    'GL_3_BYTES': 0,
+    'GL_4D_COLOR_TEXTURE': 0,
+    'GL_4_BYTES': 0,
+    'GL_ACCUM': 0,
+    'GL_ACCUM_ALPHA_BITS': 0,
+    'GL_ACCUM_BLUE_BITS': 0,
+    'GL_ACCUM_BUFFER_BIT': 0,
+    'GL_ACCUM_CLEAR_VALUE': 0,
+    'GL_ACCUM_GREEN_BITS': 0,
+    'GL_ACCUM_RED_BITS': 0,
+    'GL_ACTIVE_ATOMIC_COUNTER_BUFFERS': 17,
+    'GL_ACTIVE_ATTRIBUTES': 9,
+    'GL_ACTIVE_ATTRIBUTE_MAX_LENGTH': 9,
+    'GL_ACTIVE_PROGRAM': 16,
+    'GL_ACTIVE_RESOURCES': 18,
+    'GL_ACTIVE_SUBROUTINES': 15,
+    'GL_ACTIVE_SUBROUTINE_MAX_LENGTH': 15,
+    'GL_ACTIVE_SUBROUTINE_UNIFORMS': 15,
+    'GL_ACTIVE_SUBROUTINE_UNIFORM_LOCATIONS': 15,
+    'GL_ACTIVE_SUBROUTINE_UNIFORM_MAX_LENGTH': 15,
+    'GL_ACTIVE_TEXTURE': 6,
+    'GL_ACTIVE_UNIFORMS': 9,
+    'GL_ACTIVE_UNIFORM_BLOCKS': 12,
+    'GL_ACTIVE_UNIFORM_BLOCK_MAX_NAME_LENGTH': 12,
+    'GL_ACTIVE_UNIFORM_MAX_LENGTH': 9,
+    'GL_ACTIVE_VARIABLES': 18,
+    'GL_ADD': 0,
+    'GL_ADD_SIGNED': 6,
+    'GL_ALIASED_LINE_WIDTH_RANGE': 5,
+    'GL_ALIASED_POINT_SIZE_RANGE': 5,
+    'GL_ALL_ATTRIB_BITS': 0,
+    'GL_ALL_BARRIER_BITS': 17,
+    'GL_ALL_SHADER_BITS': 16,
+    'GL_ALPHA': 0,
+    'GL_ALPHA12': 0,
+    'GL_ALPHA16': 0,
+    'GL_ALPHA4': 0,
+    'GL_ALPHA8': 0,
+    'GL_ALPHA_BIAS': 0,
+    'GL_ALPHA_BITS': 0,
+    'GL_ALPHA_INTEGER': 11,
+    'GL_ALPHA_SCALE': 0,
+    'GL_ALPHA_TEST': 0,
+    'GL_ALPHA_TEST_FUNC': 0,
+    'GL_ALPHA_TEST_REF': 0,
+    'GL_ALREADY_SIGNALED': 13,
+    'GL_ALWAYS': 0,
+    'GL_AMBIENT': 0,
+    'GL_AMBIENT_AND_DIFFUSE': 0,
+    'GL_AND': 0,
+    'GL_AND_INVERTED': 0,
+    'GL_AND_REVERSE': 0,
+    'GL_ANY_SAMPLES_PASSED': 14,
+    'GL_ANY_SAMPLES_PASSED_CONSERVATIVE': 18,
+    'GL_ARRAY_BUFFER': 8,
+    'GL_ARRAY_BUFFER_BINDING': 8,
+    'GL_ARRAY_SIZE': 18,
+    'GL_ARRAY_STRIDE': 18,
+    'GL_ATOMIC_COUNTER_BARRIER_BIT': 17,
+    'GL_ATOMIC_COUNTER_BUFFER': 18,
+    'GL_ATOMIC_COUNTER_BUFFER_ACTIVE_ATOMIC_COUNTERS': 17,
+    'GL_ATOMIC_COUNTER_BUFFER_ACTIVE_ATOMIC_COUNTER_INDICES': 17,
+    'GL_ATOMIC_COUNTER_BUFFER_BINDING': 17,
+    'GL_ATOMIC_COUNTER_BUFFER_DATA_SIZE': 17,
+    'GL_ATOMIC_COUNTER_BUFFER_INDEX': 18,
+    'GL_ATOMIC_COUNTER_BUFFER_REFERENCED_BY_COMPUTE_SHADER': 18,
+    'GL_ATOMIC_COUNTER_BUFFER_REFERENCED_BY_FRAGMENT_SHADER': 17,
+    'GL_ATOMIC_COUNTER_BUFFER_REFERENCED_BY_GEOMETRY_SHADER': 17,
+    'GL_ATOMIC_COUNTER_BUFFER_REFERENCED_BY_TESS_CONTROL_SHADER': 17,
+    'GL_ATOMIC_COUNTER_BUFFER_REFERENCED_BY_TESS_EVALUATION_SHADER': 17,
+    'GL_ATOMIC_COUNTER_BUFFER_REFERENCED_BY_VERTEX_SHADER': 17,
+    'GL_ATOMIC_COUNTER_BUFFER_SIZE': 17,
+    'GL_ATOMIC_COUNTER_BUFFER_START': 17,
+    'GL_ATTACHED_SHADERS': 9,
+    'GL_ATTRIB_STACK_DEPTH': 0,
+    'GL_AUTO_GENERATE_MIPMAP': 18,
+    'GL_AUTO_NORMAL': 0,
+    'GL_AUX0': 0,
+    'GL_AUX1': 0,
+    'GL_AUX2': 0,
+    'GL_AUX3': 0,
+    'GL_AUX_BUFFERS': 0,
+    'GL_BACK': 0,
+    'GL_BACK_LEFT': 0,
+    'GL_BACK_RIGHT': 0,
+    'GL_BGR': 5,
+    'GL_BGRA': 5,
+    'GL_BGRA_INTEGER': 11,
+    'GL_BGR_INTEGER': 11,
+    'GL_BITMAP': 0,
+    'GL_BITMAP_TOKEN': 0,
+    'GL_BLEND': 0,
+    'GL_BLEND_COLOR': 5,
+    'GL_BLEND_DST': 0,
+    'GL_BLEND_DST_ALPHA': 7,
+    'GL_BLEND_DST_RGB': 7,
+    'GL_BLEND_EQUATION': 5,
+    'GL_BLEND_EQUATION_ALPHA': 9,
+    'GL_BLEND_EQUATION_RGB': 9,
+    'GL_BLEND_SRC': 0,
+    'GL_BLEND_SRC_ALPHA': 7,
+    'GL_BLEND_SRC_RGB': 7,
+    'GL_BLOCK_INDEX': 18,
+    'GL_BLUE': 0,
+    'GL_BLUE_BIAS': 0,
+    'GL_BLUE_BITS': 0,
+    'GL_BLUE_INTEGER': 11,
+    'GL_BLUE_SCALE': 0,
+    'GL_BOOL': 9,
+    'GL_BOOL_VEC2': 9,
+    'GL_BOOL_VEC3': 9,
+    'GL_BOOL_VEC4': 9,
+    'GL_BUFFER': 18,
+    'GL_BUFFER_ACCESS': 8,
+    'GL_BUFFER_ACCESS_FLAGS': 11,
+    'GL_BUFFER_BINDING': 18,
+    'GL_BUFFER_DATA_SIZE': 18,
+    'GL_BUFFER_IMMUTABLE_STORAGE': 19,
+    'GL_BUFFER_KHR': 18,
+    'GL_BUFFER_MAPPED': 8,
+    'GL_BUFFER_MAP_LENGTH': 11,
+    'GL_BUFFER_MAP_OFFSET': 11,
+    'GL_BUFFER_MAP_POINTER': 8,
+    'GL_BUFFER_SIZE': 8,
+    'GL_BUFFER_STORAGE_FLAGS': 19,
+    'GL_BUFFER_UPDATE_BARRIER_BIT': 17,
+    'GL_BUFFER_USAGE': 8,
+    'GL_BUFFER_VARIABLE': 18,
+    'GL_BYTE': 0,
+    'GL_C3F_V3F': 0,
+    'GL_C4F_N3F_V3F': 0,
+    'GL_C4UB_V2F': 0,
+    'GL_C4UB_V3F': 0,
+    'GL_CAVEAT_SUPPORT': 18,
+    'GL_CCW': 15,
+    'GL_CHAR': 0,
+    'GL_CLAMP': 0,
+    'GL_CLAMP_FRAGMENT_COLOR': 11,
+    'GL_CLAMP_READ_COLOR': 11,
+    'GL_CLAMP_TO_BORDER': 6,
+    'GL_CLAMP_TO_EDGE': 5,
+    'GL_CLAMP_VERTEX_COLOR': 11,
+    'GL_CLEAR': 0,
+    'GL_CLEAR_BUFFER': 18,
+    'GL_CLEAR_TEXTURE': 19,
+    'GL_CLIENT_ACTIVE_TEXTURE': 6,
+    'GL_CLIENT_ALL_ATTRIB_BITS': 0,
+    'GL_CLIENT_ATTRIB_STACK_DEPTH': 0,
+    'GL_CLIENT_MAPPED_BUFFER_BARRIER_BIT': 19,
+    'GL_CLIENT_PIXEL_STORE_BIT': 0,
+    'GL_CLIENT_STORAGE_BIT': 19,
+    'GL_CLIENT_VERTEX_ARRAY_BIT': 0,
+    'GL_CLIP_DISTANCE0': 11,
+    'GL_CLIP_DISTANCE1': 11,
+    'GL_CLIP_DISTANCE2': 11,
+    'GL_CLIP_DISTANCE3': 11,
+    'GL_CLIP_DISTANCE4': 11,
+    'GL_CLIP_DISTANCE5': 11,
+    'GL_CLIP_DISTANCE6': 11,
+    'GL_CLIP_DISTANCE7': 11,
+    'GL_CLIP_PLANE0': 0,
+    'GL_CLIP_PLANE1': 0,
+    'GL_CLIP_PLANE2': 0,
+    'GL_CLIP_PLANE3': 0,
+    'GL_CLIP_PLANE4': 0,
+    'GL_CLIP_PLANE5': 0,
+    'GL_COEFF': 0,
+    'GL_COLOR': 0,
+    'GL_COLOR_ARRAY': 0,
+    'GL_COLOR_ARRAY_BUFFER_BINDING': 8,
+    'GL_COLOR_ARRAY_POINTER': 0,
+    'GL_COLOR_ARRAY_SIZE': 0,
+    'GL_COLOR_ARRAY_STRIDE': 0,
+    'GL_COLOR_ARRAY_TYPE': 0,
+    'GL_COLOR_ATTACHMENT0': 11,
+    'GL_COLOR_ATTACHMENT1': 11,
+    'GL_COLOR_ATTACHMENT10': 11,
+    'GL_COLOR_ATTACHMENT11': 11,
+    'GL_COLOR_ATTACHMENT12': 11,
+    'GL_COLOR_ATTACHMENT13': 11,
+    'GL_COLOR_ATTACHMENT14': 11,
+    'GL_COLOR_ATTACHMENT15': 11,
+    'GL_COLOR_ATTACHMENT2': 11,
+    'GL_COLOR_ATTACHMENT3': 11,
+    'GL_COLOR_ATTACHMENT4': 11,
+    'GL_COLOR_ATTACHMENT5': 11,
+    'GL_COLOR_ATTACHMENT6': 11,
+    'GL_COLOR_ATTACHMENT7': 11,
+    'GL_COLOR_ATTACHMENT8': 11,
+    'GL_COLOR_ATTACHMENT9': 11,
+    'GL_COLOR_BUFFER_BIT': 0,
+    'GL_COLOR_CLEAR_VALUE': 0,
+    'GL_COLOR_COMPONENTS': 18,
+    'GL_COLOR_ENCODING': 18,
+    'GL_COLOR_INDEX': 0,
+    'GL_COLOR_INDEXES': 0,
+    'GL_COLOR_LOGIC_OP': 0,
+    'GL_COLOR_MATERIAL': 0,
+    'GL_COLOR_MATERIAL_FACE': 0,
+    'GL_COLOR_MATERIAL_PARAMETER': 0,
+    'GL_COLOR_MATRIX': 5,
+    'GL_COLOR_MATRIX_STACK_DEPTH': 5,
+    'GL_COLOR_RENDERABLE': 18,
+    'GL_COLOR_SUM': 7,
+    'GL_COLOR_TABLE': 5,
+    'GL_COLOR_TABLE_ALPHA_SIZE': 5,
+    'GL_COLOR_TABLE_BIAS': 5,
+    'GL_COLOR_TABLE_BLUE_SIZE': 5,
+    'GL_COLOR_TABLE_FORMAT': 5,
+    'GL_COLOR_TABLE_GREEN_SIZE': 5,
+    'GL_COLOR_TABLE_INTENSITY_SIZE': 5,
+    'GL_COLOR_TABLE_LUMINANCE_SIZE': 5,
+    'GL_COLOR_TABLE_RED_SIZE': 5,
+    'GL_COLOR_TABLE_SCALE': 5,
+    'GL_COLOR_TABLE_WIDTH': 5,
+    'GL_COLOR_WRITEMASK': 0,
+    'GL_COMBINE': 6,
+    'GL_COMBINE_ALPHA': 6,
+    'GL_COMBINE_RGB': 6,
+    'GL_COMMAND_BARRIER_BIT': 17,
+    'GL_COMPARE_REF_TO_TEXTURE': 11,
+    'GL_COMPARE_R_TO_TEXTURE': 7,
+    'GL_COMPATIBLE_SUBROUTINES': 18,
+    'GL_COMPILE': 0,
+    'GL_COMPILE_AND_EXECUTE': 0,
+    'GL_COMPILE_STATUS': 9,
+    'GL_COMPRESSED_ALPHA': 6,
+    'GL_COMPRESSED_INTENSITY': 6,
+    'GL_COMPRESSED_LUMINANCE': 6,
+    'GL_COMPRESSED_LUMINANCE_ALPHA': 6,
+    'GL_COMPRESSED_R11_EAC': 18,
+    'GL_COMPRESSED_RED': 11,
+    'GL_COMPRESSED_RED_RGTC1': 11,
+    'GL_COMPRESSED_RG': 11,
+    'GL_COMPRESSED_RG11_EAC': 18,
+    'GL_COMPRESSED_RGB': 6,
+    'GL_COMPRESSED_RGB8_ETC2': 18,
+    'GL_COMPRESSED_RGB8_PUNCHTHROUGH_ALPHA1_ETC2': 18,
+    'GL_COMPRESSED_RGBA': 6,
+    'GL_COMPRESSED_RGBA8_ETC2_EAC': 18,
+    'GL_COMPRESSED_RGBA_BPTC_UNORM': 17,
+    'GL_COMPRESSED_RGB_BPTC_SIGNED_FLOAT': 17,
+    'GL_COMPRESSED_RGB_BPTC_UNSIGNED_FLOAT': 17,
+    'GL_COMPRESSED_RG_RGTC2': 11,
+    'GL_COMPRESSED_SIGNED_R11_EAC': 18,
+    'GL_COMPRESSED_SIGNED_RED_RGTC1': 11,
+    'GL_COMPRESSED_SIGNED_RG11_EAC': 18,
+    'GL_COMPRESSED_SIGNED_RG_RGTC2': 11,
+    'GL_COMPRESSED_SLUMINANCE': 10,
+    'GL_COMPRESSED_SLUMINANCE_ALPHA': 10,
+    'GL_COMPRESSED_SRGB': 10,
+    'GL_COMPRESSED_SRGB8_ALPHA8_ETC2_EAC': 18,
+    'GL_COMPRESSED_SRGB8_ETC2': 18,
+    'GL_COMPRESSED_SRGB8_PUNCHTHROUGH_ALPHA1_ETC2': 18,
+    'GL_COMPRESSED_SRGB_ALPHA': 10,
+    'GL_COMPRESSED_SRGB_ALPHA_BPTC_UNORM': 17,
+    'GL_COMPRESSED_TEXTURE_FORMATS': 6,
+    'GL_COMPUTE_SHADER': 18,
+    'GL_COMPUTE_SHADER_BIT': 18,
+    'GL_COMPUTE_SUBROUTINE': 18,
+    'GL_COMPUTE_SUBROUTINE_UNIFORM': 18,
+    'GL_COMPUTE_TEXTURE': 18,
+    'GL_COMPUTE_WORK_GROUP_SIZE': 18,
+    'GL_CONDITION_SATISFIED': 13,
+    'GL_CONSTANT': 6,
+    'GL_CONSTANT_ALPHA': 7,
+    'GL_CONSTANT_ATTENUATION': 0,
+    'GL_CONSTANT_BORDER': 5,
+    'GL_CONSTANT_COLOR': 7,
+    'GL_CONTEXT_COMPATIBILITY_PROFILE_BIT': 13,
+    'GL_CONTEXT_CORE_PROFILE_BIT': 13,
+    'GL_CONTEXT_FLAGS': 11,
+    'GL_CONTEXT_FLAG_DEBUG_BIT': 18,
+    'GL_CONTEXT_FLAG_DEBUG_BIT_KHR': 18,
+    'GL_CONTEXT_FLAG_FORWARD_COMPATIBLE_BIT': 11,
+    'GL_CONTEXT_PROFILE_MASK': 13,
+    'GL_CONVOLUTION_1D': 5,
+    'GL_CONVOLUTION_2D': 5,
+    'GL_CONVOLUTION_BORDER_COLOR': 5,
+    'GL_CONVOLUTION_BORDER_MODE': 5,
+    'GL_CONVOLUTION_FILTER_BIAS': 5,
+    'GL_CONVOLUTION_FILTER_SCALE': 5,
+    'GL_CONVOLUTION_FORMAT': 5,
+    'GL_CONVOLUTION_HEIGHT': 5,
+    'GL_CONVOLUTION_WIDTH': 5,
+    'GL_COORD_REPLACE': 9,
+    'GL_COPY': 0,
+    'GL_COPY_INVERTED': 0,
+    'GL_COPY_PIXEL_TOKEN': 0,
+    'GL_COPY_READ_BUFFER': 12,
+    'GL_COPY_READ_BUFFER_BINDING': 12,
+    'GL_COPY_WRITE_BUFFER': 12,
+    'GL_COPY_WRITE_BUFFER_BINDING': 12,
+    'GL_CULL_FACE': 0,
+    'GL_CULL_FACE_MODE': 0,
+    'GL_CURRENT_BIT': 0,
+    'GL_CURRENT_COLOR': 0,
+    'GL_CURRENT_FOG_COORD': 8,
+    'GL_CURRENT_FOG_COORDINATE': 7,
+    'GL_CURRENT_INDEX': 0,
+    'GL_CURRENT_NORMAL': 0,
+    'GL_CURRENT_PROGRAM': 9,
+    'GL_CURRENT_QUERY': 8,
+    'GL_CURRENT_RASTER_COLOR': 0,
+    'GL_CURRENT_RASTER_DISTANCE': 0,
+    'GL_CURRENT_RASTER_INDEX': 0,
+    'GL_CURRENT_RASTER_POSITION': 0,
+    'GL_CURRENT_RASTER_POSITION_VALID': 0,
+    'GL_CURRENT_RASTER_SECONDARY_COLOR': 10,
+    'GL_CURRENT_RASTER_TEXTURE_COORDS': 0,
+    'GL_CURRENT_SECONDARY_COLOR': 7,
+    'GL_CURRENT_TEXTURE_COORDS': 0,
+    'GL_CURRENT_VERTEX_ATTRIB': 9,
+    'GL_CW': 15,
+    'GL_DEBUG_CALLBACK_FUNCTION': 18,
+    'GL_DEBUG_CALLBACK_FUNCTION_KHR': 18,
+    'GL_DEBUG_CALLBACK_USER_PARAM': 18,
+    'GL_DEBUG_CALLBACK_USER_PARAM_KHR': 18,
+    'GL_DEBUG_GROUP_STACK_DEPTH': 18,
+    'GL_DEBUG_GROUP_STACK_DEPTH_KHR': 18,
+    'GL_DEBUG_LOGGED_MESSAGES': 18,
+    'GL_DEBUG_LOGGED_MESSAGES_KHR': 18,
+    'GL_DEBUG_NEXT_LOGGED_MESSAGE_LENGTH': 18,
+    'GL_DEBUG_NEXT_LOGGED_MESSAGE_LENGTH_KHR': 18,
+    'GL_DEBUG_OUTPUT': 18,
+    'GL_DEBUG_OUTPUT_KHR': 18,
+    'GL_DEBUG_OUTPUT_SYNCHRONOUS': 18,
+    'GL_DEBUG_OUTPUT_SYNCHRONOUS_KHR': 18,
+    'GL_DEBUG_SEVERITY_HIGH': 18,
+    'GL_DEBUG_SEVERITY_HIGH_KHR': 18,
+    'GL_DEBUG_SEVERITY_LOW': 18,
+    'GL_DEBUG_SEVERITY_LOW_KHR': 18,
+    'GL_DEBUG_SEVERITY_MEDIUM': 18,
+    'GL_DEBUG_SEVERITY_MEDIUM_KHR': 18,
+    'GL_DEBUG_SEVERITY_NOTIFICATION': 18,
+    'GL_DEBUG_SEVERITY_NOTIFICATION_KHR': 18,
+    'GL_DEBUG_SOURCE_API': 18,
+    'GL_DEBUG_SOURCE_API_KHR': 18,
+    'GL_DEBUG_SOURCE_APPLICATION': 18,
+    'GL_DEBUG_SOURCE_APPLICATION_KHR': 18,
+    'GL_DEBUG_SOURCE_OTHER': 18,
+    'GL_DEBUG_SOURCE_OTHER_KHR': 18,
+    'GL_DEBUG_SOURCE_SHADER_COMPILER': 18,
+    'GL_DEBUG_SOURCE_SHADER_COMPILER_KHR': 18,
+    'GL_DEBUG_SOURCE_THIRD_PARTY': 18,
+    'GL_DEBUG_SOURCE_THIRD_PARTY_KHR': 18,
+    'GL_DEBUG_SOURCE_WINDOW_SYSTEM': 18,
+    'GL_DEBUG_SOURCE_WINDOW_SYSTEM_KHR': 18,
+    'GL_DEBUG_TYPE_DEPRECATED_BEHAVIOR': 18,
+    'GL_DEBUG_TYPE_DEPRECATED_BEHAVIOR_KHR': 18,
+    'GL_DEBUG_TYPE_ERROR': 18,
+    'GL_DEBUG_TYPE_ERROR_KHR': 18,
+    'GL_DEBUG_TYPE_MARKER': 18,
+    'GL_DEBUG_TYPE_MARKER_KHR': 18,
+    'GL_DEBUG_TYPE_OTHER': 18,
+    'GL_DEBUG_TYPE_OTHER_KHR': 18,
+    'GL_DEBUG_TYPE_PERFORMANCE': 18,
+    'GL_DEBUG_TYPE_PERFORMANCE_KHR': 18,
+    'GL_DEBUG_TYPE_POP_GROUP': 18,
+    'GL_DEBUG_TYPE_POP_GROUP_KHR': 18,
+    'GL_DEBUG_TYPE_PORTABILITY': 18,
+    'GL_DEBUG_TYPE_PORTABILITY_KHR': 18,
+    'GL_DEBUG_TYPE_PUSH_GROUP': 18,
+    'GL_DEBUG_TYPE_PUSH_GROUP_KHR': 18,
+    'GL_DEBUG_TYPE_UNDEFINED_BEHAVIOR': 18,
+    'GL_DEBUG_TYPE_UNDEFINED_BEHAVIOR_KHR': 18,
+    'GL_DECAL': 0,
+    'GL_DECR': 0,
+    'GL_DECR_WRAP': 7,
+    'GL_DELETE_STATUS': 9,
+    'GL_DEPTH': 0,
+    'GL_DEPTH24_STENCIL8': 11,
+    'GL_DEPTH32F_STENCIL8': 11,
+    'GL_DEPTH_ATTACHMENT': 11,
+    'GL_DEPTH_BIAS': 0,
+    'GL_DEPTH_BITS': 0,
+    'GL_DEPTH_BUFFER': 0,
+    'GL_DEPTH_BUFFER_BIT': 0,
+    'GL_DEPTH_CLAMP': 13,
+    'GL_DEPTH_CLEAR_VALUE': 0,
+    'GL_DEPTH_COMPONENT': 0,
+    'GL_DEPTH_COMPONENT16': 7,
+    'GL_DEPTH_COMPONENT24': 7,
+    'GL_DEPTH_COMPONENT32': 7,
+    'GL_DEPTH_COMPONENT32F': 11,
+    'GL_DEPTH_COMPONENTS': 18,
+    'GL_DEPTH_FUNC': 0,
+    'GL_DEPTH_RANGE': 16,
+    'GL_DEPTH_RENDERABLE': 18,
+    'GL_DEPTH_SCALE': 0,
+    'GL_DEPTH_STENCIL': 11,
+    'GL_DEPTH_STENCIL_ATTACHMENT': 11,
+    'GL_DEPTH_STENCIL_TEXTURE_MODE': 18,
+    'GL_DEPTH_TEST': 0,
+    'GL_DEPTH_TEXTURE_MODE': 7,
+    'GL_DEPTH_WRITEMASK': 0,
+    'GL_DIFFUSE': 0,
+    'GL_DISPATCH_INDIRECT_BUFFER': 18,
+    'GL_DISPATCH_INDIRECT_BUFFER_BINDING': 18,
+    'GL_DISPLAY_LIST': 18,
+    'GL_DITHER': 0,
+    'GL_DOMAIN': 0,
+    'GL_DONT_CARE': 0,
+    'GL_DOT3_RGB': 6,
+    'GL_DOT3_RGBA': 6,
+    'GL_DOUBLE': 0,
+    'GL_DOUBLEBUFFER': 0,
+    'GL_DOUBLE_MAT2': 16,
+    'GL_DOUBLE_MAT2x3': 16,
+    'GL_DOUBLE_MAT2x4': 16,
+    'GL_DOUBLE_MAT3': 16,
+    'GL_DOUBLE_MAT3x2': 16,
+    'GL_DOUBLE_MAT3x4': 16,
+    'GL_DOUBLE_MAT4': 16,
+    'GL_DOUBLE_MAT4x2': 16,
+    'GL_DOUBLE_MAT4x3': 16,
+    'GL_DOUBLE_VEC2': 16,
+    'GL_DOUBLE_VEC3': 16,
+    'GL_DOUBLE_VEC4': 16,
+    'GL_DRAW_BUFFER': 0,
+    'GL_DRAW_BUFFER0': 9,
+    'GL_DRAW_BUFFER1': 9,
+    'GL_DRAW_BUFFER10': 9,
+    'GL_DRAW_BUFFER11': 9,
+    'GL_DRAW_BUFFER12': 9,
+    'GL_DRAW_BUFFER13': 9,
+    'GL_DRAW_BUFFER14': 9,
+    'GL_DRAW_BUFFER15': 9,
+    'GL_DRAW_BUFFER2': 9,
+    'GL_DRAW_BUFFER3': 9,
+    'GL_DRAW_BUFFER4': 9,
+    'GL_DRAW_BUFFER5': 9,
+    'GL_DRAW_BUFFER6': 9,
+    'GL_DRAW_BUFFER7': 9,
+    'GL_DRAW_BUFFER8': 9,
+    'GL_DRAW_BUFFER9': 9,
+    'GL_DRAW_FRAMEBUFFER': 11,
+    'GL_DRAW_FRAMEBUFFER_BINDING': 11,
+    'GL_DRAW_INDIRECT_BUFFER': 15,
+    'GL_DRAW_INDIRECT_BUFFER_BINDING': 15,
+    'GL_DRAW_PIXEL_TOKEN': 0,
+    'GL_DST_ALPHA': 0,
+    'GL_DST_COLOR': 0,
+    'GL_DYNAMIC_COPY': 8,
+    'GL_DYNAMIC_DRAW': 8,
+    'GL_DYNAMIC_READ': 8,
+    'GL_DYNAMIC_STORAGE_BIT': 19,
+    'GL_EDGE_FLAG': 0,
+    'GL_EDGE_FLAG_ARRAY': 0,
+    'GL_EDGE_FLAG_ARRAY_BUFFER_BINDING': 8,
+    'GL_EDGE_FLAG_ARRAY_POINTER': 0,
+    'GL_EDGE_FLAG_ARRAY_STRIDE': 0,
+    'GL_ELEMENT_ARRAY_BARRIER_BIT': 17,
+    'GL_ELEMENT_ARRAY_BUFFER': 8,
+    'GL_ELEMENT_ARRAY_BUFFER_BINDING': 8,
+    'GL_EMISSION': 0,
+    'GL_ENABLE_BIT': 0,
+    'GL_EQUAL': 15,
+    'GL_EQUIV': 0,
+    'GL_EVAL_BIT': 0,
+    'GL_EXP': 0,
+    'GL_EXP2': 0,
+    'GL_EXTENSIONS': 0,
+    'GL_EYE_LINEAR': 0,
+    'GL_EYE_PLANE': 0,
+    'GL_FALSE': 0,
+    'GL_FASTEST': 0,
+    'GL_FEEDBACK': 0,
+    'GL_FEEDBACK_BUFFER_POINTER': 0,
+    'GL_FEEDBACK_BUFFER_SIZE': 0,
+    'GL_FEEDBACK_BUFFER_TYPE': 0,
+    'GL_FILL': 0,
+    'GL_FILTER': 18,
+    'GL_FIRST_VERTEX_CONVENTION': 16,
+    'GL_FIXED': 16,
+    'GL_FIXED_ONLY': 11,
+    'GL_FLAT': 0,
+    'GL_FLOAT': 0,
+    'GL_FLOAT_32_UNSIGNED_INT_24_8_REV': 11,
+    'GL_FLOAT_MAT2': 9,
+    'GL_FLOAT_MAT2x3': 10,
+    'GL_FLOAT_MAT2x4': 10,
+    'GL_FLOAT_MAT3': 9,
+    'GL_FLOAT_MAT3x2': 10,
+    'GL_FLOAT_MAT3x4': 10,
+    'GL_FLOAT_MAT4': 9,
+    'GL_FLOAT_MAT4x2': 10,
+    'GL_FLOAT_MAT4x3': 10,
+    'GL_FLOAT_VEC2': 9,
+    'GL_FLOAT_VEC3': 9,
+    'GL_FLOAT_VEC4': 9,
+    'GL_FOG': 0,
+    'GL_FOG_BIT': 0,
+    'GL_FOG_COLOR': 0,
+    'GL_FOG_COORD': 8,
+    'GL_FOG_COORDINATE': 7,
+    'GL_FOG_COORDINATE_ARRAY': 7,
+    'GL_FOG_COORDINATE_ARRAY_BUFFER_BINDING': 8,
+    'GL_FOG_COORDINATE_ARRAY_POINTER': 7,
+    'GL_FOG_COORDINATE_ARRAY_STRIDE': 7,
+    'GL_FOG_COORDINATE_ARRAY_TYPE': 7,
+    'GL_FOG_COORDINATE_SOURCE': 7,
+    'GL_FOG_COORD_ARRAY': 8,
+    'GL_FOG_COORD_ARRAY_BUFFER_BINDING': 8,
+    'GL_FOG_COORD_ARRAY_POINTER': 8,
+    'GL_FOG_COORD_ARRAY_STRIDE': 8,
+    'GL_FOG_COORD_ARRAY_TYPE': 8,
+    'GL_FOG_COORD_SRC': 8,
+    'GL_FOG_DENSITY': 0,
+    'GL_FOG_END': 0,
+    'GL_FOG_HINT': 0,
+    'GL_FOG_INDEX': 0,
+    'GL_FOG_MODE': 0,
+    'GL_FOG_START': 0,
+    'GL_FRACTIONAL_EVEN': 15,
+    'GL_FRACTIONAL_ODD': 15,
+    'GL_FRAGMENT_DEPTH': 7,
+    'GL_FRAGMENT_INTERPOLATION_OFFSET_BITS': 15,
+    'GL_FRAGMENT_SHADER': 9,
+    'GL_FRAGMENT_SHADER_BIT': 16,
+    'GL_FRAGMENT_SHADER_DERIVATIVE_HINT': 9,
+    'GL_FRAGMENT_SUBROUTINE': 18,
+    'GL_FRAGMENT_SUBROUTINE_UNIFORM': 18,
+    'GL_FRAGMENT_TEXTURE': 18,
+    'GL_FRAMEBUFFER': 11,
+    'GL_FRAMEBUFFER_ATTACHMENT_ALPHA_SIZE': 11,
+    'GL_FRAMEBUFFER_ATTACHMENT_BLUE_SIZE': 11,
+    'GL_FRAMEBUFFER_ATTACHMENT_COLOR_ENCODING': 11,
+    'GL_FRAMEBUFFER_ATTACHMENT_COMPONENT_TYPE': 11,
+    'GL_FRAMEBUFFER_ATTACHMENT_DEPTH_SIZE': 11,
+    'GL_FRAMEBUFFER_ATTACHMENT_GREEN_SIZE': 11,
+    'GL_FRAMEBUFFER_ATTACHMENT_LAYERED': 13,
+    'GL_FRAMEBUFFER_ATTACHMENT_OBJECT_NAME': 11,
+    'GL_FRAMEBUFFER_ATTACHMENT_OBJECT_TYPE': 11,
+    'GL_FRAMEBUFFER_ATTACHMENT_RED_SIZE': 11,
+    'GL_FRAMEBUFFER_ATTACHMENT_STENCIL_SIZE': 11,
+    'GL_FRAMEBUFFER_ATTACHMENT_TEXTURE_CUBE_MAP_FACE': 11,
+    'GL_FRAMEBUFFER_ATTACHMENT_TEXTURE_LAYER': 11,
+    'GL_FRAMEBUFFER_ATTACHMENT_TEXTURE_LEVEL': 11,
+    'GL_FRAMEBUFFER_BARRIER_BIT': 17,
+    'GL_FRAMEBUFFER_BINDING': 11,
+    'GL_FRAMEBUFFER_BLEND': 18,
+    'GL_FRAMEBUFFER_COMPLETE': 11,
+    'GL_FRAMEBUFFER_DEFAULT': 11,
+    'GL_FRAMEBUFFER_DEFAULT_FIXED_SAMPLE_LOCATIONS': 18,
+    'GL_FRAMEBUFFER_DEFAULT_HEIGHT': 18,
+    'GL_FRAMEBUFFER_DEFAULT_LAYERS': 18,
+    'GL_FRAMEBUFFER_DEFAULT_SAMPLES': 18,
+    'GL_FRAMEBUFFER_DEFAULT_WIDTH': 18,
+    'GL_FRAMEBUFFER_INCOMPLETE_ATTACHMENT': 11,
+    'GL_FRAMEBUFFER_INCOMPLETE_DIMENSIONS': 11,
+    'GL_FRAMEBUFFER_INCOMPLETE_DRAW_BUFFER': 11,
+    'GL_FRAMEBUFFER_INCOMPLETE_FORMATS': 11,
+    'GL_FRAMEBUFFER_INCOMPLETE_LAYER_TARGETS': 13,
+    'GL_FRAMEBUFFER_INCOMPLETE_MISSING_ATTACHMENT': 11,
+    'GL_FRAMEBUFFER_INCOMPLETE_MULTISAMPLE': 11,
+    'GL_FRAMEBUFFER_INCOMPLETE_READ_BUFFER': 11,
+    'GL_FRAMEBUFFER_RENDERABLE': 18,
+    'GL_FRAMEBUFFER_RENDERABLE_LAYERED': 18,
+    'GL_FRAMEBUFFER_SRGB': 11,
+    'GL_FRAMEBUFFER_UNDEFINED': 11,
+    'GL_FRAMEBUFFER_UNSUPPORTED': 11,
+    'GL_FRONT': 0,
+    'GL_FRONT_AND_BACK': 0,
+    'GL_FRONT_FACE': 0,
+    'GL_FRONT_LEFT': 0,
+    'GL_FRONT_RIGHT': 0,
+    'GL_FULL_SUPPORT': 18,
+    'GL_FUNC_ADD': 7,
+    'GL_FUNC_REVERSE_SUBTRACT': 7,
+    'GL_FUNC_SUBTRACT': 7,
+    'GL_GENERATE_MIPMAP': 7,
+    'GL_GENERATE_MIPMAP_HINT': 7,
+    'GL_GEOMETRY_INPUT_TYPE': 13,
+    'GL_GEOMETRY_OUTPUT_TYPE': 13,
+    'GL_GEOMETRY_SHADER': 13,
+    'GL_GEOMETRY_SHADER_BIT': 16,
+    'GL_GEOMETRY_SHADER_INVOCATIONS': 15,
+    'GL_GEOMETRY_SUBROUTINE': 18,
+    'GL_GEOMETRY_SUBROUTINE_UNIFORM': 18,
+    'GL_GEOMETRY_TEXTURE': 18,
+    'GL_GEOMETRY_VERTICES_OUT': 13,
+    'GL_GEQUAL': 0,
+    'GL_GET_TEXTURE_IMAGE_FORMAT': 18,
+    'GL_GET_TEXTURE_IMAGE_TYPE': 18,
+    'GL_GREATER': 0,
+    'GL_GREEN': 0,
+    'GL_GREEN_BIAS': 0,
+    'GL_GREEN_BITS': 0,
+    'GL_GREEN_INTEGER': 11,
+    'GL_GREEN_SCALE': 0,
+    'GL_HALF_FLOAT': 11,
+    'GL_HALF_NV': 0,
+    'GL_HIGH_FLOAT': 16,
+    'GL_HIGH_INT': 16,
+    'GL_HINT_BIT': 0,
+    'GL_HISTOGRAM': 5,
+    'GL_HISTOGRAM_ALPHA_SIZE': 5,
+    'GL_HISTOGRAM_BLUE_SIZE': 5,
+    'GL_HISTOGRAM_FORMAT': 5,
+    'GL_HISTOGRAM_GREEN_SIZE': 5,
+    'GL_HISTOGRAM_LUMINANCE_SIZE': 5,
+    'GL_HISTOGRAM_RED_SIZE': 5,
+    'GL_HISTOGRAM_SINK': 5,
+    'GL_HISTOGRAM_WIDTH': 5,
+    'GL_IMAGE_1D': 17,
+    'GL_IMAGE_1D_ARRAY': 17,
+    'GL_IMAGE_2D': 17,
+    'GL_IMAGE_2D_ARRAY': 17,
+    'GL_IMAGE_2D_MULTISAMPLE': 17,
+    'GL_IMAGE_2D_MULTISAMPLE_ARRAY': 17,
+    'GL_IMAGE_2D_RECT': 17,
+    'GL_IMAGE_3D': 17,
+    'GL_IMAGE_BINDING_ACCESS': 17,
+    'GL_IMAGE_BINDING_FORMAT': 17,
+    'GL_IMAGE_BINDING_LAYER': 17,
+    'GL_IMAGE_BINDING_LAYERED': 17,
+    'GL_IMAGE_BINDING_LEVEL': 17,
+    'GL_IMAGE_BINDING_NAME': 17,
+    'GL_IMAGE_BUFFER': 17,
+    'GL_IMAGE_CLASS_10_10_10_2': 18,
+    'GL_IMAGE_CLASS_11_11_10': 18,
+    'GL_IMAGE_CLASS_1_X_16': 18,
+    'GL_IMAGE_CLASS_1_X_32': 18,
+    'GL_IMAGE_CLASS_1_X_8': 18,
+    'GL_IMAGE_CLASS_2_X_16': 18,
+    'GL_IMAGE_CLASS_2_X_32': 18,
+    'GL_IMAGE_CLASS_2_X_8': 18,
+    'GL_IMAGE_CLASS_4_X_16': 18,
+    'GL_IMAGE_CLASS_4_X_32': 18,
+    'GL_IMAGE_CLASS_4_X_8': 18,
+    'GL_IMAGE_COMPATIBILITY_CLASS': 18,
+    'GL_IMAGE_CUBE': 17,
+    'GL_IMAGE_CUBE_MAP_ARRAY': 17,
+    'GL_IMAGE_FORMAT_COMPATIBILITY_BY_CLASS': 17,
+    'GL_IMAGE_FORMAT_COMPATIBILITY_BY_SIZE': 17,
+    'GL_IMAGE_FORMAT_COMPATIBILITY_TYPE': 18,
+    'GL_IMAGE_PIXEL_FORMAT': 18,
+    'GL_IMAGE_PIXEL_TYPE': 18,
+    'GL_IMAGE_TEXEL_SIZE': 18,
+    'GL_IMPLEMENTATION_COLOR_READ_FORMAT': 16,
+    'GL_IMPLEMENTATION_COLOR_READ_TYPE': 16,
+    'GL_INCR': 0,
+    'GL_INCR_WRAP': 7,
+    'GL_INDEX': 11,
+    'GL_INDEX_ARRAY': 0,
+    'GL_INDEX_ARRAY_BUFFER_BINDING': 8,
+    'GL_INDEX_ARRAY_POINTER': 0,
+    'GL_INDEX_ARRAY_STRIDE': 0,
+    'GL_INDEX_ARRAY_TYPE': 0,
+    'GL_INDEX_BITS': 0,
+    'GL_INDEX_CLEAR_VALUE': 0,
+    'GL_INDEX_LOGIC_OP': 0,
+    'GL_INDEX_MODE': 0,
+    'GL_INDEX_OFFSET': 0,
+    'GL_INDEX_SHIFT': 0,
+    'GL_INDEX_WRITEMASK': 0,
+    'GL_INFO_LOG_LENGTH': 9,
+    'GL_INT': 0,
+    'GL_INTENSITY': 0,
+    'GL_INTENSITY12': 0,
+    'GL_INTENSITY16': 0,
+    'GL_INTENSITY4': 0,
+    'GL_INTENSITY8': 0,
+    'GL_INTERLEAVED_ARRAY_POINTER': 1,
+    'GL_INTERLEAVED_ATTRIBS': 11,
+    'GL_INTERNALFORMAT_ALPHA_SIZE': 18,
+    'GL_INTERNALFORMAT_ALPHA_TYPE': 18,
+    'GL_INTERNALFORMAT_BLUE_SIZE': 18,
+    'GL_INTERNALFORMAT_BLUE_TYPE': 18,
+    'GL_INTERNALFORMAT_DEPTH_SIZE': 18,
+    'GL_INTERNALFORMAT_DEPTH_TYPE': 18,
+    'GL_INTERNALFORMAT_GREEN_SIZE': 18,
+    'GL_INTERNALFORMAT_GREEN_TYPE': 18,
+    'GL_INTERNALFORMAT_PREFERRED': 18,
+    'GL_INTERNALFORMAT_RED_SIZE': 18,
+    'GL_INTERNALFORMAT_RED_TYPE': 18,
+    'GL_INTERNALFORMAT_SHARED_SIZE': 18,
+    'GL_INTERNALFORMAT_STENCIL_SIZE': 18,
+    'GL_INTERNALFORMAT_STENCIL_TYPE': 18,
+    'GL_INTERNALFORMAT_SUPPORTED': 18,
+    'GL_INTERPOLATE': 6,
+    'GL_INT_2_10_10_10_REV': 14,
+    'GL_INT_IMAGE_1D': 17,
+    'GL_INT_IMAGE_1D_ARRAY': 17,
+    'GL_INT_IMAGE_2D': 17,
+    'GL_INT_IMAGE_2D_ARRAY': 17,
+    'GL_INT_IMAGE_2D_MULTISAMPLE': 17,
+    'GL_INT_IMAGE_2D_MULTISAMPLE_ARRAY': 17,
+    'GL_INT_IMAGE_2D_RECT': 17,
+    'GL_INT_IMAGE_3D': 17,
+    'GL_INT_IMAGE_BUFFER': 17,
+    'GL_INT_IMAGE_CUBE': 17,
+    'GL_INT_IMAGE_CUBE_MAP_ARRAY': 17,
+    'GL_INT_SAMPLER_1D': 11,
+    'GL_INT_SAMPLER_1D_ARRAY': 11,
+    'GL_INT_SAMPLER_2D': 11,
+    'GL_INT_SAMPLER_2D_ARRAY': 11,
+    'GL_INT_SAMPLER_2D_MULTISAMPLE': 13,
+    'GL_INT_SAMPLER_2D_MULTISAMPLE_ARRAY': 13,
+    'GL_INT_SAMPLER_2D_RECT': 12,
+    'GL_INT_SAMPLER_3D': 11,
+    'GL_INT_SAMPLER_BUFFER': 12,
+    'GL_INT_SAMPLER_CUBE': 11,
+    'GL_INT_SAMPLER_CUBE_MAP_ARRAY': 15,
+    'GL_INT_SAMPLER_CUBE_MAP_ARRAY_ARB': 15,
+    'GL_INT_VEC2': 9,
+    'GL_INT_VEC3': 9,
+    'GL_INT_VEC4': 9,
+    'GL_INVALID_ENUM': 0,
+    'GL_INVALID_FRAMEBUFFER_OPERATION': 11,
+    'GL_INVALID_INDEX': 12,
+    'GL_INVALID_OPERATION': 0,
+    'GL_INVALID_VALUE': 0,
+    'GL_INVERT': 0,
+    'GL_ISOLINES': 15,
+    'GL_IS_PER_PATCH': 18,
+    'GL_IS_ROW_MAJOR': 18,
+    'GL_KEEP': 0,
+    'GL_LAST_VERTEX_CONVENTION': 16,
+    'GL_LAYER_PROVOKING_VERTEX': 16,
+    'GL_LEFT': 0,
+    'GL_LEQUAL': 0,
+    'GL_LESS': 0,
+    'GL_LIGHT0': 0,
+    'GL_LIGHT1': 0,
+    'GL_LIGHT2': 0,
+    'GL_LIGHT3': 0,
+    'GL_LIGHT4': 0,
+    'GL_LIGHT5': 0,
+    'GL_LIGHT6': 0,
+    'GL_LIGHT7': 0,
+    'GL_LIGHTING': 0,
+    'GL_LIGHTING_BIT': 0,
+    'GL_LIGHT_MODEL_AMBIENT': 0,
+    'GL_LIGHT_MODEL_COLOR_CONTROL': 5,
+    'GL_LIGHT_MODEL_LOCAL_VIEWER': 0,
+    'GL_LIGHT_MODEL_TWO_SIDE': 0,
+    'GL_LINE': 0,
+    'GL_LINEAR': 0,
+    'GL_LINEAR_ATTENUATION': 0,
+    'GL_LINEAR_MIPMAP_LINEAR': 0,
+    'GL_LINEAR_MIPMAP_NEAREST': 0,
+    'GL_LINES': 0,
+    'GL_LINES_ADJACENCY': 13,
+    'GL_LINE_BIT': 0,
+    'GL_LINE_LOOP': 0,
+    'GL_LINE_RESET_TOKEN': 0,
+    'GL_LINE_SMOOTH': 0,
+    'GL_LINE_SMOOTH_HINT': 0,
+    'GL_LINE_STIPPLE': 0,
+    'GL_LINE_STIPPLE_PATTERN': 0,
+    'GL_LINE_STIPPLE_REPEAT': 0,
+    'GL_LINE_STRIP': 0,
+    'GL_LINE_STRIP_ADJACENCY': 13,
+    'GL_LINE_TOKEN': 0,
+    'GL_LINE_WIDTH': 0,
+    'GL_LINE_WIDTH_GRANULARITY': 5,
+    'GL_LINE_WIDTH_RANGE': 5,
+    'GL_LINK_STATUS': 9,
+    'GL_LIST_BASE': 0,
+    'GL_LIST_BIT': 0,
+    'GL_LIST_INDEX': 0,
+    'GL_LIST_MODE': 0,
+    'GL_LOAD': 0,
+    'GL_LOCATION': 18,
+    'GL_LOCATION_COMPONENT': 19,
+    'GL_LOCATION_INDEX': 18,
+    'GL_LOGIC_OP': 0,
+    'GL_LOGIC_OP_MODE': 0,
+    'GL_LOWER_LEFT': 9,
+    'GL_LOW_FLOAT': 16,
+    'GL_LOW_INT': 16,
+    'GL_LUMINANCE': 0,
+    'GL_LUMINANCE12': 0,
+    'GL_LUMINANCE12_ALPHA12': 0,
+    'GL_LUMINANCE12_ALPHA4': 0,
+    'GL_LUMINANCE16': 0,
+    'GL_LUMINANCE16_ALPHA16': 0,
+    'GL_LUMINANCE4': 0,
+    'GL_LUMINANCE4_ALPHA4': 0,
+    'GL_LUMINANCE6_ALPHA2': 0,
+    'GL_LUMINANCE8': 0,
+    'GL_LUMINANCE8_ALPHA8': 0,
+    'GL_LUMINANCE_ALPHA': 0,
+    'GL_MAJOR_VERSION': 11,
+    'GL_MANUAL_GENERATE_MIPMAP': 18,
+    'GL_MAP1_COLOR_4': 0,
+    'GL_MAP1_GRID_DOMAIN': 0,
+    'GL_MAP1_GRID_SEGMENTS': 0,
+    'GL_MAP1_INDEX': 0,
+    'GL_MAP1_NORMAL': 0,
+    'GL_MAP1_TEXTURE_COORD_1': 0,
+    'GL_MAP1_TEXTURE_COORD_2': 0,
+    'GL_MAP1_TEXTURE_COORD_3': 0,
+    'GL_MAP1_TEXTURE_COORD_4': 0,
+    'GL_MAP1_VERTEX_3': 0,
+    'GL_MAP1_VERTEX_4': 0,
+    'GL_MAP2_COLOR_4': 0,
+    'GL_MAP2_GRID_DOMAIN': 0,
+    'GL_MAP2_GRID_SEGMENTS': 0,
+    'GL_MAP2_INDEX': 0,
+    'GL_MAP2_NORMAL': 0,
+    'GL_MAP2_TEXTURE_COORD_1': 0,
+    'GL_MAP2_TEXTURE_COORD_2': 0,
+    'GL_MAP2_TEXTURE_COORD_3': 0,
+    'GL_MAP2_TEXTURE_COORD_4': 0,
+    'GL_MAP2_VERTEX_3': 0,
+    'GL_MAP2_VERTEX_4': 0,
+    'GL_MAP_COHERENT_BIT': 19,
+    'GL_MAP_COLOR': 0,
+    'GL_MAP_FLUSH_EXPLICIT_BIT': 11,
+    'GL_MAP_INVALIDATE_BUFFER_BIT': 11,
+    'GL_MAP_INVALIDATE_RANGE_BIT': 11,
+    'GL_MAP_PERSISTENT_BIT': 19,
+    'GL_MAP_READ_BIT': 19,
+    'GL_MAP_STENCIL': 0,
+    'GL_MAP_UNSYNCHRONIZED_BIT': 11,
+    'GL_MAP_WRITE_BIT': 19,
+    'GL_MATRIX_MODE': 0,
+    'GL_MATRIX_STRIDE': 18,
+    'GL_MAX': 7,
+    'GL_MAX_3D_TEXTURE_SIZE': 5,
+    'GL_MAX_ARRAY_TEXTURE_LAYERS': 11,
+    'GL_MAX_ATOMIC_COUNTER_BUFFER_BINDINGS': 17,
+    'GL_MAX_ATOMIC_COUNTER_BUFFER_SIZE': 17,
+    'GL_MAX_ATTRIB_STACK_DEPTH': 0,
+    'GL_MAX_CLIENT_ATTRIB_STACK_DEPTH': 0,
+    'GL_MAX_CLIP_DISTANCES': 11,
+    'GL_MAX_CLIP_PLANES': 0,
+    'GL_MAX_COLOR_ATTACHMENTS': 11,
+    'GL_MAX_COLOR_MATRIX_STACK_DEPTH': 5,
+    'GL_MAX_COLOR_TEXTURE_SAMPLES': 13,
+    'GL_MAX_COMBINED_ATOMIC_COUNTERS': 17,
+    'GL_MAX_COMBINED_ATOMIC_COUNTER_BUFFERS': 17,
+    'GL_MAX_COMBINED_COMPUTE_UNIFORM_COMPONENTS': 18,
+    'GL_MAX_COMBINED_DIMENSIONS': 18,
+    'GL_MAX_COMBINED_FRAGMENT_UNIFORM_COMPONENTS': 12,
+    'GL_MAX_COMBINED_GEOMETRY_UNIFORM_COMPONENTS': 12,
+    'GL_MAX_COMBINED_IMAGE_UNIFORMS': 17,
+    'GL_MAX_COMBINED_IMAGE_UNITS_AND_FRAGMENT_OUTPUTS': 18,
+    'GL_MAX_COMBINED_SHADER_OUTPUT_RESOURCES': 18,
+    'GL_MAX_COMBINED_SHADER_STORAGE_BLOCKS': 18,
+    'GL_MAX_COMBINED_TESS_CONTROL_UNIFORM_COMPONENTS': 15,
+    'GL_MAX_COMBINED_TESS_EVALUATION_UNIFORM_COMPONENTS': 15,
+    'GL_MAX_COMBINED_TEXTURE_IMAGE_UNITS': 9,
+    'GL_MAX_COMBINED_UNIFORM_BLOCKS': 12,
+    'GL_MAX_COMBINED_VERTEX_UNIFORM_COMPONENTS': 12,
+    'GL_MAX_COMPUTE_ATOMIC_COUNTERS': 18,
+    'GL_MAX_COMPUTE_ATOMIC_COUNTER_BUFFERS': 18,
+    'GL_MAX_COMPUTE_IMAGE_UNIFORMS': 18,
+    'GL_MAX_COMPUTE_SHADER_STORAGE_BLOCKS': 18,
+    'GL_MAX_COMPUTE_SHARED_MEMORY_SIZE': 18,
+    'GL_MAX_COMPUTE_TEXTURE_IMAGE_UNITS': 18,
+    'GL_MAX_COMPUTE_UNIFORM_BLOCKS': 18,
+    'GL_MAX_COMPUTE_UNIFORM_COMPONENTS': 18,
+    'GL_MAX_COMPUTE_WORK_GROUP_COUNT': 18,
+    'GL_MAX_COMPUTE_WORK_GROUP_INVOCATIONS': 18,
+    'GL_MAX_COMPUTE_WORK_GROUP_SIZE': 18,
+    'GL_MAX_CONVOLUTION_HEIGHT': 5,
+    'GL_MAX_CONVOLUTION_WIDTH': 5,
+    'GL_MAX_CUBE_MAP_TEXTURE_SIZE': 6,
+    'GL_MAX_DEBUG_GROUP_STACK_DEPTH': 18,
+    'GL_MAX_DEBUG_GROUP_STACK_DEPTH_KHR': 18,
+    'GL_MAX_DEBUG_LOGGED_MESSAGES': 18,
+    'GL_MAX_DEBUG_LOGGED_MESSAGES_KHR': 18,
+    'GL_MAX_DEBUG_MESSAGE_LENGTH': 18,
+    'GL_MAX_DEBUG_MESSAGE_LENGTH_KHR': 18,
+    'GL_MAX_DEPTH': 18,
+    'GL_MAX_DEPTH_TEXTURE_SAMPLES': 13,
+    'GL_MAX_DRAW_BUFFERS': 9,
+    'GL_MAX_DUAL_SOURCE_DRAW_BUFFERS': 14,
+    'GL_MAX_ELEMENTS_INDICES': 5,
+    'GL_MAX_ELEMENTS_VERTICES': 5,
+    'GL_MAX_ELEMENT_INDEX': 18,
+    'GL_MAX_EVAL_ORDER': 0,
+    'GL_MAX_FRAGMENT_ATOMIC_COUNTERS': 17,
+    'GL_MAX_FRAGMENT_ATOMIC_COUNTER_BUFFERS': 17,
+    'GL_MAX_FRAGMENT_IMAGE_UNIFORMS': 17,
+    'GL_MAX_FRAGMENT_INPUT_COMPONENTS': 13,
+    'GL_MAX_FRAGMENT_INTERPOLATION_OFFSET': 15,
+    'GL_MAX_FRAGMENT_SHADER_STORAGE_BLOCKS': 18,
+    'GL_MAX_FRAGMENT_UNIFORM_BLOCKS': 12,
+    'GL_MAX_FRAGMENT_UNIFORM_COMPONENTS': 9,
+    'GL_MAX_FRAGMENT_UNIFORM_VECTORS': 16,
+    'GL_MAX_FRAMEBUFFER_HEIGHT': 18,
+    'GL_MAX_FRAMEBUFFER_LAYERS': 18,
+    'GL_MAX_FRAMEBUFFER_SAMPLES': 18,
+    'GL_MAX_FRAMEBUFFER_WIDTH': 18,
+    'GL_MAX_GEOMETRY_ATOMIC_COUNTERS': 17,
+    'GL_MAX_GEOMETRY_ATOMIC_COUNTER_BUFFERS': 17,
+    'GL_MAX_GEOMETRY_IMAGE_UNIFORMS': 17,
+    'GL_MAX_GEOMETRY_INPUT_COMPONENTS': 13,
+    'GL_MAX_GEOMETRY_OUTPUT_COMPONENTS': 13,
+    'GL_MAX_GEOMETRY_OUTPUT_VERTICES': 13,
+    'GL_MAX_GEOMETRY_SHADER_INVOCATIONS': 15,
+    'GL_MAX_GEOMETRY_SHADER_STORAGE_BLOCKS': 18,
+    'GL_MAX_GEOMETRY_TEXTURE_IMAGE_UNITS': 13,
+    'GL_MAX_GEOMETRY_TOTAL_OUTPUT_COMPONENTS': 13,
+    'GL_MAX_GEOMETRY_UNIFORM_BLOCKS': 12,
+    'GL_MAX_GEOMETRY_UNIFORM_COMPONENTS': 13,
+    'GL_MAX_HEIGHT': 18,
+    'GL_MAX_IMAGE_SAMPLES': 17,
+    'GL_MAX_IMAGE_UNITS': 17,
+    'GL_MAX_INTEGER_SAMPLES': 13,
+    'GL_MAX_LABEL_LENGTH': 18,
+    'GL_MAX_LABEL_LENGTH_KHR': 18,
+    'GL_MAX_LAYERS': 18,
+    'GL_MAX_LIGHTS': 0,
+    'GL_MAX_LIST_NESTING': 0,
+    'GL_MAX_MODELVIEW_STACK_DEPTH': 0,
+    'GL_MAX_NAME_LENGTH': 18,
+    'GL_MAX_NAME_STACK_DEPTH': 0,
+    'GL_MAX_NUM_ACTIVE_VARIABLES': 18,
+    'GL_MAX_NUM_COMPATIBLE_SUBROUTINES': 18,
+    'GL_MAX_PATCH_VERTICES': 15,
+    'GL_MAX_PIXEL_MAP_TABLE': 0,
+    'GL_MAX_PROGRAM_TEXEL_OFFSET': 11,
+    'GL_MAX_PROGRAM_TEXTURE_GATHER_COMPONENTS_ARB': 15,
+    'GL_MAX_PROGRAM_TEXTURE_GATHER_OFFSET': 15,
+    'GL_MAX_PROGRAM_TEXTURE_GATHER_OFFSET_ARB': 15,
+    'GL_MAX_PROJECTION_STACK_DEPTH': 0,
+    'GL_MAX_RECTANGLE_TEXTURE_SIZE': 12,
+    'GL_MAX_RENDERBUFFER_SIZE': 11,
+    'GL_MAX_SAMPLES': 11,
+    'GL_MAX_SAMPLE_MASK_WORDS': 13,
+    'GL_MAX_SERVER_WAIT_TIMEOUT': 13,
+    'GL_MAX_SHADER_STORAGE_BLOCK_SIZE': 18,
+    'GL_MAX_SHADER_STORAGE_BUFFER_BINDINGS': 18,
+    'GL_MAX_SUBROUTINES': 15,
+    'GL_MAX_SUBROUTINE_UNIFORM_LOCATIONS': 15,
+    'GL_MAX_TESS_CONTROL_ATOMIC_COUNTERS': 17,
+    'GL_MAX_TESS_CONTROL_ATOMIC_COUNTER_BUFFERS': 17,
+    'GL_MAX_TESS_CONTROL_IMAGE_UNIFORMS': 17,
+    'GL_MAX_TESS_CONTROL_INPUT_COMPONENTS': 15,
+    'GL_MAX_TESS_CONTROL_OUTPUT_COMPONENTS': 15,
+    'GL_MAX_TESS_CONTROL_SHADER_STORAGE_BLOCKS': 18,
+    'GL_MAX_TESS_CONTROL_TEXTURE_IMAGE_UNITS': 15,
+    'GL_MAX_TESS_CONTROL_TOTAL_OUTPUT_COMPONENTS': 15,
+    'GL_MAX_TESS_CONTROL_UNIFORM_BLOCKS': 15,
+    'GL_MAX_TESS_CONTROL_UNIFORM_COMPONENTS': 15,
+    'GL_MAX_TESS_EVALUATION_ATOMIC_COUNTERS': 17,
+    'GL_MAX_TESS_EVALUATION_ATOMIC_COUNTER_BUFFERS': 17,
+    'GL_MAX_TESS_EVALUATION_IMAGE_UNIFORMS': 17,
+    'GL_MAX_TESS_EVALUATION_INPUT_COMPONENTS': 15,
+    'GL_MAX_TESS_EVALUATION_OUTPUT_COMPONENTS': 15,
+    'GL_MAX_TESS_EVALUATION_SHADER_STORAGE_BLOCKS': 18,
+    'GL_MAX_TESS_EVALUATION_TEXTURE_IMAGE_UNITS': 15,
+    'GL_MAX_TESS_EVALUATION_UNIFORM_BLOCKS': 15,
+    'GL_MAX_TESS_EVALUATION_UNIFORM_COMPONENTS': 15,
+    'GL_MAX_TESS_GEN_LEVEL': 15,
+    'GL_MAX_TESS_PATCH_COMPONENTS': 15,
+    'GL_MAX_TEXTURE_BUFFER_SIZE': 12,
+    'GL_MAX_TEXTURE_BUFFER_SIZE_ARB': 11,
+    'GL_MAX_TEXTURE_COORDS': 9,
+    'GL_MAX_TEXTURE_IMAGE_UNITS': 9,
+    'GL_MAX_TEXTURE_LOD_BIAS': 7,
+    'GL_MAX_TEXTURE_SIZE': 0,
+    'GL_MAX_TEXTURE_STACK_DEPTH': 0,
+    'GL_MAX_TEXTURE_UNITS': 6,
+    'GL_MAX_TRANSFORM_FEEDBACK_BUFFERS': 15,
+    'GL_MAX_TRANSFORM_FEEDBACK_INTERLEAVED_COMPONENTS': 11,
+    'GL_MAX_TRANSFORM_FEEDBACK_SEPARATE_ATTRIBS': 11,
+    'GL_MAX_TRANSFORM_FEEDBACK_SEPARATE_COMPONENTS': 11,
+    'GL_MAX_UNIFORM_BLOCK_SIZE': 12,
+    'GL_MAX_UNIFORM_BUFFER_BINDINGS': 12,
+    'GL_MAX_UNIFORM_LOCATIONS': 18,
+    'GL_MAX_VARYING_COMPONENTS': 11,
+    'GL_MAX_VARYING_FLOATS': 9,
+    'GL_MAX_VARYING_VECTORS': 16,
+    'GL_MAX_VERTEX_ATOMIC_COUNTERS': 17,
+    'GL_MAX_VERTEX_ATOMIC_COUNTER_BUFFERS': 17,
+    'GL_MAX_VERTEX_ATTRIBS': 9,
+    'GL_MAX_VERTEX_ATTRIB_BINDINGS': 18,
+    'GL_MAX_VERTEX_ATTRIB_RELATIVE_OFFSET': 18,
+    'GL_MAX_VERTEX_ATTRIB_STRIDE': 19,
+    'GL_MAX_VERTEX_IMAGE_UNIFORMS': 17,
+    'GL_MAX_VERTEX_OUTPUT_COMPONENTS': 13,
+    'GL_MAX_VERTEX_SHADER_STORAGE_BLOCKS': 18,
+    'GL_MAX_VERTEX_STREAMS': 15,
+    'GL_MAX_VERTEX_TEXTURE_IMAGE_UNITS': 9,
+    'GL_MAX_VERTEX_UNIFORM_BLOCKS': 12,
+    'GL_MAX_VERTEX_UNIFORM_COMPONENTS': 9,
+    'GL_MAX_VERTEX_UNIFORM_VECTORS': 16,
+    'GL_MAX_VIEWPORTS': 16,
+    'GL_MAX_VIEWPORT_DIMS': 0,
+    'GL_MAX_WIDTH': 18,
+    'GL_MEDIUM_FLOAT': 16,
+    'GL_MEDIUM_INT': 16,
+    'GL_MIN': 7,
+    'GL_MINMAX': 5,
+    'GL_MINMAX_FORMAT': 5,
+    'GL_MINMAX_SINK': 5,
+    'GL_MINOR_VERSION': 11,
+    'GL_MIN_FRAGMENT_INTERPOLATION_OFFSET': 15,
+    'GL_MIN_MAP_BUFFER_ALIGNMENT': 17,
+    'GL_MIN_PROGRAM_TEXEL_OFFSET': 11,
+    'GL_MIN_PROGRAM_TEXTURE_GATHER_OFFSET': 15,
+    'GL_MIN_PROGRAM_TEXTURE_GATHER_OFFSET_ARB': 15,
+    'GL_MIN_SAMPLE_SHADING_VALUE': 15,
+    'GL_MIPMAP': 18,
+    'GL_MIRRORED_REPEAT': 7,
+    'GL_MIRROR_CLAMP_TO_EDGE': 19,
+    'GL_MODELVIEW': 0,
+    'GL_MODELVIEW0_EXT': 0,
+    'GL_MODELVIEW0_MATRIX_EXT': 0,
+    'GL_MODELVIEW0_STACK_DEPTH_EXT': 0,
+    'GL_MODELVIEW_MATRIX': 0,
+    'GL_MODELVIEW_STACK_DEPTH': 0,
+    'GL_MODULATE': 0,
+    'GL_MULT': 0,
+    'GL_MULTISAMPLE': 6,
+    'GL_MULTISAMPLE_BIT': 6,
+    'GL_N3F_V3F': 0,
+    'GL_NAME_LENGTH': 18,
+    'GL_NAME_STACK_DEPTH': 0,
+    'GL_NAND': 0,
+    'GL_NEAREST': 0,
+    'GL_NEAREST_MIPMAP_LINEAR': 0,
+    'GL_NEAREST_MIPMAP_NEAREST': 0,
+    'GL_NEVER': 0,
+    'GL_NICEST': 0,
+    'GL_NONE': 0,
+    'GL_NOOP': 0,
+    'GL_NOR': 0,
+    'GL_NORMALIZE': 0,
+    'GL_NORMAL_ARRAY': 0,
+    'GL_NORMAL_ARRAY_BUFFER_BINDING': 8,
+    'GL_NORMAL_ARRAY_POINTER': 0,
+    'GL_NORMAL_ARRAY_STRIDE': 0,
+    'GL_NORMAL_ARRAY_TYPE': 0,
+    'GL_NORMAL_MAP': 6,
+    'GL_NOTEQUAL': 0,
+    'GL_NO_ERROR': 0,
+    'GL_NUM_ACTIVE_VARIABLES': 18,
+    'GL_NUM_COMPATIBLE_SUBROUTINES': 18,
+    'GL_NUM_COMPRESSED_TEXTURE_FORMATS': 6,
+    'GL_NUM_EXTENSIONS': 11,
+    'GL_NUM_PROGRAM_BINARY_FORMATS': 16,
+    'GL_NUM_SAMPLE_COUNTS': 18,
+    'GL_NUM_SHADER_BINARY_FORMATS': 16,
+    'GL_NUM_SHADING_LANGUAGE_VERSIONS': 18,
+    'GL_OBJECT_ACTIVE_UNIFORMS': 9,
+    'GL_OBJECT_ACTIVE_UNIFORM_MAX_LENGTH': 9,
+    'GL_OBJECT_COMPILE_STATUS': 9,
+    'GL_OBJECT_LINEAR': 0,
+    'GL_OBJECT_LINK_STATUS': 9,
+    'GL_OBJECT_PLANE': 0,
+    'GL_OBJECT_TYPE': 13,
+    'GL_OFFSET': 18,
+    'GL_ONE': 0,
+    'GL_ONE_MINUS_CONSTANT_ALPHA': 7,
+    'GL_ONE_MINUS_CONSTANT_COLOR': 7,
+    'GL_ONE_MINUS_DST_ALPHA': 0,
+    'GL_ONE_MINUS_DST_COLOR': 0,
+    'GL_ONE_MINUS_SRC1_ALPHA': 14,
+    'GL_ONE_MINUS_SRC1_COLOR': 14,
+    'GL_ONE_MINUS_SRC_ALPHA': 0,
+    'GL_ONE_MINUS_SRC_COLOR': 0,
+    'GL_OPERAND0_ALPHA': 6,
+    'GL_OPERAND0_RGB': 6,
+    'GL_OPERAND1_ALPHA': 6,
+    'GL_OPERAND1_RGB': 6,
+    'GL_OPERAND2_ALPHA': 6,
+    'GL_OPERAND2_RGB': 6,
+    'GL_OR': 0,
+    'GL_ORDER': 0,
+    'GL_OR_INVERTED': 0,
+    'GL_OR_REVERSE': 0,
+    'GL_OUT_OF_MEMORY': 0,
+    'GL_PACK_ALIGNMENT': 0,
+    'GL_PACK_COMPRESSED_BLOCK_DEPTH': 17,
+    'GL_PACK_COMPRESSED_BLOCK_HEIGHT': 17,
+    'GL_PACK_COMPRESSED_BLOCK_SIZE': 17,
+    'GL_PACK_COMPRESSED_BLOCK_WIDTH': 17,
+    'GL_PACK_IMAGE_HEIGHT': 5,
+    'GL_PACK_LSB_FIRST': 0,
+    'GL_PACK_ROW_LENGTH': 0,
+    'GL_PACK_SKIP_IMAGES': 5,
+    'GL_PACK_SKIP_PIXELS': 0,
+    'GL_PACK_SKIP_ROWS': 0,
+    'GL_PACK_SWAP_BYTES': 0,
+    'GL_PASS_THROUGH_TOKEN': 0,
+    'GL_PATCHES': 15,
+    'GL_PATCH_DEFAULT_INNER_LEVEL': 15,
+    'GL_PATCH_DEFAULT_OUTER_LEVEL': 15,
+    'GL_PATCH_VERTICES': 15,
+    'GL_PERSPECTIVE_CORRECTION_HINT': 0,
+    'GL_PIXEL_BUFFER_BARRIER_BIT': 17,
+    'GL_PIXEL_MAP_A_TO_A': 0,
+    'GL_PIXEL_MAP_A_TO_A_SIZE': 0,
+    'GL_PIXEL_MAP_B_TO_B': 0,
+    'GL_PIXEL_MAP_B_TO_B_SIZE': 0,
+    'GL_PIXEL_MAP_G_TO_G': 0,
+    'GL_PIXEL_MAP_G_TO_G_SIZE': 0,
+    'GL_PIXEL_MAP_I_TO_A': 0,
+    'GL_PIXEL_MAP_I_TO_A_SIZE': 0,
+    'GL_PIXEL_MAP_I_TO_B': 0,
+    'GL_PIXEL_MAP_I_TO_B_SIZE': 0,
+    'GL_PIXEL_MAP_I_TO_G': 0,
+    'GL_PIXEL_MAP_I_TO_G_SIZE': 0,
+    'GL_PIXEL_MAP_I_TO_I': 0,
+    'GL_PIXEL_MAP_I_TO_I_SIZE': 0,
+    'GL_PIXEL_MAP_I_TO_R': 0,
+    'GL_PIXEL_MAP_I_TO_R_SIZE': 0,
+    'GL_PIXEL_MAP_R_TO_R': 0,
+    'GL_PIXEL_MAP_R_TO_R_SIZE': 0,
+    'GL_PIXEL_MAP_S_TO_S': 0,
+    'GL_PIXEL_MAP_S_TO_S_SIZE': 0,
+    'GL_PIXEL_MODE_BIT': 0,
+    'GL_PIXEL_PACK_BUFFER': 10,
+    'GL_PIXEL_PACK_BUFFER_BINDING': 10,
+    'GL_PIXEL_UNPACK_BUFFER': 10,
+    'GL_PIXEL_UNPACK_BUFFER_BINDING': 10,
+    'GL_POINT': 0,
+    'GL_POINTS': 0,
+    'GL_POINT_BIT': 0,
+    'GL_POINT_DISTANCE_ATTENUATION': 7,
+    'GL_POINT_FADE_THRESHOLD_SIZE': 7,
+    'GL_POINT_SIZE': 0,
+    'GL_POINT_SIZE_GRANULARITY': 5,
+    'GL_POINT_SIZE_MAX': 7,
+    'GL_POINT_SIZE_MIN': 7,
+    'GL_POINT_SIZE_RANGE': 5,
+    'GL_POINT_SMOOTH': 0,
+    'GL_POINT_SMOOTH_HINT': 0,
+    'GL_POINT_SPRITE': 9,
+    'GL_POINT_SPRITE_COORD_ORIGIN': 9,
+    'GL_POINT_TOKEN': 0,
+    'GL_POLYGON': 0,
+    'GL_POLYGON_BIT': 0,
+    'GL_POLYGON_MODE': 0,
+    'GL_POLYGON_OFFSET_FACTOR': 0,
+    'GL_POLYGON_OFFSET_FILL': 0,
+    'GL_POLYGON_OFFSET_LINE': 0,
+    'GL_POLYGON_OFFSET_POINT': 0,
+    'GL_POLYGON_OFFSET_UNITS': 0,
+    'GL_POLYGON_SMOOTH': 0,
+    'GL_POLYGON_SMOOTH_HINT': 0,
+    'GL_POLYGON_STIPPLE': 0,
+    'GL_POLYGON_STIPPLE_BIT': 0,
+    'GL_POLYGON_TOKEN': 0,
+    'GL_POSITION': 0,
+    'GL_POST_COLOR_MATRIX_ALPHA_BIAS': 5,
+    'GL_POST_COLOR_MATRIX_ALPHA_SCALE': 5,
+    'GL_POST_COLOR_MATRIX_BLUE_BIAS': 5,
+    'GL_POST_COLOR_MATRIX_BLUE_SCALE': 5,
+    'GL_POST_COLOR_MATRIX_COLOR_TABLE': 5,
+    'GL_POST_COLOR_MATRIX_GREEN_BIAS': 5,
+    'GL_POST_COLOR_MATRIX_GREEN_SCALE': 5,
+    'GL_POST_COLOR_MATRIX_RED_BIAS': 5,
+    'GL_POST_COLOR_MATRIX_RED_SCALE': 5,
+    'GL_POST_CONVOLUTION_ALPHA_BIAS': 5,
+    'GL_POST_CONVOLUTION_ALPHA_SCALE': 5,
+    'GL_POST_CONVOLUTION_BLUE_BIAS': 5,
+    'GL_POST_CONVOLUTION_BLUE_SCALE': 5,
+    'GL_POST_CONVOLUTION_COLOR_TABLE': 5,
+    'GL_POST_CONVOLUTION_GREEN_BIAS': 5,
+    'GL_POST_CONVOLUTION_GREEN_SCALE': 5,
+    'GL_POST_CONVOLUTION_RED_BIAS': 5,
+    'GL_POST_CONVOLUTION_RED_SCALE': 5,
+    'GL_PREVIOUS': 6,
+    'GL_PRIMARY_COLOR': 6,
+    'GL_PRIMITIVES_GENERATED': 11,
+    'GL_PRIMITIVE_RESTART': 12,
+    'GL_PRIMITIVE_RESTART_FIXED_INDEX': 18,
+    'GL_PRIMITIVE_RESTART_FOR_PATCHES_SUPPORTED': 19,
+    'GL_PRIMITIVE_RESTART_INDEX': 12,
+    'GL_PROGRAM': 18,
+    'GL_PROGRAM_BINARY_FORMATS': 16,
+    'GL_PROGRAM_BINARY_LENGTH': 16,
+    'GL_PROGRAM_BINARY_RETRIEVABLE_HINT': 16,
+    'GL_PROGRAM_INPUT': 18,
+    'GL_PROGRAM_KHR': 18,
+    'GL_PROGRAM_OUTPUT': 18,
+    'GL_PROGRAM_PIPELINE': 18,
+    'GL_PROGRAM_PIPELINE_BINDING': 16,
+    'GL_PROGRAM_POINT_SIZE': 13,
+    'GL_PROGRAM_SEPARABLE': 16,
+    'GL_PROJECTION': 0,
+    'GL_PROJECTION_MATRIX': 0,
+    'GL_PROJECTION_STACK_DEPTH': 0,
+    'GL_PROVOKING_VERTEX': 16,
+    'GL_PROXY_COLOR_TABLE': 5,
+    'GL_PROXY_HISTOGRAM': 5,
+    'GL_PROXY_POST_COLOR_MATRIX_COLOR_TABLE': 5,
+    'GL_PROXY_POST_CONVOLUTION_COLOR_TABLE': 5,
+    'GL_PROXY_TEXTURE_1D': 0,
+    'GL_PROXY_TEXTURE_1D_ARRAY': 11,
+    'GL_PROXY_TEXTURE_2D': 0,
+    'GL_PROXY_TEXTURE_2D_ARRAY': 11,
+    'GL_PROXY_TEXTURE_2D_MULTISAMPLE': 13,
+    'GL_PROXY_TEXTURE_2D_MULTISAMPLE_ARRAY': 13,
+    'GL_PROXY_TEXTURE_3D': 5,
+    'GL_PROXY_TEXTURE_CUBE_MAP': 6,
+    'GL_PROXY_TEXTURE_CUBE_MAP_ARRAY': 15,
+    'GL_PROXY_TEXTURE_CUBE_MAP_ARRAY_ARB': 15,
+    'GL_PROXY_TEXTURE_RECTANGLE': 12,
+    'GL_Q': 0,
+    'GL_QUADRATIC_ATTENUATION': 0,
+    'GL_QUADS': 15,
+    'GL_QUADS_FOLLOW_PROVOKING_VERTEX_CONVENTION': 13,
+    'GL_QUAD_STRIP': 0,
+    'GL_QUERY': 18,
+    'GL_QUERY_BUFFER': 19,
+    'GL_QUERY_BUFFER_BARRIER_BIT': 19,
+    'GL_QUERY_BUFFER_BINDING': 19,
+    'GL_QUERY_BY_REGION_NO_WAIT': 11,
+    'GL_QUERY_BY_REGION_WAIT': 11,
+    'GL_QUERY_COUNTER_BITS': 8,
+    'GL_QUERY_KHR': 18,
+    'GL_QUERY_NO_WAIT': 11,
+    'GL_QUERY_RESULT': 8,
+    'GL_QUERY_RESULT_AVAILABLE': 8,
+    'GL_QUERY_RESULT_NO_WAIT': 19,
+    'GL_QUERY_WAIT': 11,
+    'GL_R': 0,
+    'GL_R11F_G11F_B10F': 11,
+    'GL_R16': 11,
+    'GL_R16F': 11,
+    'GL_R16I': 11,
+    'GL_R16UI': 11,
+    'GL_R16_SNORM': 12,
+    'GL_R32F': 11,
+    'GL_R32I': 11,
+    'GL_R32UI': 11,
+    'GL_R3_G3_B2': 0,
+    'GL_R8': 11,
+    'GL_R8I': 11,
+    'GL_R8UI': 11,
+    'GL_R8_SNORM': 12,
+    'GL_RASTERIZER_DISCARD': 11,
+    'GL_READ_BUFFER': 0,
+    'GL_READ_FRAMEBUFFER': 11,
+    'GL_READ_FRAMEBUFFER_BINDING': 11,
+    'GL_READ_ONLY': 8,
+    'GL_READ_PIXELS': 18,
+    'GL_READ_PIXELS_FORMAT': 18,
+    'GL_READ_PIXELS_TYPE': 18,
+    'GL_READ_WRITE': 8,
+    'GL_RED': 0,
+    'GL_REDUCE': 5,
+    'GL_RED_BIAS': 0,
+    'GL_RED_BITS': 0,
+    'GL_RED_INTEGER': 11,
+    'GL_RED_SCALE': 0,
+    'GL_REFERENCED_BY_COMPUTE_SHADER': 18,
+    'GL_REFERENCED_BY_FRAGMENT_SHADER': 18,
+    'GL_REFERENCED_BY_GEOMETRY_SHADER': 18,
+    'GL_REFERENCED_BY_TESS_CONTROL_SHADER': 18,
+    'GL_REFERENCED_BY_TESS_EVALUATION_SHADER': 18,
+    'GL_REFERENCED_BY_VERTEX_SHADER': 18,
+    'GL_REFLECTION_MAP': 6,
+    'GL_RENDER': 0,
+    'GL_RENDERBUFFER': 18,
+    'GL_RENDERBUFFER_ALPHA_SIZE': 11,
+    'GL_RENDERBUFFER_BINDING': 11,
+    'GL_RENDERBUFFER_BLUE_SIZE': 11,
+    'GL_RENDERBUFFER_DEPTH_SIZE': 11,
+    'GL_RENDERBUFFER_GREEN_SIZE': 11,
+    'GL_RENDERBUFFER_HEIGHT': 11,
+    'GL_RENDERBUFFER_INTERNAL_FORMAT': 11,
+    'GL_RENDERBUFFER_RED_SIZE': 11,
+    'GL_RENDERBUFFER_SAMPLES': 11,
+    'GL_RENDERBUFFER_STENCIL_SIZE': 11,
+    'GL_RENDERBUFFER_WIDTH': 11,
+    'GL_RENDERER': 0,
+    'GL_RENDER_MODE': 0,
+    'GL_REPEAT': 0,
+    'GL_REPLACE': 0,
+    'GL_REPLICATE_BORDER': 5,
+    'GL_RESCALE_NORMAL': 5,
+    'GL_RETURN': 0,
+    'GL_RG': 11,
+    'GL_RG16': 11,
+    'GL_RG16F': 11,
+    'GL_RG16I': 11,
+    'GL_RG16UI': 11,
+    'GL_RG16_SNORM': 12,
+    'GL_RG32F': 11,
+    'GL_RG32I': 11,
+    'GL_RG32UI': 11,
+    'GL_RG8': 11,
+    'GL_RG8I': 11,
+    'GL_RG8UI': 11,
+    'GL_RG8_SNORM': 12,
+    'GL_RGB': 0,
+    'GL_RGB10': 0,
+    'GL_RGB10_A2': 0,
+    'GL_RGB10_A2UI': 14,
+    'GL_RGB12': 0,
+    'GL_RGB16': 0,
+    'GL_RGB16F': 11,
+    'GL_RGB16I': 11,
+    'GL_RGB16UI': 11,
+    'GL_RGB16_SNORM': 12,
+    'GL_RGB32F': 15,
+    'GL_RGB32I': 16,
+    'GL_RGB32UI': 15,
+    'GL_RGB4': 0,
+    'GL_RGB5': 0,
+    'GL_RGB565': 16,
+    'GL_RGB5_A1': 0,
+    'GL_RGB8': 0,
+    'GL_RGB8I': 11,
+    'GL_RGB8UI': 11,
+    'GL_RGB8_SNORM': 12,
+    'GL_RGB9_E5': 11,
+    'GL_RGBA': 0,
+    'GL_RGBA12': 0,
+    'GL_RGBA16': 0,
+    'GL_RGBA16F': 11,
+    'GL_RGBA16I': 11,
+    'GL_RGBA16UI': 11,
+    'GL_RGBA16_SNORM': 12,
+    'GL_RGBA2': 0,
+    'GL_RGBA32F': 11,
+    'GL_RGBA32I': 11,
+    'GL_RGBA32UI': 11,
+    'GL_RGBA4': 0,
+    'GL_RGBA8': 0,
+    'GL_RGBA8I': 11,
+    'GL_RGBA8UI': 11,
+    'GL_RGBA8_SNORM': 12,
+    'GL_RGBA_INTEGER': 11,
+    'GL_RGBA_MODE': 0,
+    'GL_RGB_INTEGER': 11,
+    'GL_RGB_SCALE': 6,
+    'GL_RG_INTEGER': 11,
+    'GL_RIGHT': 0,
+    'GL_S': 0,
+    'GL_SAMPLER': 18,
+    'GL_SAMPLER_1D': 9,
+    'GL_SAMPLER_1D_ARRAY': 11,
+    'GL_SAMPLER_1D_ARRAY_SHADOW': 11,
+    'GL_SAMPLER_1D_SHADOW': 9,
+    'GL_SAMPLER_2D': 9,
+    'GL_SAMPLER_2D_ARRAY': 11,
+    'GL_SAMPLER_2D_ARRAY_SHADOW': 11,
+    'GL_SAMPLER_2D_MULTISAMPLE': 13,
+    'GL_SAMPLER_2D_MULTISAMPLE_ARRAY': 13,
+    'GL_SAMPLER_2D_RECT': 12,
+    'GL_SAMPLER_2D_RECT_SHADOW': 12,
+    'GL_SAMPLER_2D_SHADOW': 9,
+    'GL_SAMPLER_3D': 9,
+    'GL_SAMPLER_BINDING': 14,
+    'GL_SAMPLER_BUFFER': 12,
+    'GL_SAMPLER_CUBE': 9,
+    'GL_SAMPLER_CUBE_MAP_ARRAY': 15,
+    'GL_SAMPLER_CUBE_MAP_ARRAY_ARB': 15,
+    'GL_SAMPLER_CUBE_MAP_ARRAY_SHADOW': 15,
+    'GL_SAMPLER_CUBE_MAP_ARRAY_SHADOW_ARB': 15,
+    'GL_SAMPLER_CUBE_SHADOW': 11,
+    'GL_SAMPLER_KHR': 18,
+    'GL_SAMPLES': 18,
+    'GL_SAMPLES_PASSED': 8,
+    'GL_SAMPLE_ALPHA_TO_COVERAGE': 6,
+    'GL_SAMPLE_ALPHA_TO_ONE': 6,
+    'GL_SAMPLE_BUFFERS': 6,
+    'GL_SAMPLE_COVERAGE': 6,
+    'GL_SAMPLE_COVERAGE_INVERT': 6,
+    'GL_SAMPLE_COVERAGE_VALUE': 6,
+    'GL_SAMPLE_MASK': 13,
+    'GL_SAMPLE_MASK_VALUE': 13,
+    'GL_SAMPLE_POSITION': 13,
+    'GL_SAMPLE_SHADING': 15,
+    'GL_SCISSOR_BIT': 0,
+    'GL_SCISSOR_BOX': 16,
+    'GL_SCISSOR_TEST': 16,
+    'GL_SECONDARY_COLOR_ARRAY': 7,
+    'GL_SECONDARY_COLOR_ARRAY_BUFFER_BINDING': 8,
+    'GL_SECONDARY_COLOR_ARRAY_POINTER': 7,
+    'GL_SECONDARY_COLOR_ARRAY_SIZE': 7,
+    'GL_SECONDARY_COLOR_ARRAY_STRIDE': 7,
+    'GL_SECONDARY_COLOR_ARRAY_TYPE': 7,
+    'GL_SELECT': 0,
+    'GL_SELECTION_BUFFER_POINTER': 0,
+    'GL_SELECTION_BUFFER_SIZE': 0,
+    'GL_SEPARABLE_2D': 5,
+    'GL_SEPARATE_ATTRIBS': 11,
+    'GL_SEPARATE_SPECULAR_COLOR': 5,
+    'GL_SET': 0,
+    'GL_SHADER': 18,
+    'GL_SHADER_BINARY_FORMATS': 16,
+    'GL_SHADER_COMPILER': 16,
+    'GL_SHADER_IMAGE_ACCESS_BARRIER_BIT': 17,
+    'GL_SHADER_IMAGE_ATOMIC': 18,
+    'GL_SHADER_IMAGE_LOAD': 18,
+    'GL_SHADER_IMAGE_STORE': 18,
+    'GL_SHADER_KHR': 18,
+    'GL_SHADER_SOURCE_LENGTH': 9,
+    'GL_SHADER_STORAGE_BARRIER_BIT': 18,
+    'GL_SHADER_STORAGE_BLOCK': 18,
+    'GL_SHADER_STORAGE_BUFFER': 18,
+    'GL_SHADER_STORAGE_BUFFER_BINDING': 18,
+    'GL_SHADER_STORAGE_BUFFER_OFFSET_ALIGNMENT': 18,
+    'GL_SHADER_STORAGE_BUFFER_SIZE': 18,
+    'GL_SHADER_STORAGE_BUFFER_START': 18,
+    'GL_SHADER_TYPE': 9,
+    'GL_SHADE_MODEL': 0,
+    'GL_SHADING_LANGUAGE_VERSION': 9,
+    'GL_SHININESS': 0,
+    'GL_SHORT': 0,
+    'GL_SIGNALED': 13,
+    'GL_SIGNED_NORMALIZED': 12,
+    'GL_SIMULTANEOUS_TEXTURE_AND_DEPTH_TEST': 18,
+    'GL_SIMULTANEOUS_TEXTURE_AND_DEPTH_WRITE': 18,
+    'GL_SIMULTANEOUS_TEXTURE_AND_STENCIL_TEST': 18,
+    'GL_SIMULTANEOUS_TEXTURE_AND_STENCIL_WRITE': 18,
+    'GL_SINGLE_COLOR': 5,
+    'GL_SLUMINANCE': 10,
+    'GL_SLUMINANCE8': 10,
+    'GL_SLUMINANCE8_ALPHA8': 10,
+    'GL_SLUMINANCE_ALPHA': 10,
+    'GL_SMOOTH': 0,
+    'GL_SMOOTH_LINE_WIDTH_GRANULARITY': 5,
+    'GL_SMOOTH_LINE_WIDTH_RANGE': 5,
+    'GL_SMOOTH_POINT_SIZE_GRANULARITY': 5,
+    'GL_SMOOTH_POINT_SIZE_RANGE': 5,
+    'GL_SOURCE0_ALPHA': 6,
+    'GL_SOURCE0_RGB': 6,
+    'GL_SOURCE1_ALPHA': 6,
+    'GL_SOURCE1_RGB': 6,
+    'GL_SOURCE2_ALPHA': 6,
+    'GL_SOURCE2_RGB': 6,
+    'GL_SPECULAR': 0,
+    'GL_SPHERE_MAP': 0,
+    'GL_SPOT_CUTOFF': 0,
+    'GL_SPOT_DIRECTION': 0,
+    'GL_SPOT_EXPONENT': 0,
+    'GL_SRC0_ALPHA': 8,
+    'GL_SRC0_RGB': 8,
+    'GL_SRC1_ALPHA': 14,
+    'GL_SRC1_COLOR': 14,
+    'GL_SRC1_RGB': 8,
+    'GL_SRC2_ALPHA': 8,
+    'GL_SRC2_RGB': 8,
+    'GL_SRC_ALPHA': 0,
+    'GL_SRC_ALPHA_SATURATE': 0,
+    'GL_SRC_COLOR': 0,
+    'GL_SRGB': 10,
+    'GL_SRGB8': 10,
+    'GL_SRGB8_ALPHA8': 10,
+    'GL_SRGB_ALPHA': 10,
+    'GL_SRGB_DECODE_ARB': 18,
+    'GL_SRGB_READ': 18,
+    'GL_SRGB_WRITE': 18,
+    'GL_STACK_OVERFLOW': 18,
+    'GL_STACK_OVERFLOW_KHR': 18,
+    'GL_STACK_UNDERFLOW': 18,
+    'GL_STACK_UNDERFLOW_KHR': 18,
+    'GL_STATIC_COPY': 8,
+    'GL_STATIC_DRAW': 8,
+    'GL_STATIC_READ': 8,
+    'GL_STENCIL': 0,
+    'GL_STENCIL_ATTACHMENT': 11,
+    'GL_STENCIL_BACK_FAIL': 9,
+    'GL_STENCIL_BACK_FUNC': 9,
+    'GL_STENCIL_BACK_PASS_DEPTH_FAIL': 9,
+    'GL_STENCIL_BACK_PASS_DEPTH_PASS': 9,
+    'GL_STENCIL_BACK_REF': 9,
+    'GL_STENCIL_BACK_VALUE_MASK': 9,
+    'GL_STENCIL_BACK_WRITEMASK': 9,
+    'GL_STENCIL_BITS': 0,
+    'GL_STENCIL_BUFFER': 0,
+    'GL_STENCIL_BUFFER_BIT': 0,
+    'GL_STENCIL_CLEAR_VALUE': 0,
+    'GL_STENCIL_COMPONENTS': 18,
+    'GL_STENCIL_FAIL': 0,
+    'GL_STENCIL_FUNC': 0,
+    'GL_STENCIL_INDEX': 19,
+    'GL_STENCIL_INDEX1': 11,
+    'GL_STENCIL_INDEX16': 11,
+    'GL_STENCIL_INDEX4': 11,
+    'GL_STENCIL_INDEX8': 19,
+    'GL_STENCIL_PASS_DEPTH_FAIL': 0,
+    'GL_STENCIL_PASS_DEPTH_PASS': 0,
+    'GL_STENCIL_REF': 0,
+    'GL_STENCIL_RENDERABLE': 18,
+    'GL_STENCIL_TEST': 0,
+    'GL_STENCIL_VALUE_MASK': 0,
+    'GL_STENCIL_WRITEMASK': 0,
+    'GL_STEREO': 0,
+    'GL_STREAM_COPY': 8,
+    'GL_STREAM_DRAW': 8,
+    'GL_STREAM_READ': 8,
+    'GL_SUBPIXEL_BITS': 0,
+    'GL_SUBTRACT': 6,
+    'GL_SYNC_CONDITION': 13,
+    'GL_SYNC_FENCE': 13,
+    'GL_SYNC_FLAGS': 13,
+    'GL_SYNC_FLUSH_COMMANDS_BIT': 13,
+    'GL_SYNC_GPU_COMMANDS_COMPLETE': 13,
+    'GL_SYNC_STATUS': 13,
+    'GL_T': 0,
+    'GL_T2F_C3F_V3F': 0,
+    'GL_T2F_C4F_N3F_V3F': 0,
+    'GL_T2F_C4UB_V3F': 0,
+    'GL_T2F_N3F_V3F': 0,
+    'GL_T2F_V3F': 0,
+    'GL_T4F_C4F_N3F_V4F': 0,
+    'GL_T4F_V4F': 0,
+    'GL_TABLE_TOO_LARGE': 5,
+    'GL_TESS_CONTROL_OUTPUT_VERTICES': 15,
+    'GL_TESS_CONTROL_SHADER': 15,
+    'GL_TESS_CONTROL_SHADER_BIT': 16,
+    'GL_TESS_CONTROL_SUBROUTINE': 18,
+    'GL_TESS_CONTROL_SUBROUTINE_UNIFORM': 18,
+    'GL_TESS_CONTROL_TEXTURE': 18,
+    'GL_TESS_EVALUATION_SHADER': 15,
+    'GL_TESS_EVALUATION_SHADER_BIT': 16,
+    'GL_TESS_EVALUATION_SUBROUTINE': 18,
+    'GL_TESS_EVALUATION_SUBROUTINE_UNIFORM': 18,
+    'GL_TESS_EVALUATION_TEXTURE': 18,
+    'GL_TESS_GEN_MODE': 15,
+    'GL_TESS_GEN_POINT_MODE': 15,
+    'GL_TESS_GEN_SPACING': 15,
+    'GL_TESS_GEN_VERTEX_ORDER': 15,
+    'GL_TEXTURE': 0,
+    'GL_TEXTURE0': 6,
+    'GL_TEXTURE1': 6,
+    'GL_TEXTURE10': 6,
+    'GL_TEXTURE11': 6,
+    'GL_TEXTURE12': 6,
+    'GL_TEXTURE13': 6,
+    'GL_TEXTURE14': 6,
+    'GL_TEXTURE15': 6,
+    'GL_TEXTURE16': 6,
+    'GL_TEXTURE17': 6,
+    'GL_TEXTURE18': 6,
+    'GL_TEXTURE19': 6,
+    'GL_TEXTURE2': 6,
+    'GL_TEXTURE20': 6,
+    'GL_TEXTURE21': 6,
+    'GL_TEXTURE22': 6,
+    'GL_TEXTURE23': 6,
+    'GL_TEXTURE24': 6,
+    'GL_TEXTURE25': 6,
+    'GL_TEXTURE26': 6,
+    'GL_TEXTURE27': 6,
+    'GL_TEXTURE28': 6,
+    'GL_TEXTURE29': 6,
+    'GL_TEXTURE3': 6,
+    'GL_TEXTURE30': 6,
+    'GL_TEXTURE31': 6,
+    'GL_TEXTURE4': 6,
+    'GL_TEXTURE5': 6,
+    'GL_TEXTURE6': 6,
+    'GL_TEXTURE7': 6,
+    'GL_TEXTURE8': 6,
+    'GL_TEXTURE9': 6,
+    'GL_TEXTURE_1D': 18,
+    'GL_TEXTURE_1D_ARRAY': 18,
+    'GL_TEXTURE_2D': 18,
+    'GL_TEXTURE_2D_ARRAY': 18,
+    'GL_TEXTURE_2D_MULTISAMPLE': 18,
+    'GL_TEXTURE_2D_MULTISAMPLE_ARRAY': 18,
+    'GL_TEXTURE_3D': 18,
+    'GL_TEXTURE_ALPHA_SIZE': 0,
+    'GL_TEXTURE_ALPHA_TYPE': 11,
+    'GL_TEXTURE_BASE_LEVEL': 5,
+    'GL_TEXTURE_BINDING_1D': 0,
+    'GL_TEXTURE_BINDING_1D_ARRAY': 11,
+    'GL_TEXTURE_BINDING_2D': 0,
+    'GL_TEXTURE_BINDING_2D_ARRAY': 11,
+    'GL_TEXTURE_BINDING_2D_MULTISAMPLE': 13,
+    'GL_TEXTURE_BINDING_2D_MULTISAMPLE_ARRAY': 13,
+    'GL_TEXTURE_BINDING_3D': 5,
+    'GL_TEXTURE_BINDING_BUFFER': 12,
+    'GL_TEXTURE_BINDING_BUFFER_ARB': 11,
+    'GL_TEXTURE_BINDING_CUBE_MAP': 6,
+    'GL_TEXTURE_BINDING_CUBE_MAP_ARRAY': 15,
+    'GL_TEXTURE_BINDING_CUBE_MAP_ARRAY_ARB': 15,
+    'GL_TEXTURE_BINDING_RECTANGLE': 12,
+    'GL_TEXTURE_BIT': 0,
+    'GL_TEXTURE_BLUE_SIZE': 0,
+    'GL_TEXTURE_BLUE_TYPE': 11,
+    'GL_TEXTURE_BORDER': 0,
+    'GL_TEXTURE_BORDER_COLOR': 0,
+    'GL_TEXTURE_BUFFER': 18,
+    'GL_TEXTURE_BUFFER_ARB': 11,
+    'GL_TEXTURE_BUFFER_BINDING': 19,
+    'GL_TEXTURE_BUFFER_DATA_STORE_BINDING': 12,
+    'GL_TEXTURE_BUFFER_DATA_STORE_BINDING_ARB': 11,
+    'GL_TEXTURE_BUFFER_FORMAT_ARB': 11,
+    'GL_TEXTURE_BUFFER_OFFSET': 18,
+    'GL_TEXTURE_BUFFER_OFFSET_ALIGNMENT': 18,
+    'GL_TEXTURE_BUFFER_SIZE': 18,
+    'GL_TEXTURE_COMPARE_FUNC': 7,
+    'GL_TEXTURE_COMPARE_MODE': 7,
+    'GL_TEXTURE_COMPONENTS': 0,
+    'GL_TEXTURE_COMPRESSED': 18,
+    'GL_TEXTURE_COMPRESSED_BLOCK_HEIGHT': 18,
+    'GL_TEXTURE_COMPRESSED_BLOCK_SIZE': 18,
+    'GL_TEXTURE_COMPRESSED_BLOCK_WIDTH': 18,
+    'GL_TEXTURE_COMPRESSED_IMAGE_SIZE': 6,
+    'GL_TEXTURE_COMPRESSION_HINT': 6,
+    'GL_TEXTURE_COORD_ARRAY': 0,
+    'GL_TEXTURE_COORD_ARRAY_BUFFER_BINDING': 8,
+    'GL_TEXTURE_COORD_ARRAY_POINTER': 0,
+    'GL_TEXTURE_COORD_ARRAY_SIZE': 0,
+    'GL_TEXTURE_COORD_ARRAY_STRIDE': 0,
+    'GL_TEXTURE_COORD_ARRAY_TYPE': 0,
+    'GL_TEXTURE_CUBE_MAP': 18,
+    'GL_TEXTURE_CUBE_MAP_ARRAY': 18,
+    'GL_TEXTURE_CUBE_MAP_ARRAY_ARB': 15,
+    'GL_TEXTURE_CUBE_MAP_NEGATIVE_X': 6,
+    'GL_TEXTURE_CUBE_MAP_NEGATIVE_Y': 6,
+    'GL_TEXTURE_CUBE_MAP_NEGATIVE_Z': 6,
+    'GL_TEXTURE_CUBE_MAP_POSITIVE_X': 6,
+    'GL_TEXTURE_CUBE_MAP_POSITIVE_Y': 6,
+    'GL_TEXTURE_CUBE_MAP_POSITIVE_Z': 6,
+    'GL_TEXTURE_CUBE_MAP_SEAMLESS': 13,
+    'GL_TEXTURE_DEPTH': 5,
+    'GL_TEXTURE_DEPTH_SIZE': 7,
+    'GL_TEXTURE_DEPTH_TYPE': 11,
+    'GL_TEXTURE_ENV': 0,
+    'GL_TEXTURE_ENV_COLOR': 0,
+    'GL_TEXTURE_ENV_MODE': 0,
+    'GL_TEXTURE_FETCH_BARRIER_BIT': 17,
+    'GL_TEXTURE_FILTER_CONTROL': 7,
+    'GL_TEXTURE_FIXED_SAMPLE_LOCATIONS': 13,
+    'GL_TEXTURE_GATHER': 18,
+    'GL_TEXTURE_GATHER_SHADOW': 18,
+    'GL_TEXTURE_GEN_MODE': 0,
+    'GL_TEXTURE_GEN_Q': 0,
+    'GL_TEXTURE_GEN_R': 0,
+    'GL_TEXTURE_GEN_S': 0,
+    'GL_TEXTURE_GEN_T': 0,
+    'GL_TEXTURE_GREEN_SIZE': 0,
+    'GL_TEXTURE_GREEN_TYPE': 11,
+    'GL_TEXTURE_HEIGHT': 0,
+    'GL_TEXTURE_IMAGE_FORMAT': 18,
+    'GL_TEXTURE_IMAGE_TYPE': 18,
+    'GL_TEXTURE_IMMUTABLE_FORMAT': 17,
+    'GL_TEXTURE_IMMUTABLE_LEVELS': 18,
+    'GL_TEXTURE_INTENSITY_SIZE': 0,
+    'GL_TEXTURE_INTENSITY_TYPE': 11,
+    'GL_TEXTURE_INTERNAL_FORMAT': 0,
+    'GL_TEXTURE_LOD_BIAS': 7,
+    'GL_TEXTURE_LUMINANCE_SIZE': 0,
+    'GL_TEXTURE_LUMINANCE_TYPE': 11,
+    'GL_TEXTURE_MAG_FILTER': 0,
+    'GL_TEXTURE_MATRIX': 0,
+    'GL_TEXTURE_MAX_LEVEL': 5,
+    'GL_TEXTURE_MAX_LOD': 5,
+    'GL_TEXTURE_MIN_FILTER': 0,
+    'GL_TEXTURE_MIN_LOD': 5,
+    'GL_TEXTURE_PRIORITY': 0,
+    'GL_TEXTURE_RECTANGLE': 18,
+    'GL_TEXTURE_RED_SIZE': 0,
+    'GL_TEXTURE_RED_TYPE': 11,
+    'GL_TEXTURE_RESIDENT': 0,
+    'GL_TEXTURE_SAMPLES': 13,
+    'GL_TEXTURE_SHADOW': 18,
+    'GL_TEXTURE_SHARED_SIZE': 11,
+    'GL_TEXTURE_STACK_DEPTH': 0,
+    'GL_TEXTURE_STENCIL_SIZE': 11,
+    'GL_TEXTURE_SWIZZLE_A': 14,
+    'GL_TEXTURE_SWIZZLE_B': 14,
+    'GL_TEXTURE_SWIZZLE_G': 14,
+    'GL_TEXTURE_SWIZZLE_R': 14,
+    'GL_TEXTURE_SWIZZLE_RGBA': 14,
+    'GL_TEXTURE_UPDATE_BARRIER_BIT': 17,
+    'GL_TEXTURE_VIEW': 18,
+    'GL_TEXTURE_VIEW_MIN_LAYER': 18,
+    'GL_TEXTURE_VIEW_MIN_LEVEL': 18,
+    'GL_TEXTURE_VIEW_NUM_LAYERS': 18,
+    'GL_TEXTURE_VIEW_NUM_LEVELS': 18,
+    'GL_TEXTURE_WIDTH': 0,
+    'GL_TEXTURE_WRAP_R': 5,
+    'GL_TEXTURE_WRAP_S': 0,
+    'GL_TEXTURE_WRAP_T': 0,
+    'GL_TIMEOUT_EXPIRED': 13,
+    'GL_TIMEOUT_IGNORED': 13,
+    'GL_TIMESTAMP': 14,
+    'GL_TIME_ELAPSED': 14,
+    'GL_TOP_LEVEL_ARRAY_SIZE': 18,
+    'GL_TOP_LEVEL_ARRAY_STRIDE': 18,
+    'GL_TRANSFORM_BIT': 0,
+    'GL_TRANSFORM_FEEDBACK': 15,
+    'GL_TRANSFORM_FEEDBACK_ACTIVE': 15,
+    'GL_TRANSFORM_FEEDBACK_BARRIER_BIT': 17,
+    'GL_TRANSFORM_FEEDBACK_BINDING': 15,
+    'GL_TRANSFORM_FEEDBACK_BUFFER': 19,
+    'GL_TRANSFORM_FEEDBACK_BUFFER_ACTIVE': 15,
+    'GL_TRANSFORM_FEEDBACK_BUFFER_BINDING': 11,
+    'GL_TRANSFORM_FEEDBACK_BUFFER_INDEX': 19,
+    'GL_TRANSFORM_FEEDBACK_BUFFER_MODE': 11,
+    'GL_TRANSFORM_FEEDBACK_BUFFER_PAUSED': 15,
+    'GL_TRANSFORM_FEEDBACK_BUFFER_SIZE': 11,
+    'GL_TRANSFORM_FEEDBACK_BUFFER_START': 11,
+    'GL_TRANSFORM_FEEDBACK_BUFFER_STRIDE': 19,
+    'GL_TRANSFORM_FEEDBACK_PAUSED': 15,
+    'GL_TRANSFORM_FEEDBACK_PRIMITIVES_WRITTEN': 11,
+    'GL_TRANSFORM_FEEDBACK_VARYING': 18,
+    'GL_TRANSFORM_FEEDBACK_VARYINGS': 11,
+    'GL_TRANSFORM_FEEDBACK_VARYING_MAX_LENGTH': 11,
+    'GL_TRANSPOSE_COLOR_MATRIX': 6,
+    'GL_TRANSPOSE_MODELVIEW_MATRIX': 6,
+    'GL_TRANSPOSE_PROJECTION_MATRIX': 6,
+    'GL_TRANSPOSE_TEXTURE_MATRIX': 6,
+    'GL_TRIANGLES': 15,
+    'GL_TRIANGLES_ADJACENCY': 13,
+    'GL_TRIANGLE_FAN': 0,
+    'GL_TRIANGLE_STRIP': 0,
+    'GL_TRIANGLE_STRIP_ADJACENCY': 13,
+    'GL_TRUE': 0,
+    'GL_TYPE': 18,
+    'GL_UNDEFINED_VERTEX': 16,
+    'GL_UNIFORM': 18,
+    'GL_UNIFORM_ARRAY_STRIDE': 12,
+    'GL_UNIFORM_ATOMIC_COUNTER_BUFFER_INDEX': 17,
+    'GL_UNIFORM_BARRIER_BIT': 17,
+    'GL_UNIFORM_BLOCK': 18,
+    'GL_UNIFORM_BLOCK_ACTIVE_UNIFORMS': 12,
+    'GL_UNIFORM_BLOCK_ACTIVE_UNIFORM_INDICES': 12,
+    'GL_UNIFORM_BLOCK_BINDING': 12,
+    'GL_UNIFORM_BLOCK_DATA_SIZE': 12,
+    'GL_UNIFORM_BLOCK_INDEX': 12,
+    'GL_UNIFORM_BLOCK_NAME_LENGTH': 12,
+    'GL_UNIFORM_BLOCK_REFERENCED_BY_COMPUTE_SHADER': 18,
+    'GL_UNIFORM_BLOCK_REFERENCED_BY_FRAGMENT_SHADER': 12,
+    'GL_UNIFORM_BLOCK_REFERENCED_BY_GEOMETRY_SHADER': 12,
+    'GL_UNIFORM_BLOCK_REFERENCED_BY_TESS_CONTROL_SHADER': 15,
+    'GL_UNIFORM_BLOCK_REFERENCED_BY_TESS_EVALUATION_SHADER': 15,
+    'GL_UNIFORM_BLOCK_REFERENCED_BY_VERTEX_SHADER': 12,
+    'GL_UNIFORM_BUFFER': 12,
+    'GL_UNIFORM_BUFFER_BINDING': 12,
+    'GL_UNIFORM_BUFFER_OFFSET_ALIGNMENT': 12,
+    'GL_UNIFORM_BUFFER_SIZE': 12,
+    'GL_UNIFORM_BUFFER_START': 12,
+    'GL_UNIFORM_IS_ROW_MAJOR': 12,
+    'GL_UNIFORM_MATRIX_STRIDE': 12,
+    'GL_UNIFORM_NAME_LENGTH': 15,
+    'GL_UNIFORM_OFFSET': 12,
+    'GL_UNIFORM_SIZE': 15,
+    'GL_UNIFORM_TYPE': 12,
+    'GL_UNPACK_ALIGNMENT': 0,
+    'GL_UNPACK_COMPRESSED_BLOCK_DEPTH': 17,
+    'GL_UNPACK_COMPRESSED_BLOCK_HEIGHT': 17,
+    'GL_UNPACK_COMPRESSED_BLOCK_SIZE': 17,
+    'GL_UNPACK_COMPRESSED_BLOCK_WIDTH': 17,
+    'GL_UNPACK_IMAGE_HEIGHT': 5,
+    'GL_UNPACK_LSB_FIRST': 0,
+    'GL_UNPACK_ROW_LENGTH': 0,
+    'GL_UNPACK_SKIP_IMAGES': 5,
+    'GL_UNPACK_SKIP_PIXELS': 0,
+    'GL_UNPACK_SKIP_ROWS': 0,
+    'GL_UNPACK_SWAP_BYTES': 0,
+    'GL_UNSIGNALED': 13,
+    'GL_UNSIGNED_BYTE': 0,
+    'GL_UNSIGNED_BYTE_2_3_3_REV': 5,
+    'GL_UNSIGNED_BYTE_3_3_2': 5,
+    'GL_UNSIGNED_INT': 0,
+    'GL_UNSIGNED_INT64': 0,
+    'GL_UNSIGNED_INT_10F_11F_11F_REV': 19,
+    'GL_UNSIGNED_INT_10_10_10_2': 5,
+    'GL_UNSIGNED_INT_24_8': 11,
+    'GL_UNSIGNED_INT_2_10_10_10_REV': 14,
+    'GL_UNSIGNED_INT_5_9_9_9_REV': 11,
+    'GL_UNSIGNED_INT_8_8_8_8': 5,
+    'GL_UNSIGNED_INT_8_8_8_8_REV': 5,
+    'GL_UNSIGNED_INT_ATOMIC_COUNTER': 17,
+    'GL_UNSIGNED_INT_IMAGE_1D': 17,
+    'GL_UNSIGNED_INT_IMAGE_1D_ARRAY': 17,
+    'GL_UNSIGNED_INT_IMAGE_2D': 17,
+    'GL_UNSIGNED_INT_IMAGE_2D_ARRAY': 17,
+    'GL_UNSIGNED_INT_IMAGE_2D_MULTISAMPLE': 17,
+    'GL_UNSIGNED_INT_IMAGE_2D_MULTISAMPLE_ARRAY': 17,
+    'GL_UNSIGNED_INT_IMAGE_2D_RECT': 17,
+    'GL_UNSIGNED_INT_IMAGE_3D': 17,
+    'GL_UNSIGNED_INT_IMAGE_BUFFER': 17,
+    'GL_UNSIGNED_INT_IMAGE_CUBE': 17,
+    'GL_UNSIGNED_INT_IMAGE_CUBE_MAP_ARRAY': 17,
+    'GL_UNSIGNED_INT_SAMPLER_1D': 11,
+    'GL_UNSIGNED_INT_SAMPLER_1D_ARRAY': 11,
+    'GL_UNSIGNED_INT_SAMPLER_2D': 11,
+    'GL_UNSIGNED_INT_SAMPLER_2D_ARRAY': 11,
+    'GL_UNSIGNED_INT_SAMPLER_2D_MULTISAMPLE': 13,
+    'GL_UNSIGNED_INT_SAMPLER_2D_MULTISAMPLE_ARRAY': 13,
+    'GL_UNSIGNED_INT_SAMPLER_2D_RECT': 12,
+    'GL_UNSIGNED_INT_SAMPLER_3D': 11,
+    'GL_UNSIGNED_INT_SAMPLER_BUFFER': 12,
+    'GL_UNSIGNED_INT_SAMPLER_CUBE': 11,
+    'GL_UNSIGNED_INT_SAMPLER_CUBE_MAP_ARRAY': 15,
+    'GL_UNSIGNED_INT_SAMPLER_CUBE_MAP_ARRAY_ARB': 15,
+    'GL_UNSIGNED_INT_VEC2': 11,
+    'GL_UNSIGNED_INT_VEC3': 11,
+    'GL_UNSIGNED_INT_VEC4': 11,
+    'GL_UNSIGNED_NORMALIZED': 11,
+    'GL_UNSIGNED_SHORT': 0,
+    'GL_UNSIGNED_SHORT_1_5_5_5_REV': 5,
+    'GL_UNSIGNED_SHORT_4_4_4_4': 5,
+    'GL_UNSIGNED_SHORT_4_4_4_4_REV': 5,
+    'GL_UNSIGNED_SHORT_5_5_5_1': 5,
+    'GL_UNSIGNED_SHORT_5_6_5': 5,
+    'GL_UNSIGNED_SHORT_5_6_5_REV': 5,
+    'GL_UPPER_LEFT': 9,
+    'GL_V2F': 0,
+    'GL_V3F': 0,
+    'GL_VALIDATE_STATUS': 9,
+    'GL_VENDOR': 0,
+    'GL_VERSION': 0,
+    'GL_VERTEX_ARRAY': 18,
+    'GL_VERTEX_ARRAY_BINDING': 11,
+    'GL_VERTEX_ARRAY_BUFFER_BINDING': 8,
+    'GL_VERTEX_ARRAY_KHR': 18,
+    'GL_VERTEX_ARRAY_POINTER': 0,
+    'GL_VERTEX_ARRAY_SIZE': 0,
+    'GL_VERTEX_ARRAY_STRIDE': 0,
+    'GL_VERTEX_ARRAY_TYPE': 0,
+    'GL_VERTEX_ATTRIB_ARRAY_BARRIER_BIT': 17,
+    'GL_VERTEX_ATTRIB_ARRAY_BUFFER_BINDING': 8,
+    'GL_VERTEX_ATTRIB_ARRAY_DIVISOR': 14,
+    'GL_VERTEX_ATTRIB_ARRAY_ENABLED': 9,
+    'GL_VERTEX_ATTRIB_ARRAY_INTEGER': 11,
+    'GL_VERTEX_ATTRIB_ARRAY_LONG': 18,
+    'GL_VERTEX_ATTRIB_ARRAY_NORMALIZED': 9,
+    'GL_VERTEX_ATTRIB_ARRAY_POINTER': 9,
+    'GL_VERTEX_ATTRIB_ARRAY_SIZE': 9,
+    'GL_VERTEX_ATTRIB_ARRAY_STRIDE': 9,
+    'GL_VERTEX_ATTRIB_ARRAY_TYPE': 9,
+    'GL_VERTEX_ATTRIB_BINDING': 18,
+    'GL_VERTEX_ATTRIB_RELATIVE_OFFSET': 18,
+    'GL_VERTEX_BINDING_BUFFER': 18,
+    'GL_VERTEX_BINDING_DIVISOR': 18,
+    'GL_VERTEX_BINDING_OFFSET': 18,
+    'GL_VERTEX_BINDING_STRIDE': 18,
+    'GL_VERTEX_PROGRAM_POINT_SIZE': 9,
+    'GL_VERTEX_PROGRAM_TWO_SIDE': 9,
+    'GL_VERTEX_SHADER': 9,
+    'GL_VERTEX_SHADER_BIT': 16,
+    'GL_VERTEX_SUBROUTINE': 18,
+    'GL_VERTEX_SUBROUTINE_UNIFORM': 18,
+    'GL_VERTEX_TEXTURE': 18,
+    'GL_VIEWPORT': 16,
+    'GL_VIEWPORT_BIT': 0,
+    'GL_VIEWPORT_BOUNDS_RANGE': 16,
+    'GL_VIEWPORT_INDEX_PROVOKING_VERTEX': 16,
+    'GL_VIEWPORT_SUBPIXEL_BITS': 16,
+    'GL_VIEW_CLASS_128_BITS': 18,
+    'GL_VIEW_CLASS_16_BITS': 18,
+    'GL_VIEW_CLASS_24_BITS': 18,
+    'GL_VIEW_CLASS_32_BITS': 18,
+    'GL_VIEW_CLASS_48_BITS': 18,
+    'GL_VIEW_CLASS_64_BITS': 18,
+    'GL_VIEW_CLASS_8_BITS': 18,
+    'GL_VIEW_CLASS_96_BITS': 18,
+    'GL_VIEW_CLASS_BPTC_FLOAT': 18,
+    'GL_VIEW_CLASS_BPTC_UNORM': 18,
+    'GL_VIEW_CLASS_RGTC1_RED': 18,
+    'GL_VIEW_CLASS_RGTC2_RG': 18,
+    'GL_VIEW_CLASS_S3TC_DXT1_RGB': 18,
+    'GL_VIEW_CLASS_S3TC_DXT1_RGBA': 18,
+    'GL_VIEW_CLASS_S3TC_DXT3_RGBA': 18,
+    'GL_VIEW_CLASS_S3TC_DXT5_RGBA': 18,
+    'GL_VIEW_COMPATIBILITY_CLASS': 18,
+    'GL_VOID_P': 0,
+    'GL_WAIT_FAILED': 13,
+    'GL_WEIGHT_ARRAY_BUFFER_BINDING': 8,
+    'GL_WRITE_ONLY': 8,
+    'GL_XOR': 0,
+    'GL_ZERO': 0,
+    'GL_ZOOM_X': 0,
+    'GL_ZOOM_Y': 0,
+    'GLbitfield': 0,
+    'GLboolean': 0,
+    'GLbyte': 0,
+    'GLchar': 0,
+    'GLcharARB': 0,
+    'GLclampd': 0,
+    'GLclampf': 0,
+    'GLdouble': 0,
+    'GLdouble_2': 0,
+    'GLdouble_3': 0,
+    'GLdouble_4': 0,
+    'GLeglImageOES': 0,
+    'GLenum': 0,
+    'GLenumArray': 9,
+    'GLfloat': 0,
+    'GLfloat_2': 0,
+    'GLfloat_3': 0,
+    'GLfloat_4': 0,
+    'GLhalfARB': 0,
+    'GLhalfNV': 0,
+    'GLhandle': 0,
+    'GLhandleARB': 0,
+    'GLint': 0,
+    'GLint64': 0,
+    'GLint64EXT': 0,
+    'GLintArray': 13,
+    'GLintptr': 0,
+    'GLintptrARB': 0,
+    'GLshort': 0,
+    'GLsizei': 0,
+    'GLsizeiptr': 0,
+    'GLsizeiptrARB': 0,
+    'GLsync': 0,
+    'GLubyte': 0,
+    'GLubyte_3': 0,
+    'GLuint': 0,
+    'GLuint64': 0,
+    'GLuint64EXT': 0,
+    'GLulong': 0,
+    'GLushort': 0,
+    'GLvdpauSurfaceNV': 0,
+    'GLvoid': 0,
+    'GLvoidp': 0,
+    'OpenGL': 9,
+    'arrays': 0,
+    'as_8_bit': 0,
+    'bytes': 0,
+    'c_char_p': 11,
+    'c_int': 0,
+    'constant': 0,
+    'constants': 5,
+    'contextdata': 1,
+    'converters': 1,
+    'ctypes': 0,
+    'ctypes_version': 0,
+    'error': 1,
+    'extensions': 0,
+    'glAccum': 0,
+    'glActiveShaderProgram': 16,
+    'glActiveTexture': 6,
+    'glAlphaFunc': 0,
+    'glAreTexturesResident': 3,
+    'glArrayElement': 0,
+    'glAttachShader': 9,
+    'glBegin': 3,
+    'glBeginConditionalRender': 11,
+    'glBeginQuery': 8,
+    'glBeginQueryIndexed': 15,
+    'glBeginTransformFeedback': 11,
+    'glBindAttribLocation': 9,
+    'glBindBuffer': 8,
+    'glBindBufferBase': 11,
+    'glBindBufferRange': 11,
+    'glBindBuffersBase': 19,
+    'glBindBuffersRange': 19,
+    'glBindFragDataLocation': 11,
+    'glBindFragDataLocationIndexed': 14,
+    'glBindFramebuffer': 11,
+    'glBindImageTexture': 17,
+    'glBindImageTextures': 19,
+    'glBindProgramPipeline': 16,
+    'glBindRenderbuffer': 11,
+    'glBindSampler': 14,
+    'glBindSamplers': 19,
+    'glBindTexture': 0,
+    'glBindTextures': 19,
+    'glBindTransformFeedback': 15,
+    'glBindVertexArray': 11,
+    'glBindVertexBuffer': 18,
+    'glBindVertexBuffers': 19,
+    'glBitmap': 0,
+    'glBlendColor': 7,
+    'glBlendEquation': 7,
+    'glBlendEquationSeparate': 9,
+    'glBlendEquationSeparatei': 15,
+    'glBlendEquationi': 15,
+    'glBlendFunc': 0,
+    'glBlendFuncSeparate': 7,
+    'glBlendFuncSeparatei': 15,
+    'glBlendFunci': 15,
+    'glBlitFramebuffer': 11,
+    'glBufferData': 8,
+    'glBufferStorage': 19,
+    'glBufferSubData': 8,
+    'glCallList': 0,
+    'glCallLists': 3,
+    'glCheckFramebufferStatus': 11,
+    'glClampColor': 11,
+    'glClear': 0,
+    'glClearAccum': 0,
+    'glClearBufferData': 18,
+    'glClearBufferSubData': 18,
+    'glClearBufferfi': 11,
+    'glClearBufferfv': 11,
+    'glClearBufferiv': 11,
+    'glClearBufferuiv': 11,
+    'glClearColor': 0,
+    'glClearDepth': 0,
+    'glClearDepthf': 16,
+    'glClearIndex': 0,
+    'glClearStencil': 0,
+    'glClearTexImage': 19,
+    'glClearTexSubImage': 19,
+    'glClientActiveTexture': 6,
+    'glClientWaitSync': 13,
+    'glClipPlane': 0,
+    'glColor': 3,
+    'glColor3b': 0,
+    'glColor3bv': 0,
+    'glColor3d': 0,
+    'glColor3dv': 0,
+    'glColor3f': 0,
+    'glColor3fv': 0,
+    'glColor3i': 0,
+    'glColor3iv': 0,
+    'glColor3s': 0,
+    'glColor3sv': 0,
+    'glColor3ub': 0,
+    'glColor3ubv': 0,
+    'glColor3ui': 0,
+    'glColor3uiv': 0,
+    'glColor3us': 0,
+    'glColor3usv': 0,
+    'glColor4b': 0,
+    'glColor4bv': 0,
+    'glColor4d': 0,
+    'glColor4dv': 0,
+    'glColor4f': 0,
+    'glColor4fv': 0,
+    'glColor4i': 0,
+    'glColor4iv': 0,
+    'glColor4s': 0,
+    'glColor4sv': 0,
+    'glColor4ub': 0,
+    'glColor4ubv': 0,
+    'glColor4ui': 0,
+    'glColor4uiv': 0,
+    'glColor4us': 0,
+    'glColor4usv': 0,
+    'glColorMask': 0,
+    'glColorMaski': 11,
+    'glColorMaterial': 0,
+    'glColorP3ui': 14,
+    'glColorP3uiv': 14,
+    'glColorP4ui': 14,
+    'glColorP4uiv': 14,
+    'glColorPointer': 1,
+    'glColorPointerb': 1,
+    'glColorPointerd': 1,
+    'glColorPointerf': 1,
+    'glColorPointeri': 1,
+    'glColorPointers': 1,
+    'glColorPointerub': 1,
+    'glColorPointerui': 1,
+    'glColorPointerus': 1,
+    'glColorSubTable': 5,
+    'glColorTable': 5,
+    'glColorTableParameterfv': 5,
+    'glColorTableParameteriv': 5,
+    'glCompileShader': 9,
+    'glCompressedTexImage1D': 6,
+    'glCompressedTexImage2D': 6,
+    'glCompressedTexImage3D': 6,
+    'glCompressedTexSubImage1D': 6,
+    'glCompressedTexSubImage2D': 6,
+    'glCompressedTexSubImage3D': 6,
+    'glConvolutionFilter1D': 5,
+    'glConvolutionFilter2D': 5,
+    'glConvolutionParameterf': 5,
+    'glConvolutionParameterfv': 5,
+    'glConvolutionParameteri': 5,
+    'glConvolutionParameteriv': 5,
+    'glCopyBufferSubData': 12,
+    'glCopyColorSubTable': 5,
+    'glCopyColorTable': 5,
+    'glCopyConvolutionFilter1D': 5,
+    'glCopyConvolutionFilter2D': 5,
+    'glCopyImageSubData': 18,
+    'glCopyPixels': 0,
+    'glCopyTexImage1D': 0,
+    'glCopyTexImage2D': 0,
+    'glCopyTexSubImage1D': 0,
+    'glCopyTexSubImage2D': 0,
+    'glCopyTexSubImage3D': 5,
+    'glCreateProgram': 9,
+    'glCreateShader': 9,
+    'glCreateShaderProgramv': 16,
+    'glCullFace': 0,
+    'glDebugMessageCallback': 18,
+    'glDebugMessageCallbackKHR': 18,
+    'glDebugMessageControl': 18,
+    'glDebugMessageControlKHR': 18,
+    'glDebugMessageInsert': 18,
+    'glDebugMessageInsertKHR': 18,
+    'glDeleteBuffers': 8,
+    'glDeleteFramebuffers': 11,
+    'glDeleteLists': 0,
+    'glDeleteProgram': 9,
+    'glDeleteProgramPipelines': 16,
+    'glDeleteQueries': 8,
+    'glDeleteRenderbuffers': 11,
+    'glDeleteSamplers': 14,
+    'glDeleteShader': 9,
+    'glDeleteSync': 13,
+    'glDeleteTextures': 3,
+    'glDeleteTransformFeedbacks': 15,
+    'glDeleteVertexArrays': 11,
+    'glDepthFunc': 0,
+    'glDepthMask': 0,
+    'glDepthRange': 0,
+    'glDepthRangeArrayv': 16,
+    'glDepthRangeIndexed': 16,
+    'glDepthRangef': 16,
+    'glDetachShader': 9,
+    'glDisable': 0,
+    'glDisableClientState': 0,
+    'glDisableVertexAttribArray': 9,
+    'glDisablei': 11,
+    'glDispatchCompute': 18,
+    'glDispatchComputeIndirect': 18,
+    'glDrawArrays': 0,
+    'glDrawArraysIndirect': 15,
+    'glDrawArraysInstanced': 12,
+    'glDrawArraysInstancedBaseInstance': 17,
+    'glDrawBuffer': 0,
+    'glDrawBuffers': 9,
+    'glDrawElements': 1,
+    'glDrawElementsBaseVertex': 13,
+    'glDrawElementsIndirect': 15,
+    'glDrawElementsInstanced': 12,
+    'glDrawElementsInstancedBaseInstance': 17,
+    'glDrawElementsInstancedBaseVertex': 13,
+    'glDrawElementsInstancedBaseVertexBaseInstance': 17,
+    'glDrawElementsub': 1,
+    'glDrawElementsui': 1,
+    'glDrawElementsus': 1,
+    'glDrawPixels': 2,
+    'glDrawPixelsb': 2,
+    'glDrawPixelsf': 2,
+    'glDrawPixelsi': 2,
+    'glDrawPixelss': 2,
+    'glDrawPixelsub': 2,
+    'glDrawPixelsui': 2,
+    'glDrawPixelsus': 2,
+    'glDrawRangeElements': 5,
+    'glDrawRangeElementsBaseVertex': 13,
+    'glDrawTransformFeedback': 15,
+    'glDrawTransformFeedbackInstanced': 17,
+    'glDrawTransformFeedbackStream': 15,
+    'glDrawTransformFeedbackStreamInstanced': 17,
+    'glEdgeFlag': 0,
+    'glEdgeFlagPointer': 1,
+    'glEdgeFlagPointerb': 1,
+    'glEdgeFlagv': 0,
+    'glEnable': 0,
+    'glEnableClientState': 0,
+    'glEnableVertexAttribArray': 9,
+    'glEnablei': 11,
+    'glEnd': 3,
+    'glEndConditionalRender': 11,
+    'glEndList': 0,
+    'glEndQuery': 8,
+    'glEndQueryIndexed': 15,
+    'glEndTransformFeedback': 11,
+    'glEvalCoord1d': 0,
+    'glEvalCoord1dv': 0,
+    'glEvalCoord1f': 0,
+    'glEvalCoord1fv': 0,
+    'glEvalCoord2d': 0,
+    'glEvalCoord2dv': 0,
+    'glEvalCoord2f': 0,
+    'glEvalCoord2fv': 0,
+    'glEvalMesh1': 0,
+    'glEvalMesh2': 0,
+    'glEvalPoint1': 0,
+    'glEvalPoint2': 0,
+    'glFeedbackBuffer': 1,
+    'glFenceSync': 13,
+    'glFinish': 0,
+    'glFlush': 0,
+    'glFlushMappedBufferRange': 11,
+    'glFogCoordPointer': 7,
+    'glFogCoordd': 7,
+    'glFogCoorddv': 7,
+    'glFogCoordf': 7,
+    'glFogCoordfv': 7,
+    'glFogf': 0,
+    'glFogfv': 0,
+    'glFogi': 0,
+    'glFogiv': 0,
+    'glFramebufferParameteri': 18,
+    'glFramebufferRenderbuffer': 11,
+    'glFramebufferTexture': 13,
+    'glFramebufferTexture1D': 11,
+    'glFramebufferTexture2D': 11,
+    'glFramebufferTexture3D': 11,
+    'glFramebufferTextureLayer': 11,
+    'glFrontFace': 0,
+    'glFrustum': 0,
+    'glGenBuffers': 8,
+    'glGenFramebuffers': 11,
+    'glGenLists': 0,
+    'glGenProgramPipelines': 16,
+    'glGenQueries': 8,
+    'glGenRenderbuffers': 11,
+    'glGenSamplers': 14,
+    'glGenTextures': 3,
+    'glGenTransformFeedbacks': 15,
+    'glGenVertexArrays': 11,
+    'glGenerateMipmap': 11,
+    'glGetActiveAtomicCounterBufferiv': 17,
+    'glGetActiveAttrib': 9,
+    'glGetActiveSubroutineName': 15,
+    'glGetActiveSubroutineUniformName': 15,
+    'glGetActiveSubroutineUniformiv': 15,
+    'glGetActiveUniform': 9,
+    'glGetActiveUniformBlockName': 12,
+    'glGetActiveUniformBlockiv': 12,
+    'glGetActiveUniformName': 12,
+    'glGetActiveUniformsiv': 12,
+    'glGetAttachedShaders': 9,
+    'glGetAttribLocation': 9,
+    'glGetBooleani_v': 11,
+    'glGetBooleanv': 0,
+    'glGetBufferParameteri64v': 13,
+    'glGetBufferParameteriv': 8,
+    'glGetBufferPointerv': 8,
+    'glGetBufferSubData': 8,
+    'glGetClipPlane': 0,
+    'glGetColorTable': 5,
+    'glGetColorTableParameterfv': 5,
+    'glGetColorTableParameteriv': 5,
+    'glGetCompressedTexImage': 6,
+    'glGetConvolutionFilter': 5,
+    'glGetConvolutionParameterfv': 5,
+    'glGetConvolutionParameteriv': 5,
+    'glGetDebugMessageLog': 18,
+    'glGetDebugMessageLogKHR': 18,
+    'glGetDoublei_v': 16,
+    'glGetDoublev': 0,
+    'glGetError': 0,
+    'glGetFloati_v': 16,
+    'glGetFloatv': 0,
+    'glGetFragDataIndex': 14,
+    'glGetFragDataLocation': 11,
+    'glGetFramebufferAttachmentParameteriv': 11,
+    'glGetFramebufferParameteriv': 18,
+    'glGetHistogram': 5,
+    'glGetHistogramParameterfv': 5,
+    'glGetHistogramParameteriv': 5,
+    'glGetInteger64i_v': 13,
+    'glGetInteger64v': 13,
+    'glGetIntegeri_v': 11,
+    'glGetIntegerv': 0,
+    'glGetInternalformati64v': 18,
+    'glGetInternalformativ': 17,
+    'glGetLightfv': 0,
+    'glGetLightiv': 0,
+    'glGetMapdv': 0,
+    'glGetMapfv': 0,
+    'glGetMapiv': 0,
+    'glGetMaterialfv': 0,
+    'glGetMaterialiv': 0,
+    'glGetMinmax': 5,
+    'glGetMinmaxParameterfv': 5,
+    'glGetMinmaxParameteriv': 5,
+    'glGetMultisamplefv': 13,
+    'glGetObjectLabel': 18,
+    'glGetObjectLabelKHR': 18,
+    'glGetObjectPtrLabel': 18,
+    'glGetObjectPtrLabelKHR': 18,
+    'glGetPixelMapfv': 0,
+    'glGetPixelMapuiv': 0,
+    'glGetPixelMapusv': 0,
+    'glGetPointerv': 18,
+    'glGetPointervKHR': 18,
+    'glGetPolygonStipple': 0,
+    'glGetProgramBinary': 16,
+    'glGetProgramInfoLog': 9,
+    'glGetProgramInterfaceiv': 18,
+    'glGetProgramPipelineInfoLog': 16,
+    'glGetProgramPipelineiv': 16,
+    'glGetProgramResourceIndex': 18,
+    'glGetProgramResourceLocation': 18,
+    'glGetProgramResourceLocationIndex': 18,
+    'glGetProgramResourceName': 18,
+    'glGetProgramResourceiv': 18,
+    'glGetProgramStageiv': 15,
+    'glGetProgramiv': 9,
+    'glGetQueryIndexediv': 15,
+    'glGetQueryObjecti64v': 14,
+    'glGetQueryObjectiv': 8,
+    'glGetQueryObjectui64v': 14,
+    'glGetQueryObjectuiv': 8,
+    'glGetQueryiv': 8,
+    'glGetRenderbufferParameteriv': 11,
+    'glGetSamplerParameterIiv': 14,
+    'glGetSamplerParameterIuiv': 14,
+    'glGetSamplerParameterfv': 14,
+    'glGetSamplerParameteriv': 14,
+    'glGetSeparableFilter': 5,
+    'glGetShaderInfoLog': 9,
+    'glGetShaderPrecisionFormat': 16,
+    'glGetShaderSource': 9,
+    'glGetShaderiv': 9,
+    'glGetString': 0,
+    'glGetStringi': 11,
+    'glGetSubroutineIndex': 15,
+    'glGetSubroutineUniformLocation': 15,
+    'glGetSync': 13,
+    'glGetSynciv': 13,
+    'glGetTexEnvfv': 0,
+    'glGetTexEnviv': 0,
+    'glGetTexGendv': 0,
+    'glGetTexGenfv': 0,
+    'glGetTexGeniv': 0,
+    'glGetTexImage': 2,
+    'glGetTexImageb': 2,
+    'glGetTexImaged': 2,
+    'glGetTexImagef': 2,
+    'glGetTexImagei': 2,
+    'glGetTexImages': 2,
+    'glGetTexImageub': 2,
+    'glGetTexImageui': 2,
+    'glGetTexImageus': 2,
+    'glGetTexLevelParameterfv': 0,
+    'glGetTexLevelParameteriv': 0,
+    'glGetTexParameterIiv': 11,
+    'glGetTexParameterIuiv': 11,
+    'glGetTexParameterfv': 0,
+    'glGetTexParameteriv': 0,
+    'glGetTransformFeedbackVarying': 11,
+    'glGetUniformBlockIndex': 12,
+    'glGetUniformIndices': 12,
+    'glGetUniformLocation': 9,
+    'glGetUniformSubroutineuiv': 15,
+    'glGetUniformdv': 15,
+    'glGetUniformfv': 9,
+    'glGetUniformiv': 9,
+    'glGetUniformuiv': 11,
+    'glGetVertexAttribIiv': 11,
+    'glGetVertexAttribIuiv': 11,
+    'glGetVertexAttribLdv': 16,
+    'glGetVertexAttribPointerv': 9,
+    'glGetVertexAttribdv': 9,
+    'glGetVertexAttribfv': 9,
+    'glGetVertexAttribiv': 9,
+    'glHint': 0,
+    'glHistogram': 5,
+    'glIndexMask': 0,
+    'glIndexPointer': 1,
+    'glIndexPointerb': 1,
+    'glIndexPointerd': 1,
+    'glIndexPointerf': 1,
+    'glIndexPointeri': 1,
+    'glIndexPointers': 1,
+    'glIndexPointerub': 1,
+    'glIndexd': 0,
+    'glIndexdv': 0,
+    'glIndexf': 0,
+    'glIndexfv': 0,
+    'glIndexi': 0,
+    'glIndexiv': 0,
+    'glIndexs': 0,
+    'glIndexsv': 0,
+    'glIndexub': 0,
+    'glIndexubv': 0,
+    'glInitArraysOfArraysARB': 18,
+    'glInitBaseInstanceARB': 17,
+    'glInitBlendFuncExtendedARB': 14,
+    'glInitClearBufferObjectARB': 18,
+    'glInitCompressedTexturePixelStorageARB': 17,
+    'glInitComputeShaderARB': 18,
+    'glInitConservativeDepthARB': 17,
+    'glInitCopyBufferARB': 12,
+    'glInitCopyImageARB': 18,
+    'glInitDebugKHR': 18,
+    'glInitDrawElementsBaseVertexARB': 13,
+    'glInitDrawIndirectARB': 15,
+    'glInitEs2CompatibilityARB': 16,
+    'glInitEs3CompatibilityARB': 18,
+    'glInitExplicitAttribLocationARB': 14,
+    'glInitExplicitUniformLocationARB': 18,
+    'glInitFragmentLayerViewportARB': 18,
+    'glInitFramebufferNoAttachmentsARB': 18,
+    'glInitFramebufferObjectARB': 11,
+    'glInitGetProgramBinaryARB': 16,
+    'glInitGl10VERSION': 0,
+    'glInitGl11VERSION': 0,
+    'glInitGl12VERSION': 5,
+    'glInitGl13VERSION': 6,
+    'glInitGl14VERSION': 7,
+    'glInitGl15VERSION': 8,
+    'glInitGl20VERSION': 9,
+    'glInitGl21VERSION': 10,
+    'glInitGl30VERSION': 11,
+    'glInitGl31VERSION': 12,
+    'glInitGl32VERSION': 13,
+    'glInitGl33VERSION': 14,
+    'glInitGl40VERSION': 15,
+    'glInitGl41VERSION': 16,
+    'glInitGl42VERSION': 17,
+    'glInitGl43VERSION': 18,
+    'glInitGl44VERSION': 19,
+    'glInitGpuShader5ARB': 15,
+    'glInitGpuShaderFp64ARB': 15,
+    'glInitImagingARB': 5,
+    'glInitInternalformatQuery2ARB': 18,
+    'glInitInternalformatQueryARB': 17,
+    'glInitInvalidateSubdataARB': 18,
+    'glInitMapBufferAlignmentARB': 17,
+    'glInitMapBufferRangeARB': 11,
+    'glInitMultiDrawIndirectARB': 18,
+    'glInitNames': 0,
+    'glInitOcclusionQuery2ARB': 14,
+    'glInitProgramInterfaceQueryARB': 18,
+    'glInitProvokingVertexARB': 13,
+    'glInitRobustBufferAccessBehaviorARB': 18,
+    'glInitSamplerObjectsARB': 14,
+    'glInitSeparateShaderObjectsARB': 16,
+    'glInitShaderAtomicCountersARB': 17,
+    'glInitShaderBitEncodingARB': 14,
+    'glInitShaderImageLoadStoreARB': 17,
+    'glInitShaderImageSizeARB': 18,
+    'glInitShaderPrecisionARB': 16,
+    'glInitShaderStorageBufferObjectARB': 18,
+    'glInitShaderSubroutineARB': 15,
+    'glInitShadingLanguage420PackARB': 17,
+    'glInitShadingLanguagePackingARB': 17,
+    'glInitStencilTexturingARB': 18,
+    'glInitSyncARB': 13,
+    'glInitTessellationShaderARB': 15,
+    'glInitTextureBufferObjectARB': 11,
+    'glInitTextureBufferObjectRgb32ARB': 15,
+    'glInitTextureBufferRangeARB': 18,
+    'glInitTextureCubeMapArrayARB': 15,
+    'glInitTextureGatherARB': 15,
+    'glInitTextureMultisampleARB': 13,
+    'glInitTextureQueryLevelsARB': 18,
+    'glInitTextureQueryLodARB': 15,
+    'glInitTextureRgb10A2UiARB': 14,
+    'glInitTextureStorageARB': 17,
+    'glInitTextureStorageMultisampleARB': 18,
+    'glInitTextureSwizzleARB': 14,
+    'glInitTextureViewARB': 18,
+    'glInitTimerQueryARB': 14,
+    'glInitTransformFeedback2ARB': 15,
+    'glInitTransformFeedback3ARB': 15,
+    'glInitTransformFeedbackInstancedARB': 17,
+    'glInitUniformBufferObjectARB': 12,
+    'glInitVertexArrayObjectARB': 11,
+    'glInitVertexAttrib64BitARB': 16,
+    'glInitVertexAttribBindingARB': 18,
+    'glInitVertexType2101010RevARB': 14,
+    'glInitViewportArrayARB': 16,
+    'glInterleavedArrays': 1,
+    'glInvalidateBufferData': 18,
+    'glInvalidateBufferSubData': 18,
+    'glInvalidateFramebuffer': 18,
+    'glInvalidateSubFramebuffer': 18,
+    'glInvalidateTexImage': 18,
+    'glInvalidateTexSubImage': 18,
+    'glIsBuffer': 8,
+    'glIsEnabled': 0,
+    'glIsEnabledi': 11,
+    'glIsFramebuffer': 11,
+    'glIsList': 0,
+    'glIsProgram': 9,
+    'glIsProgramPipeline': 16,
+    'glIsQuery': 8,
+    'glIsRenderbuffer': 11,
+    'glIsSampler': 14,
+    'glIsShader': 9,
+    'glIsSync': 13,
+    'glIsTexture': 0,
+    'glIsTransformFeedback': 15,
+    'glIsVertexArray': 11,
+    'glLightModelf': 0,
+    'glLightModelfv': 0,
+    'glLightModeli': 0,
+    'glLightModeliv': 0,
+    'glLightf': 0,
+    'glLightfv': 0,
+    'glLighti': 0,
+    'glLightiv': 0,
+    'glLineStipple': 0,
+    'glLineWidth': 0,
+    'glLinkProgram': 9,
+    'glListBase': 0,
+    'glLoadIdentity': 0,
+    'glLoadMatrixd': 0,
+    'glLoadMatrixf': 0,
+    'glLoadName': 0,
+    'glLoadTransposeMatrixd': 6,
+    'glLoadTransposeMatrixf': 6,
+    'glLogicOp': 0,
+    'glMap1d': 3,
+    'glMap1f': 3,
+    'glMap2d': 3,
+    'glMap2f': 3,
+    'glMapBuffer': 8,
+    'glMapBufferRange': 11,
+    'glMapGrid1d': 0,
+    'glMapGrid1f': 0,
+    'glMapGrid2d': 0,
+    'glMapGrid2f': 0,
+    'glMaterial': 3,
+    'glMaterialf': 0,
+    'glMaterialfv': 0,
+    'glMateriali': 0,
+    'glMaterialiv': 0,
+    'glMatrixMode': 0,
+    'glMemoryBarrier': 17,
+    'glMinSampleShading': 15,
+    'glMinmax': 5,
+    'glMultMatrixd': 0,
+    'glMultMatrixf': 0,
+    'glMultTransposeMatrixd': 6,
+    'glMultTransposeMatrixf': 6,
+    'glMultiDrawArrays': 7,
+    'glMultiDrawArraysIndirect': 18,
+    'glMultiDrawElements': 7,
+    'glMultiDrawElementsBaseVertex': 13,
+    'glMultiDrawElementsIndirect': 18,
+    'glMultiTexCoord1d': 6,
+    'glMultiTexCoord1dv': 6,
+    'glMultiTexCoord1f': 6,
+    'glMultiTexCoord1fv': 6,
+    'glMultiTexCoord1i': 6,
+    'glMultiTexCoord1iv': 6,
+    'glMultiTexCoord1s': 6,
+    'glMultiTexCoord1sv': 6,
+    'glMultiTexCoord2d': 6,
+    'glMultiTexCoord2dv': 6,
+    'glMultiTexCoord2f': 6,
+    'glMultiTexCoord2fv': 6,
+    'glMultiTexCoord2i': 6,
+    'glMultiTexCoord2iv': 6,
+    'glMultiTexCoord2s': 6,
+    'glMultiTexCoord2sv': 6,
+    'glMultiTexCoord3d': 6,
+    'glMultiTexCoord3dv': 6,
+    'glMultiTexCoord3f': 6,
+    'glMultiTexCoord3fv': 6,
+    'glMultiTexCoord3i': 6,
+    'glMultiTexCoord3iv': 6,
+    'glMultiTexCoord3s': 6,
+    'glMultiTexCoord3sv': 6,
+    'glMultiTexCoord4d': 6,
+    'glMultiTexCoord4dv': 6,
+    'glMultiTexCoord4f': 6,
+    'glMultiTexCoord4fv': 6,
+    'glMultiTexCoord4i': 6,
+    'glMultiTexCoord4iv': 6,
+    'glMultiTexCoord4s': 6,
+    'glMultiTexCoord4sv': 6,
+    'glMultiTexCoordP1ui': 14,
+    'glMultiTexCoordP1uiv': 14,
+    'glMultiTexCoordP2ui': 14,
+    'glMultiTexCoordP2uiv': 14,
+    'glMultiTexCoordP3ui': 14,
+    'glMultiTexCoordP3uiv': 14,
+    'glMultiTexCoordP4ui': 14,
+    'glMultiTexCoordP4uiv': 14,
+    'glNewList': 0,
+    'glNormal3b': 0,
+    'glNormal3bv': 0,
+    'glNormal3d': 0,
+    'glNormal3dv': 0,
+    'glNormal3f': 0,
+    'glNormal3fv': 0,
+    'glNormal3i': 0,
+    'glNormal3iv': 0,
+    'glNormal3s': 0,
+    'glNormal3sv': 0,
+    'glNormalP3ui': 14,
+    'glNormalP3uiv': 14,
+    'glNormalPointer': 1,
+    'glNormalPointerb': 1,
+    'glNormalPointerd': 1,
+    'glNormalPointerf': 1,
+    'glNormalPointeri': 1,
+    'glNormalPointers': 1,
+    'glObjectLabel': 18,
+    'glObjectLabelKHR': 18,
+    'glObjectPtrLabel': 18,
+    'glObjectPtrLabelKHR': 18,
+    'glOrtho': 0,
+    'glPassThrough': 0,
+    'glPatchParameterfv': 15,
+    'glPatchParameteri': 15,
+    'glPauseTransformFeedback': 15,
+    'glPixelMapfv': 0,
+    'glPixelMapuiv': 0,
+    'glPixelMapusv': 0,
+    'glPixelStoref': 0,
+    'glPixelStorei': 0,
+    'glPixelTransferf': 0,
+    'glPixelTransferi': 0,
+    'glPixelZoom': 0,
+    'glPointParameterf': 7,
+    'glPointParameterfv': 7,
+    'glPointParameteri': 7,
+    'glPointParameteriv': 7,
+    'glPointSize': 0,
+    'glPolygonMode': 0,
+    'glPolygonOffset': 0,
+    'glPolygonStipple': 0,
+    'glPopAttrib': 0,
+    'glPopClientAttrib': 0,
+    'glPopDebugGroup': 18,
+    'glPopDebugGroupKHR': 18,
+    'glPopMatrix': 0,
+    'glPopName': 0,
+    'glPrimitiveRestartIndex': 12,
+    'glPrioritizeTextures': 0,
+    'glProgramBinary': 16,
+    'glProgramParameteri': 16,
+    'glProgramUniform1d': 16,
+    'glProgramUniform1dv': 16,
+    'glProgramUniform1f': 16,
+    'glProgramUniform1fv': 16,
+    'glProgramUniform1i': 16,
+    'glProgramUniform1iv': 16,
+    'glProgramUniform1ui': 16,
+    'glProgramUniform1uiv': 16,
+    'glProgramUniform2d': 16,
+    'glProgramUniform2dv': 16,
+    'glProgramUniform2f': 16,
+    'glProgramUniform2fv': 16,
+    'glProgramUniform2i': 16,
+    'glProgramUniform2iv': 16,
+    'glProgramUniform2ui': 16,
+    'glProgramUniform2uiv': 16,
+    'glProgramUniform3d': 16,
+    'glProgramUniform3dv': 16,
+    'glProgramUniform3f': 16,
+    'glProgramUniform3fv': 16,
+    'glProgramUniform3i': 16,
+    'glProgramUniform3iv': 16,
+    'glProgramUniform3ui': 16,
+    'glProgramUniform3uiv': 16,
+    'glProgramUniform4d': 16,
+    'glProgramUniform4dv': 16,
+    'glProgramUniform4f': 16,
+    'glProgramUniform4fv': 16,
+    'glProgramUniform4i': 16,
+    'glProgramUniform4iv': 16,
+    'glProgramUniform4ui': 16,
+    'glProgramUniform4uiv': 16,
+    'glProgramUniformMatrix2dv': 16,
+    'glProgramUniformMatrix2fv': 16,
+    'glProgramUniformMatrix2x3dv': 16,
+    'glProgramUniformMatrix2x3fv': 16,
+    'glProgramUniformMatrix2x4dv': 16,
+    'glProgramUniformMatrix2x4fv': 16,
+    'glProgramUniformMatrix3dv': 16,
+    'glProgramUniformMatrix3fv': 16,
+    'glProgramUniformMatrix3x2dv': 16,
+    'glProgramUniformMatrix3x2fv': 16,
+    'glProgramUniformMatrix3x4dv': 16,
+    'glProgramUniformMatrix3x4fv': 16,
+    'glProgramUniformMatrix4dv': 16,
+    'glProgramUniformMatrix4fv': 16,
+    'glProgramUniformMatrix4x2dv': 16,
+    'glProgramUniformMatrix4x2fv': 16,
+    'glProgramUniformMatrix4x3dv': 16,
+    'glProgramUniformMatrix4x3fv': 16,
+    'glProvokingVertex': 13,
+    'glPushAttrib': 0,
+    'glPushClientAttrib': 0,
+    'glPushDebugGroup': 18,
+    'glPushDebugGroupKHR': 18,
+    'glPushMatrix': 0,
+    'glPushName': 0,
+    'glQueryCounter': 14,
+    'glRasterPos': 3,
+    'glRasterPos2d': 0,
+    'glRasterPos2dv': 0,
+    'glRasterPos2f': 0,
+    'glRasterPos2fv': 0,
+    'glRasterPos2i': 0,
+    'glRasterPos2iv': 0,
+    'glRasterPos2s': 0,
+    'glRasterPos2sv': 0,
+    'glRasterPos3d': 0,
+    'glRasterPos3dv': 0,
+    'glRasterPos3f': 0,
+    'glRasterPos3fv': 0,
+    'glRasterPos3i': 0,
+    'glRasterPos3iv': 0,
+    'glRasterPos3s': 0,
+    'glRasterPos3sv': 0,
+    'glRasterPos4d': 0,
+    'glRasterPos4dv': 0,
+    'glRasterPos4f': 0,
+    'glRasterPos4fv': 0,
+    'glRasterPos4i': 0,
+    'glRasterPos4iv': 0,
+    'glRasterPos4s': 0,
+    'glRasterPos4sv': 0,
+    'glReadBuffer': 0,
+    'glReadPixels': 2,
+    'glReadPixelsb': 2,
+    'glReadPixelsd': 2,
+    'glReadPixelsf': 2,
+    'glReadPixelsi': 2,
+    'glReadPixelss': 2,
+    'glReadPixelsub': 2,
+    'glReadPixelsui': 2,
+    'glReadPixelsus': 2,
+    'glRectd': 0,
+    'glRectdv': 0,
+    'glRectf': 0,
+    'glRectfv': 0,
+    'glRecti': 0,
+    'glRectiv': 0,
+    'glRects': 0,
+    'glRectsv': 0,
+    'glReleaseShaderCompiler': 16,
+    'glRenderMode': 1,
+    'glRenderbufferStorage': 11,
+    'glRenderbufferStorageMultisample': 11,
+    'glResetHistogram': 5,
+    'glResetMinmax': 5,
+    'glResumeTransformFeedback': 15,
+    'glRotated': 0,
+    'glRotatef': 0,
+    'glSampleCoverage': 6,
+    'glSampleMaski': 13,
+    'glSamplerParameterIiv': 14,
+    'glSamplerParameterIuiv': 14,
+    'glSamplerParameterf': 14,
+    'glSamplerParameterfv': 14,
+    'glSamplerParameteri': 14,
+    'glSamplerParameteriv': 14,
+    'glScaled': 0,
+    'glScalef': 0,
+    'glScissor': 0,
+    'glScissorArrayv': 16,
+    'glScissorIndexed': 16,
+    'glScissorIndexedv': 16,
+    'glSecondaryColor3b': 7,
+    'glSecondaryColor3bv': 7,
+    'glSecondaryColor3d': 7,
+    'glSecondaryColor3dv': 7,
+    'glSecondaryColor3f': 7,
+    'glSecondaryColor3fv': 7,
+    'glSecondaryColor3i': 7,
+    'glSecondaryColor3iv': 7,
+    'glSecondaryColor3s': 7,
+    'glSecondaryColor3sv': 7,
+    'glSecondaryColor3ub': 7,
+    'glSecondaryColor3ubv': 7,
+    'glSecondaryColor3ui': 7,
+    'glSecondaryColor3uiv': 7,
+    'glSecondaryColor3us': 7,
+    'glSecondaryColor3usv': 7,
+    'glSecondaryColorP3ui': 14,
+    'glSecondaryColorP3uiv': 14,
+    'glSecondaryColorPointer': 7,
+    'glSelectBuffer': 1,
+    'glSeparableFilter2D': 5,
+    'glShadeModel': 0,
+    'glShaderBinary': 16,
+    'glShaderSource': 9,
+    'glShaderStorageBlockBinding': 18,
+    'glStencilFunc': 0,
+    'glStencilFuncSeparate': 9,
+    'glStencilMask': 0,
+    'glStencilMaskSeparate': 9,
+    'glStencilOp': 0,
+    'glStencilOpSeparate': 9,
+    'glTexBuffer': 12,
+    'glTexBufferARB': 11,
+    'glTexBufferRange': 18,
+    'glTexCoord1d': 0,
+    'glTexCoord1dv': 0,
+    'glTexCoord1f': 0,
+    'glTexCoord1fv': 0,
+    'glTexCoord1i': 0,
+    'glTexCoord1iv': 0,
+    'glTexCoord1s': 0,
+    'glTexCoord1sv': 0,
+    'glTexCoord2d': 0,
+    'glTexCoord2dv': 0,
+    'glTexCoord2f': 0,
+    'glTexCoord2fv': 0,
+    'glTexCoord2i': 0,
+    'glTexCoord2iv': 0,
+    'glTexCoord2s': 0,
+    'glTexCoord2sv': 0,
+    'glTexCoord3d': 0,
+    'glTexCoord3dv': 0,
+    'glTexCoord3f': 0,
+    'glTexCoord3fv': 0,
+    'glTexCoord3i': 0,
+    'glTexCoord3iv': 0,
+    'glTexCoord3s': 0,
+    'glTexCoord3sv': 0,
+    'glTexCoord4d': 0,
+    'glTexCoord4dv': 0,
+    'glTexCoord4f': 0,
+    'glTexCoord4fv': 0,
+    'glTexCoord4i': 0,
+    'glTexCoord4iv': 0,
+    'glTexCoord4s': 0,
+    'glTexCoord4sv': 0,
+    'glTexCoordP1ui': 14,
+    'glTexCoordP1uiv': 14,
+    'glTexCoordP2ui': 14,
+    'glTexCoordP2uiv': 14,
+    'glTexCoordP3ui': 14,
+    'glTexCoordP3uiv': 14,
+    'glTexCoordP4ui': 14,
+    'glTexCoordP4uiv': 14,
+    'glTexCoordPointer': 1,
+    'glTexCoordPointerb': 1,
+    'glTexCoordPointerd': 1,
+    'glTexCoordPointerf': 1,
+    'glTexCoordPointeri': 1,
+    'glTexCoordPointers': 1,
+    'glTexEnvf': 0,
+    'glTexEnvfv': 0,
+    'glTexEnvi': 0,
+    'glTexEnviv': 0,
+    'glTexGend': 0,
+    'glTexGendv': 0,
+    'glTexGenf': 0,
+    'glTexGenfv': 0,
+    'glTexGeni': 0,
+    'glTexGeniv': 0,
+    'glTexImage1D': 2,
+    'glTexImage1Db': 2,
+    'glTexImage1Df': 2,
+    'glTexImage1Di': 2,
+    'glTexImage1Ds': 2,
+    'glTexImage1Dub': 2,
+    'glTexImage1Dui': 2,
+    'glTexImage1Dus': 2,
+    'glTexImage2D': 2,
+    'glTexImage2DMultisample': 13,
+    'glTexImage2Db': 2,
+    'glTexImage2Df': 2,
+    'glTexImage2Di': 2,
+    'glTexImage2Ds': 2,
+    'glTexImage2Dub': 2,
+    'glTexImage2Dui': 2,
+    'glTexImage2Dus': 2,
+    'glTexImage3D': 5,
+    'glTexImage3DMultisample': 13,
+    'glTexImage3Db': 5,
+    'glTexImage3Df': 5,
+    'glTexImage3Di': 5,
+    'glTexImage3Ds': 5,
+    'glTexImage3Dub': 5,
+    'glTexImage3Dui': 5,
+    'glTexImage3Dus': 5,
+    'glTexParameter': 3,
+    'glTexParameterIiv': 11,
+    'glTexParameterIuiv': 11,
+    'glTexParameterf': 0,
+    'glTexParameterfv': 0,
+    'glTexParameteri': 0,
+    'glTexParameteriv': 0,
+    'glTexStorage1D': 17,
+    'glTexStorage2D': 17,
+    'glTexStorage2DMultisample': 18,
+    'glTexStorage3D': 17,
+    'glTexStorage3DMultisample': 18,
+    'glTexSubImage1D': 2,
+    'glTexSubImage1Db': 2,
+    'glTexSubImage1Df': 2,
+    'glTexSubImage1Di': 2,
+    'glTexSubImage1Ds': 2,
+    'glTexSubImage1Dub': 2,
+    'glTexSubImage1Dui': 2,
+    'glTexSubImage1Dus': 2,
+    'glTexSubImage2D': 2,
+    'glTexSubImage2Db': 2,
+    'glTexSubImage2Df': 2,
+    'glTexSubImage2Di': 2,
+    'glTexSubImage2Ds': 2,
+    'glTexSubImage2Dub': 2,
+    'glTexSubImage2Dui': 2,
+    'glTexSubImage2Dus': 2,
+    'glTexSubImage3D': 5,
+    'glTexSubImage3Db': 5,
+    'glTexSubImage3Df': 5,
+    'glTexSubImage3Di': 5,
+    'glTexSubImage3Ds': 5,
+    'glTexSubImage3Dub': 5,
+    'glTexSubImage3Dui': 5,
+    'glTexSubImage3Dus': 5,
+    'glTextureView': 18,
+    'glTransformFeedbackVaryings': 11,
+    'glTranslated': 0,
+    'glTranslatef': 0,
+    'glUniform1d': 15,
+    'glUniform1dv': 15,
+    'glUniform1f': 9,
+    'glUniform1fv': 9,
+    'glUniform1i': 9,
+    'glUniform1iv': 9,
+    'glUniform1ui': 11,
+    'glUniform1uiv': 11,
+    'glUniform2d': 15,
+    'glUniform2dv': 15,
+    'glUniform2f': 9,
+    'glUniform2fv': 9,
+    'glUniform2i': 9,
+    'glUniform2iv': 9,
+    'glUniform2ui': 11,
+    'glUniform2uiv': 11,
+    'glUniform3d': 15,
+    'glUniform3dv': 15,
+    'glUniform3f': 9,
+    'glUniform3fv': 9,
+    'glUniform3i': 9,
+    'glUniform3iv': 9,
+    'glUniform3ui': 11,
+    'glUniform3uiv': 11,
+    'glUniform4d': 15,
+    'glUniform4dv': 15,
+    'glUniform4f': 9,
+    'glUniform4fv': 9,
+    'glUniform4i': 9,
+    'glUniform4iv': 9,
+    'glUniform4ui': 11,
+    'glUniform4uiv': 11,
+    'glUniformBlockBinding': 12,
+    'glUniformMatrix2dv': 15,
+    'glUniformMatrix2fv': 9,
+    'glUniformMatrix2x3dv': 15,
+    'glUniformMatrix2x3fv': 10,
+    'glUniformMatrix2x4dv': 15,
+    'glUniformMatrix2x4fv': 10,
+    'glUniformMatrix3dv': 15,
+    'glUniformMatrix3fv': 9,
+    'glUniformMatrix3x2dv': 15,
+    'glUniformMatrix3x2fv': 10,
+    'glUniformMatrix3x4dv': 15,
+    'glUniformMatrix3x4fv': 10,
+    'glUniformMatrix4dv': 15,
+    'glUniformMatrix4fv': 9,
+    'glUniformMatrix4x2dv': 15,
+    'glUniformMatrix4x2fv': 10,
+    'glUniformMatrix4x3dv': 15,
+    'glUniformMatrix4x3fv': 10,
+    'glUniformSubroutinesuiv': 15,
+    'glUnmapBuffer': 8,
+    'glUseProgram': 9,
+    'glUseProgramStages': 16,
+    'glValidateProgram': 9,
+    'glValidateProgramPipeline': 16,
+    'glVertex': 3,
+    'glVertex2d': 0,
+    'glVertex2dv': 0,
+    'glVertex2f': 0,
+    'glVertex2fv': 0,
+    'glVertex2i': 0,
+    'glVertex2iv': 0,
+    'glVertex2s': 0,
+    'glVertex2sv': 0,
+    'glVertex3d': 0,
+    'glVertex3dv': 0,
+    'glVertex3f': 0,
+    'glVertex3fv': 0,
+    'glVertex3i': 0,
+    'glVertex3iv': 0,
+    'glVertex3s': 0,
+    'glVertex3sv': 0,
+    'glVertex4d': 0,
+    'glVertex4dv': 0,
+    'glVertex4f': 0,
+    'glVertex4fv': 0,
+    'glVertex4i': 0,
+    'glVertex4iv': 0,
+    'glVertex4s': 0,
+    'glVertex4sv': 0,
+    'glVertexAttrib1d': 9,
+    'glVertexAttrib1dv': 9,
+    'glVertexAttrib1f': 9,
+    'glVertexAttrib1fv': 9,
+    'glVertexAttrib1s': 9,
+    'glVertexAttrib1sv': 9,
+    'glVertexAttrib2d': 9,
+    'glVertexAttrib2dv': 9,
+    'glVertexAttrib2f': 9,
+    'glVertexAttrib2fv': 9,
+    'glVertexAttrib2s': 9,
+    'glVertexAttrib2sv': 9,
+    'glVertexAttrib3d': 9,
+    'glVertexAttrib3dv': 9,
+    'glVertexAttrib3f': 9,
+    'glVertexAttrib3fv': 9,
+    'glVertexAttrib3s': 9,
+    'glVertexAttrib3sv': 9,
+    'glVertexAttrib4Nbv': 9,
+    'glVertexAttrib4Niv': 9,
+    'glVertexAttrib4Nsv': 9,
+    'glVertexAttrib4Nub': 9,
+    'glVertexAttrib4Nubv': 9,
+    'glVertexAttrib4Nuiv': 9,
+    'glVertexAttrib4Nusv': 9,
+    'glVertexAttrib4bv': 9,
+    'glVertexAttrib4d': 9,
+    'glVertexAttrib4dv': 9,
+    'glVertexAttrib4f': 9,
+    'glVertexAttrib4fv': 9,
+    'glVertexAttrib4iv': 9,
+    'glVertexAttrib4s': 9,
+    'glVertexAttrib4sv': 9,
+    'glVertexAttrib4ubv': 9,
+    'glVertexAttrib4uiv': 9,
+    'glVertexAttrib4usv': 9,
+    'glVertexAttribBinding': 18,
+    'glVertexAttribDivisor': 14,
+    'glVertexAttribFormat': 18,
+    'glVertexAttribI1i': 11,
+    'glVertexAttribI1iv': 11,
+    'glVertexAttribI1ui': 11,
+    'glVertexAttribI1uiv': 11,
+    'glVertexAttribI2i': 11,
+    'glVertexAttribI2iv': 11,
+    'glVertexAttribI2ui': 11,
+    'glVertexAttribI2uiv': 11,
+    'glVertexAttribI3i': 11,
+    'glVertexAttribI3iv': 11,
+    'glVertexAttribI3ui': 11,
+    'glVertexAttribI3uiv': 11,
+    'glVertexAttribI4bv': 11,
+    'glVertexAttribI4i': 11,
+    'glVertexAttribI4iv': 11,
+    'glVertexAttribI4sv': 11,
+    'glVertexAttribI4ubv': 11,
+    'glVertexAttribI4ui': 11,
+    'glVertexAttribI4uiv': 11,
+    'glVertexAttribI4usv': 11,
+    'glVertexAttribIFormat': 18,
+    'glVertexAttribIPointer': 11,
+    'glVertexAttribL1d': 16,
+    'glVertexAttribL1dv': 16,
+    'glVertexAttribL2d': 16,
+    'glVertexAttribL2dv': 16,
+    'glVertexAttribL3d': 16,
+    'glVertexAttribL3dv': 16,
+    'glVertexAttribL4d': 16,
+    'glVertexAttribL4dv': 16,
+    'glVertexAttribLFormat': 18,
+    'glVertexAttribLPointer': 16,
+    'glVertexAttribP1ui': 14,
+    'glVertexAttribP1uiv': 14,
+    'glVertexAttribP2ui': 14,
+    'glVertexAttribP2uiv': 14,
+    'glVertexAttribP3ui': 14,
+    'glVertexAttribP3uiv': 14,
+    'glVertexAttribP4ui': 14,
+    'glVertexAttribP4uiv': 14,
+    'glVertexAttribPointer': 9,
+    'glVertexBindingDivisor': 18,
+    'glVertexP2ui': 14,
+    'glVertexP2uiv': 14,
+    'glVertexP3ui': 14,
+    'glVertexP3uiv': 14,
+    'glVertexP4ui': 14,
+    'glVertexP4uiv': 14,
+    'glVertexPointer': 1,
+    'glVertexPointerb': 1,
+    'glVertexPointerd': 1,
+    'glVertexPointerf': 1,
+    'glVertexPointeri': 1,
+    'glVertexPointers': 1,
+    'glViewport': 0,
+    'glViewportArrayv': 16,
+    'glViewportIndexedf': 16,
+    'glViewportIndexedfv': 16,
+    'glWaitSync': 13,
+    'glWindowPos2d': 7,
+    'glWindowPos2dv': 7,
+    'glWindowPos2f': 7,
+    'glWindowPos2fv': 7,
+    'glWindowPos2i': 7,
+    'glWindowPos2iv': 7,
+    'glWindowPos2s': 7,
+    'glWindowPos2sv': 7,
+    'glWindowPos3d': 7,
+    'glWindowPos3dv': 7,
+    'glWindowPos3f': 7,
+    'glWindowPos3fv': 7,
+    'glWindowPos3i': 7,
+    'glWindowPos3iv': 7,
+    'glWindowPos3s': 7,
+    'glWindowPos3sv': 7,
+    'imaging': 5,
+    'integer_types': 2,
+    'long': 0,
+    'platform': 0,
+    'size_t': 0,
+    'sizeof': 0,
+    'unicode': 0,
+    'void': 0,
+    'wrapper': 0,
+}
+SUBMODULES = (
+    'ARB',
+    'KHR',
+    'VERSION',
+    'exceptional',
+    'glget',
+    'images',
+    'pointers',
+    'vboimplementation',
+)
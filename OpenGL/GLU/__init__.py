@@ -1,14 +1,43 @@
-"""The GLU library implementation via ctypes"""
+"""The GLU library implementation via ctypes
+
+The entry points are bound lazily, on first access, see OpenGL.lazynamespace
+"""
 from OpenGL import platform
 from OpenGL.error import *
-from OpenGL.raw.GLU import *
-from OpenGL.raw.GLU.annotations import *
-
-from OpenGL.GLU.quadrics import *
-from OpenGL.GLU.projection import *
-from OpenGL.GLU.tess import *
-from OpenGL.GLU.glunurbs import *
+from OpenGL import lazynamespace as _lazynamespace
 import ctypes
 
-gluErrorString.restype = ctypes.c_char_p
-gluGetString.restype = ctypes.c_char_p
\ No newline at end of file
+# the modules this namespace is made of, in the order they used to be
+# star-imported (later ones win)
+_SOURCES = (
+    'OpenGL.raw.GLU',
+    'OpenGL.raw.GLU.annotations',
+    'OpenGL.GLU.quadrics',
+    'OpenGL.GLU.projection',
+    'OpenGL.GLU.tess',
+    'OpenGL.GLU.glunurbs',
+)
+
+def _stringResult( name ):
+    """The raw function name, returning its (char *) result as bytes"""
+    def derive():
+        from OpenGL.raw import GLU
+        function = getattr( GLU, name )
+        function.restype = ctypes.c_char_p
+        return function
+    return derive
+
+try:
+    from OpenGL.GLU import _index
+except ImportError:
+    _index = None
+_namespace = _lazynamespace.LazyNamespace(
+    globals(), _SOURCES, _index,
+    {
+        'gluErrorString': _stringResult( 'gluErrorString' ),
+        'gluGetString': _stringResult( 'gluGetString' ),
+    },
+)
+__getattr__ = _namespace.resolve
+__dir__ = _namespace.dir
+__all__ = _namespace.names()
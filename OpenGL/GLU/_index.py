@@ -0,0 +1,247 @@
+"""Generated by OpenGL.lazynamespace from OpenGL.GLU._SOURCES, do not edit"""
+SOURCES = (
+    'OpenGL.raw.GLU',
+    'OpenGL.raw.GLU.annotations',
+    'OpenGL.GLU.quadrics',
+    'OpenGL.GLU.projection',
+    'OpenGL.GLU.tess',
+    'OpenGL.GLU.glunurbs',
+)
+INDEX = {
+    'GLUQuadric': 2,
+    'GLU_AUTO_LOAD_MATRIX': 0,
+    'GLU_BEGIN': 0,
+    'GLU_CCW': 0,
+    'GLU_CULLING': 0,
+    'GLU_CW': 0,
+    'GLU_DISPLAY_MODE': 0,
+    'GLU_DOMAIN_DISTANCE': 0,
+    'GLU_EDGE_FLAG': 0,
+    'GLU_END': 0,
+    'GLU_ERROR': 0,
+    'GLU_EXTENSIONS': 0,
+    'GLU_EXTERIOR': 0,
+    'GLU_FALSE': 0,
+    'GLU_FILL': 0,
+    'GLU_FLAT': 0,
+    'GLU_INCOMPATIBLE_GL_VERSION': 0,
+    'GLU_INSIDE': 0,
+    'GLU_INTERIOR': 0,
+    'GLU_INVALID_ENUM': 0,
+    'GLU_INVALID_OPERATION': 0,
+    'GLU_INVALID_VALUE': 0,
+    'GLU_LINE': 0,
+    'GLU_MAP1_TRIM_2': 0,
+    'GLU_MAP1_TRIM_3': 0,
+    'GLU_NONE': 0,
+    'GLU_NURBS_BEGIN': 0,
+    'GLU_NURBS_BEGIN_DATA': 0,
+    'GLU_NURBS_BEGIN_DATA_EXT': 0,
+    'GLU_NURBS_BEGIN_EXT': 0,
+    'GLU_NURBS_COLOR': 0,
+    'GLU_NURBS_COLOR_DATA': 0,
+    'GLU_NURBS_COLOR_DATA_EXT': 0,
+    'GLU_NURBS_COLOR_EXT': 0,
+    'GLU_NURBS_END': 0,
+    'GLU_NURBS_END_DATA': 0,
+    'GLU_NURBS_END_DATA_EXT': 0,
+    'GLU_NURBS_END_EXT': 0,
+    'GLU_NURBS_ERROR': 0,
+    'GLU_NURBS_ERROR1': 0,
+    'GLU_NURBS_ERROR10': 0,
+    'GLU_NURBS_ERROR11': 0,
+    'GLU_NURBS_ERROR12': 0,
+    'GLU_NURBS_ERROR13': 0,
+    'GLU_NURBS_ERROR14': 0,
+    'GLU_NURBS_ERROR15': 0,
+    'GLU_NURBS_ERROR16': 0,
+    'GLU_NURBS_ERROR17': 0,
+    'GLU_NURBS_ERROR18': 0,
+    'GLU_NURBS_ERROR19': 0,
+    'GLU_NURBS_ERROR2': 0,
+    'GLU_NURBS_ERROR20': 0,
+    'GLU_NURBS_ERROR21': 0,
+    'GLU_NURBS_ERROR22': 0,
+    'GLU_NURBS_ERROR23': 0,
+    'GLU_NURBS_ERROR24': 0,
+    'GLU_NURBS_ERROR25': 0,
+    'GLU_NURBS_ERROR26': 0,
+    'GLU_NURBS_ERROR27': 0,
+    'GLU_NURBS_ERROR28': 0,
+    'GLU_NURBS_ERROR29': 0,
+    'GLU_NURBS_ERROR3': 0,
+    'GLU_NURBS_ERROR30': 0,
+    'GLU_NURBS_ERROR31': 0,
+    'GLU_NURBS_ERROR32': 0,
+    'GLU_NURBS_ERROR33': 0,
+    'GLU_NURBS_ERROR34': 0,
+    'GLU_NURBS_ERROR35': 0,
+    'GLU_NURBS_ERROR36': 0,
+    'GLU_NURBS_ERROR37': 0,
+    'GLU_NURBS_ERROR4': 0,
+    'GLU_NURBS_ERROR5': 0,
+    'GLU_NURBS_ERROR6': 0,
+    'GLU_NURBS_ERROR7': 0,
+    'GLU_NURBS_ERROR8': 0,
+    'GLU_NURBS_ERROR9': 0,
+    'GLU_NURBS_MODE': 0,
+    'GLU_NURBS_MODE_EXT': 0,
+    'GLU_NURBS_NORMAL': 0,
+    'GLU_NURBS_NORMAL_DATA': 0,
+    'GLU_NURBS_NORMAL_DATA_EXT': 0,
+    'GLU_NURBS_NORMAL_EXT': 0,
+    'GLU_NURBS_RENDERER': 0,
+    'GLU_NURBS_RENDERER_EXT': 0,
+    'GLU_NURBS_TESSELLATOR': 0,
+    'GLU_NURBS_TESSELLATOR_EXT': 0,
+    'GLU_NURBS_TEXTURE_COORD': 0,
+    'GLU_NURBS_TEXTURE_COORD_DATA': 0,
+    'GLU_NURBS_TEX_COORD_DATA_EXT': 0,
+    'GLU_NURBS_TEX_COORD_EXT': 0,
+    'GLU_NURBS_VERTEX': 0,
+    'GLU_NURBS_VERTEX_DATA': 0,
+    'GLU_NURBS_VERTEX_DATA_EXT': 0,
+    'GLU_NURBS_VERTEX_EXT': 0,
+    'GLU_OBJECT_PARAMETRIC_ERROR': 0,
+    'GLU_OBJECT_PARAMETRIC_ERROR_EXT': 0,
+    'GLU_OBJECT_PATH_LENGTH': 0,
+    'GLU_OBJECT_PATH_LENGTH_EXT': 0,
+    'GLU_OUTLINE_PATCH': 0,
+    'GLU_OUTLINE_POLYGON': 0,
+    'GLU_OUTSIDE': 0,
+    'GLU_OUT_OF_MEMORY': 0,
+    'GLU_PARAMETRIC_ERROR': 0,
+    'GLU_PARAMETRIC_TOLERANCE': 0,
+    'GLU_PATH_LENGTH': 0,
+    'GLU_POINT': 0,
+    'GLU_SAMPLING_METHOD': 0,
+    'GLU_SAMPLING_TOLERANCE': 0,
+    'GLU_SILHOUETTE': 0,
+    'GLU_SMOOTH': 0,
+    'GLU_TESS_BEGIN': 0,
+    'GLU_TESS_BEGIN_DATA': 0,
+    'GLU_TESS_BOUNDARY_ONLY': 0,
+    'GLU_TESS_COMBINE': 0,
+    'GLU_TESS_COMBINE_DATA': 0,
+    'GLU_TESS_COORD_TOO_LARGE': 0,
+    'GLU_TESS_EDGE_FLAG': 0,
+    'GLU_TESS_EDGE_FLAG_DATA': 0,
+    'GLU_TESS_END': 0,
+    'GLU_TESS_END_DATA': 0,
+    'GLU_TESS_ERROR': 0,
+    'GLU_TESS_ERROR1': 0,
+    'GLU_TESS_ERROR2': 0,
+    'GLU_TESS_ERROR3': 0,
+    'GLU_TESS_ERROR4': 0,
+    'GLU_TESS_ERROR5': 0,
+    'GLU_TESS_ERROR6': 0,
+    'GLU_TESS_ERROR7': 0,
+    'GLU_TESS_ERROR8': 0,
+    'GLU_TESS_ERROR_DATA': 0,
+    'GLU_TESS_MAX_COORD': 0,
+    'GLU_TESS_MISSING_BEGIN_CONTOUR': 0,
+    'GLU_TESS_MISSING_BEGIN_POLYGON': 0,
+    'GLU_TESS_MISSING_END_CONTOUR': 0,
+    'GLU_TESS_MISSING_END_POLYGON': 0,
+    'GLU_TESS_NEED_COMBINE_CALLBACK': 0,
+    'GLU_TESS_TOLERANCE': 0,
+    'GLU_TESS_VERTEX': 0,
+    'GLU_TESS_VERTEX_DATA': 0,
+    'GLU_TESS_WINDING_ABS_GEQ_TWO': 0,
+    'GLU_TESS_WINDING_NEGATIVE': 0,
+    'GLU_TESS_WINDING_NONZERO': 0,
+    'GLU_TESS_WINDING_ODD': 0,
+    'GLU_TESS_WINDING_POSITIVE': 0,
+    'GLU_TESS_WINDING_RULE': 0,
+    'GLU_TRUE': 0,
+    'GLU_UNKNOWN': 0,
+    'GLU_U_STEP': 0,
+    'GLU_VERSION': 0,
+    'GLU_VERSION_1_1': 0,
+    'GLU_VERSION_1_2': 0,
+    'GLU_VERSION_1_3': 0,
+    'GLU_VERTEX': 0,
+    'GLU_V_STEP': 0,
+    'GLUnurbs': 5,
+    'GLUnurbsObj': 0,
+    'GLUquadric': 0,
+    'GLUquadricObj': 0,
+    'GLUtesselator': 0,
+    'GLUtesselatorObj': 0,
+    'GLUtriangulatorObj': 0,
+    'GLboolean': 0,
+    'GLdouble': 0,
+    'GLenum': 0,
+    'GLfloat': 0,
+    'GLint': 0,
+    'GLsizei': 0,
+    'GLubyte': 0,
+    'GLvoid': 0,
+    '_GLUfuncptr': 0,
+    'gluBeginCurve': 0,
+    'gluBeginPolygon': 0,
+    'gluBeginSurface': 0,
+    'gluBeginTrim': 0,
+    'gluBuild1DMipmapLevels': 0,
+    'gluBuild1DMipmaps': 0,
+    'gluBuild2DMipmapLevels': 0,
+    'gluBuild2DMipmaps': 0,
+    'gluBuild3DMipmapLevels': 0,
+    'gluBuild3DMipmaps': 0,
+    'gluCheckExtension': 1,
+    'gluCylinder': 0,
+    'gluDeleteNurbsRenderer': 0,
+    'gluDeleteQuadric': 0,
+    'gluDeleteTess': 0,
+    'gluDisk': 0,
+    'gluEndCurve': 0,
+    'gluEndPolygon': 0,
+    'gluEndSurface': 0,
+    'gluEndTrim': 0,
+    'gluErrorString': 0,
+    'gluGetNurbsProperty': 1,
+    'gluGetString': 0,
+    'gluGetTessProperty': 4,
+    'gluLoadSamplingMatrices': 1,
+    'gluLookAt': 0,
+    'gluNewNurbsRenderer': 5,
+    'gluNewQuadric': 2,
+    'gluNewTess': 4,
+    'gluNextContour': 0,
+    'gluNurbsCallback': 5,
+    'gluNurbsCallbackData': 5,
+    'gluNurbsCallbackDataEXT': 5,
+    'gluNurbsCurve': 5,
+    'gluNurbsProperty': 0,
+    'gluNurbsSurface': 5,
+    'gluOrtho2D': 0,
+    'gluPartialDisk': 0,
+    'gluPerspective': 0,
+    'gluPickMatrix': 1,
+    'gluProject': 3,
+    'gluPwlCurve': 5,
+    'gluQuadricCallback': 2,
+    'gluQuadricDrawStyle': 0,
+    'gluQuadricNormals': 0,
+    'gluQuadricOrientation': 0,
+    'gluQuadricTexture': 0,
+    'gluScaleImage': 0,
+    'gluSphere': 0,
+    'gluTessBeginContour': 0,
+    'gluTessBeginPolygon': 4,
+    'gluTessCallback': 4,
+    'gluTessEndContour': 0,
+    'gluTessEndPolygon': 0,
+    'gluTessNormal': 0,
+    'gluTessProperty': 0,
+    'gluTessVertex': 4,
+    'gluUnProject': 3,
+    'gluUnProject4': 3,
+}
+SUBMODULES = (
+    'glunurbs',
+    'glustruct',
+    'projection',
+    'quadrics',
+    'tess',
+)
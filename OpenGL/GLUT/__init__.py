@@ -1,12 +1,35 @@
-"""The GLUT library implementation via ctypes"""
-from OpenGL.raw.GLUT import *
-
-from OpenGL.GLUT.special import *
-from OpenGL.GLUT.fonts import *
-from OpenGL.GLUT.freeglut import *
-from OpenGL.GLUT.osx import *
-
-if glutLeaveMainLoop:
-    HAVE_FREEGLUT = True 
-else:
-    HAVE_FREEGLUT = False 
+"""The GLUT library implementation via ctypes
+
+The entry points are bound lazily, on first access, see OpenGL.lazynamespace
+"""
+from OpenGL import lazynamespace as _lazynamespace
+
+# the modules this namespace is made of, in the order they used to be
+# star-imported (later ones win)
+_SOURCES = (
+    'OpenGL.raw.GLUT',
+    'OpenGL.GLUT.special',
+    'OpenGL.GLUT.fonts',
+    'OpenGL.GLUT.freeglut',
+    'OpenGL.GLUT.osx',
+)
+
+def _haveFreeglut():
+    """HAVE_FREEGLUT, whether the GLUT library is FreeGLUT"""
+    from OpenGL.GLUT import glutLeaveMainLoop
+    if glutLeaveMainLoop:
+        return True
+    else:
+        return False
+
+try:
+    from OpenGL.GLUT import _index
+except ImportError:
+    _index = None
+_namespace = _lazynamespace.LazyNamespace(
+    globals(), _SOURCES, _index,
+    {'HAVE_FREEGLUT': _haveFreeglut},
+)
+__getattr__ = _namespace.resolve
+__dir__ = _namespace.dir
+__all__ = _namespace.names()
@@ -0,0 +1,463 @@
+"""Generated by OpenGL.lazynamespace from OpenGL.GLUT._SOURCES, do not edit"""
+SOURCES = (
+    'OpenGL.raw.GLUT',
+    'OpenGL.GLUT.special',
+    'OpenGL.GLUT.fonts',
+    'OpenGL.GLUT.freeglut',
+    'OpenGL.GLUT.osx',
+)
+INDEX = {
+    'ARRAY_TYPE_TO_CONSTANT': 3,
+    'Constant': 0,
+    'CurrentContextIsValid': 1,
+    'FUNCTION_TYPE': 1,
+    'GLDEBUGPROC': 3,
+    'GLDEBUGPROCAMD': 3,
+    'GLDEBUGPROCARB': 3,
+    'GLDEBUGPROCKHR': 3,
+    'GLUT': 1,
+    'GLUTCallback': 1,
+    'GLUTMenuCallback': 1,
+    'GLUTTimerCallback': 1,
+    'GLUT_3_2_CORE_PROFILE': 4,
+    'GLUT_ACCUM': 0,
+    'GLUT_ACTION_CONTINUE_EXECUTION': 3,
+    'GLUT_ACTION_EXIT': 3,
+    'GLUT_ACTION_GLUTMAINLOOP_RETURNS': 3,
+    'GLUT_ACTION_ON_WINDOW_CLOSE': 3,
+    'GLUT_ACTIVE_ALT': 0,
+    'GLUT_ACTIVE_CTRL': 0,
+    'GLUT_ACTIVE_SHIFT': 0,
+    'GLUT_ALLOW_DIRECT_CONTEXT': 3,
+    'GLUT_ALPHA': 0,
+    'GLUT_API_VERSION': 0,
+    'GLUT_AUX': 3,
+    'GLUT_AUX1': 3,
+    'GLUT_AUX2': 3,
+    'GLUT_AUX3': 3,
+    'GLUT_AUX4': 3,
+    'GLUT_BITMAP_8_BY_13': 2,
+    'GLUT_BITMAP_9_BY_15': 2,
+    'GLUT_BITMAP_HELVETICA_10': 2,
+    'GLUT_BITMAP_HELVETICA_12': 2,
+    'GLUT_BITMAP_HELVETICA_18': 2,
+    'GLUT_BITMAP_TIMES_ROMAN_10': 2,
+    'GLUT_BITMAP_TIMES_ROMAN_24': 2,
+    'GLUT_BLUE': 0,
+    'GLUT_BORDERLESS': 3,
+    'GLUT_CAPTIONLESS': 3,
+    'GLUT_COMPATIBILITY_PROFILE': 3,
+    'GLUT_CORE_PROFILE': 3,
+    'GLUT_CREATE_NEW_CONTEXT': 3,
+    'GLUT_CURSOR_BOTTOM_LEFT_CORNER': 0,
+    'GLUT_CURSOR_BOTTOM_RIGHT_CORNER': 0,
+    'GLUT_CURSOR_BOTTOM_SIDE': 0,
+    'GLUT_CURSOR_CROSSHAIR': 0,
+    'GLUT_CURSOR_CYCLE': 0,
+    'GLUT_CURSOR_DESTROY': 0,
+    'GLUT_CURSOR_FULL_CROSSHAIR': 0,
+    'GLUT_CURSOR_HELP': 0,
+    'GLUT_CURSOR_INFO': 0,
+    'GLUT_CURSOR_INHERIT': 0,
+    'GLUT_CURSOR_LEFT_ARROW': 0,
+    'GLUT_CURSOR_LEFT_RIGHT': 0,
+    'GLUT_CURSOR_LEFT_SIDE': 0,
+    'GLUT_CURSOR_NONE': 0,
+    'GLUT_CURSOR_RIGHT_ARROW': 0,
+    'GLUT_CURSOR_RIGHT_SIDE': 0,
+    'GLUT_CURSOR_SPRAY': 0,
+    'GLUT_CURSOR_TEXT': 0,
+    'GLUT_CURSOR_TOP_LEFT_CORNER': 0,
+    'GLUT_CURSOR_TOP_RIGHT_CORNER': 0,
+    'GLUT_CURSOR_TOP_SIDE': 0,
+    'GLUT_CURSOR_UP_DOWN': 0,
+    'GLUT_CURSOR_WAIT': 0,
+    'GLUT_DEBUG': 3,
+    'GLUT_DEPTH': 0,
+    'GLUT_DEVICE_IGNORE_KEY_REPEAT': 0,
+    'GLUT_DEVICE_KEY_REPEAT': 0,
+    'GLUT_DIRECT_RENDERING': 3,
+    'GLUT_DISPLAY_MODE_POSSIBLE': 0,
+    'GLUT_DOUBLE': 0,
+    'GLUT_DOWN': 0,
+    'GLUT_ELAPSED_TIME': 0,
+    'GLUT_ENTERED': 0,
+    'GLUT_FORCE_DIRECT_CONTEXT': 3,
+    'GLUT_FORCE_INDIRECT_CONTEXT': 3,
+    'GLUT_FORWARD_COMPATIBLE': 3,
+    'GLUT_FULLY_COVERED': 0,
+    'GLUT_FULLY_RETAINED': 0,
+    'GLUT_FULL_SCREEN': 3,
+    'GLUT_GAME_MODE_ACTIVE': 0,
+    'GLUT_GAME_MODE_DISPLAY_CHANGED': 0,
+    'GLUT_GAME_MODE_HEIGHT': 0,
+    'GLUT_GAME_MODE_PIXEL_DEPTH': 0,
+    'GLUT_GAME_MODE_POSSIBLE': 0,
+    'GLUT_GAME_MODE_REFRESH_RATE': 0,
+    'GLUT_GAME_MODE_WIDTH': 0,
+    'GLUT_GREEN': 0,
+    'GLUT_GUARD_CALLBACKS': 1,
+    'GLUT_HAS_DIAL_AND_BUTTON_BOX': 0,
+    'GLUT_HAS_JOYSTICK': 0,
+    'GLUT_HAS_KEYBOARD': 0,
+    'GLUT_HAS_MOUSE': 0,
+    'GLUT_HAS_OVERLAY': 0,
+    'GLUT_HAS_SPACEBALL': 0,
+    'GLUT_HAS_TABLET': 0,
+    'GLUT_HIDDEN': 0,
+    'GLUT_INDEX': 0,
+    'GLUT_INIT_DISPLAY_MODE': 0,
+    'GLUT_INIT_FLAGS': 3,
+    'GLUT_INIT_MAJOR_VERSION': 3,
+    'GLUT_INIT_MINOR_VERSION': 3,
+    'GLUT_INIT_PROFILE': 3,
+    'GLUT_INIT_STATE': 0,
+    'GLUT_INIT_WINDOW_HEIGHT': 0,
+    'GLUT_INIT_WINDOW_WIDTH': 0,
+    'GLUT_INIT_WINDOW_X': 0,
+    'GLUT_INIT_WINDOW_Y': 0,
+    'GLUT_JOYSTICK_AXES': 0,
+    'GLUT_JOYSTICK_BUTTONS': 0,
+    'GLUT_JOYSTICK_BUTTON_A': 0,
+    'GLUT_JOYSTICK_BUTTON_B': 0,
+    'GLUT_JOYSTICK_BUTTON_C': 0,
+    'GLUT_JOYSTICK_BUTTON_D': 0,
+    'GLUT_JOYSTICK_POLL_RATE': 0,
+    'GLUT_KEY_BEGIN': 3,
+    'GLUT_KEY_DELETE': 3,
+    'GLUT_KEY_DOWN': 0,
+    'GLUT_KEY_END': 0,
+    'GLUT_KEY_F1': 0,
+    'GLUT_KEY_F10': 0,
+    'GLUT_KEY_F11': 0,
+    'GLUT_KEY_F12': 0,
+    'GLUT_KEY_F2': 0,
+    'GLUT_KEY_F3': 0,
+    'GLUT_KEY_F4': 0,
+    'GLUT_KEY_F5': 0,
+    'GLUT_KEY_F6': 0,
+    'GLUT_KEY_F7': 0,
+    'GLUT_KEY_F8': 0,
+    'GLUT_KEY_F9': 0,
+    'GLUT_KEY_HOME': 0,
+    'GLUT_KEY_INSERT': 0,
+    'GLUT_KEY_LEFT': 0,
+    'GLUT_KEY_NUM_LOCK': 3,
+    'GLUT_KEY_PAGE_DOWN': 0,
+    'GLUT_KEY_PAGE_UP': 0,
+    'GLUT_KEY_REPEAT_DEFAULT': 0,
+    'GLUT_KEY_REPEAT_OFF': 0,
+    'GLUT_KEY_REPEAT_ON': 0,
+    'GLUT_KEY_RIGHT': 0,
+    'GLUT_KEY_UP': 0,
+    'GLUT_LAYER_IN_USE': 0,
+    'GLUT_LEFT': 0,
+    'GLUT_LEFT_BUTTON': 0,
+    'GLUT_LUMINANCE': 0,
+    'GLUT_MENU_IN_USE': 0,
+    'GLUT_MENU_NOT_IN_USE': 0,
+    'GLUT_MENU_NUM_ITEMS': 0,
+    'GLUT_MIDDLE_BUTTON': 0,
+    'GLUT_MULTISAMPLE': 0,
+    'GLUT_NORMAL': 0,
+    'GLUT_NORMAL_DAMAGED': 0,
+    'GLUT_NOT_VISIBLE': 0,
+    'GLUT_NO_RECOVERY': 4,
+    'GLUT_NUM_BUTTON_BOX_BUTTONS': 0,
+    'GLUT_NUM_DIALS': 0,
+    'GLUT_NUM_MOUSE_BUTTONS': 0,
+    'GLUT_NUM_SPACEBALL_BUTTONS': 0,
+    'GLUT_NUM_TABLET_BUTTONS': 0,
+    'GLUT_OVERLAY': 0,
+    'GLUT_OVERLAY_DAMAGED': 0,
+    'GLUT_OVERLAY_POSSIBLE': 0,
+    'GLUT_OWNS_JOYSTICK': 0,
+    'GLUT_PARTIALLY_RETAINED': 0,
+    'GLUT_RED': 0,
+    'GLUT_RENDERING_CONTEXT': 3,
+    'GLUT_RGB': 0,
+    'GLUT_RGBA': 0,
+    'GLUT_RIGHT_BUTTON': 0,
+    'GLUT_SCREEN_HEIGHT': 0,
+    'GLUT_SCREEN_HEIGHT_MM': 0,
+    'GLUT_SCREEN_WIDTH': 0,
+    'GLUT_SCREEN_WIDTH_MM': 0,
+    'GLUT_SINGLE': 0,
+    'GLUT_SRGB': 3,
+    'GLUT_STENCIL': 0,
+    'GLUT_STEREO': 0,
+    'GLUT_STROKE_MONO_ROMAN': 2,
+    'GLUT_STROKE_ROMAN': 2,
+    'GLUT_TRANSPARENT_INDEX': 0,
+    'GLUT_TRY_DIRECT_CONTEXT': 3,
+    'GLUT_UP': 0,
+    'GLUT_USE_CURRENT_CONTEXT': 3,
+    'GLUT_VIDEO_RESIZE_HEIGHT': 0,
+    'GLUT_VIDEO_RESIZE_HEIGHT_DELTA': 0,
+    'GLUT_VIDEO_RESIZE_IN_USE': 0,
+    'GLUT_VIDEO_RESIZE_POSSIBLE': 0,
+    'GLUT_VIDEO_RESIZE_WIDTH': 0,
+    'GLUT_VIDEO_RESIZE_WIDTH_DELTA': 0,
+    'GLUT_VIDEO_RESIZE_X': 0,
+    'GLUT_VIDEO_RESIZE_X_DELTA': 0,
+    'GLUT_VIDEO_RESIZE_Y': 0,
+    'GLUT_VIDEO_RESIZE_Y_DELTA': 0,
+    'GLUT_VISIBLE': 0,
+    'GLUT_WINDOW_ACCUM_ALPHA_SIZE': 0,
+    'GLUT_WINDOW_ACCUM_BLUE_SIZE': 0,
+    'GLUT_WINDOW_ACCUM_GREEN_SIZE': 0,
+    'GLUT_WINDOW_ACCUM_RED_SIZE': 0,
+    'GLUT_WINDOW_ALPHA_SIZE': 0,
+    'GLUT_WINDOW_BLUE_SIZE': 0,
+    'GLUT_WINDOW_BORDER_WIDTH': 3,
+    'GLUT_WINDOW_BUFFER_SIZE': 0,
+    'GLUT_WINDOW_COLORMAP_SIZE': 0,
+    'GLUT_WINDOW_CURSOR': 0,
+    'GLUT_WINDOW_DEPTH_SIZE': 0,
+    'GLUT_WINDOW_DOUBLEBUFFER': 0,
+    'GLUT_WINDOW_FORMAT_ID': 0,
+    'GLUT_WINDOW_GREEN_SIZE': 0,
+    'GLUT_WINDOW_HEADER_HEIGHT': 3,
+    'GLUT_WINDOW_HEIGHT': 0,
+    'GLUT_WINDOW_NUM_CHILDREN': 0,
+    'GLUT_WINDOW_NUM_SAMPLES': 0,
+    'GLUT_WINDOW_PARENT': 0,
+    'GLUT_WINDOW_RED_SIZE': 0,
+    'GLUT_WINDOW_RGBA': 0,
+    'GLUT_WINDOW_STENCIL_SIZE': 0,
+    'GLUT_WINDOW_STEREO': 0,
+    'GLUT_WINDOW_WIDTH': 0,
+    'GLUT_WINDOW_X': 0,
+    'GLUT_WINDOW_Y': 0,
+    'GLUT_XLIB_IMPLEMENTATION': 0,
+    'GL_BYTE': 3,
+    'GL_CHAR': 3,
+    'GL_DOUBLE': 3,
+    'GL_FALSE': 3,
+    'GL_FLOAT': 3,
+    'GL_HALF_NV': 3,
+    'GL_INT': 3,
+    'GL_SHORT': 3,
+    'GL_TRUE': 3,
+    'GL_UNSIGNED_BYTE': 3,
+    'GL_UNSIGNED_INT': 3,
+    'GL_UNSIGNED_INT64': 3,
+    'GL_UNSIGNED_SHORT': 3,
+    'GL_VOID_P': 3,
+    'GLbitfield': 3,
+    'GLboolean': 3,
+    'GLbyte': 3,
+    'GLchar': 3,
+    'GLcharARB': 3,
+    'GLclampd': 3,
+    'GLclampf': 3,
+    'GLdouble': 0,
+    'GLdouble_2': 3,
+    'GLdouble_3': 3,
+    'GLdouble_4': 3,
+    'GLeglImageOES': 3,
+    'GLenum': 0,
+    'GLfloat': 0,
+    'GLfloat_2': 3,
+    'GLfloat_3': 3,
+    'GLfloat_4': 3,
+    'GLhalfARB': 3,
+    'GLhalfNV': 3,
+    'GLhandle': 3,
+    'GLhandleARB': 3,
+    'GLint': 0,
+    'GLint64': 3,
+    'GLint64EXT': 3,
+    'GLintptr': 3,
+    'GLintptrARB': 3,
+    'GLshort': 3,
+    'GLsizei': 3,
+    'GLsizeiptr': 3,
+    'GLsizeiptrARB': 3,
+    'GLsync': 3,
+    'GLubyte': 3,
+    'GLubyte_3': 3,
+    'GLuint': 3,
+    'GLuint64': 3,
+    'GLuint64EXT': 3,
+    'GLulong': 3,
+    'GLushort': 3,
+    'GLvdpauSurfaceNV': 3,
+    'GLvoid': 0,
+    'GLvoidp': 3,
+    'INITIALIZED': 1,
+    'PLATFORM': 1,
+    'arrays': 0,
+    'as_8_bit': 1,
+    'bytes': 1,
+    'c_char_p': 0,
+    'c_int': 0,
+    'c_ubyte': 0,
+    'c_void_p': 0,
+    'constant': 3,
+    'contextdata': 1,
+    'ctypes': 1,
+    'ctypes_version': 3,
+    'error': 1,
+    'fgDeinitialize': 3,
+    'glutAddMenuEntry': 0,
+    'glutAddSubMenu': 0,
+    'glutAttachMenu': 0,
+    'glutBitmapCharacter': 0,
+    'glutBitmapHeight': 3,
+    'glutBitmapLength': 0,
+    'glutBitmapString': 3,
+    'glutBitmapWidth': 0,
+    'glutButtonBoxFunc': 1,
+    'glutChangeToMenuEntry': 0,
+    'glutChangeToSubMenu': 0,
+    'glutCheckLoop': 4,
+    'glutCloseFunc': 3,
+    'glutCopyColormap': 0,
+    'glutCreateMenu': 1,
+    'glutCreateSubWindow': 0,
+    'glutCreateWindow': 0,
+    'glutDestroyMenu': 1,
+    'glutDestroyWindow': 1,
+    'glutDetachMenu': 0,
+    'glutDeviceGet': 0,
+    'glutDialsFunc': 1,
+    'glutDisplayFunc': 1,
+    'glutEnterGameMode': 0,
+    'glutEntryFunc': 1,
+    'glutEstablishOverlay': 0,
+    'glutExtensionSupported': 0,
+    'glutForceJoystickFunc': 0,
+    'glutFullScreen': 0,
+    'glutFullScreenToggle': 3,
+    'glutGameModeGet': 0,
+    'glutGameModeString': 0,
+    'glutGet': 0,
+    'glutGetColor': 0,
+    'glutGetMenu': 0,
+    'glutGetMenuData': 3,
+    'glutGetModeValues': 3,
+    'glutGetModifiers': 0,
+    'glutGetProcAddress': 3,
+    'glutGetWindow': 0,
+    'glutGetWindowData': 3,
+    'glutHideOverlay': 0,
+    'glutHideWindow': 0,
+    'glutIconifyWindow': 0,
+    'glutIdleFunc': 1,
+    'glutIgnoreKeyRepeat': 0,
+    'glutInit': 1,
+    'glutInitContextFlags': 3,
+    'glutInitContextProfile': 3,
+    'glutInitContextVersion': 3,
+    'glutInitDisplayMode': 0,
+    'glutInitDisplayString': 0,
+    'glutInitWindowPosition': 0,
+    'glutInitWindowSize': 0,
+    'glutJoystickFunc': 1,
+    'glutKeyboardFunc': 1,
+    'glutKeyboardUpFunc': 1,
+    'glutLayerGet': 0,
+    'glutLeaveGameMode': 0,
+    'glutLeaveMainLoop': 3,
+    'glutMainLoop': 0,
+    'glutMainLoopEvent': 3,
+    'glutMenuDestroyFunc': 3,
+    'glutMenuStateFunc': 1,
+    'glutMenuStatusFunc': 1,
+    'glutMotionFunc': 1,
+    'glutMouseFunc': 1,
+    'glutMouseWheelFunc': 3,
+    'glutOverlayDisplayFunc': 1,
+    'glutPassiveMotionFunc': 1,
+    'glutPopWindow': 0,
+    'glutPositionWindow': 0,
+    'glutPostOverlayRedisplay': 0,
+    'glutPostRedisplay': 0,
+    'glutPostWindowOverlayRedisplay': 0,
+    'glutPostWindowRedisplay': 0,
+    'glutPushWindow': 0,
+    'glutRemoveMenuItem': 0,
+    'glutRemoveOverlay': 0,
+    'glutReportErrors': 0,
+    'glutReshapeFunc': 1,
+    'glutReshapeWindow': 0,
+    'glutSetColor': 0,
+    'glutSetCursor': 0,
+    'glutSetIconTitle': 0,
+    'glutSetKeyRepeat': 0,
+    'glutSetMenu': 0,
+    'glutSetMenuData': 3,
+    'glutSetOption': 3,
+    'glutSetWindow': 0,
+    'glutSetWindowData': 3,
+    'glutSetWindowTitle': 0,
+    'glutSetupVideoResizing': 0,
+    'glutShowOverlay': 0,
+    'glutShowWindow': 0,
+    'glutSolidCone': 0,
+    'glutSolidCube': 0,
+    'glutSolidCylinder': 3,
+    'glutSolidDodecahedron': 0,
+    'glutSolidIcosahedron': 0,
+    'glutSolidOctahedron': 0,
+    'glutSolidRhombicDodecahedron': 3,
+    'glutSolidSierpinskiSponge': 3,
+    'glutSolidSphere': 0,
+    'glutSolidTeapot': 0,
+    'glutSolidTetrahedron': 0,
+    'glutSolidTorus': 0,
+    'glutSpaceballButtonFunc': 1,
+    'glutSpaceballMotionFunc': 1,
+    'glutSpaceballRotateFunc': 1,
+    'glutSpecialFunc': 1,
+    'glutSpecialUpFunc': 1,
+    'glutStopVideoResizing': 0,
+    'glutStrokeCharacter': 0,
+    'glutStrokeHeight': 3,
+    'glutStrokeLength': 0,
+    'glutStrokeString': 3,
+    'glutStrokeWidth': 0,
+    'glutSwapBuffers': 0,
+    'glutTabletButtonFunc': 1,
+    'glutTabletMotionFunc': 1,
+    'glutTimerFunc': 1,
+    'glutUseLayer': 0,
+    'glutVideoPan': 0,
+    'glutVideoResize': 0,
+    'glutVideoResizeGet': 0,
+    'glutVisibilityFunc': 1,
+    'glutWMCloseFunc': 4,
+    'glutWarpPointer': 0,
+    'glutWindowStatusFunc': 1,
+    'glutWireCone': 0,
+    'glutWireCube': 0,
+    'glutWireCylinder': 3,
+    'glutWireDodecahedron': 0,
+    'glutWireIcosahedron': 0,
+    'glutWireOctahedron': 0,
+    'glutWireRhombicDodecahedron': 3,
+    'glutWireSierpinskiSponge': 3,
+    'glutWireSphere': 0,
+    'glutWireTeapot': 0,
+    'glutWireTetrahedron': 0,
+    'glutWireTorus': 0,
+    'integer_types': 1,
+    'logging': 2,
+    'logs': 1,
+    'long': 1,
+    'os': 1,
+    'platform': 0,
+    'size_t': 3,
+    'sizeof': 0,
+    'sys': 1,
+    'traceback': 1,
+    'unicode': 0,
+    'void': 3,
+}
+SUBMODULES = (
+    'fonts',
+    'freeglut',
+    'osx',
+    'special',
+)
@@ -66,6 +66,19 @@ import occurs the flags should no longer be changed.
 
         Default: False
 
+    COPY_AUDIT -- if set to a True value before importing
+        the array support modules, array operations record every
+        copy they make (size, source type, GL type and the calling
+        file:line), and the report, heaviest call sites first, is
+        logged when the interpreter exits.  See OpenGL.arrays.copyaudit, which can also turn
+        auditing on and off at run-time.
+
+        Unlike ERROR_ON_COPY this doesn't break the application,
+        so it can be used on a whole renderer to find the copies
+        which matter.
+
+        Default: False
+
     CONTEXT_CHECKING -- if set to True, PyOpenGL will wrap
         *every* GL and GLU call with a check to see if there
         is a valid context.  If there is no valid context
@@ -132,8 +145,11 @@ import occurs the flags should no longer be changed.
         all GLint/GLfloat calls conversions with wrappers
         that allow for passing numpy scalar values.
 
-        Note that this is experimental, *not* reliable,
-        and very slow!
+        Scalar types which need converting are remembered,
+        so after the first call each costs one conversion
+        rather than a raised and caught TypeError.  Numpy
+        scalars passed as *arrays* are handled by the numpy
+        array handler whatever this flag's value.
 
         Note that byte/char types are not wrapped.
 
@@ -186,6 +202,7 @@ def environ_key( name, default ):
 ERROR_CHECKING = environ_key( 'ERROR_CHECKING', True)
 ERROR_LOGGING = environ_key( 'ERROR_LOGGING', False )
 ERROR_ON_COPY = environ_key( 'ERROR_ON_COPY', False )
+COPY_AUDIT = environ_key( 'COPY_AUDIT', False )
 ARRAY_SIZE_CHECKING = environ_key( 'ARRAY_SIZE_CHECKING', True )
 STORE_POINTERS = environ_key( 'STORE_POINTERS', True )
 WARN_ON_FORMAT_UNAVAILABLE = False
@@ -266,12 +283,20 @@ FormatHandler( 'ctypespointer', 'OpenGL.arrays.ctypespointers.CtypesPointerHandl
 ],isOutput=False )
 FormatHandler( 'numpy', 'OpenGL.arrays.numpymodule.NumpyHandler', [
     'numpy.ndarray',
+    'numpy.generic',
     'numpy.core.memmap.memmap',
 ],isOutput=True )
 FormatHandler( 'buffer', 'OpenGL.arrays.buffers.BufferHandler', [
     'OpenGL.arrays._buffers.Py_buffer',
     _bi+'.memoryview',
     _bi+'.bytearray',
+    'array.array',
+    'mmap.mmap',
 ],isOutput=True )
 FormatHandler( 'vbo', 'OpenGL.arrays.vbo.VBOHandler', ['OpenGL.arrays.vbo.VBO','OpenGL_accelerate.vbo.VBO'],isOutput=False )
 FormatHandler( 'vbooffset', 'OpenGL.arrays.vbo.VBOOffsetHandler', ['OpenGL.arrays.vbo.VBOOffset','OpenGL_accelerate.vbo.VBOOffset'],isOutput=False )
+
+def warmup( targets, background=True, namespace=None ):
+    """Finalise functions ahead of their first call (see OpenGL.finalisation)"""
+    from OpenGL.finalisation import warmup
+    return warmup( targets, background=background, namespace=namespace )
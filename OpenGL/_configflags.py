@@ -3,6 +3,7 @@ from OpenGL import (
     ERROR_CHECKING,
     ERROR_LOGGING,
     ERROR_ON_COPY,
+    COPY_AUDIT,
     ARRAY_SIZE_CHECKING,
     STORE_POINTERS,
     WARN_ON_FORMAT_UNAVAILABLE,
@@ -1,5 +1,5 @@
 """Array data-type implementations (abstraction points for GL array types"""
-import ctypes
+import ctypes, weakref
 import OpenGL
 from OpenGL.raw.GL import _types
 from OpenGL import plugins
@@ -7,6 +7,55 @@ from OpenGL.arrays import formathandler, _arrayconstants as GL_1_1
 from OpenGL import logs
 _log = logs.getLog( 'OpenGL.arrays.arraydatatype' )
 
+class HandlerCache( object ):
+    """Monomorphic inline cache of handler lookups for one argument slot
+
+    A given argument of a given function almost always gets the same type
+    of value call after call, so array converters remember the last type
+    they saw and its handler, and only go to the registry when the type
+    changes.  Callers inline the check to avoid a call on the hit path:
+
+        entry = cache.entry
+        if value.__class__ is entry[0]:
+            handler = entry[1]
+        else:
+            handler = cache.lookup( value )
+
+    The type and handler are kept as one (type, handler) tuple, replaced
+    with a single store, so that a cache shared between threads never
+    pairs one type with another type's handler.  The registry clears
+    every cache when a handler is registered.
+    """
+    __slots__ = ( 'registry','entry','__weakref__' )
+    ALL = weakref.WeakSet()
+    EMPTY = (None, None)
+    def __init__( self, registry=None ):
+        self.registry = registry
+        self.entry = self.EMPTY
+        self.ALL.add( self )
+    def lookup( self, value ):
+        """Look up the handler for value in the registry and remember it"""
+        registry = self.registry
+        if registry is None:
+            registry = self.registry = ArrayDatatype.getRegistry()
+        handler = registry( value )
+        self.entry = (value.__class__, handler)
+        return handler
+    def __call__( self, value ):
+        """Handler for value"""
+        entry = self.entry
+        if value.__class__ is entry[0]:
+            return entry[1]
+        return self.lookup( value )
+    def clear( self ):
+        """Forget the cached type"""
+        self.entry = self.EMPTY
+    @classmethod
+    def clearAll( cls ):
+        """Forget the cached types of every cache"""
+        for cache in list( cls.ALL ):
+            cache.clear()
+
 
 from OpenGL import acceleratesupport
 ADT = None
@@ -26,6 +75,9 @@ if ADT is None:
             self.output_handler = None 
             self.preferredOutput = None
             self.all_output_handlers = []
+            # types without a handler, with the number of format plugins
+            # declared when we found that out
+            self.unhandled = {}
         def __call__( self, value ):
             """Lookup of handler for given value"""
             try:
@@ -34,6 +86,8 @@ if ADT is None:
                 typ = type(value)
             handler = self.get( typ )
             if not handler:
+                if self.unhandled.get( typ ) == len( plugins.FormatHandler.registry ):
+                    raise self.unhandledError( typ, value )
                 if hasattr( typ, '__mro__' ):
                     for base in typ.__mro__:
                         handler = self.get( base )
@@ -48,12 +102,29 @@ if ADT is None:
                             if hasattr( handler, 'registerEquivalent' ):
                                 handler.registerEquivalent( typ, base )
                             return handler
-                raise TypeError(
-                    """No array-type handler for type %s.%s (value: %s) registered"""%(
-                        typ.__module__, type.__name__, repr(value)[:50]
-                    )
-                )
+                handler = self.bufferHandler( value )
+                if handler:
+                    self[ typ ] = handler
+                    return handler
+                self.unhandled[ typ ] = len( plugins.FormatHandler.registry )
+                raise self.unhandledError( typ, value )
             return handler
+        def bufferHandler( self, value ):
+            """Buffer handler for any other object exporting a buffer, or None"""
+            try:
+                memoryview( value ).release()
+            except TypeError as err:
+                return None
+            handler = self.handler_by_plugin_name( 'buffer' )
+            if handler:
+                handler = handler()
+            return handler
+        def unhandledError( self, typ, value ):
+            return TypeError(
+                """No array-type handler for type %s.%s (value: %s) registered"""%(
+                    typ.__module__, typ.__name__, repr(value)[:50]
+                )
+            )
         
         def handler_by_plugin_name( self, name ):
             plugin = plugins.FormatHandler.by_name( name )
@@ -89,6 +160,8 @@ if ADT is None:
                 self[ type ] = handler
             if handler.isOutput:
                 self.all_output_handlers.append( handler )
+            self.unhandled.clear()
+            HandlerCache.clearAll()
             
         def registerReturn( self, handler ):
             """Register this handler as the default return-type handler"""
@@ -120,7 +193,11 @@ if ADT is None:
             return cls.handler 
         def from_param( cls, value, typeConstant=None ):
             """Given a value in a known data-pointer type, convert to a ctypes pointer"""
-            return cls.getHandler(value).from_param( value, cls.typeConstant )
+            cache = cls.paramCache
+            entry = cache.entry
+            if value.__class__ is entry[0]:
+                return entry[1].from_param( value, cls.typeConstant )
+            return cache.lookup( value ).from_param( value, cls.typeConstant )
         from_param = classmethod( logs.logOnFail( from_param, _log ) )
         def dataPointer( cls, value ):
             """Given a value in a known data-pointer type, return long for pointer"""
@@ -265,6 +342,17 @@ if ADT is None:
         """Array datatype for GLenum types"""
         baseType = _types.GLvoidp
         typeConstant = _types.GL_VOID_P
+
+    # ctypes calls from_param for every array argument, give each array
+    # type its own cache rather than having them all evict each other
+    for _arrayType in (
+        ArrayDatatype, GLclampdArray, GLclampfArray, GLfloatArray, GLdoubleArray,
+        GLbyteArray, GLcharArray, GLshortArray, GLintArray, GLubyteArray,
+        GLushortArray, GLuintArray, GLint64Array, GLuint64Array, GLenumArray,
+        GLsizeiArray, GLvoidpArray,
+    ):
+        _arrayType.paramCache = HandlerCache( GLOBAL_REGISTRY )
+    del _arrayType
 else:
     # Cython-coded array handler
     _log.info( 'Using accelerated ArrayDatatype' )
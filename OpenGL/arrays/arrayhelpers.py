@@ -46,11 +46,18 @@ if AsArrayTypedSizeChecked is None:
         def __init__( self, arrayName='pointer', typeName='type' ):
             self.arrayName = arrayName
             self.typeName = typeName 
+            self.handlers = arraydatatype.HandlerCache()
         def __call__( self, arg, wrappedOperation, args):
             """Get the arg as an array of the appropriate type"""
             type = args[ self.typeIndex ]
             arrayType = arraydatatype.GL_CONSTANT_TO_ARRAY_TYPE[ type ]
-            return arrayType.asArray( arg )
+            handlers = self.handlers
+            entry = handlers.entry
+            if arg.__class__ is entry[0]:
+                handler = entry[1]
+            else:
+                handler = handlers.lookup( arg )
+            return handler.asArray( arg, arrayType.typeConstant )
     class AsArrayTyped( converters.PyConverter ):
         """Given arrayName and arrayType, convert arrayName to array of type
         
@@ -65,9 +72,16 @@ if AsArrayTypedSizeChecked is None:
         def __init__( self, arrayName='pointer', arrayType=None ):
             self.arrayName = arrayName
             self.arrayType = arrayType
+            self.handlers = arraydatatype.HandlerCache()
         def __call__( self, arg, wrappedOperation, args):
             """Get the arg as an array of the appropriate type"""
-            return self.arrayType.asArray( arg )
+            handlers = self.handlers
+            entry = handlers.entry
+            if arg.__class__ is entry[0]:
+                handler = entry[1]
+            else:
+                handler = handlers.lookup( arg )
+            return handler.asArray( arg, self.arrayType.typeConstant )
     class AsArrayTypedSize( converters.CConverter ):
         """Given arrayName and arrayType, determine size of arrayName
         """
@@ -78,16 +92,33 @@ if AsArrayTypedSizeChecked is None:
         def __init__( self, arrayName='pointer', arrayType=None ):
             self.arrayName = arrayName
             self.arrayType = arrayType
+            self.handlers = arraydatatype.HandlerCache()
         def __call__( self, pyArgs, index, wrappedOperation ):
             """Get the arg as an array of the appropriate type"""
-            return self.arrayType.arraySize( pyArgs[self.arrayIndex ] )
+            arg = pyArgs[self.arrayIndex ]
+            handlers = self.handlers
+            entry = handlers.entry
+            if arg.__class__ is entry[0]:
+                handler = entry[1]
+            else:
+                handler = handlers.lookup( arg )
+            return handler.arraySize( arg, self.arrayType.typeConstant )
 else:
     returnPointer = returnPyArgumentIndex( 0 )
 
 if not _configflags.ERROR_ON_COPY:
     def asArrayType( typ, size=None ):
         """Create PyConverter to get first argument as array of type"""
-        return converters.CallFuncPyConverter( typ.asArray )
+        if getattr( typ, 'isAccelerated', True ):
+            return converters.CallFuncPyConverter( typ.asArray )
+        handlers = arraydatatype.HandlerCache()
+        typeConstant = typ.typeConstant
+        def asArray( incoming, function, args ):
+            entry = handlers.entry
+            if incoming.__class__ is entry[0]:
+                return entry[1].asArray( incoming, typeConstant )
+            return handlers.lookup( incoming ).asArray( incoming, typeConstant )
+        return asArray
 else:
     def asArrayType( typ, size=None ):
         """No converter required"""
@@ -104,12 +135,15 @@ else:
             
             Produces a raw function, not a PyConverter instance
             """
-            asArray = typ.asArray
             dataType = typ.typeConstant
-            arraySize = typ.arraySize
             expectedBytes = ctypes.sizeof( typ.baseType ) * size
+            handlers = arraydatatype.HandlerCache()
             def asArraySize( incoming, function, args ):
-                handler = typ.getHandler( incoming )
+                entry = handlers.entry
+                if incoming.__class__ is entry[0]:
+                    handler = entry[1]
+                else:
+                    handler = handlers.lookup( incoming )
                 result = handler.asArray( incoming, dataType )
                 # check that the number of bytes expected is present...
                 byteSize = handler.arrayByteCount( result )
@@ -129,7 +163,7 @@ if not _configflags.ERROR_ON_COPY:
     def asVoidArray( ):
         """Create PyConverter returning incoming as an array of any type"""
         from OpenGL.arrays import ArrayDatatype
-        return converters.CallFuncPyConverter( ArrayDatatype.asArray )
+        return asArrayType( ArrayDatatype )
 else:
     def asVoidArray( ):
         """If there's no copying allowed, we can use default passing"""
@@ -171,7 +205,16 @@ def setInputArraySizeType( baseOperation, size, type, argName=0 ):
     return wrapper.wrapper( baseOperation ).setInputArraySize( argName, size )
 
 def arraySizeOfFirstType( typ, default ):
-    unitSize = typ.unitSize
+    if getattr( typ, 'isAccelerated', True ):
+        unitSize = typ.unitSize
+    else:
+        handlers = arraydatatype.HandlerCache()
+        typeConstant = typ.typeConstant
+        def unitSize( array ):
+            entry = handlers.entry
+            if array.__class__ is entry[0]:
+                return entry[1].unitSize( array, typeConstant )
+            return handlers.lookup( array ).unitSize( array, typeConstant )
     def arraySizeOfFirst( pyArgs, index, baseOperation ):
         """Return the array size of the first argument"""
         array = pyArgs[0]
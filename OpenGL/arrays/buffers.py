@@ -1,14 +1,13 @@
 #! /usr/bin/env python
-"""Test for a buffer-protocol-based access mechanism
+"""Buffer-protocol-based access mechanism
 
-Will *only* work for Python 2.6+, and pretty much just works for strings
-under 2.6 (in terms of the common object types).
+Will *only* work for Python 2.7+ (memoryview support).
 """
-import ctypes,sys,operator,logging,traceback
+import ctypes,sys,operator,logging,traceback,weakref
 from OpenGL.arrays import _buffers
 from OpenGL.raw.GL import _types
 from OpenGL.raw.GL.VERSION import GL_1_1
-from OpenGL.arrays import formathandler
+from OpenGL.arrays import formathandler, copyaudit
 from OpenGL import _configflags
 from OpenGL import acceleratesupport
 _log = logging.getLogger( __name__ )
@@ -33,30 +32,37 @@ if sys.version_info[:2] > (2,6):
             BufferHandler = MemoryviewHandler
 if not BufferHandler:
     class BufferHandler( formathandler.FormatHandler ):
-        """Buffer-protocol data-type handler for OpenGL"""
+        """Buffer-protocol data-type handler for OpenGL
+
+        Handles memoryview, bytearray, array.array, mmap and any other
+        object exporting a buffer, as memoryviews of the exporter's own
+        memory.  C-contiguous data is never copied; anything else is
+        copied into a contiguous buffer, or, with ERROR_ON_COPY, raises
+        a CopyError saying which layout made the copy necessary.
+
+        A memoryview pins its buffer for as long as it is alive (the
+        exporter can't resize or close it while it is exported), so
+        the base address of memoryviews is looked up once and cached;
+        to stream data from an mmap, wrap it in a memoryview once and
+        pass that.  Other exporters can move their buffers between
+        calls, so their address is taken on each call.
+        """
         isOutput=False
         ERROR_ON_COPY = _configflags.ERROR_ON_COPY
-        if sys.version_info[:2] >= (3,0):
-            @classmethod
-            def from_param( cls, value, typeCode=None ):
-                if not isinstance( value, _buffers.Py_buffer ):
-                    value = cls.asArray( value )
-                    #raise TypeError( """Can't convert value to py-buffer in from_param""" )
-                return value
-        else:
-            # Not sure *why* 2.7 segfaults with the "use a buffer as the buffer"
-            # version above, but it works fine with the value.buf here
-            @classmethod
-            def from_param( cls, value, typeCode=None ):
-                if not isinstance( value, _buffers.Py_buffer ):
-                    value = cls.asArray( value )
-                    #raise TypeError( """Can't convert value to py-buffer in from_param""" )
+        @classmethod
+        def from_param( cls, value, typeCode=None ):
+            if isinstance( value, _buffers.Py_buffer ):
+                return ctypes.c_void_p( value.buf )
+            view = cls.asArray( value )
+            pointer = ctypes.c_void_p( viewPointer( view ) )
+            # keep the exporter alive while the pointer is in use
+            pointer._temporary_array_ = (view,)
+            return pointer
+        @classmethod
+        def dataPointer( cls, value ):
+            if isinstance( value, _buffers.Py_buffer ):
                 return value.buf
-        def dataPointer( value ):
-            if not isinstance( value, _buffers.Py_buffer ):
-                value = _buffers.Py_buffer.from_object( value )
-            return value.buf
-        dataPointer = staticmethod( dataPointer )
+            return viewPointer( cls.asArray( value ))
         @classmethod
         def zeros( cls, dims, typeCode=None ):
             """Currently don't allow strings as output types!"""
@@ -69,30 +75,97 @@ if not BufferHandler:
         @classmethod
         def arrayToGLType( cls, value ):
             """Given a value, guess OpenGL type of the corresponding pointer"""
-            format = value.format 
+            format = cls.view( value ).format
+            if isinstance( format, bytes ):
+                format = format.decode( 'latin-1' )
             if format in ARRAY_TO_GL_TYPE_MAPPING:
                 return ARRAY_TO_GL_TYPE_MAPPING[format]
             raise TypeError( 'Unknown format: %r'%(format,))
         @classmethod
         def arraySize( cls, value, typeCode = None ):
             """Given a data-value, calculate ravelled size for the array"""
-            return value.len // value.itemsize
+            view = cls.view( value )
+            return cls.arrayByteCount( view ) // view.itemsize
         @classmethod
         def arrayByteCount( cls, value, typeCode = None ):
             """Given a data-value, calculate number of bytes required to represent"""
-            return value.len
+            if isinstance( value, _buffers.Py_buffer ):
+                return value.len
+            return cls.view( value ).nbytes
         @classmethod 
         def unitSize( cls, value, default=None ):
-            return value.dims[-1]
+            return cls.dimensions( value )[-1]
         @classmethod
         def asArray( cls, value, typeCode=None ):
-            """Convert given value to an array value of given typeCode"""
-            buf = _buffers.Py_buffer.from_object( value )
-            return buf
+            """Convert given value to a C-contiguous memoryview of its data"""
+            if isinstance( value, _buffers.Py_buffer ):
+                return value
+            view = value if value.__class__ is memoryview else memoryview( value )
+            if view.c_contiguous:
+                return view
+            if cls.ERROR_ON_COPY:
+                from OpenGL import error
+                raise error.CopyError(
+                    """%s passed, cannot copy it with ERROR_ON_COPY set: %s"""%(
+                        value.__class__.__name__, copyReason( view ),
+                    )
+                )
+            copy = memoryview( bytearray( view.tobytes() ))
+            if copyaudit.AUDIT is not None:
+                copyaudit.record( value, copy.nbytes, typeCode or ARRAY_TO_GL_TYPE_MAPPING.get( view.format ) )
+            try:
+                return copy.cast( view.format, view.shape )
+            except (TypeError,ValueError) as err:
+                return copy
+        @classmethod
+        def view( cls, value ):
+            """value as a memoryview (Py_buffer structures as they are)"""
+            if value.__class__ is memoryview or isinstance( value, _buffers.Py_buffer ):
+                return value
+            return memoryview( value )
         @classmethod
         def dimensions( cls, value, typeCode=None ):
             """Determine dimensions of the passed array value (if possible)"""
-            return value.dims
+            view = cls.view( value )
+            if isinstance( view, _buffers.Py_buffer ):
+                return view.dims
+            return view.shape
+
+    # id(memoryview): (weakref to it, base address)
+    _VIEW_POINTERS = {}
+    def viewPointer( view ):
+        """Base address of a C-contiguous memoryview (None if empty)"""
+        key = id( view )
+        cached = _VIEW_POINTERS.get( key )
+        if cached is not None and cached[0]() is view:
+            # raises ValueError if the view has been released since
+            if view.nbytes:
+                return cached[1]
+        if not view.nbytes:
+            return None
+        if view.readonly:
+            # ctypes only wraps writable buffers, ask for the address;
+            # view keeps the memory exported once we release ours
+            pointer = _buffers.Py_buffer.from_object( view, _buffers.PyBUF_SIMPLE ).buf
+        else:
+            pointer = ctypes.addressof( ctypes.c_char.from_buffer( view ))
+        if view.__class__ is memoryview:
+            _VIEW_POINTERS[key] = (
+                weakref.ref( view, lambda ref, key=key: _forgetView( key, ref )),
+                pointer,
+            )
+        return pointer
+    def _forgetView( key, ref ):
+        cached = _VIEW_POINTERS.get( key )
+        if cached is not None and cached[0] is ref:
+            del _VIEW_POINTERS[key]
+
+    def copyReason( view ):
+        """Describe why view can't be passed without copying it"""
+        layout = 'Fortran-contiguous' if view.f_contiguous else 'non-contiguous'
+        return """%s data (format %r, itemsize %d, shape %s, strides %s), GL needs C-contiguous memory"""%(
+            layout, view.format, view.itemsize, view.shape, view.strides,
+        )
 
 ARRAY_TO_GL_TYPE_MAPPING = _buffers.ARRAY_TO_GL_TYPE_MAPPING
 BYTE_SIZES = _buffers.BYTE_SIZES
@@ -0,0 +1,138 @@
+"""Audit of the implicit array copies made by the format handlers
+
+ERROR_ON_COPY raises at the first copy, which is of little use for finding
+the copies that matter in a large application.  With auditing on, the
+handlers (lists, numbers, numpy, strings and buffers) instead record
+each copy they make -- its size, the type of the value copied, the GL type
+it was converted to and the file:line of the (non-PyOpenGL) code whose
+call caused it -- and carry on as usual:
+
+    from OpenGL.arrays import copyaudit
+    copyaudit.enable()
+    ... render some frames ...
+    print( copyaudit.format() )
+
+or set PYOPENGL_COPY_AUDIT=1 (OpenGL.COPY_AUDIT) to audit the whole run
+and log the report to the OpenGL.arrays.copyaudit logger at exit.
+
+The report has one entry per call site, source type and GL type, heaviest
+(most bytes copied per second of auditing) first.  ERROR_ON_COPY, where
+set, still raises before anything is recorded.
+"""
+import atexit, logging, os, sys, threading, time
+from collections import namedtuple
+_log = logging.getLogger( __name__ )
+
+CopySite = namedtuple( 'CopySite', (
+    'filename','line','source','glType','copies','bytes',
+    'bytesPerSecond','copiesPerSecond',
+))
+
+OPENGL_DIRECTORY = os.path.dirname( os.path.dirname( os.path.abspath( __file__ ) ))
+
+def typeName( glType ):
+    """Readable name of a GL type constant (or dtype, or None)"""
+    if glType is None:
+        return None
+    name = getattr( glType, 'name', None )
+    if isinstance( name, str ):
+        return name
+    return str( glType )
+
+def callSite( depth=2 ):
+    """(filename, line) of the innermost caller outside the OpenGL package"""
+    frame = sys._getframe( depth )
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if not os.path.abspath( filename ).startswith( OPENGL_DIRECTORY+os.sep ):
+            return filename, frame.f_lineno
+        frame = frame.f_back
+    return '<unknown>', 0
+
+class CopyAudit( object ):
+    """Totals of the copies made since the audit started (or was reset)
+
+    sites -- {(filename, line, source, glType): [copies, bytes]}
+    """
+    def __init__( self ):
+        self.lock = threading.Lock()
+        self.reset()
+    def reset( self ):
+        """Forget everything recorded so far"""
+        with self.lock:
+            self.sites = {}
+            self.started = time.time()
+    def record( self, source, nbytes, glType=None, depth=3 ):
+        """Record a copy of nbytes of source, converted to glType"""
+        filename, line = callSite( depth )
+        key = (filename, line, source.__class__.__name__, typeName( glType ))
+        with self.lock:
+            totals = self.sites.get( key )
+            if totals is None:
+                totals = self.sites[key] = [0,0]
+            totals[0] += 1
+            totals[1] += nbytes
+    def report( self ):
+        """[CopySite], most bytes per second first"""
+        elapsed = max( time.time() - self.started, 1e-9 )
+        with self.lock:
+            items = list( self.sites.items() )
+        sites = [
+            CopySite(
+                filename, line, source, glType, copies, nbytes,
+                nbytes/elapsed, copies/elapsed,
+            )
+            for (filename, line, source, glType), (copies, nbytes) in items
+        ]
+        sites.sort( key=lambda site: site.bytesPerSecond, reverse=True )
+        return sites
+    def format( self, limit=None ):
+        """The report as a table of text"""
+        sites = self.report()
+        if limit is not None:
+            sites = sites[:limit]
+        lines = ['%12s %10s %10s %12s  %s'%(
+            'bytes/s','copies/s','copies','bytes','site (source -> GL type)',
+        )]
+        for site in sites:
+            lines.append( '%12.0f %10.1f %10d %12d  %s:%d (%s -> %s)'%(
+                site.bytesPerSecond, site.copiesPerSecond, site.copies,
+                site.bytes, site.filename, site.line, site.source, site.glType,
+            ))
+        return '\n'.join( lines )
+
+# the active CopyAudit, handlers check this before recording
+AUDIT = None
+
+def enable( ):
+    """Start auditing copies (continuing the current audit if there is one)"""
+    global AUDIT
+    if AUDIT is None:
+        AUDIT = CopyAudit()
+    return AUDIT
+def disable( ):
+    """Stop auditing copies, return the finished CopyAudit"""
+    global AUDIT
+    audit, AUDIT = AUDIT, None
+    return audit
+def record( source, nbytes, glType=None ):
+    """Handlers: record a copy they made, if auditing"""
+    audit = AUDIT
+    if audit is not None:
+        audit.record( source, nbytes, glType )
+def report( ):
+    """[CopySite] of the current audit"""
+    return AUDIT.report() if AUDIT is not None else []
+def format( limit=None ):
+    """Text report of the current audit"""
+    return AUDIT.format( limit ) if AUDIT is not None else 'Copy audit not enabled'
+
+def logReport( ):
+    """Log the report of the current audit, if there were any copies"""
+    if AUDIT is not None and AUDIT.sites:
+        _log.warning( 'Implicit array copies:\n%s', AUDIT.format() )
+
+from OpenGL._configflags import COPY_AUDIT
+if COPY_AUDIT:
+    enable()
+    atexit.register( logReport )
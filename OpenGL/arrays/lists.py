@@ -7,13 +7,14 @@ Note:
     for usage without numpy installed.
 """
 REGISTRY_NAME = 'lists'
-import ctypes, _ctypes
+import array, ctypes, _ctypes
+from itertools import chain
 # Note: these are the same definitions as for GLES, so we are not cross-polluting
 from OpenGL.raw.GL import _types 
 from OpenGL.arrays import _arrayconstants as GL_1_1
 from OpenGL import constant, error
 from OpenGL._configflags import ERROR_ON_COPY
-from OpenGL.arrays import formathandler
+from OpenGL.arrays import formathandler, copyaudit
 from OpenGL._bytes import bytes,unicode,as_8_bit
 HANDLED_TYPES = (list,tuple)
 import operator
@@ -140,10 +141,20 @@ class ListHandler( formathandler.FormatHandler ):
         """
         if typeCode is None:
             raise NotImplementedError( """Haven't implemented type-inference for lists yet""" )
+        result = cls.convert( value, typeCode )
+        if copyaudit.AUDIT is not None:
+            copyaudit.record( value, ctypes.sizeof( result ), typeCode )
+        return result
+    @classmethod
+    def convert( cls, value, typeCode ):
+        """Build the ctypes array for asArray (a copy of value)"""
         arrayType = GL_TYPE_TO_ARRAY_MAPPING[ typeCode ]
         if isinstance( value, (list,tuple)):
+            result = cls.rectangularArray( value, arrayType )
+            if result is not None:
+                return result
             subItems = [
-                cls.asArray( item, typeCode )
+                cls.convert( item, typeCode )
                 for item in value
             ]
             if subItems:
@@ -155,6 +166,43 @@ class ListHandler( formathandler.FormatHandler ):
                 return result
         else:
             return arrayType( value )
+    @classmethod
+    def rectangularArray( cls, value, arrayType ):
+        """Convert a rectangular nested list of numbers to a ctypes array
+
+        Flattens value level by level and packs the numbers into an
+        array.array of arrayType's C type in one go, then views that
+        buffer as the same nested ctypes array type asArray would have
+        built element by element.
+
+        returns None for anything else (ragged or empty lists, non-numeric
+        items, values out of range for the type...), which asArray then
+        converts the slow way
+        """
+        typeCode = ARRAY_TYPE_CODES.get( arrayType )
+        if typeCode is None:
+            return None
+        dims = []
+        item = value
+        while isinstance( item, (list,tuple) ):
+            if not item:
+                return None
+            dims.append( len(item) )
+            item = item[0]
+        flat = value
+        try:
+            for size in dims[1:]:
+                # len() of a number raises TypeError, ragged rows give
+                # more than one length
+                if set( map( len, flat )) != set( (size,) ):
+                    return None
+                flat = list( chain.from_iterable( flat ))
+            data = array.array( typeCode, flat )
+        except (TypeError,ValueError,OverflowError) as err:
+            return None
+        for dim in dims[::-1]:
+            arrayType *= dim
+        return arrayType.from_buffer( data )
     @err_on_copy
     @classmethod
     def unitSize( cls, value, typeCode=None ):
@@ -195,3 +243,21 @@ GL_TYPE_TO_ARRAY_MAPPING = {
     GL_1_1.GL_BYTE: _types.GLbyte,
     GL_1_1.GL_UNSIGNED_BYTE: _types.GLubyte,
 }
+
+def _arrayTypeCodes( ):
+    """array.array type codes for the C types with the same item size"""
+    codes = {}
+    for arrayType, typeCode in (
+        (_types.GLdouble, 'd'),
+        (_types.GLfloat, 'f'),
+        (_types.GLint, 'i'),
+        (_types.GLuint, 'I'),
+        (_types.GLshort, 'h'),
+        (_types.GLushort, 'H'),
+        (_types.GLbyte, 'b'),
+        (_types.GLubyte, 'B'),
+    ):
+        if array.array( typeCode ).itemsize == ctypes.sizeof( arrayType ):
+            codes[arrayType] = typeCode
+    return codes
+ARRAY_TYPE_CODES = _arrayTypeCodes()
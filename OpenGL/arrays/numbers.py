@@ -3,7 +3,7 @@
 REGISTRY_NAME = 'numbers'
 from OpenGL.raw.GL import _types 
 from OpenGL.raw.GL.VERSION import GL_1_1
-from OpenGL.arrays import formathandler
+from OpenGL.arrays import formathandler, copyaudit
 import ctypes
 from OpenGL._bytes import long, integer_types
 
@@ -54,6 +54,8 @@ class NumberHandler( formathandler.FormatHandler ):
             return value
         targetType = CONSTANT_TO_TYPE.get( typeCode )
         if targetType is not None:
+            if copyaudit.AUDIT is not None:
+                copyaudit.record( value, ctypes.sizeof( targetType ), typeCode )
             return targetType( value )
         raise TypeError( """Don't know how to convert %r to an array type"""%(
             typeCode,
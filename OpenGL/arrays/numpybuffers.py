@@ -12,7 +12,7 @@ try:
     import numpy
 except ImportError as err:
     raise ImportError( """No numpy module present: %s"""%(err))
-from OpenGL.arrays import buffers
+from OpenGL.arrays import buffers, copyaudit
 from OpenGL.raw.GL import _types 
 from OpenGL.raw.GL.VERSION import GL_1_1
 from OpenGL import constant, error
@@ -47,9 +47,12 @@ class NumpyHandler( buffers.BufferHandler ):
             contiguous = source.flags.contiguous
         except AttributeError as err:
             if typeCode:
-                return numpy.ascontiguousarray( source, typeCode )
+                result = numpy.ascontiguousarray( source, typeCode )
             else:
-                return numpy.ascontiguousarray( source )
+                result = numpy.ascontiguousarray( source )
+            if copyaudit.AUDIT is not None:
+                copyaudit.record( source, result.nbytes, ARRAY_TO_GL_TYPE_MAPPING.get( result.dtype ) )
+            return result
         else:
             if contiguous and (typeCode is None or typeCode==source.dtype.char):
                 return source
@@ -73,7 +76,10 @@ class NumpyHandler( buffers.BufferHandler ):
                     )
                 if typeCode is None:
                     typeCode = source.dtype.char
-                return numpy.ascontiguousarray( source, typeCode )
+                result = numpy.ascontiguousarray( source, typeCode )
+                if copyaudit.AUDIT is not None:
+                    copyaudit.record( source, result.nbytes, ARRAY_TO_GL_TYPE_MAPPING.get( result.dtype ) )
+                return result
 try:
     numpy.array( [1], 's' )
     SHORT_TYPE = 's'
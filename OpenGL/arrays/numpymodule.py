@@ -18,8 +18,11 @@ from OpenGL._bytes import long, integer_types
 from OpenGL.raw.GL import _types 
 from OpenGL.raw.GL.VERSION import GL_1_1
 from OpenGL import constant, error
-from OpenGL.arrays import formathandler
+from OpenGL.arrays import formathandler, copyaudit
 c_void_p = ctypes.c_void_p
+addressof = ctypes.addressof
+byref = ctypes.byref
+fromBuffer = ctypes.c_char.from_buffer
 from OpenGL import acceleratesupport
 NumpyHandler = None
 if acceleratesupport.ACCELERATE_AVAILABLE:
@@ -39,6 +42,9 @@ if NumpyHandler is None:
         def dataPointer( cls, instance ):
             """Convert given instance to a data-pointer value (integer)"""
             try:
+                if instance.flags.carray and instance.nbytes:
+                    # far cheaper than building the __array_interface__ dict
+                    return addressof( fromBuffer( instance ))
                 return long(instance.__array_interface__['data'][0])
             except AttributeError as err:
                 instance = cls.asArray( instance )
@@ -72,8 +78,14 @@ if NumpyHandler is None:
             ERROR_ON_COPY -- if True, will raise errors
                 if we have to copy an array object in order to produce
                 a contiguous array of the correct type.
+
+        Arrays which are already C-contiguous, aligned, writeable and of
+        the required dtype (the usual case for per-frame data) are
+        recognised with a single flags check and passed by address
+        without further conversion.  Numpy scalars are passed as
+        1-element arrays of their own (or the required) dtype.
         """
-        HANDLED_TYPES = (numpy.ndarray,)# list, tuple )
+        HANDLED_TYPES = (numpy.ndarray,numpy.generic)# list, tuple )
         dataPointer = dataPointer
         isOutput = True
         ERROR_ON_COPY = _configflags.ERROR_ON_COPY
@@ -116,8 +128,26 @@ if NumpyHandler is None:
             """Convert given value to an array value of given typeCode"""
             if value is None:
                 return value
+            elif isinstance( value, numpy.generic ):
+                return cls.fromScalar( value, typeCode )
             else:
                 return cls.contiguous( value, typeCode )
+        @classmethod
+        def fromScalar( cls, value, typeCode=None ):
+            """1-element array holding numpy scalar value (as typeCode)"""
+            dtype = GL_TYPE_TO_ARRAY_MAPPING[ typeCode ]
+            if dtype is None:
+                dtype = value.dtype
+            elif cls.ERROR_ON_COPY and value.dtype != dtype:
+                raise error.CopyError(
+                    """Scalar of type %r passed, required array of type %r"""%(
+                        value.dtype.char, dtype.char,
+                    )
+                )
+            result = numpy.array( (value,), dtype )
+            if copyaudit.AUDIT is not None:
+                copyaudit.record( value, result.nbytes, ARRAY_TO_GL_TYPE_MAPPING.get( result.dtype ) )
+            return result
 
         @classmethod
         def contiguous( cls, source, typeCode=None ):
@@ -137,14 +167,17 @@ if NumpyHandler is None:
             """
             typeCode = GL_TYPE_TO_ARRAY_MAPPING[ typeCode ]
             try:
-                contiguous = source.flags.contiguous
+                contiguous = source.flags.c_contiguous
             except AttributeError as err:
                 if typeCode:
-                    return numpy.ascontiguousarray( source, typeCode )
+                    result = numpy.ascontiguousarray( source, typeCode )
                 else:
-                    return numpy.ascontiguousarray( source )
+                    result = numpy.ascontiguousarray( source )
+                if copyaudit.AUDIT is not None:
+                    copyaudit.record( source, result.nbytes, ARRAY_TO_GL_TYPE_MAPPING.get( result.dtype ) )
+                return result
             else:
-                if contiguous and (typeCode is None or typeCode==source.dtype.char):
+                if contiguous and (typeCode is None or source.dtype is typeCode or typeCode==source.dtype):
                     return source
                 elif (contiguous and cls.ERROR_ON_COPY):
                     from OpenGL import error
@@ -166,7 +199,10 @@ if NumpyHandler is None:
                         )
                     if typeCode is None:
                         typeCode = source.dtype.char
-                    return numpy.ascontiguousarray( source, typeCode )
+                    result = numpy.ascontiguousarray( source, typeCode )
+                    if copyaudit.AUDIT is not None:
+                        copyaudit.record( source, result.nbytes, ARRAY_TO_GL_TYPE_MAPPING.get( result.dtype ) )
+                    return result
         @classmethod
         def unitSize( cls, value, typeCode=None ):
             """Determine unit size of an array (if possible)"""
@@ -177,11 +213,25 @@ if NumpyHandler is None:
             return value.shape
         @classmethod
         def from_param( cls, instance, typeCode=None ):
+            try:
+                if instance.flags.carray and (
+                    typeCode is None or instance.dtype is GL_TYPE_TO_ARRAY_MAPPING[ typeCode ]
+                ):
+                    # the array's own memory, which the byref keeps alive
+                    return byref( fromBuffer( instance ))
+            except (AttributeError,ValueError) as err:
+                # not an array, or zero-length
+                pass
+            if isinstance( instance, numpy.generic ):
+                array = cls.fromScalar( instance, typeCode )
+                pp = c_void_p( cls.dataPointer( array ))
+                pp._temporary_array_ = (array,)
+                return pp
             try:
                 pointer = cls.dataPointer( instance )
             except TypeError as err:
                 array = cls.asArray( instance, typeCode )
-                pp = cls.dataPointer( array )
+                pp = c_void_p( cls.dataPointer( array ))
                 pp._temporary_array_ = (array,)
                 return pp
             else:
@@ -200,7 +250,7 @@ except TypeError as err:
     USHORT_TYPE = 'H'
 
 def lookupDtype( char ):
-    return numpy.zeros( (1,), dtype=char ).dtype
+    return numpy.dtype( char )
 
 ARRAY_TO_GL_TYPE_MAPPING = {
     lookupDtype('d'): GL_1_1.GL_DOUBLE,
@@ -2,7 +2,7 @@
 """
 from OpenGL.raw.GL import _types 
 from OpenGL.raw.GL.VERSION import GL_1_1
-from OpenGL.arrays import formathandler
+from OpenGL.arrays import formathandler, copyaudit
 import ctypes
 from OpenGL import _bytes, error
 from OpenGL._configflags import ERROR_ON_COPY
@@ -40,12 +40,16 @@ class StringHandler( formathandler.FormatHandler ):
         if isinstance( value, bytes ):
             return value
         elif hasattr( value, 'tostring' ):
-            return value.tostring()
+            result = value.tostring()
         elif hasattr( value, 'raw' ):
-            return value.raw
-        # could convert types to string here, but we're not registered for
-        # anything save string types...
-        raise TypeError( """String handler got non-string object: %r"""%(type(value)))
+            result = value.raw
+        else:
+            # could convert types to string here, but we're not registered for
+            # anything save string types...
+            raise TypeError( """String handler got non-string object: %r"""%(type(value)))
+        if copyaudit.AUDIT is not None:
+            copyaudit.record( value, len(result), typeCode )
+        return result
     def dimensions( self, value, typeCode=None ):
         """Determine dimensions of the passed array value (if possible)"""
         raise TypeError(
@@ -64,11 +68,15 @@ class UnicodeHandler( StringHandler ):
                 raise error.CopyError(
                     """Unicode string passed, cannot copy with ERROR_ON_COPY set, please use 8-bit strings"""
                 )
+            if copyaudit.AUDIT is not None:
+                copyaudit.record( value, len(converted), typeCode )
             result._temporary_array_ = converted 
         return result
     def asArray( self, value, typeCode=None ):
-        value = _bytes.as_8_bit( value )
-        return StringHandler.asArray( self, value, typeCode=typeCode )
+        converted = _bytes.as_8_bit( value )
+        if converted is not value and copyaudit.AUDIT is not None:
+            copyaudit.record( value, len(converted), typeCode )
+        return StringHandler.asArray( self, converted, typeCode=typeCode )
 
 
 BYTE_SIZES = {
@@ -0,0 +1,195 @@
+"""Finalising wrapped functions ahead of their first call
+
+Wrappers (LateBind objects) build their call path in finalise() the first
+time they are called, and the entry points behind them are only looked up
+in the library at that point too.  Each costs a fraction of a millisecond,
+which adds up to a visible stall when a frame is the first to use a batch
+of functions.  warmup() does that work in advance, optionally on a
+background thread (during a loading screen, say):
+
+    import OpenGL, OpenGL.GL
+    report = OpenGL.warmup( OpenGL.GL, background=True )
+    ...
+    report.wait()
+    for name, seconds, stages in report.finalised:
+        ...
+
+Looking up an extension's entry point, or choosing between alternative
+implementations of a function, needs to know whether the current context
+supports the extension, so those are only done when a context is current
+on the thread doing the work; otherwise they are left to their first
+call, as are functions of extensions the context doesn't support.
+Finalising is idempotent, so a function called while it is being warmed
+up just ends up finalised by whichever thread gets there first.
+"""
+import importlib, threading, time, types
+from collections import namedtuple
+from OpenGL import extensions, latebind
+from OpenGL.platform import baseplatform
+
+Finalised = namedtuple( 'Finalised', ('name','seconds','stages') )
+Failed = namedtuple( 'Failed', ('name','error') )
+
+DEFAULT_NAMESPACE = 'OpenGL.GL'
+
+def isCore( function ):
+    """Whether function's entry point can be looked up without a context"""
+    extension = function.extension
+    return (not extension) or extension.split('_')[1] == 'VERSION'
+
+def pendingWork( function, resolveExtensions=False ):
+    """Yield (stage, target, prepare) for the work function's first call would do
+
+    stage -- 'finalise' for LateBind.finalise(), 'resolve' for looking up
+        the entry point of a null function pointer
+    target -- the object the work is for (function, or something it wraps)
+    prepare -- callable doing the work
+    """
+    seen = set()
+    pending = [function]
+    while pending:
+        current = pending.pop(0)
+        if current is None or id(current) in seen:
+            continue
+        seen.add( id(current) )
+        if isinstance( current, extensions._Alternate ):
+            # choosing an alternative checks which extensions are available
+            if resolveExtensions:
+                if not getattr( current, '_finalCall', None ):
+                    yield 'finalise', current, current.getFinalCall
+                pending.append( getattr( current, '_finalCall', None ))
+        elif isinstance( current, latebind.LateBind ):
+            if not getattr( current, '_finalCall', None ):
+                yield 'finalise', current, current.getFinalCall
+            pending.append( getattr( current, 'wrappedOperation', None ))
+        elif isinstance( current, latebind.Curry ):
+            # lazy wrappers, their wrapper function is plain Python
+            pending.append( current.baseFunction )
+        elif isinstance( current, baseplatform._NullFunctionPointer ):
+            if current.resolved or current.deprecated:
+                continue
+            if resolveExtensions or isCore( current ):
+                yield 'resolve', current, current.load
+
+def collect( targets, namespace=None, failed=None ):
+    """Produce [(name, function)] for the targets given to warmup()
+
+    failed -- if given, list to append Failed( target, error ) to for
+        targets which can't be found, rather than raising
+    """
+    if isinstance( targets, (str, types.ModuleType) ) or callable( targets ):
+        targets = [targets]
+    functions = []
+    for target in targets:
+        try:
+            functions.extend( resolveTarget( target, namespace ))
+        except Exception as err:
+            if failed is None:
+                raise
+            failed.append( Failed( target, err ))
+    return functions
+
+def resolveTarget( target, namespace=None ):
+    """[(name, function)] for a single warmup() target"""
+    if isinstance( target, types.ModuleType ):
+        return moduleFunctions( target )
+    if not isinstance( target, str ):
+        return [(getattr( target, '__name__', repr(target) ), target)]
+    if '.' in target:
+        try:
+            module = importlib.import_module( target )
+        except ImportError:
+            moduleName, name = target.rsplit( '.', 1 )
+            return [(target, getattr( importlib.import_module( moduleName ), name ))]
+        return moduleFunctions( module )
+    if namespace is None or isinstance( namespace, str ):
+        namespace = importlib.import_module( namespace or DEFAULT_NAMESPACE )
+    return [(target, getattr( namespace, target ))]
+
+def moduleFunctions( module ):
+    """[(name, function)] for every public callable module exports"""
+    names = getattr( module, '__all__', None )
+    if names is None:
+        names = [name for name in vars( module ) if not name.startswith( '_' )]
+    result = []
+    for name in names:
+        value = getattr( module, name, None )
+        if isinstance( value, (latebind.LateBind, latebind.Curry, baseplatform._NullFunctionPointer) ):
+            result.append( ('%s.%s'%( module.__name__, name ), value) )
+    return result
+
+class Warmup( object ):
+    """Progress and results of a warmup() call
+
+    finalised -- list of Finalised( name, seconds, stages ) for each
+        function which had work done, stages being the names of the
+        pieces of work (see pendingWork)
+    failed -- list of Failed( name, error ) for targets which couldn't be
+        found and functions which raised
+    seconds -- total time spent, once done
+    """
+    def __init__( self, targets, namespace=None ):
+        self.targets = targets
+        self.namespace = namespace
+        self.finalised = []
+        self.failed = []
+        self.seconds = None
+        self.done = threading.Event()
+        self.thread = None
+    def run( self ):
+        """Do the work on this thread"""
+        from OpenGL import platform
+        start = time.perf_counter()
+        try:
+            try:
+                context = platform.PLATFORM.GetCurrentContext()
+            except Exception:
+                context = None
+            for name, function in collect( self.targets, self.namespace, self.failed ):
+                self.warm( name, function, bool(context) )
+        finally:
+            self.seconds = time.perf_counter() - start
+            self.done.set()
+        return self
+    def warm( self, name, function, resolveExtensions ):
+        """Do the pending work of one function"""
+        stages = []
+        started = time.perf_counter()
+        try:
+            for stage, target, prepare in pendingWork( function, resolveExtensions ):
+                prepare()
+                stages.append( stage )
+        except Exception as err:
+            self.failed.append( Failed( name, err ))
+            return
+        if stages:
+            self.finalised.append( Finalised( name, time.perf_counter() - started, tuple(stages) ))
+    def start( self ):
+        """Do the work on a daemon thread"""
+        self.thread = threading.Thread(
+            target=self.run, name='OpenGL.warmup', daemon=True,
+        )
+        self.thread.start()
+        return self
+    def wait( self, timeout=None ):
+        """Wait for the work to finish, return whether it has"""
+        return self.done.wait( timeout )
+
+def warmup( targets, background=True, namespace=None ):
+    """Finalise functions ahead of their first call
+
+    targets -- a module (every wrapped function it exports), a dotted name
+        of a module or function ('OpenGL.GLU', 'OpenGL.GL.glDrawElements'),
+        a function, a plain function name looked up in namespace, or a
+        sequence of any of those
+    background -- if True, do the work on a daemon thread and return at
+        once, otherwise do it before returning
+    namespace -- module (or its dotted name) plain names are looked up
+        in, OpenGL.GL by default
+
+    returns a Warmup, reporting the functions finalised and time taken
+    """
+    report = Warmup( targets, namespace )
+    if background:
+        return report.start()
+    return report.run()
@@ -0,0 +1,179 @@
+"""Lazily populated package namespaces (PEP 562)
+
+OpenGL.GL, OpenGL.GLU and OpenGL.GLUT used to star-import every module they
+re-export, building thousands of ctypes functions and constants before the
+first thing was drawn.  Instead they now list those modules (their sources)
+in star-import order, and keep a generated index (their _index module) of
+which source provides each name.  The package's module-level __getattr__
+imports just the source a name comes from, the first time it is asked for.
+
+The index records, for each name, the earliest source providing the same
+object the star-imports would have ended up with, so the value is always
+what the eager import would have given.  Names the index doesn't know (or
+which a source turns out not to have, say on another platform) make the
+namespace load every source as the eager import did, so a stale index costs
+time, never correctness.  After editing a package's sources, regenerate the
+indices with:
+
+    python -m OpenGL.lazynamespace
+
+``from package import *`` still works (through __all__), but resolves, and
+so imports, everything.
+"""
+import importlib, sys
+
+NOTHING = object()
+
+def exportedNames( module ):
+    """Names ``from module import *`` would bind"""
+    names = getattr( module, '__all__', None )
+    if names is None:
+        names = [name for name in vars( module ) if not name.startswith( '_' )]
+    return names
+
+class LazyNamespace( object ):
+    """Resolves the names of a package namespace on first access
+
+    namespace -- the package's globals()
+    sources -- names of the modules the package would star-import, in order
+    index -- the generated _index module of the package, or None
+    derived -- mapping of name to a callable producing the value of a name
+        which isn't simply taken from a source (aliases and the like)
+    """
+    def __init__( self, namespace, sources, index, derived=None ):
+        self.namespace = namespace
+        self.package = namespace['__name__']
+        self.sources = tuple(sources)
+        self.derived = derived or {}
+        self.loadedAll = False
+        if tuple(getattr( index, 'SOURCES', () )) == self.sources and hasattr( index, 'SUBMODULES' ):
+            self.index = index.INDEX
+            self.submodules = index.SUBMODULES
+        else:
+            # no index yet, or one generated from other sources (or by an
+            # older version of this module)
+            self.index = {}
+            self.submodules = ()
+            self.loadAll()
+    def names( self ):
+        """The public names of the namespace, for __all__"""
+        names = set( self.index )
+        names.update( self.submodules )
+        names.update( self.derived )
+        names.update( self.namespace )
+        return sorted([name for name in names if not name.startswith( '_' )])
+    def dir( self ):
+        """All of the names of the namespace, for __dir__"""
+        names = set( self.index )
+        names.update( self.submodules )
+        names.update( self.derived )
+        names.update( self.namespace )
+        return sorted( names )
+    def resolve( self, name ):
+        """Module __getattr__: import name's source and bind name"""
+        derive = self.derived.get( name )
+        if derive is not None:
+            value = derive()
+        else:
+            source = self.index.get( name )
+            value = NOTHING
+            if source is not None:
+                value = getattr( importlib.import_module( self.sources[source] ), name, NOTHING )
+            if value is NOTHING:
+                return self.missing( name )
+        self.namespace[name] = value
+        return value
+    def missing( self, name ):
+        """Resolve a name the index couldn't"""
+        if name.startswith( '__' ):
+            raise AttributeError( """module %r has no attribute %r"""%( self.package, name ))
+        # our own submodules, which the eager import left as attributes
+        # as a side effect of importing them
+        try:
+            return importlib.import_module( '%s.%s'%( self.package, name ))
+        except ImportError as err:
+            if getattr( err, 'name', None ) != '%s.%s'%( self.package, name ):
+                raise
+        self.loadAll()
+        try:
+            return self.namespace[name]
+        except KeyError:
+            raise AttributeError( """module %r has no attribute %r"""%( self.package, name ))
+    def loadAll( self ):
+        """Bind every name, as the star-imports would have"""
+        if self.loadedAll:
+            return
+        self.loadedAll = True
+        values = {}
+        for source in self.sources:
+            module = importlib.import_module( source )
+            for name in exportedNames( module ):
+                values[name] = getattr( module, name )
+        for name, value in values.items():
+            # names the package binds itself come after the star-imports
+            self.namespace.setdefault( name, value )
+        for name, derive in self.derived.items():
+            if name not in self.namespace:
+                self.namespace[name] = derive()
+
+def alias( namespace, name ):
+    """Derived value which is just another name of the namespace"""
+    def derive():
+        return getattr( sys.modules[namespace['__name__']], name )
+    return derive
+
+def buildIndex( package, sources ):
+    """Work out which source provides each name of package
+
+    Imports every source, returns {name: index of source}
+    """
+    modules = [importlib.import_module( source ) for source in sources]
+    final = {}
+    for module in modules:
+        for name in exportedNames( module ):
+            final[name] = getattr( module, name )
+    index = {}
+    for name, value in final.items():
+        if type(value) is type(sys) and value.__name__ == '%s.%s'%( package, name ):
+            # a submodule, imported as such by LazyNamespace.missing
+            continue
+        for i, module in enumerate( modules ):
+            if getattr( module, name, NOTHING ) is value:
+                index[name] = i
+                break
+    return index
+
+def writeIndex( package ):
+    """Regenerate the _index module of package"""
+    module = importlib.import_module( package )
+    sources = module._SOURCES
+    index = buildIndex( package, sources )
+    lines = [
+        '"""Generated by OpenGL.lazynamespace from %s._SOURCES, do not edit"""'%( package, ),
+        'SOURCES = (',
+    ]
+    lines.extend( '    %r,'%( source, ) for source in sources )
+    lines.append( ')' )
+    lines.append( 'INDEX = {' )
+    lines.extend( '    %r: %d,'%( name, index[name] ) for name in sorted( index ))
+    lines.append( '}' )
+    # submodules the sources import, which the eager import left bound
+    submodules = sorted([
+        name for name, value in vars( module ).items()
+        if type(value) is type(sys) and value.__name__ == '%s.%s'%( package, name )
+        and not name.startswith( '_' )
+    ])
+    lines.append( 'SUBMODULES = (' )
+    lines.extend( '    %r,'%( name, ) for name in submodules )
+    lines.append( ')' )
+    path = '%s/_index.py'%( module.__path__[0], )
+    with open( path, 'w' ) as output:
+        output.write( '\n'.join( lines )+'\n' )
+    return path, len(index)
+
+PACKAGES = ('OpenGL.GL', 'OpenGL.GLU', 'OpenGL.GLUT')
+
+if __name__ == "__main__":
+    for package in PACKAGES:
+        path, count = writeIndex( package )
+        print( '%s: %d names'%( path, count ))
@@ -2,49 +2,171 @@
 
 We keep rewriting functions as the main entry points change,
 so let's just localise the changes here...
+
+Library names are resolved with ctypes.util.find_library, which on most
+platforms imports subprocess and friends and runs an external tool
+(ldconfig, gcc...) per library, in every process.  The results are kept
+in a small versioned cache file (see LibraryCache), so a process which
+finds everything it needs there never imports ctypes.util at all.
 """
-import ctypes, logging, os, sys
+import ctypes, logging, marshal, os, sys
 _log = logging.getLogger( 'OpenGL.platform.ctypesloader' )
 #_log.setLevel( logging.DEBUG )
 ctypes_version = [
     int(x) for x in ctypes.__version__.split('.')
 ]
-from ctypes import util
 import OpenGL
 
 DLL_DIRECTORY = os.path.join( os.path.dirname( OpenGL.__file__ ), 'DLLS' )
 
+class LibraryCache( object ):
+    """Persistent cache of library name resolutions
+
+    The file is read (in one read) the first time a library is loaded, and
+    written back whenever a library had to be resolved the slow way.  Its
+    key covers everything resolution depends on: the cache format, the
+    PyOpenGL and Python versions, the platform, the environment variables
+    the loaders search and the modification time of the system's shared
+    library cache.  If any of them changed the whole cache is dropped, and
+    a cached name which then fails to load is resolved again.
+
+    PYOPENGL_LIBRARY_CACHE names the file to use, an empty value disables
+    the cache.
+    """
+    VERSION = 1
+    ENVIRONMENT = (
+        'PYOPENGL_PLATFORM',
+        'LD_LIBRARY_PATH',
+        'DYLD_LIBRARY_PATH',
+        'DYLD_FALLBACK_LIBRARY_PATH',
+    )
+    SYSTEM_CACHES = (
+        '/etc/ld.so.cache',
+        '/var/run/ld.so.hints',
+        '/var/run/ld-elf.so.hints',
+    )
+    def __init__( self, path ):
+        self.path = path
+        self.entries = None
+    @classmethod
+    def defaultPath( cls ):
+        """Path of the cache file, None if the cache is disabled"""
+        path = os.environ.get( 'PYOPENGL_LIBRARY_CACHE' )
+        if path is not None:
+            return path or None
+        base = os.environ.get( 'XDG_CACHE_HOME' ) or os.path.join(
+            os.path.expanduser( '~' ), '.cache'
+        )
+        return os.path.join( base, 'pyopengl', 'libraries.marshal' )
+    def key( self ):
+        """Everything a cached resolution depends upon"""
+        environment = tuple([os.environ.get( name ) for name in self.ENVIRONMENT])
+        if os.name == 'nt':
+            environment += (os.environ.get( 'PATH' ),)
+        systemCaches = []
+        for path in self.SYSTEM_CACHES:
+            try:
+                systemCaches.append( os.stat( path ).st_mtime )
+            except OSError:
+                systemCaches.append( None )
+        return (
+            self.VERSION, OpenGL.__version__, tuple(sys.version_info[:2]),
+            marshal.version, sys.platform, os.name,
+            environment, tuple(systemCaches),
+        )
+    def load( self ):
+        """Read the cache file, if it is there and current"""
+        self.entries = {}
+        try:
+            with open( self.path, 'rb' ) as cacheFile:
+                key, entries = marshal.loads( cacheFile.read() )
+        except Exception:
+            return
+        if key == self.key() and isinstance( entries, dict ):
+            self.entries = entries
+    def lookup( self, name ):
+        """Return (found, fullName) for name, fullName may be None"""
+        if self.entries is None:
+            self.load()
+        if name in self.entries:
+            return True, self.entries[name]
+        return False, None
+    def store( self, name, fullName ):
+        """Record fullName for name and write out the cache file"""
+        if self.entries is None:
+            self.load()
+        self.entries[name] = fullName
+        temporary = '%s.%s'%( self.path, os.getpid() )
+        try:
+            directory = os.path.dirname( self.path )
+            if directory and not os.path.isdir( directory ):
+                os.makedirs( directory )
+            # replace the file whole, so concurrent readers see either
+            # the old cache or the new one, never a partial write
+            with open( temporary, 'wb' ) as cacheFile:
+                cacheFile.write( marshal.dumps( (self.key(), self.entries) ))
+            os.replace( temporary, self.path )
+        except Exception as err:
+            _log.info( '''Unable to write library cache %r: %s''', self.path, err )
+    def discard( self, name ):
+        """Forget a cached resolution which didn't load"""
+        if self.entries is not None:
+            self.entries.pop( name, None )
+
+_libraryCache = None
+def libraryCache( ):
+    """The process' LibraryCache, None if it is disabled"""
+    global _libraryCache
+    if _libraryCache is None:
+        path = LibraryCache.defaultPath()
+        _libraryCache = LibraryCache( path ) if path else False
+    return _libraryCache or None
+
+def findLibrary( name ):
+    """Resolve a short library name to the name to load, None if not found"""
+    from ctypes import util
+    try:
+        fullName = util.find_library( name )
+        if fullName is None and os.path.isfile( os.path.join( DLL_DIRECTORY, name + '.dll' )):
+            fullName = os.path.join( DLL_DIRECTORY, name + '.dll' )
+        return fullName
+    except Exception as err:
+        _log.info( '''Failed on util.find_library( %r ): %s''', name, err )
+        # Should the call fail, we just try to load the base filename...
+        return None
+
 def loadLibrary( dllType, name, mode = ctypes.RTLD_GLOBAL ):
     """Load a given library by name with the given mode
-    
+
     dllType -- the standard ctypes pointer to a dll type, such as
-        ctypes.cdll or ctypes.windll or the underlying ctypes.CDLL or 
+        ctypes.cdll or ctypes.windll or the underlying ctypes.CDLL or
         ctypes.WinDLL classes.
     name -- a short module name, e.g. 'GL' or 'GLU'
     mode -- ctypes.RTLD_GLOBAL or ctypes.RTLD_LOCAL,
         controls whether the module resolves names via other
         modules already loaded into this process.  GL modules
         generally need to be loaded with GLOBAL flags
-    
+
     returns the ctypes C-module object
     """
     if isinstance( dllType, ctypes.LibraryLoader ):
         dllType = dllType._dlltype
-    fullName = None
-    try:
-        fullName = util.find_library( name )
-        if fullName is not None:
-            name = fullName
-        elif os.path.isfile( os.path.join( DLL_DIRECTORY, name + '.dll' )):
-            name = os.path.join( DLL_DIRECTORY, name + '.dll' )
-    except Exception as err:
-        _log.info( '''Failed on util.find_library( %r ): %s''', name, err )
-        # Should the call fail, we just try to load the base filename...
-        pass
+    cache = libraryCache()
+    if cache is not None:
+        found, fullName = cache.lookup( name )
+        if found:
+            try:
+                return dllType( fullName or name, mode )
+            except Exception:
+                # stale entry (library moved or removed), resolve again
+                cache.discard( name )
+    fullName = findLibrary( name )
+    if cache is not None:
+        cache.store( name, fullName )
     try:
-        return dllType( name, mode )
+        return dllType( fullName or name, mode )
     except Exception as err:
-        err.args += (name,fullName)
+        err.args += (fullName or name,fullName)
         raise
 
 def buildFunction( functionType, name, dll ):
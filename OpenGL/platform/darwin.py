@@ -21,7 +21,7 @@ Documentation and header files are found in:
 /System/Library/Frameworks/GLUT.framework
 
 """
-import ctypes, ctypes.util
+import ctypes
 from OpenGL.platform import baseplatform, ctypesloader
 
 class DarwinPlatform( baseplatform.BasePlatform ):
@@ -1,5 +1,5 @@
 """EGL (cross-platform) platform library"""
-import ctypes, ctypes.util
+import ctypes
 from OpenGL.platform import baseplatform, ctypesloader
 
 class EGLPlatform( baseplatform.BasePlatform ):
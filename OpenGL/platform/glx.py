@@ -1,5 +1,5 @@
 """GLX (x-windows)-specific platform features"""
-import ctypes, ctypes.util
+import ctypes
 from functools import wraps
 from OpenGL.platform import baseplatform, ctypesloader
 
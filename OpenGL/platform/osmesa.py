@@ -6,7 +6,7 @@ To request an OSMesa context, you need to run your script with:
 
 defined in your shell/execution environment.
 """
-import ctypes, ctypes.util
+import ctypes
 from OpenGL.platform import baseplatform, ctypesloader
 from OpenGL.constant import Constant
 from OpenGL.raw.osmesa import _types
@@ -45,14 +45,21 @@ def _defineType( name, baseType, convertFunc = long ):
     if do_wrapping:
         original = baseType.from_param
         if not getattr( original, 'from_param_numpy_scalar', False ):
+            # classes (numpy scalar types) which have to be converted,
+            # so that each only raises and catches a TypeError once
+            converted = set()
             def from_param( x, typeCode=None ):
+                if x.__class__ in converted:
+                    return original( convertFunc(x) )
                 try:
                     return original( x )
                 except TypeError as err:
                     try:
-                        return original( convertFunc(x) )
+                        result = original( convertFunc(x) )
                     except TypeError as err2:
                         raise err
+                    converted.add( x.__class__ )
+                    return result
             from_param = staticmethod( from_param )
             setattr( baseType, 'from_param', from_param )
             baseType.from_param_numpy_scalar = True
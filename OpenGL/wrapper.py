@@ -40,6 +40,167 @@ def none_or_pass( incoming, function, arguments ):
     return incoming
 none_or_pass.optional=True
 
+# markers for the cConverter slots of a call shape, other slots hold the
+# index of the Python argument passed straight through (DefaultCConverter)
+CALL_SLOT = 'call'
+CONSTANT_SLOT = 'constant'
+
+_CALL_FACTORIES = {}
+def _callFactory( shape ):
+    """Compile (once per shape) a factory for specialised wrapperCall functions
+
+    shape -- (pyShape, cShape, cResolverShape, hasStoreValues, hasReturnValues)
+        as calculated by Wrapper.finaliseCall
+
+    The factory takes the wrapper, the wrapped operation, storeValues,
+    returnValues, the three generic calculators and then every non-trivial
+    converter in slot order, and returns the wrapperCall closed over them.
+    """
+    factory = _CALL_FACTORIES.get( shape )
+    if factory is None:
+        namespace = {'ctypes': ctypes, 'error': error, 'NULL': NULL}
+        exec( compile( _callSource( shape ), '<wrapperCall %r>'%(shape,), 'exec' ), namespace )
+        factory = _CALL_FACTORIES[shape] = namespace['factory']
+    return factory
+
+def _callSource( shape ):
+    """Generate the source of the factory for the given call shape
+
+    Every converter gets a try of its own which adds the same annotation to
+    its exception as the generic calculators do, so a failing call never runs
+    a converter twice.  The generic calculators are only called when there
+    are too few arguments, before any converter has run, to raise their error.
+    """
+    pyShape, cShape, cResolverShape, hasStoreValues, hasReturnValues = shape
+    bound = []
+    body = []
+    if pyShape is not None:
+        required, slots = pyShape
+        steps = []
+        items = []
+        for index, optional in enumerate( slots ):
+            item = 'a%d'%(index,)
+            items.append( item )
+            if optional is None:
+                steps.append( '%s = args[%d]'%(item, index) )
+                continue
+            name = 'py%d'%(index,)
+            bound.append( name )
+            call = '%s( args[%d], self, args )'%(name, index)
+            if index >= required:
+                # only optional arguments may be left off
+                call = '%s if len( args ) > %d else NULL'%(call, index)
+            steps.extend([
+                'try:',
+                '    %s = %s'%(item, call),
+                'except IndexError:',
+                '    %s = NULL'%(item,),
+                'except Exception as err:',
+                '    if hasattr( err, \'args\' ):',
+                '        err.args += ( %s, )'%(name,),
+                '    raise',
+            ])
+        steps.append( 'pyArgs = (%s,)'%(', '.join( items ),) )
+        body.append( 'if len( args ) < %d:'%(required,) )
+        body.append( '    pyArgs = tuple( calculate_pyArgs( args ))' )
+        body.append( 'else:' )
+        body.extend( '    '+step for step in steps )
+    else:
+        body.append( 'pyArgs = args' )
+    if cShape is not None:
+        steps = []
+        items = []
+        for index, slot in enumerate( cShape ):
+            name = 'c%d'%(index,)
+            if slot == CALL_SLOT:
+                bound.append( name )
+                item = 'b%d'%(index,)
+                items.append( item )
+                steps.extend([
+                    'try:',
+                    '    %s = %s( pyArgs, %d, self )'%(item, name, index),
+                    'except Exception as err:',
+                    '    if hasattr( err, \'args\' ):',
+                    '        err.args += (',
+                    '            """Failure in cConverter %%r"""%%(%s),'%(name,),
+                    '            pyArgs, %d, self,'%(index,),
+                    '        )',
+                    '    raise',
+                ])
+            elif slot == CONSTANT_SLOT:
+                bound.append( name )
+                items.append( name )
+            else:
+                items.append( 'pyArgs[%d]'%(slot,) )
+        steps.append( 'cArgs = (%s,)'%(', '.join( items ),) )
+        passed = [slot for slot in cShape if slot not in (CALL_SLOT, CONSTANT_SLOT)]
+        if pyShape is None and passed:
+            # pyArgs are the caller's own arguments, which may be too few
+            body.append( 'if len( pyArgs ) <= %d:'%(max( passed ),) )
+            body.append( '    cArgs = tuple( calculate_cArgs( pyArgs ))' )
+            body.append( 'else:' )
+            body.extend( '    '+step for step in steps )
+        else:
+            body.extend( steps )
+    else:
+        body.append( 'cArgs = pyArgs' )
+    if cResolverShape is not None:
+        steps = []
+        items = []
+        for index, resolve in enumerate( cResolverShape ):
+            if resolve:
+                name = 'r%d'%(index,)
+                bound.append( name )
+                item = 'd%d'%(index,)
+                items.append( item )
+                steps.extend([
+                    'try:',
+                    '    %s = %s( cArgs[%d] )'%(item, name, index),
+                    'except Exception as err:',
+                    '    err.args += (%s,)'%(name,),
+                    '    raise',
+                ])
+            else:
+                items.append( 'cArgs[%d]'%(index,) )
+        steps.append( 'cArguments = (%s,)'%(', '.join( items ),) )
+        if cShape is None:
+            # cArgs may still be the caller's own arguments
+            body.append( 'if len( cArgs ) < %d:'%(len( cResolverShape ),) )
+            body.append( '    cArguments = tuple( calculate_cArguments( cArgs ))' )
+            body.append( 'else:' )
+            body.extend( '    '+step for step in steps )
+        else:
+            body.extend( steps )
+    else:
+        body.append( 'cArguments = cArgs' )
+    body.extend([
+        'try:',
+        '    result = wrappedOperation( *cArguments )',
+        'except ctypes.ArgumentError as err:',
+        '    err.args = err.args + (cArguments,)',
+        '    raise err',
+        'except error.GLError as err:',
+        '    err.cArgs = cArgs',
+        '    err.pyArgs = pyArgs',
+        '    raise err',
+    ])
+    if hasStoreValues:
+        # handle storage of persistent argument values...
+        body.append( 'storeValues( result, self, pyArgs, cArgs )' )
+    if hasReturnValues:
+        body.append( 'return returnValues( result, self, pyArgs, cArgs )' )
+    else:
+        body.append( 'return result' )
+    lines = [
+        'def factory( self, wrappedOperation, storeValues, returnValues, calculate_pyArgs, calculate_cArgs, calculate_cArguments%s ):'%(
+            ''.join( ', '+name for name in bound ),
+        ),
+        '    def wrapperCall( *args ):',
+    ]
+    lines.extend( '        '+line for line in body )
+    lines.append( '    return wrapperCall' )
+    return '\n'.join( lines )+'\n'
+
 class Wrapper( LateBind ):
     """Wrapper around a ctypes cFunction object providing SWIG-like hooks
 
@@ -213,7 +374,7 @@ class Wrapper( LateBind ):
                     # special case, we will convert to a void * array...
                     self.setPyConverter( 
                         argName,
-                        converters.CallFuncPyConverter( arraydatatype.ArrayDatatype.asArray )
+                        arrayhelpers.asArrayType( arraydatatype.ArrayDatatype )
                     )
                     self.setCConverter( argName, converters.getPyArgsName( argName ) )
                     return self
@@ -395,10 +556,13 @@ class Wrapper( LateBind ):
         """Produce specialised versions of call for finalised wrapper object
 
         This returns a version of __call__ that only does that work which is
-        required by the particular wrapper object
+        required by the particular wrapper object.
 
-        This is essentially a huge set of expanded nested functions, very
-        inelegant...
+        Without OpenGL_accelerate the call is generated as straight-line
+        Python (see _callFactory), with each converter applied by index and
+        the slots which need no conversion reduced to plain indexing.  The
+        generic calculate_* generators below only raise the errors for
+        calls with too few arguments.
         """
         pyConverters = getattr( self, 'pyConverters', None )
         cConverters = getattr( self, 'cConverters', None )
@@ -492,892 +656,55 @@ class Wrapper( LateBind ):
                 storeValues=storeValues,
                 returnValues=returnValues,
             )
+        # the shape of the call decides the generated source, the converters
+        # themselves are only bound into it, so wrappers of the same shape
+        # share one compiled factory
+        bound = []
         if pyConverters:
-            if cConverters:
-                # create a map of index,converter, callable
-                if cResolvers:
-                    if storeValues:
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all possible operations"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = tuple(calculate_cArgs( pyArgs ))
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = tuple(calculate_cArgs( pyArgs ))
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return result
-                            return wrapperCall
-                    else: # null storeValues
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save storeValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = tuple(calculate_cArgs( pyArgs ))
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues and storeValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = tuple(calculate_cArgs( pyArgs ))
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return result
-                            return wrapperCall
-                else:
-                    # null cResolvers
-                    if storeValues:
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all possible operations"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = tuple(calculate_cArgs( pyArgs ))
-                                cArguments = cArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = tuple(calculate_cArgs( pyArgs ))
-                                cArguments = cArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return result
-                            return wrapperCall
-                    else: # null storeValues
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save storeValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = tuple(calculate_cArgs( pyArgs ))
-                                cArguments = cArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues and storeValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = tuple(calculate_cArgs( pyArgs ))
-                                cArguments = cArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return result
-                            return wrapperCall
-            else:
-                # null cConverters
-                if cResolvers:
-                    if storeValues:
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all possible operations"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = pyArgs
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = pyArgs
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return result
-                            return wrapperCall
-                    else: # null storeValues
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save storeValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = pyArgs
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues and storeValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArgs = pyArgs
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return result
-                            return wrapperCall
+            pyShape = []
+            for converter in pyConverters:
+                if converter is None:
+                    pyShape.append( None )
                 else:
-                    # null cResolvers
-                    if storeValues:
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all possible operations"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArguments = pyArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArguments
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArguments,
-                                )
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArguments,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArguments = pyArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArguments
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArguments,
-                                )
-                                return result
-                            return wrapperCall
-                    else: # null storeValues
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save storeValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArguments = pyArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArguments
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArguments,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues and storeValues"""
-                                pyArgs = tuple( calculate_pyArgs( args ))
-                                cArguments = pyArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArguments
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return result
-                            return wrapperCall
+                    pyShape.append( bool(getattr( converter, 'optional', False )) )
+                    bound.append( converter )
+            pyShape = (pyConverters_length, tuple(pyShape))
         else:
-            # null pyConverters
-            if cConverters:
-                if cResolvers:
-                    if storeValues:
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all possible operations"""
-                                pyArgs = args
-                                cArgs = []
-                                for (index,converter) in enumerate( cConverters ):
-                                    # move enumerate out...
-                                    if not hasattr(converter,'__call__'):
-                                        cArgs.append( converter )
-                                    else:
-                                        try:
-                                            cArgs.append(
-                                                converter( pyArgs, index, self )
-                                            )
-                                        except Exception as err:
-                                            if hasattr( err, 'args' ):
-                                                err.args += (
-                                                    """Failure in cConverter %r"""%(converter),
-                                                    pyArgs, index,
-                                                )
-                                            raise
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues"""
-                                pyArgs = args
-                                cArgs = []
-                                for (index,converter) in enumerate( cConverters ):
-                                    # move enumerate out...
-                                    if not hasattr(converter,'__call__'):
-                                        cArgs.append( converter )
-                                    else:
-                                        try:
-                                            cArgs.append(
-                                                converter( pyArgs, index, self )
-                                            )
-                                        except Exception as err:
-                                            if hasattr( err, 'args' ):
-                                                err.args += (
-                                                    """Failure in cConverter %r"""%(converter),
-                                                    pyArgs, index,
-                                                )
-                                            raise
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return result
-                            return wrapperCall
-                    else: # null storeValues
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save storeValues"""
-                                pyArgs = args
-                                cArgs = []
-                                for (index,converter) in enumerate( cConverters ):
-                                    # move enumerate out...
-                                    if not hasattr(converter,'__call__'):
-                                        cArgs.append( converter )
-                                    else:
-                                        try:
-                                            cArgs.append(
-                                                converter( pyArgs, index, self )
-                                            )
-                                        except Exception as err:
-                                            if hasattr( err, 'args' ):
-                                                err.args += (
-                                                    """Failure in cConverter %r"""%(converter),
-                                                    pyArgs, index,
-                                                )
-                                            raise
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues and storeValues"""
-                                pyArgs = args
-                                cArgs = []
-                                for (index,converter) in enumerate( cConverters ):
-                                    # move enumerate out...
-                                    if not hasattr(converter,'__call__'):
-                                        cArgs.append( converter )
-                                    else:
-                                        try:
-                                            cArgs.append(
-                                                converter( pyArgs, index, self )
-                                            )
-                                        except Exception as err:
-                                            if hasattr( err, 'args' ):
-                                                err.args += (
-                                                    """Failure in cConverter %r"""%(converter),
-                                                    pyArgs, index,
-                                                )
-                                            raise
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return result
-                            return wrapperCall
+            pyShape = None
+        if cConverters:
+            cShape = []
+            for converter in cConverters:
+                if isinstance( converter, DefaultCConverter ):
+                    cShape.append( converter.index )
+                elif hasattr( converter, '__call__' ):
+                    cShape.append( CALL_SLOT )
+                    bound.append( converter )
                 else:
-                    # null cResolvers
-                    if storeValues:
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all possible operations"""
-                                pyArgs = args
-                                cArgs = []
-                                for (index,converter) in enumerate( cConverters ):
-                                    # move enumerate out...
-                                    if not hasattr(converter,'__call__'):
-                                        cArgs.append( converter )
-                                    else:
-                                        try:
-                                            cArgs.append(
-                                                converter( pyArgs, index, self )
-                                            )
-                                        except Exception as err:
-                                            if hasattr( err, 'args' ):
-                                                err.args += (
-                                                    """Failure in cConverter %r"""%(converter),
-                                                    pyArgs, index,
-                                                )
-                                            raise
-                                cArguments = cArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues"""
-                                pyArgs = args
-                                cArgs = []
-                                for (index,converter) in enumerate( cConverters ):
-                                    # move enumerate out...
-                                    if not hasattr(converter,'__call__'):
-                                        cArgs.append( converter )
-                                    else:
-                                        try:
-                                            cArgs.append(
-                                                converter( pyArgs, index, self )
-                                            )
-                                        except Exception as err:
-                                            if hasattr( err, 'args' ):
-                                                err.args += (
-                                                    """Failure in cConverter %r"""%(converter),
-                                                    pyArgs, index,
-                                                )
-                                            raise
-                                cArguments = cArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                                return result
-                            return wrapperCall
-                    else: # null storeValues
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save storeValues"""
-                                pyArgs = args
-                                cArgs = []
-                                for (index,converter) in enumerate( cConverters ):
-                                    # move enumerate out...
-                                    if not hasattr(converter,'__call__'):
-                                        cArgs.append( converter )
-                                    else:
-                                        try:
-                                            cArgs.append(
-                                                converter( pyArgs, index, self )
-                                            )
-                                        except Exception as err:
-                                            if hasattr( err, 'args' ):
-                                                err.args += (
-                                                    """Failure in cConverter %r"""%(converter),
-                                                    pyArgs, index,
-                                                )
-                                            raise
-                                cArguments = cArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return returnValues(
-                                    result,
-                                    self,
-                                    pyArgs,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues and storeValues"""
-                                pyArgs = args
-                                cArgs = []
-                                for (index,converter) in enumerate( cConverters ):
-                                    # move enumerate out...
-                                    if not hasattr(converter,'__call__'):
-                                        cArgs.append( converter )
-                                    else:
-                                        try:
-                                            cArgs.append(
-                                                converter( pyArgs, index, self )
-                                            )
-                                        except Exception as err:
-                                            if hasattr( err, 'args' ):
-                                                err.args += (
-                                                    """Failure in cConverter %r"""%(converter),
-                                                    pyArgs, index,
-                                                )
-                                            raise
-                                cArguments = cArgs
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = pyArgs
-                                    raise err
-                                return result
-                            return wrapperCall
-            else:
-                # null cConverters
-                if cResolvers:
-                    if storeValues:
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all possible operations"""
-                                cArgs = args
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = args
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    args,
-                                    cArgs,
-                                )
-                                return returnValues(
-                                    result,
-                                    self,
-                                    args,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues"""
-                                cArgs = args
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = args
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    args,
-                                    cArgs,
-                                )
-                                return result
-                            return wrapperCall
-                    else: # null storeValues
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save storeValues"""
-                                cArgs = args
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = args
-                                    raise err
-                                return returnValues(
-                                    result,
-                                    self,
-                                    args,
-                                    cArgs,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues and storeValues"""
-                                cArgs = args
-                                cArguments = tuple(calculate_cArguments( cArgs ))
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArgs
-                                    err.pyArgs = args
-                                    raise err
-                                return result
-                            return wrapperCall
+                    cShape.append( CONSTANT_SLOT )
+                    bound.append( converter )
+            cShape = tuple(cShape)
+        else:
+            cShape = None
+        if cResolvers:
+            cResolverShape = []
+            for converter in cResolvers:
+                if converter is None:
+                    cResolverShape.append( False )
                 else:
-                    # null cResolvers
-                    if storeValues:
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all possible operations"""
-                                cArguments = args
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArguments
-                                    err.pyArgs = args
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    args,
-                                    cArguments,
-                                )
-                                return returnValues(
-                                    result,
-                                    self,
-                                    args,
-                                    cArguments,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues"""
-                                cArguments = args
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArguments
-                                    err.pyArgs = args
-                                    raise err
-                                # handle storage of persistent argument values...
-                                storeValues(
-                                    result,
-                                    self,
-                                    args,
-                                    cArguments,
-                                )
-                                return result
-                            return wrapperCall
-                    else: # null storeValues
-                        if returnValues:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save storeValues"""
-                                cArguments = args
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArguments
-                                    err.pyArgs = args
-                                    raise err
-                                return returnValues(
-                                    result,
-                                    self,
-                                    args,
-                                    cArguments,
-                                )
-                            return wrapperCall
-                        else:
-                            def wrapperCall( *args ):
-                                """Wrapper with all save returnValues and storeValues"""
-                                cArguments = args
-                                try:
-                                    result = wrappedOperation( *cArguments )
-                                except ctypes.ArgumentError as err:
-                                    err.args = err.args + (cArguments,)
-                                    raise err
-                                except error.GLError as err:
-                                    err.cArgs = cArguments
-                                    err.pyArgs = args
-                                    raise err
-                                return result
-                            return wrapperCall
+                    cResolverShape.append( True )
+                    bound.append( converter )
+            cResolverShape = tuple(cResolverShape)
+        else:
+            cResolverShape = None
+        factory = _callFactory(
+            (pyShape, cShape, cResolverShape, storeValues is not None, returnValues is not None)
+        )
+        return factory(
+            self, wrappedOperation, storeValues, returnValues,
+            calculate_pyArgs, calculate_cArgs, calculate_cArguments,
+            *bound
+        )
+
 #    def __call__( self, *args, **named ):
 #        """Finalise the wrapper before calling it"""
 #        try:
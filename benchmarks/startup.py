@@ -0,0 +1,266 @@
+"""Startup cost benchmarks for the OpenGL package
+
+Measures, each in fresh interpreters so nothing is already imported:
+
+  * wall time to import OpenGL.GL, GLU, GLUT, GLES2 and EGL (min and
+    median of --repeat runs, after one discarded run that compiles the
+    bytecode)
+  * peak memory of the import, as traced Python allocations (tracemalloc)
+    and as growth of the process' maximum resident set size
+  * a per-module breakdown, from the interpreter's own import-time hooks
+    (python -X importtime), largest self time first
+  * first-call latency of a sample of functions of each namespace: looking
+    the name up, then each piece of work deferred to the first call, as
+    OpenGL.warmup() would do it (see OpenGL.finalisation.pendingWork).
+    The C function itself is never called, as there is no context to call
+    it in, and so only work which doesn't need one is measured.
+
+Results are written as JSON (to stdout, or --output) for regression
+tracking, e.g.:
+
+    python benchmarks/startup.py --output startup.json
+    python benchmarks/startup.py --target OpenGL.GL --repeat 20
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+# module: (environment it needs, sample of functions for first-call timing)
+TARGETS = {
+    'OpenGL.GL': ({}, (
+        'glClear', 'glClearColor', 'glVertex3f', 'glGetIntegerv',
+        'glGenTextures', 'glTexImage2D', 'glGenBuffers', 'glBufferData',
+        'glShaderSource', 'glUniformMatrix4fv', 'glVertexAttribPointer',
+        'glDrawElements',
+    )),
+    'OpenGL.GLU': ({}, (
+        'gluPerspective', 'gluLookAt', 'gluNewQuadric', 'gluProject',
+        'gluErrorString',
+    )),
+    'OpenGL.GLUT': ({}, (
+        'glutInit', 'glutCreateWindow', 'glutDisplayFunc',
+        'glutBitmapCharacter', 'glutSwapBuffers',
+    )),
+    'OpenGL.GLES2': ({}, (
+        'glClear', 'glGenBuffers', 'glBufferData', 'glShaderSource',
+        'glUniformMatrix4fv', 'glVertexAttribPointer', 'glDrawElements',
+    )),
+    'OpenGL.EGL': ({'PYOPENGL_PLATFORM': 'egl'}, (
+        'eglGetDisplay', 'eglInitialize', 'eglChooseConfig',
+        'eglCreateContext', 'eglMakeCurrent',
+    )),
+}
+
+### CHILD PROCESSES ###
+
+# Run with python -c rather than as this script, so that nothing but the
+# target shows up in the import-time breakdown; the marker on stderr
+# separates the target's imports from the interpreter's own startup.
+IMPORT_CHILD = """
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+module, traceMemory = sys.argv[2], sys.argv[3] == '1'
+try:
+    import resource
+except ImportError:
+    resource = None
+def maxRss():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == 'darwin' else rss
+if traceMemory:
+    import tracemalloc
+    tracemalloc.start()
+before = maxRss()
+sys.stderr.write('%s\\n' % sys.argv[4])
+sys.stderr.flush()
+start = time.perf_counter()
+__import__(module)
+result = {'seconds': time.perf_counter() - start}
+if before is not None:
+    result['maxrssGrowthKB'] = maxRss() - before
+if traceMemory:
+    result['tracedPeakKB'] = tracemalloc.get_traced_memory()[1] / 1024.0
+json.dump(result, sys.stdout)
+"""
+IMPORT_MARKER = '--- benchmark import starts ---'
+
+def childCalls(module, names):
+    """Time the first-call work of names in module"""
+    start = time.perf_counter()
+    namespace = importlib.import_module(module)
+    from OpenGL import finalisation
+    results = {'importSeconds': time.perf_counter() - start, 'functions': {}}
+    for name in names:
+        start = time.perf_counter()
+        try:
+            function = getattr(namespace, name)
+        except AttributeError:
+            results['functions'][name] = {'error': 'not found'}
+            continue
+        entry = {'lookupSeconds': time.perf_counter() - start, 'stages': []}
+        for stage, target, prepare in finalisation.pendingWork(function):
+            start = time.perf_counter()
+            try:
+                prepare()
+            except Exception as err:
+                entry['error'] = '%s: %s' % (type(err).__name__, err)
+                break
+            entry['stages'].append({
+                'stage': stage,
+                'object': type(target).__name__,
+                'seconds': time.perf_counter() - start,
+            })
+        entry['totalSeconds'] = entry['lookupSeconds'] + sum(
+            stage['seconds'] for stage in entry['stages']
+        )
+        results['functions'][name] = entry
+    return results
+
+### PARENT PROCESS ###
+
+def runChild(arguments, environment, interpreterOptions=()):
+    """Run this script in a fresh interpreter, return (result, stderr)"""
+    command = [sys.executable] + list(interpreterOptions) + [os.path.abspath(__file__)] + arguments
+    return runCommand(command, environment)
+
+def runImport(module, environment, traceMemory=False, interpreterOptions=()):
+    """Import module in a fresh interpreter, return (result, stderr)"""
+    command = [sys.executable] + list(interpreterOptions) + [
+        '-c', IMPORT_CHILD, ROOT, module, '1' if traceMemory else '0', IMPORT_MARKER,
+    ]
+    return runCommand(command, environment)
+
+def runCommand(command, environment):
+    """Run command, return (its JSON output, its stderr)"""
+    completed = subprocess.run(
+        command, cwd=ROOT, env=environment,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True,
+    )
+    if (completed.returncode != 0):
+        lines = completed.stderr.strip().splitlines() or ['exit status %d' % completed.returncode]
+        raise RuntimeError(lines[-1])
+    return json.loads(completed.stdout), completed.stderr
+
+def parseImportTime(output):
+    """Parse python -X importtime output into a list of module records"""
+    modules = []
+    if (IMPORT_MARKER in output):
+        output = output.split(IMPORT_MARKER, 1)[1]
+    for line in output.splitlines():
+        if (not line.startswith('import time:') or 'self [us]' in line):
+            continue
+        selfTime, cumulative, name = line[len('import time:'):].split('|', 2)
+        modules.append({
+            'module': name.strip(),
+            'selfSeconds': int(selfTime) / 1e6,
+            'cumulativeSeconds': int(cumulative) / 1e6,
+        })
+    return modules
+
+def summarise(samples):
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'max': max(samples),
+        'runs': len(samples),
+    }
+
+def benchmark(module, environment, names, repeat, top):
+    """Measure one target, return its JSON record"""
+    record = {}
+    try:
+        # compiles and caches the bytecode, so every measured run is alike
+        runImport(module, environment)
+        samples = [runImport(module, environment)[0] for _ in range(repeat)]
+    except RuntimeError as err:
+        return {'error': str(err)}
+    record['importSeconds'] = summarise([sample['seconds'] for sample in samples])
+    if ('maxrssGrowthKB' in samples[0]):
+        record['maxrssGrowthKB'] = summarise([sample['maxrssGrowthKB'] for sample in samples])
+    memory, _ = runImport(module, environment, traceMemory=True)
+    record['tracedPeakKB'] = memory['tracedPeakKB']
+
+    _, importTime = runImport(module, environment, interpreterOptions=('-X', 'importtime'))
+    modules = parseImportTime(importTime)
+    record['modulesImported'] = len(modules)
+    record['packageSelfSeconds'] = packageTotals(modules)
+    record['slowestModules'] = sorted(
+        modules, key=lambda entry: entry['selfSeconds'], reverse=True,
+    )[:top]
+
+    if (names):
+        calls, _ = runChild(['--child-calls', module] + list(names), environment)
+        record['firstCall'] = calls['functions']
+    return record
+
+def packageTotals(modules):
+    """Self time grouped by the first two components of the module name"""
+    totals = {}
+    for entry in modules:
+        package = '.'.join(entry['module'].split('.')[:2])
+        totals[package] = totals.get(package, 0.0) + entry['selfSeconds']
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure OpenGL import and first-call cost')
+    parser.add_argument('--target', action='append', choices=sorted(TARGETS),
+                        help='namespace to measure (repeatable, default all)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='timed import runs per target')
+    parser.add_argument('--top', type=int, default=25,
+                        help='modules to list in the per-module breakdown')
+    parser.add_argument('--function', action='append', dest='functions',
+                        help='function to time the first call of, instead of the samples')
+    parser.add_argument('--output', help='write the JSON here instead of stdout')
+    parser.add_argument('--child-calls', help=argparse.SUPPRESS)
+    parser.add_argument('names', nargs='*', help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if (ROOT not in sys.path):
+        sys.path.insert(0, ROOT)
+    if (options.child_calls):
+        json.dump(childCalls(options.child_calls, options.names), sys.stdout)
+        return
+
+    import OpenGL
+    report = {
+        'timestamp': time.time(),
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'pyopengl': OpenGL.__version__,
+        'repeat': options.repeat,
+        'targets': {},
+    }
+    for module in options.target or list(TARGETS):
+        extraEnvironment, samples = TARGETS[module]
+        environment = dict(os.environ)
+        for key, value in extraEnvironment.items():
+            environment.setdefault(key, value)
+        environment['PYTHONPATH'] = os.pathsep.join(
+            filter(None, [ROOT, environment.get('PYTHONPATH')])
+        )
+        report['targets'][module] = benchmark(
+            module, environment, options.functions or samples,
+            max(options.repeat, 1), options.top,
+        )
+    if (options.output):
+        with open(options.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+if __name__ == '__main__':
+    main()
@@ -6,17 +6,36 @@
 ## Controls: ##
 # Arrow Keys # Control lander
 #          R # Restart game
+#          Z # Rewind (hold)
 
+import argparse
+import asyncio
+import csv
+import socket
+import struct
 import sys
+import types
 
 # OpenGL module used for rendering graphics
+import OpenGL
 from OpenGL.GLUT import *
 from OpenGL.GLU  import *
 from OpenGL.GL   import *
+from OpenGL.GL   import shaders
+from OpenGL.GL.VERSION.GL_3_1 import glDrawArraysInstanced, glTexBuffer, GL_TEXTURE_BUFFER
 
 import math
+import os
+import queue
 import random
+import threading
+import time
 
+import numpy
+
+from array import array
+from collections import Counter, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from copy import copy
 from enum import Enum, IntEnum
 
@@ -27,6 +46,7 @@ class PostGameState(Enum):
     sideways = 3
     missedLandingArea = 4
     starting = 5 # just easy to put this in here.. isn't really a post game state
+    collided = 6 # hit another lander (arena mode)
 
 class SpecialKey(IntEnum):
     left = 100
@@ -34,11 +54,123 @@ class SpecialKey(IntEnum):
     right = 102
 
 class Vector2:
+    __slots__ = ('x', 'y')
+
     def __init__(self, x, y):
         self.x = x
         self.y = y
 
-class Lander:    
+# a named convex polygon, vertices in local coordinates (y up) listed clockwise
+LanderPart = namedtuple('LanderPart', 'name vertices')
+
+# where a lander first touched the ground, and with which part of its hull
+Contact = namedtuple('Contact', 'part x y')
+
+# terrain as arrays for the collision tests: points is the surface polyline,
+# shaped (segments + 1, 2) and sorted by x. normals is the upward normal n of
+# every segment and offsets is n.start for each, see buildTerrain().
+# Several terrains can be laid end to end in one, see stackTerrains(): terrain
+# i is then moved right by i * stride, and the landing area fields are arrays
+# with one entry per terrain.
+Terrain = namedtuple('Terrain', 'points normals offsets landingX landingY landingWidth stride')
+
+# a Vector2 that lives inside a flat array('d'), see Lander.state
+class ArrayVector2:
+    __slots__ = ('values', 'offset')
+
+    def __init__(self, values, offset):
+        self.values = values
+        self.offset = offset
+
+    @property
+    def x(self):
+        return self.values[self.offset]
+
+    @x.setter
+    def x(self, value):
+        self.values[self.offset] = value
+
+    @property
+    def y(self):
+        return self.values[self.offset + 1]
+
+    @y.setter
+    def y(self, value):
+        self.values[self.offset + 1] = value
+
+# a scalar attribute stored at a fixed index of obj.state
+class StateField:
+    __slots__ = ('index', 'cast')
+
+    def __init__(self, index, cast=float):
+        self.index = index
+        self.cast = cast
+
+    def __get__(self, obj, objtype=None):
+        if obj is None: return self
+        return self.cast(obj.state[self.index])
+
+    def __set__(self, obj, value):
+        obj.state[self.index] = value
+
+# xorshift64* generator with the random.Random interface (randint, uniform, ...).
+# Its whole state is a single 64 bit integer, where the default Mersenne Twister
+# has 625 words, so it is cheap enough to record every tick for rewinding.
+# gauss() isn't used by the game, so gauss_next isn't part of the state.
+class SimulationRandom(random.Random):
+    mask = 0xFFFFFFFFFFFFFFFF
+
+    def seed(self, a=None, version=2):
+        if a is None:
+            a = int.from_bytes(os.urandom(8), 'little')
+        elif not isinstance(a, int):
+            a = hash(a)
+        # scramble the seed (splitmix64) so that nearby seeds, like consecutive
+        # episode numbers, start far apart. The state must never be 0
+        a = (a + 0x9E3779B97F4A7C15) & self.mask
+        a = ((a ^ (a >> 30)) * 0xBF58476D1CE4E5B9) & self.mask
+        a = ((a ^ (a >> 27)) * 0x94D049BB133111EB) & self.mask
+        self.state = (a ^ (a >> 31)) or 1
+        self.gauss_next = None
+
+    def next64(self):
+        x = self.state
+        x ^= x >> 12
+        x ^= (x << 25) & self.mask
+        x ^= x >> 27
+        self.state = x
+        return (x * 0x2545F4914F6CDD1D) & self.mask
+
+    def random(self):
+        return (self.next64() >> 11) * (1.0 / 9007199254740992.0)
+
+    def getrandbits(self, k):
+        bits = 0
+        for shift in range(0, k, 64):
+            bits |= self.next64() << shift
+        return bits & ((1 << k) - 1)
+
+    def getstate(self):
+        return self.state
+
+    def setstate(self, state):
+        self.state = state
+
+class Lander:
+    # All of the lander's dynamic state lives in one flat array('d'), laid out as
+    # [position x/y, velocity x/y, acceleration x/y, rotation, rotationVelocity,
+    #  fuel, hitGround, visible]
+    # so the rewind buffer can copy it in one slice assignment (and numpy can
+    # wrap it without copying, via numpy.frombuffer(lander.state)).
+    __slots__ = ('state', 'position', 'velocity', 'acceleration')
+    stateSize = 11
+
+    rotation = StateField(6)
+    rotationVelocity = StateField(7)
+    fuel = StateField(8)
+    hitGround = StateField(9, bool)
+    visible = StateField(10, bool)
+
     startingFuel = 80
     fuelConsumptionRate = 10 # fuel consumed per second
     
@@ -48,15 +180,27 @@ class Lander:
     maxLandingVelocity = 40
     maxLandingRotation = 10
 
-    size = Vector2(20, 25)
+    size = Vector2(20, 25) # bounding box of the hull
+
+    # compound convex hull, relative to position before rotation.
+    # Each part has to be convex for the collision test, see hullContacts()
+    hull = (LanderPart('body', ((-8, 12.5), (8, 12.5), (8, -5), (-8, -5))),
+            LanderPart('left leg', ((-8, -5), (-5, -5), (-8, -12.5), (-10, -12.5))),
+            LanderPart('right leg', ((5, -5), (8, -5), (10, -12.5), (8, -12.5))))
     
     def __init__(self):
+        self.state = array('d', bytes(8 * self.stateSize))
+        self.position = ArrayVector2(self.state, 0)
+        self.velocity = ArrayVector2(self.state, 2)
+        self.acceleration = ArrayVector2(self.state, 4)
+
         # default initialization values
-        self.position = Vector2(random.randint(0, glutGet(GLUT_WINDOW_WIDTH)), glutGet(GLUT_WINDOW_HEIGHT)-20)
-        self.velocity = Vector2(random.randint(-20, 20), 0)
-        self.acceleration = Vector2(0, 0)
+        # (the simulation thread must not call into GLUT, so use the cached window size)
+        self.position.x = simulationRandom.randint(0, WINDOW_WIDTH)
+        self.position.y = WINDOW_HEIGHT-20
+        self.velocity.x = simulationRandom.randint(-20, 20)
         
-        self.rotation = random.randint(-20, 20)
+        self.rotation = simulationRandom.randint(-20, 20)
         self.rotationVelocity = 0
         #self.rotationAcceleration = 0
         
@@ -68,15 +212,996 @@ class FuelParticle:
     speed = 3
     defaultLifetime = 1
     defaultSize = 4
-    
-    def __init__(self, x, y):
-        self.position = Vector2(x, y)
-        self.velocity = Vector2(0, 0)
-        self.rotation = 0
-        self.rotationVelocity = 0
-        self.lifetime = 0
-        self.currentLifetime = 0
-        self.size = self.defaultSize
+
+# All the live particles, one row each of an array with the same 8 columns as
+# the rewind state (see captureState()), so a tick of particle physics is a
+# handful of array operations, and saving or restoring them is one copy. The
+# array is column-major, which makes the per-column physics several times faster.
+# Velocities and rotation velocities are per tick, lifetimes in seconds.
+class ParticleSystem:
+    columns = ('x', 'y', 'velocityX', 'velocityY', 'rotation', 'rotationVelocity', 'lifetime', 'currentLifetime')
+
+    restitution = 0.4 # share of the speed into the ground kept when bouncing off it
+    friction = 0.9 # share of the speed along the ground kept on each tick touching it
+
+    def __init__(self, capacity=256):
+        self.data = numpy.zeros((capacity, len(self.columns)), order='F')
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    # view of the live rows
+    def live(self):
+        return self.data[:self.count]
+
+    def clear(self):
+        self.count = 0
+
+    def spawn(self, x, y, velocityX, velocityY, rotation, rotationVelocity, lifetime):
+        if (self.count == len(self.data)):
+            self.reserve(2 * self.count)
+        self.data[self.count] = (x, y, velocityX, velocityY, rotation, rotationVelocity, lifetime, 0)
+        self.count += 1
+
+    def reserve(self, capacity):
+        if (capacity > len(self.data)):
+            data = numpy.zeros((capacity, len(self.columns)), order='F')
+            data[:self.count] = self.live()
+            self.data = data
+
+    # replaces the live particles with rows (anything shaped (count, 8))
+    def load(self, rows):
+        self.reserve(len(rows))
+        self.count = len(rows)
+        self.data[:self.count] = rows
+
+    # one tick. heights is the terrain heightmap (see createTerrain()) to collide
+    # with, or None
+    def step(self, dt, heights):
+        live = self.live()
+        live[:, 0:2] += live[:, 2:4]
+        live[:, 4] += live[:, 5]
+        live[:, 7] += dt
+
+        if (heights is not None and len(heights) > 1):
+            self.collideWithGround(live, heights)
+
+        # remove old particles, keeping the rest in order
+        alive = live[:, 7] <= live[:, 6]
+        if (not alive.all()):
+            kept = live[alive]
+            self.count = len(kept)
+            self.data[:self.count] = kept
+
+    # particles that have gone below the ground are put back on it, and bounce
+    # off it or slide along it, with the slope taken from the heightmap
+    def collideWithGround(self, live, heights):
+        x = live[:, 0]
+        column = numpy.clip(x, 0, len(heights) - 2).astype(numpy.intp)
+        slope = heights[column + 1] - heights[column]
+        ground = heights[column] + slope * numpy.clip(x - column, 0, 1)
+        below = numpy.flatnonzero(live[:, 1] < ground)
+        if (not len(below)):
+            return
+
+        slope = slope[below]
+        length = numpy.sqrt(1 + slope*slope)
+        normalX = -slope / length
+        normalY = 1 / length
+        velocityX = live[below, 2]
+        velocityY = live[below, 3]
+        # split the velocity into the parts into the ground and along it
+        intoGround = velocityX*normalX + velocityY*normalY
+        alongX = velocityX - intoGround*normalX
+        alongY = velocityY - intoGround*normalY
+        intoGround = numpy.where(intoGround < 0, -self.restitution * intoGround, intoGround)
+
+        live[below, 1] = ground[below]
+        live[below, 2] = self.friction*alongX + intoGround*normalX
+        live[below, 3] = self.friction*alongY + intoGround*normalY
+
+# Any number of landers simulated together, one numpy array per attribute
+# (struct of arrays) so that a tick is a fixed number of array operations
+# however many landers there are. Uses the same constants and integration as
+# Lander and update(). outcome holds each lander's PostGameState value,
+# PostGameState.none while it is still flying; landers that have stopped
+# have their velocity and acceleration zeroed so the physics leaves them alone.
+class LanderBatch:
+    def __init__(self, count=0):
+        self.position = numpy.zeros((count, 2))
+        self.velocity = numpy.zeros((count, 2))
+        self.acceleration = numpy.zeros((count, 2))
+        self.rotation = numpy.zeros(count)
+        self.rotationVelocity = numpy.zeros(count)
+        self.fuel = numpy.full(count, float(Lander.startingFuel))
+        self.outcome = numpy.full(count, PostGameState.none.value)
+        self.contactPart = numpy.full(count, -1) # index into landerHull.names
+        self.terrainIndex = numpy.zeros(count, dtype=numpy.intp) # for stacked terrains
+
+    def __len__(self):
+        return len(self.rotation)
+
+    # landers spread over a jittered grid (spacing units apart) stacked up above
+    # the top of the screen, so they don't start out overlapping each other
+    # or the player's lander
+    @classmethod
+    def spawn(cls, count, rng, width, height, spacing=40):
+        batch = cls(count)
+        columns = max(1, int(width // spacing))
+        row, column = numpy.divmod(numpy.arange(count), columns)
+        jitter = (spacing - landerHull.radius*2) / 2
+        batch.position[:, 0] = (column + 0.5) * width / columns + rng.uniform(-jitter, jitter, count)
+        batch.position[:, 1] = height - 20 + (row + 1) * spacing + rng.uniform(-jitter, jitter, count)
+        batch.velocity[:, 0] = rng.integers(-20, 21, count)
+        batch.rotation[:] = rng.integers(-20, 21, count)
+        return batch
+
+    @property
+    def flying(self):
+        return self.outcome == PostGameState.none.value
+
+    # flying or landed, crashed landers aren't drawn
+    @property
+    def visible(self):
+        return (self.outcome == PostGameState.none.value) | (self.outcome == PostGameState.success.value)
+
+    # stop the landers in mask, with the given PostGameState
+    def stop(self, mask, state):
+        self.outcome[mask] = state.value
+        self.velocity[mask] = 0
+        self.acceleration[mask] = 0
+        self.rotationVelocity[mask] = 0
+
+    # one fixed timestep of dt seconds, the batched equivalent of update().
+    # thrust is a bool per lander, turn is -1 (left), 0 or 1 (right)
+    def step(self, dt, thrust, turn, terrain):
+        ### LANDER PHYSICS ###
+        self.position += dt * (self.velocity + dt * self.acceleration / 2)
+        self.velocity += dt * self.acceleration
+        self.rotation += self.rotationVelocity
+
+        # wrap rotation values into [-180, 180)
+        numpy.subtract(numpy.mod(self.rotation + 180, 360), 180, out=self.rotation)
+
+        # wrap landers around screen edges
+        landerMaxEdge = max(Lander.size.x, Lander.size.y)/2
+        x = self.position[:, 0]
+        x[x > WINDOW_WIDTH + landerMaxEdge] = -landerMaxEdge
+        x[x < -landerMaxEdge] = WINDOW_WIDTH + landerMaxEdge
+
+        # blow up landers that somehow get below the terrain
+        self.stop(self.flying & (self.position[:, 1] < 0), PostGameState.missedLandingArea)
+
+        # initialise default lander movement values
+        flying = self.flying
+        self.acceleration[:, 0] = 0
+        self.acceleration[:, 1] = numpy.where(flying, gravity, 0)
+        self.rotationVelocity[:] = 0
+
+        self.collideWithTerrain(terrain)
+
+        ### LANDER CONTROLS ###
+        # set exactly to 0 so UI displays as 0, not -1
+        self.fuel[self.fuel <= 0] = 0
+        # do not accept control if no fuel or touched ground
+        active = self.flying & (self.fuel > 0)
+        thrust = thrust & active
+        turning = (turn != 0) & active
+
+        sin, cos = sinCos(self.rotation)
+        self.acceleration[thrust, 0] = Lander.thrusterStrength * sin[thrust]
+        self.acceleration[thrust, 1] = gravity + Lander.thrusterStrength * cos[thrust]
+        self.rotationVelocity[turning] = numpy.sign(turn[turning]) * Lander.sideThrusterStrength
+        self.fuel -= Lander.fuelConsumptionRate * dt * (thrust + 0.5 * turning)
+
+    # batched doCollisionDetection(): separating axis tests of every flying lander
+    # near the ground against the terrain segments under it, in one go
+    def collideWithTerrain(self, terrain):
+        radius = landerHull.radius
+        terrainX = terrain.points[:, 0]
+        terrainY = terrain.points[:, 1]
+        segmentCount = len(terrainX) - 1
+
+        # the segments overlapping each lander's horizontal extent: a fixed size
+        # window from the first one, masked off past the last one
+        indices = numpy.flatnonzero(self.flying)
+        shift = self.terrainIndex[indices] * terrain.stride
+        x = self.position[indices, 0] + shift
+        first = numpy.clip(terrainX.searchsorted(x - radius, 'right') - 1, 0, segmentCount - 1)
+        last = numpy.clip(terrainX.searchsorted(x + radius, 'left'), 1, segmentCount)
+        window = int(2 * radius // terrainMinXSpacing) + 3
+        segments = numpy.minimum(first[:, None] + numpy.arange(window), segmentCount - 1)
+        inWindow = segments < last[:, None]
+
+        # nothing to do for landers clear above the highest of those points
+        tops = numpy.where(inWindow, numpy.maximum(terrainY[segments], terrainY[segments + 1]), -numpy.inf).max(axis=1)
+        near = self.position[indices, 1] - radius <= tops
+        if (not near.any()):
+            return
+        indices = indices[near]
+        segments = segments[near]
+        inWindow = inWindow[near]
+        position = self.position[indices]
+        position[:, 0] += shift[near]
+
+        # take rotation of landers into account: [lander, part, vertex, xy]
+        vertices = transformPoints(position[:, 0], position[:, 1], -self.rotation[indices], landerHull.vertices[None])
+        normals = transformPoints(0, 0, -self.rotation[indices], landerHull.normals[None])
+
+        # the axis normal to each segment: [lander, part, vertex, segment]
+        depths = terrain.offsets[segments][:, None, None, :] - numpy.einsum('lpvi,lsi->lpvs', vertices, terrain.normals[segments])
+        hits = (depths.max(axis=2) >= 0) & (depths.min(axis=2) <= 0) & inWindow[:, None, :]
+
+        # axes from the hull's own edges, with the segments moved relative to each lander
+        starts = numpy.einsum('lpai,lsi->lpas', normals, terrain.points[segments] - position[:, None, :])
+        ends = numpy.einsum('lpai,lsi->lpas', normals, terrain.points[segments + 1] - position[:, None, :])
+        hits &= ((numpy.maximum(starts, ends) >= landerHull.projectionMin[None, :, :, None]) &
+                 (numpy.minimum(starts, ends) <= landerHull.projectionMax[None, :, :, None])).all(axis=2)
+
+        touching = hits.any(axis=(1, 2))
+        if (not touching.any()):
+            return
+        indices = indices[touching]
+        hits = hits[touching]
+        depths = depths[touching]
+
+        # as in doCollisionDetection(), the leftmost segment touched decides the outcome
+        # and the part reaching deepest below it is the one that touched
+        rows = numpy.arange(len(indices))
+        segment = hits.any(axis=1).argmax(axis=1)
+        partDepths = depths[rows, :, :, segment].max(axis=2)
+        self.contactPart[indices] = numpy.where(hits[rows, :, segment], partDepths, -numpy.inf).argmax(axis=1)
+
+        tooFast = numpy.abs(self.velocity[indices, 1]) > Lander.maxLandingVelocity
+        terrainIndex = self.terrainIndex[indices]
+        missed = terrainX[segments[touching][rows, segment]] != numpy.take(terrain.landingX, terrainIndex)
+        sideways = numpy.abs(self.rotation[indices]) > Lander.maxLandingRotation
+        outcome = numpy.select((tooFast, missed, sideways),
+                               (PostGameState.tooFast.value, PostGameState.missedLandingArea.value, PostGameState.sideways.value),
+                               PostGameState.success.value)
+
+        # lock landed landers onto the ground
+        success = outcome == PostGameState.success.value
+        landed = indices[success]
+        self.rotation[landed] = 0
+        self.position[landed, 1] = numpy.take(terrain.landingY, terrainIndex[success]) + Lander.size.y/2
+        for state in PostGameState:
+            self.stop(indices[outcome == state.value], state)
+
+# Scripted autopilot for a LanderBatch: tilts towards the centre of the landing
+# area (proportional to the distance, damped by horizontal speed), levels out
+# for the final approach, and fires the main thruster whenever descending faster
+# than a target speed that shrinks with height above the ground beneath it.
+# The gains are attributes so they can be tuned, and they can be arrays with
+# one entry per lander, to fly a whole population of controllers at once (see
+# optimizeController()).
+class PDController:
+    # names of the gains, in the order of a parameter vector, and their ranges
+    parameterNames = ('horizontalGain', 'horizontalDamping', 'maxTilt', 'levelHeight', 'descentGain', 'minDescentSpeed')
+    parameterMin = numpy.array((0, 0, 0, 0, 0, 0), dtype=float)
+    parameterMax = numpy.array((1, 3, 60, 150, 1.5, 40), dtype=float)
+
+    def __init__(self, horizontalGain=0.15, horizontalDamping=0.6, maxTilt=25, levelHeight=40,
+                 descentGain=0.3, minDescentSpeed=10):
+        self.horizontalGain = horizontalGain
+        self.horizontalDamping = horizontalDamping
+        self.maxTilt = maxTilt
+        self.levelHeight = levelHeight
+        self.descentGain = descentGain
+        self.minDescentSpeed = minDescentSpeed
+
+    # parameters is a parameter vector, or (landers, parameters) for one controller per lander
+    @classmethod
+    def fromParameters(cls, parameters):
+        parameters = numpy.asarray(parameters, dtype=float)
+        return cls(*(parameters[..., i] for i in range(len(cls.parameterNames))))
+
+    def parameters(self):
+        return numpy.array([getattr(self, name) for name in self.parameterNames], dtype=float)
+
+    # returns (thrust, turn) arrays for LanderBatch.step()
+    def __call__(self, batch, terrain):
+        x = batch.position[:, 0]
+        shift = batch.terrainIndex * terrain.stride
+        height = batch.position[:, 1] - Lander.size.y/2 - numpy.interp(x + shift, terrain.points[:, 0], terrain.points[:, 1])
+
+        offset = (numpy.take(terrain.landingX, batch.terrainIndex) - shift +
+                  numpy.take(terrain.landingWidth, batch.terrainIndex)/2 - x)
+        targetRotation = numpy.clip(self.horizontalGain * offset - self.horizontalDamping * batch.velocity[:, 0],
+                                    -self.maxTilt, self.maxTilt)
+        targetRotation = numpy.where(height < self.levelHeight, 0, targetRotation)
+        error = targetRotation - batch.rotation
+        turn = numpy.where(numpy.abs(error) >= Lander.sideThrusterStrength, numpy.sign(error), 0)
+
+        targetVelocity = -(self.minDescentSpeed + self.descentGain * numpy.maximum(height, 0))
+        thrust = batch.velocity[:, 1] < targetVelocity
+        return thrust, turn
+
+# Autopilot that looks its action up in a precomputed policy table (see
+# solvePolicy()), indexed by the nearest grid point to the lander's state. The
+# grid is over (height above the landing area, horizontal offset from its
+# centre, velocity x, velocity y, rotation, fuel), and each entry is an index
+# into actions. The table is kept as one byte per entry in a .npy file, which
+# is memory-mapped when loaded, so only the pages the landers visit are read.
+class PolicyController:
+    axes = (numpy.array((0, 2, 5, 10, 15, 20, 30, 40, 60, 80, 110, 150, 200, 260, 340, 480), dtype=float),
+            numpy.array((-720, -320, -160, -80, -40, -15, -5, 0, 5, 15, 40, 80, 160, 320, 720), dtype=float),
+            numpy.array((-60, -30, -15, -5, 0, 5, 15, 30, 60), dtype=float),
+            numpy.array((-100, -70, -50, -40, -30, -20, -12, -6, 0, 6, 15, 30), dtype=float),
+            numpy.arange(-40, 41, 10, dtype=float),
+            numpy.array((0, 10, 30, 80), dtype=float))
+    shape = tuple(len(axis) for axis in axes)
+    # (thrust, turn) for each action index
+    actions = ((False, -1), (False, 0), (False, 1), (True, -1), (True, 0), (True, 1))
+
+    # nearest grid point along an axis is found by comparing against the midpoints
+    midpoints = tuple((axis[1:] + axis[:-1]) / 2 for axis in axes)
+    actionThrust = numpy.array([thrust for thrust, turn in actions])
+    actionTurn = numpy.array([turn for thrust, turn in actions])
+
+    def __init__(self, table):
+        if (table.shape != self.shape):
+            raise ValueError("policy table is shaped %s, expected %s (solve it again)" % (table.shape, self.shape))
+        self.table = table.reshape(-1)
+
+    @classmethod
+    def load(cls, path):
+        return cls(numpy.load(path, mmap_mode='r'))
+
+    def save(self, path):
+        numpy.save(path, numpy.asarray(self.table).reshape(self.shape))
+
+    # returns (thrust, turn) arrays for LanderBatch.step()
+    def __call__(self, batch, terrain):
+        shift = batch.terrainIndex * terrain.stride
+        centre = (numpy.take(terrain.landingX, batch.terrainIndex) - shift +
+                  numpy.take(terrain.landingWidth, batch.terrainIndex)/2)
+        state = (batch.position[:, 1] - Lander.size.y/2 - numpy.take(terrain.landingY, batch.terrainIndex),
+                 batch.position[:, 0] - centre,
+                 batch.velocity[:, 0], batch.velocity[:, 1], batch.rotation, batch.fuel)
+        index = numpy.ravel_multi_index([midpoints.searchsorted(values) for midpoints, values in zip(self.midpoints, state)],
+                                        self.shape)
+        action = self.table[index]
+        return self.actionThrust[action], self.actionTurn[action]
+
+# Flies every lander with the controls recorded in a replay (see
+# ReplayRecorder), one row per tick, and lets go once they run out. On the
+# replay's own seed this flies the recorded run again.
+class ReplayController:
+    def __init__(self, controls, seed=None):
+        self.controls = numpy.asarray(controls, dtype=float) # (ticks, 2) of thrust, turn
+        self.seed = seed
+        self.tick = 0
+
+    @classmethod
+    def load(cls, path):
+        with numpy.load(path) as replay:
+            return cls(replay['frames'][:, 3:5], int(replay['seed']))
+
+    # returns (thrust, turn) arrays for LanderBatch.step()
+    def __call__(self, batch, terrain):
+        thrust, turn = self.controls[self.tick] if self.tick < len(self.controls) else (0, 0)
+        self.tick += 1
+        return numpy.full(len(batch), bool(thrust)), numpy.full(len(batch), turn)
+
+### SNAPSHOTS ###
+# The simulation thread publishes an immutable copy of everything the renderer
+# needs after every batch of updates. The render callback only ever reads these,
+# so it never sees a half-updated lander or a particle list being resized.
+LanderSnapshot = namedtuple('LanderSnapshot', 'x y vx vy rotation fuel visible')
+# particles is a (count, 5) array of (x, y, rotation, currentLifetime, lifetime)
+# arena is (positions, rotations) of the visible arena landers,
+# runTick is the number of ticks since the run started (for the ghosts)
+GameSnapshot = namedtuple('GameSnapshot', 'tick lander particles postGameState terrain landingArea stars contact arena runTick')
+
+class SnapshotBuffer:
+    # Double buffer of published snapshots. Only the simulation thread writes,
+    # and swapping the front index is a single (atomic) assignment, so readers
+    # don't need a lock. The previous snapshot is kept around in the back slot.
+    def __init__(self):
+        self.slots = [None, None]
+        self.front = 0
+
+    def publish(self, snapshot):
+        back = 1 - self.front
+        self.slots[back] = snapshot
+        self.front = back
+
+    def latest(self):
+        return self.slots[self.front]
+
+    def previous(self):
+        return self.slots[1 - self.front]
+
+### REWIND ###
+# Every tick the full game state is flattened into a single array('d') (see
+# captureState()) and recorded here. Every keyframeInterval ticks a full copy is
+# stored, the ticks in between only store the values that changed since the
+# previous tick. Whole blocks (a keyframe and its deltas) are dropped from the
+# old end once the buffer goes over its memory budget.
+class RewindBuffer:
+    # rough per-entry overhead of the python objects holding a delta
+    entryOverhead = 64
+
+    def __init__(self, memoryBudget, keyframeInterval):
+        self.memoryBudget = memoryBudget
+        self.keyframeInterval = keyframeInterval
+        self.blocks = deque() # each block is [keyframe, delta, delta, ...]
+        self.blockSizes = deque()
+        self.size = 0
+        # copy of the most recently recorded state, and a spare array to swap with
+        # it, since callers reuse the array they pass to record()
+        self.last = array('d')
+        self.spare = array('d')
+        self.decodedBlock = None # states of the newest block, filled in while scrubbing
+
+    def clear(self):
+        self.blocks.clear()
+        self.blockSizes.clear()
+        self.size = 0
+        del self.last[:]
+        self.decodedBlock = None
+
+    def __len__(self):
+        return sum(len(block) for block in self.blocks)
+
+    # keyframes are plain arrays, deltas are (length, indices, values) tuples
+    def entrySize(self, entry):
+        if (isinstance(entry, array)):
+            return self.entryOverhead + len(entry) * entry.itemsize
+        length, indices, values = entry
+        return self.entryOverhead + len(indices) * indices.itemsize + len(values) * values.itemsize
+
+    def record(self, state):
+        self.decodedBlock = None
+        if (not self.blocks or len(self.blocks[-1]) >= self.keyframeInterval):
+            entry = array('d', state)
+            self.blocks.append([entry])
+            self.blockSizes.append(0)
+        else:
+            entry = diffStates(self.last, state)
+            self.blocks[-1].append(entry)
+
+        entrySize = self.entrySize(entry)
+        self.blockSizes[-1] += entrySize
+
+        self.size += entrySize
+        self.spare[:] = state
+        self.last, self.spare = self.spare, self.last
+
+        # always keep the newest block, even if it alone is over budget
+        while (self.size > self.memoryBudget and len(self.blocks) > 1):
+            self.blocks.popleft()
+            self.size -= self.blockSizes.popleft()
+
+    # drop the newest state and return the one before it,
+    # or None if there is nothing older to go back to
+    def stepBack(self):
+        if (not self.blocks or (len(self.blocks) == 1 and len(self.blocks[0]) == 1)):
+            return None
+
+        if (self.decodedBlock is None):
+            self.decodeNewestBlock()
+
+        entry = self.blocks[-1].pop()
+        self.decodedBlock.pop()
+        entrySize = self.entrySize(entry)
+        self.blockSizes[-1] -= entrySize
+        self.size -= entrySize
+
+        # newest block is used up, continue from the end of the one before it
+        if (not self.blocks[-1]):
+            self.blocks.pop()
+            self.blockSizes.pop()
+            self.decodeNewestBlock()
+
+        # (a copy, record() overwrites self.last in place)
+        self.last = array('d', self.decodedBlock[-1])
+        return self.last
+
+    # replay the newest block from its keyframe once, so that
+    # scrubbing back through it only costs a list pop per tick
+    def decodeNewestBlock(self):
+        block = self.blocks[-1]
+        self.decodedBlock = [block[0]]
+        for delta in block[1:]:
+            self.decodedBlock.append(applyDelta(self.decodedBlock[-1], delta))
+
+### GHOSTS ###
+# A replay is the (x, y, rotation) of the player's lander and the controls
+# held (thrust 0 or 1, turn -1, 0 or 1) on every tick of a run, along with the
+# seed the run started from (see restartGame()). It is saved as an .npz file
+# holding frames, a float32 array shaped (ticks, 5), and seed. Poses are NaN
+# once the lander has exploded, and a replay stops once the lander stops
+# changing. The seed and controls are enough to fly the run again, see
+# ReplayController.
+class ReplayRecorder:
+    columns = 5
+
+    def __init__(self):
+        self.frames = array('f')
+
+    def clear(self):
+        del self.frames[:]
+
+    # runTick counts from 1 on the first tick of the run, so it is recorded in
+    # row runTick - 1; after a rewind it goes back, and whatever was recorded
+    # after it is overwritten
+    def record(self, runTick, lander, thrust, turn):
+        del self.frames[self.columns * (runTick - 1):]
+        if (lander.visible):
+            self.frames.extend((lander.position.x, lander.position.y, lander.rotation, thrust, turn))
+        else:
+            self.frames.extend((math.nan, math.nan, math.nan, thrust, turn))
+
+    def save(self, path, seed):
+        frames = numpy.frombuffer(self.frames, dtype=numpy.float32).reshape(-1, self.columns)
+        # drop the trailing rows that just repeat the final pose
+        poses = frames[:, :3]
+        final = poses[-1]
+        same = ((poses == final) | (numpy.isnan(poses) & numpy.isnan(final))).all(axis=1)
+        changed = numpy.flatnonzero(~same)
+        end = changed[-1] + 2 if len(changed) else 1
+        numpy.savez(path, frames=frames[:end], seed=seed)
+
+# Any number of replays packed back to back into one array, so that the poses of
+# all the ghosts on a tick are gathered with a single numpy.take. Ghosts whose
+# replay is shorter hold their last row, so landed ghosts stay on the pad and
+# exploded ones stay hidden (NaN). The fourth column is padding, see GhostRenderer.
+class GhostReplays:
+    def __init__(self, replays):
+        lengths = numpy.array([len(replay) for replay in replays], dtype=numpy.intp)
+        self.frames = numpy.zeros((lengths.sum(), 4), dtype=numpy.float32)
+        if (len(replays)):
+            self.frames[:, :3] = numpy.concatenate(replays)
+        self.starts = numpy.cumsum(lengths) - lengths
+        self.ends = self.starts + lengths - 1
+        self.poses = numpy.empty((len(replays), 4), dtype=numpy.float32)
+        self.indices = numpy.empty(len(replays), dtype=numpy.intp)
+
+    @classmethod
+    def load(cls, directory):
+        names = sorted(name for name in os.listdir(directory) if name.endswith('.npz'))
+        replays = []
+        for name in names:
+            with numpy.load(os.path.join(directory, name)) as replay:
+                replays.append(replay['frames'][:, :3])
+        return cls(replays)
+
+    def __len__(self):
+        return len(self.starts)
+
+    # (ghosts, 4) array of every ghost's pose on a tick of the run. The array is
+    # reused on the next call. Row k holds runTick k + 1 (see ReplayRecorder),
+    # and before the first tick the ghosts wait on their first row.
+    def posesAt(self, runTick):
+        numpy.minimum(self.starts + max(runTick - 1, 0), self.ends, out=self.indices)
+        return numpy.take(self.frames, self.indices, axis=0, out=self.poses)
+
+### QUALITY GOVERNOR ###
+# Watches the rolling average frame time, and when it goes over the target,
+# trims the least important work one step at a time: particle emission, then
+# star density, then how often the HUD text is redrawn. Once frames are
+# comfortably under the target again the steps are undone in reverse order.
+# Every change is kept in interventions.
+Intervention = namedtuple('Intervention', 'time frameTime setting value')
+
+class QualityGovernor:
+    # (setting, the step applied while trimming, limit)
+    steps = (('particleEmission', 0.5, 0.125),
+             ('starDensity', 0.5, 0.125),
+             ('textRefreshInterval', 2, 16))
+    defaults = {'particleEmission': 1.0, 'starDensity': 1.0, 'textRefreshInterval': 1}
+
+    restoreThreshold = 0.7 # undo a step when frames take less than this share of the target
+
+    def __init__(self, targetFrameTime, window=30, report=None):
+        self.targetFrameTime = targetFrameTime # seconds
+        self.frameTimes = deque(maxlen=window)
+        self.lastFrame = None
+        self.interventions = []
+        self.report = report
+        for setting, value in self.defaults.items():
+            setattr(self, setting, value)
+
+    def rollingFrameTime(self):
+        return sum(self.frameTimes) / len(self.frameTimes) if self.frameTimes else 0
+
+    # called by the renderer as each frame is finished
+    def frameFinished(self, now):
+        if (self.lastFrame is not None):
+            self.frameTimes.append(now - self.lastFrame)
+        self.lastFrame = now
+        if (len(self.frameTimes) < self.frameTimes.maxlen):
+            return
+
+        frameTime = self.rollingFrameTime()
+        if (frameTime > self.targetFrameTime):
+            for setting, step, limit in self.steps:
+                value = getattr(self, setting)
+                if ((value > limit) if step < 1 else (value < limit)):
+                    self.intervene(now, frameTime, setting, value * step)
+                    return
+        elif (frameTime < self.targetFrameTime * self.restoreThreshold):
+            for setting, step, limit in reversed(self.steps):
+                value = getattr(self, setting)
+                if (value != self.defaults[setting]):
+                    self.intervene(now, frameTime, setting, type(step)(value / step))
+                    return
+
+    def intervene(self, now, frameTime, setting, value):
+        setattr(self, setting, value)
+        intervention = Intervention(now, frameTime, setting, value)
+        self.interventions.append(intervention)
+        if (self.report is not None):
+            self.report(intervention)
+        # judge the change on frames drawn after it
+        self.frameTimes.clear()
+
+### SPECTATORS ###
+# An optional asyncio server streams the published snapshots to spectators on
+# localhost (TCP or a Unix socket). The simulation thread only drops the newest
+# snapshot into a single slot and wakes the server's loop, so a spectator can
+# never hold up the game. Every spectator is sent the newest snapshot once it
+# has drained the last one; anything published in between is coalesced into it
+# (the particles are sent in full each frame, and the lander only as the fields
+# that changed since that spectator's previous frame).
+#
+# Each frame is a uint32 length followed by a uint8 flags and a uint32 tick,
+# then the sections the flags list, in this order:
+#   frameTerrain   - uint16 point count, the points and the landing area (x, y, width) as float32
+#   frameLander    - uint8 mask of the landerFields that changed, then each of them as float32
+#   frameParticles - uint32 count, then particleRecord records
+#   frameArena     - uint32 count, then arenaRecord records
+# A frame with the terrain in it is a key frame: the lander is sent in full.
+# Positions are quantized to 1/16 of a unit and rotations to 1/64 of a degree.
+frameLength = struct.Struct('<I')
+frameHeader = struct.Struct('<BI')
+frameCount = struct.Struct('<I')
+frameTerrain = 1
+frameLander = 2
+frameParticles = 4
+frameArena = 8
+
+landerFields = LanderSnapshot._fields + ('postGameState',)
+particleRecord = numpy.dtype([('x', '<i2'), ('y', '<i2'), ('rotation', '<i2'), ('life', 'u1')])
+arenaRecord = numpy.dtype([('x', '<i2'), ('y', '<i2'), ('rotation', '<i2')])
+positionScale = 16
+rotationScale = 64
+
+def quantize(values, scale):
+    return numpy.clip(numpy.rint(values * scale), -32768, 32767)
+
+def encodeParticles(particles):
+    records = numpy.empty(len(particles), particleRecord)
+    records['x'] = quantize(particles[:, 0], positionScale)
+    records['y'] = quantize(particles[:, 1], positionScale)
+    records['rotation'] = quantize(particles[:, 2] % 360, rotationScale)
+    records['life'] = numpy.clip(particles[:, 3] / particles[:, 4] * 255, 0, 255)
+    return frameCount.pack(len(records)) + records.tobytes()
+
+def encodeArena(arena):
+    positions, rotations = arena
+    records = numpy.empty(len(positions), arenaRecord)
+    records['x'] = quantize(positions[:, 0], positionScale)
+    records['y'] = quantize(positions[:, 1], positionScale)
+    records['rotation'] = quantize(rotations, rotationScale)
+    return frameCount.pack(len(records)) + records.tobytes()
+
+def encodeTerrain(terrain, landingArea):
+    points = numpy.array(terrain, '<f4').reshape(-1, 2)
+    return struct.pack('<H', len(points)) + points.tobytes() + numpy.array(landingArea, '<f4').tobytes()
+
+def landerValues(snapshot):
+    return tuple(snapshot.lander) + (snapshot.postGameState.value,)
+
+class SpectatorEncoder:
+    # per spectator, remembers what that spectator was last sent
+    def __init__(self):
+        self.terrain = None
+        self.lander = None
+
+    # sections is (particles, arena), encoded once per snapshot for everyone
+    def encode(self, snapshot, sections):
+        flags = frameParticles | frameArena
+        parts = []
+        values = landerValues(snapshot)
+        if (snapshot.terrain is not self.terrain):
+            self.terrain = snapshot.terrain
+            self.lander = None
+            flags |= frameTerrain
+            parts.append(encodeTerrain(snapshot.terrain, snapshot.landingArea))
+        mask = 0
+        for index, value in enumerate(values):
+            if (self.lander is None or self.lander[index] != value):
+                mask |= 1 << index
+        if (mask):
+            flags |= frameLander
+            changed = [value for index, value in enumerate(values) if mask & (1 << index)]
+            parts.append(struct.pack('<B%df' % len(changed), mask, *changed))
+        self.lander = values
+        parts.extend(sections)
+        frame = frameHeader.pack(flags, snapshot.tick) + b''.join(parts)
+        return frameLength.pack(len(frame)) + frame
+
+class SpectatorDecoder:
+    # rebuilds GameSnapshots from a stream, for the viewer (stars are its own)
+    def __init__(self, stars):
+        self.stars = stars
+        self.terrain = ()
+        self.landingArea = (0, 0, 0)
+        self.lander = [0.0] * len(landerFields)
+
+    def decode(self, frame):
+        flags, tick = frameHeader.unpack_from(frame)
+        offset = frameHeader.size
+        if (flags & frameTerrain):
+            count, = struct.unpack_from('<H', frame, offset)
+            offset += 2
+            points = numpy.frombuffer(frame, '<f4', count * 2 + 3, offset)
+            offset += points.nbytes
+            self.terrain = tuple(map(tuple, points[:-3].reshape(-1, 2).tolist()))
+            self.landingArea = tuple(points[-3:].tolist())
+        if (flags & frameLander):
+            mask = frame[offset]
+            offset += 1
+            for index in range(len(landerFields)):
+                if (mask & (1 << index)):
+                    self.lander[index], = struct.unpack_from('<f', frame, offset)
+                    offset += 4
+        particles = numpy.zeros((0, 5))
+        if (flags & frameParticles):
+            count, = frameCount.unpack_from(frame, offset)
+            records = numpy.frombuffer(frame, particleRecord, count, offset + frameCount.size)
+            offset += frameCount.size + records.nbytes
+            particles = numpy.empty((count, 5))
+            particles[:, 0] = records['x'] / positionScale
+            particles[:, 1] = records['y'] / positionScale
+            particles[:, 2] = records['rotation'] / rotationScale
+            particles[:, 3] = records['life'] / 255
+            particles[:, 4] = 1
+        arena = (numpy.zeros((0, 2)), numpy.zeros(0))
+        if (flags & frameArena):
+            count, = frameCount.unpack_from(frame, offset)
+            records = numpy.frombuffer(frame, arenaRecord, count, offset + frameCount.size)
+            offset += frameCount.size + records.nbytes
+            arena = (numpy.stack((records['x'], records['y']), axis=1) / positionScale,
+                     records['rotation'] / rotationScale)
+        lander = LanderSnapshot(*self.lander[:-2], bool(self.lander[-2]))
+        return GameSnapshot(tick, lander, particles, PostGameState(int(self.lander[-1])),
+                            self.terrain, self.landingArea, self.stars, None, arena, 0)
+
+# "PORT" or "HOST:PORT" for TCP (on localhost unless HOST says otherwise),
+# and anything with a / in it is the path of a Unix socket
+def parseSpectatorAddress(text):
+    if ('/' in text):
+        return text
+    host, _, port = text.rpartition(':')
+    return (host or '127.0.0.1', int(port))
+
+class Spectator:
+    def __init__(self):
+        self.ready = asyncio.Event()
+        self.frames = 0
+        self.coalesced = 0
+
+class SpectatorServer:
+    bufferLimit = 64 * 1024 # bytes queued for a spectator before it counts as slow
+
+    def __init__(self, address):
+        self.address = address
+        self.loop = None
+        self.spectators = set()
+        self.offered = None
+        self.wakeScheduled = False
+        self.latest = None
+        self.sections = (None, None)
+        self.started = threading.Event()
+        self.error = None
+
+    # raises OSError if the address can't be listened on
+    def start(self):
+        thread = threading.Thread(target=asyncio.run, args=(self.serve(),), name='spectators', daemon=True)
+        thread.start()
+        self.started.wait()
+        if (self.error is not None):
+            raise self.error
+        return thread
+
+    async def serve(self):
+        try:
+            if (isinstance(self.address, str)):
+                server = await asyncio.start_unix_server(self.serveSpectator, self.address)
+            else:
+                server = await asyncio.start_server(self.serveSpectator, *self.address)
+        except OSError as error:
+            self.error = error
+            self.started.set()
+            return
+        self.loop = asyncio.get_running_loop()
+        self.started.set()
+        async with server:
+            await server.serve_forever()
+
+    # called on the simulation thread; never blocks, whatever the spectators do
+    def offer(self, snapshot):
+        self.offered = snapshot
+        if (self.loop is not None and not self.wakeScheduled):
+            self.wakeScheduled = True
+            self.loop.call_soon_threadsafe(self.wake)
+
+    def wake(self):
+        # clear the flag before reading the slot, so a snapshot offered
+        # after this read always schedules another wake
+        self.wakeScheduled = False
+        self.latest = self.offered
+        for spectator in self.spectators:
+            spectator.ready.set()
+
+    def sectionsFor(self, snapshot):
+        if (self.sections[0] is not snapshot):
+            self.sections = (snapshot, (encodeParticles(snapshot.particles), encodeArena(snapshot.arena)))
+        return self.sections[1]
+
+    async def serveSpectator(self, reader, writer):
+        writer.transport.set_write_buffer_limits(high=self.bufferLimit)
+        spectator = Spectator()
+        encoder = SpectatorEncoder()
+        self.spectators.add(spectator)
+        sent = None
+        if (self.latest is not None):
+            spectator.ready.set()
+        try:
+            while True:
+                await spectator.ready.wait()
+                spectator.ready.clear()
+                snapshot = self.latest
+                if (snapshot is sent):
+                    continue
+                if (sent is not None):
+                    spectator.coalesced += max(0, snapshot.tick - sent.tick - 1)
+                writer.write(encoder.encode(snapshot, self.sectionsFor(snapshot)))
+                spectator.frames += 1
+                sent = snapshot
+                # a slow spectator waits here while newer snapshots pile up
+                # in the single slot, and is sent just the newest one
+                await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            self.spectators.discard(spectator)
+            writer.close()
+
+def connectSpectator(address):
+    if (isinstance(address, str)):
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        connection = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    connection.connect(address)
+    return connection
+
+# the reference viewer: reads frames on a thread of its own and publishes them
+# as snapshots, in place of the simulation, for the usual renderer to draw
+def watchSpectatorStream(connection, decoder):
+    stream = connection.makefile('rb')
+    while True:
+        header = stream.read(frameLength.size)
+        if (len(header) < frameLength.size):
+            break
+        length, = frameLength.unpack(header)
+        frame = stream.read(length)
+        if (len(frame) < length):
+            break
+        snapshots.publish(decoder.decode(frame))
+    print("spectator stream closed")
+
+### TELEMETRY ###
+# With --telemetry, the player's lander is logged every tick as fixed size
+# binary records with no header, so a log (even one still being written) can be
+# read back with numpy.memmap(path, telemetryRecord, mode='r'). Records are
+# collected in batches on the simulation thread, and the full batches are
+# written out by a thread of its own. The log is closed once glutMainLoop()
+# returns when the window is closed (see main()), which needs freeglut; with
+# another GLUT the process exits in the loop and the batch being collected
+# (under a second of it) is lost.
+telemetryRecord = numpy.dtype([('tick', '<u4'), ('runTick', '<u4'),
+                               ('x', '<f4'), ('y', '<f4'), ('vx', '<f4'), ('vy', '<f4'),
+                               ('ax', '<f4'), ('ay', '<f4'), ('rotation', '<f4'), ('rotationVelocity', '<f4'),
+                               ('fuel', '<f4'), ('thrust', 'i1'), ('turn', 'i1'),
+                               ('flags', 'u1'), ('postGameState', 'u1')])
+telemetryHitGround = 1
+telemetryVisible = 2
+
+class TelemetryLog:
+    batchSize = 64 # records, just under a second of ticks
+
+    def __init__(self, path):
+        self.file = open(path, 'ab')
+        self.batch = numpy.zeros(self.batchSize, telemetryRecord)
+        self.count = 0
+        self.spare = [] # written batches, to be reused
+        self.batches = queue.Queue()
+        self.thread = threading.Thread(target=self.writeBatches, name='telemetry', daemon=True)
+        self.thread.start()
+
+    # called on the simulation thread after every tick
+    def record(self, tick, runTick, lander, thrust, turn, postGameState):
+        flags = (telemetryHitGround if lander.hitGround else 0) | (telemetryVisible if lander.visible else 0)
+        self.batch[self.count] = (tick, runTick, *lander.state[:9], thrust, turn, flags, postGameState.value)
+        self.count += 1
+        if (self.count == self.batchSize):
+            self.flush()
+
+    def flush(self):
+        if (self.count):
+            self.batches.put((self.batch, self.count))
+            self.batch = self.spare.pop() if self.spare else numpy.zeros(self.batchSize, telemetryRecord)
+            self.count = 0
+
+    def writeBatches(self):
+        while True:
+            batch, count = self.batches.get()
+            if (batch is None):
+                break
+            self.file.write(batch[:count].tobytes())
+            self.spare.append(batch)
+        self.file.close()
+
+    # writes out what has been recorded and waits for the writer to finish
+    def close(self):
+        self.flush()
+        self.batches.put((None, 0))
+        self.thread.join()
+
+### INPUT LATENCY ###
+# Measures how long a key press takes to reach the screen: from the keyboard
+# callback, through the update that consumes it and the snapshot published
+# after that update, to the glutSwapBuffers() of the first frame drawn from a
+# snapshot that has it. (The swap returns once the frame is queued, so the
+# display's own scan out isn't included.) Presses are matched to frames by
+# time rather than by tick, as rewinding moves the tick backwards.
+class InputLatency:
+    bucketWidth = 0.005 # seconds
+    bucketCount = 40 # the last bucket collects everything slower
+
+    def __init__(self):
+        self.pending = deque() # (publish time, press time), in publish order
+        self.histogram = [0] * self.bucketCount
+        self.samples = 0
+        self.total = 0
+        self.worst = 0
+        self.reported = 0
+
+    # called on the simulation thread just after a snapshot is published
+    def published(self, pressTimes):
+        now = time.perf_counter()
+        for pressTime in pressTimes:
+            self.pending.append((now, pressTime))
+
+    # called by the renderer after the swap, with the time it took its snapshot
+    def presented(self, frameStart, now):
+        while (self.pending and self.pending[0][0] <= frameStart):
+            _, pressTime = self.pending.popleft()
+            self.record(now - pressTime)
+
+    def record(self, latency):
+        self.histogram[min(int(latency / self.bucketWidth), self.bucketCount - 1)] += 1
+        self.samples += 1
+        self.total += latency
+        self.worst = max(self.worst, latency)
+
+    def report(self):
+        lines = ["input latency: %d presses, mean %.1f ms, worst %.1f ms" %
+                 (self.samples, self.total / max(self.samples, 1) * 1000, self.worst * 1000)]
+        peak = max(self.histogram)
+        for bucket, count in enumerate(self.histogram):
+            if (count):
+                low = bucket * self.bucketWidth * 1000
+                label = "%3d+    ms" % low if bucket == self.bucketCount - 1 else \
+                        "%3d-%-3d ms" % (low, low + self.bucketWidth * 1000)
+                lines.append("  %s %5d %s" % (label, count, '#' * max(1, round(count * 40 / peak))))
+        return "\n".join(lines)
 
 ### GLOBALS ###
 
@@ -91,7 +1216,17 @@ aspectRatio = DEFAULT_WINDOW_WIDTH / DEFAULT_WINDOW_HEIGHT # dynamically changed
 
 postGameState = PostGameState.starting
 
-keysDown = {}
+keysDown = {} # owned by the simulation thread, fed from inputEvents
+
+# keyboard callbacks push (keyCode, isDown, time) events here and the simulation
+# thread drains it at the start of every update. deque.append/popleft are atomic,
+# so neither side ever blocks on the other.
+inputEvents = deque()
+inputLatency = InputLatency()
+consumedPresses = [] # times of the presses consumed since the last snapshot
+latencyReport = False # print the input latency histogram (see main())
+latencyReportInterval = 10
+lastLatencyReport = 0
 
 terrainMinHeight = 20
 terrainMaxHeight = 400
@@ -100,6 +1235,9 @@ terrainVariationY = 10 # higher numbers create more rocky terrain
 terrainMinXSpacing = 12
 terrainMaxXSpacing = 15
 terrainPoints = [] # dynamic array that stores the current terrain map
+terrainSnapshot = () # immutable copy of terrainPoints for the renderer
+terrain = None # Terrain built from terrainPoints, for the collision tests
+terrainHeights = None # terrain height at every whole x, for the particles
 
 landingAreaPosition = Vector2(0,0) # top-left coordinate of the landing area
 landingAreaWidth = 0
@@ -107,85 +1245,384 @@ landingAreaWidth = 0
 landingAreaMinAdditionalWidth = 10 
 landingAreaMaxAdditionalWidth = 40
 
+landerContact = None # Contact recorded when the lander hit the ground
+
 gravity = -30
 
 numStars = 300
+targetFrameTime = 1 / 30 # seconds, see QualityGovernor
+governor = QualityGovernor(targetFrameTime)
+
+# stress test mode (see main()): entity counts scaled up by these, and the
+# frame times reported every stressReportInterval seconds
+particlesPerRelease = 1
+particleRelease = 0 # fractions of a particle carried over to the next release
+stressMode = False
+stressLandersPerMultiple = 100
+stressReportInterval = 2
+lastStressReport = 0
 stars = []
+starsSnapshot = ()
 
-fuelParticles = []
+fuelParticles = ParticleSystem()
 lastFuelParticle = 0 # counter used to time the release of fuel particles
                      # (see update() function)
 
 fuelBarWidth = 20
 fuelBarHeight = 200
 
+# arena mode: arenaSize extra landers flown by arenaController, colliding with
+# the terrain, each other and the player. Set from the command line, see main()
+arenaSize = 0
+arenaController = PDController()
+landers = LanderBatch()
+
+snapshots = SnapshotBuffer()
+simulationTick = 0
+
+# the simulation and the renderer each get their own generator: the renderer's
+# random flicker must not disturb the (recorded, rewindable) simulation sequence
+simulationRandom = SimulationRandom()
+renderRandom = numpy.random.default_rng()
+
+# sin/cos of every whole degree: rotations only ever step by whole
+# degrees (sideThrusterStrength, particle rotationVelocity)
+sinTable = numpy.sin(numpy.radians(numpy.arange(360)))
+cosTable = numpy.cos(numpy.radians(numpy.arange(360)))
+
+# directions from the centre to each corner of a rectangle, in the order
+# top-left, top-right, bottom-right, bottom-left
+rectangleCornerSigns = numpy.array([[-1, 1], [1, 1], [1, -1], [-1, -1]], dtype=float)
+
+rewindKey = b'z'
+rewindMemoryBudget = 8 * 1024 * 1024 # bytes
+rewindKeyframeInterval = 60 # ticks
+rewindBuffer = RewindBuffer(rewindMemoryBudget, rewindKeyframeInterval)
+stateBuffer = array('d') # reused by captureState() every tick
+
+# ghost replays: with a ghost directory set (see main()), every finished run is
+# saved into it, and the runs already in it are drawn along with the player
+ghostDirectory = None
+runStartTick = 0
+runSeed = 0 # see restartGame()
+replayRecorder = ReplayRecorder()
+ghostReplays = GhostReplays([])
+ghostRenderer = None # GhostRenderer, once there is a GL context
+
+spectatorServer = None # SpectatorServer, with --spectate
+telemetryLog = None # TelemetryLog, with --telemetry
+
 ### SOME HELPER FUNCTIONS ###
 # w2r: converts world coordinates to render coordinates
-def w2r(coordinates):
+# pass out to write the result into an existing Vector2 instead of allocating one
+def w2r(coordinates, out=None):
     windowWidth = glutGet(GLUT_WINDOW_WIDTH)
     windowHeight = glutGet(GLUT_WINDOW_HEIGHT)
     x = aspectRatio*(2*(coordinates.x / windowWidth) - 1)
     y = 2*(coordinates.y / windowHeight) - 1
-    return Vector2(x, y)
-
-def rotateAround(point, origin, angle):
-    angle = math.radians(angle) # convert angle to radians
-
-    diff = Vector2(point.x - origin.x, point.y - origin.y)
-    trans = Vector2(diff.x * math.cos(angle) - diff.y * math.sin(angle),
-                    diff.x * math.sin(angle) + diff.y * math.cos(angle))
-
-    point.x = origin.x + trans.x
-    point.y = origin.y + trans.y
-
+    if out is None:
+        return Vector2(x, y)
+    out.x = x
+    out.y = y
+    return out
+
+# vectorized w2r for an array of world coordinates, shaped (..., 2)
+def w2rArray(points):
+    windowWidth = glutGet(GLUT_WINDOW_WIDTH)
+    windowHeight = glutGet(GLUT_WINDOW_HEIGHT)
+    return points * (2*aspectRatio / windowWidth, 2 / windowHeight) - (aspectRatio, 1)
+
+# sin and cos of angles in degrees, from the lookup tables when they are all
+# whole degrees (which they normally are). Takes and returns either plain
+# numbers or arrays.
+def sinCos(angles):
+    if (isinstance(angles, (int, float))):
+        if (angles == int(angles)):
+            index = int(angles) % 360
+            return float(sinTable[index]), float(cosTable[index])
+        angles = math.radians(angles)
+        return math.sin(angles), math.cos(angles)
+
+    angles = numpy.asarray(angles, dtype=float)
+    wholeAngles = numpy.rint(angles)
+    if (numpy.array_equal(wholeAngles, angles)):
+        indices = wholeAngles.astype(numpy.intp) % 360
+        return sinTable[indices], cosTable[indices]
+    angles = numpy.radians(angles)
+    return numpy.sin(angles), numpy.cos(angles)
+
+# Transform kernel shared by collision detection and rendering: rotates local
+# points by angle degrees and moves them to (x, y), for any number of bodies in
+# one go. x, y and angle are scalars or 1D arrays with one entry per body, points
+# is shaped (bodies or 1, ..., 2). Returns an array shaped (bodies, ..., 2).
+def transformPoints(x, y, angle, points):
+    points = numpy.asarray(points, dtype=float)
+    bodyShape = (-1,) + (1,) * (points.ndim - 2)
+    x = numpy.atleast_1d(x).reshape(bodyShape)
+    y = numpy.atleast_1d(y).reshape(bodyShape)
+    sin, cos = sinCos(numpy.atleast_1d(angle))
+    sin = sin.reshape(bodyShape)
+    cos = cos.reshape(bodyShape)
+
+    pointsX = points[..., 0]
+    pointsY = points[..., 1]
+    transformed = numpy.empty(numpy.broadcast_shapes(pointsX.shape, x.shape, sin.shape) + (2,))
+    transformed[..., 0] = x + pointsX*cos - pointsY*sin
+    transformed[..., 1] = y + pointsX*sin + pointsY*cos
+    return transformed
+
+# rotated corners of any number of rectangles centred on (x, y), shaped
+# (bodies, 4, 2), corners ordered top-left, top-right, bottom-right, bottom-left
+# before rotation
+def transformRectangles(x, y, halfWidth, halfHeight, angle):
+    halfSizes = numpy.stack(numpy.broadcast_arrays(numpy.atleast_1d(halfWidth), numpy.atleast_1d(halfHeight)), -1)
+    return transformPoints(x, y, angle, rectangleCornerSigns * halfSizes[:, None, :])
+
+# Hull.vertices and Hull.normals are shaped (parts, vertices, 2), parts with
+# fewer vertices than the largest are padded by repeating their last vertex
+# (which gives a zero normal, an axis everything overlaps on).
+# projectionMin/Max are each part's extent along its own edge normals, which
+# doesn't change when the hull is moved or rotated, so it is worked out once.
+# radius is the distance of the furthest vertex from the origin.
+Hull = namedtuple('Hull', 'names vertices normals projectionMin projectionMax radius')
+
+def buildHull(parts):
+    vertexCount = max(len(part.vertices) for part in parts)
+    vertices = numpy.array([part.vertices + (part.vertices[-1],) * (vertexCount - len(part.vertices))
+                            for part in parts], dtype=float)
+    edges = numpy.roll(vertices, -1, axis=1) - vertices
+    normals = numpy.stack((-edges[..., 1], edges[..., 0]), -1)
+    # projections[part, axis, vertex]
+    projections = numpy.einsum('pai,pvi->pav', normals, vertices)
+    return Hull(tuple(part.name for part in parts), vertices, normals,
+                projections.min(axis=2), projections.max(axis=2),
+                float(numpy.hypot(vertices[..., 0], vertices[..., 1]).max()))
+
+landerHull = buildHull(Lander.hull)
+# vertex indices splitting each (convex) hull part into a triangle fan
+hullFanIndices = numpy.array([(0, i, i + 1) for i in range(1, landerHull.vertices.shape[1] - 1)]).ravel()
+
+# Separating axis test of every part of a hull (placed at x, y and rotated by
+# angle degrees) against every segment of a polyline, all in one set of array
+# operations. points is the polyline, shaped (segments + 1, 2), segmentNormals
+# and segmentOffsets are each segment's normal n and n.start (see
+# createTerrain()). Returns (hits, vertices, depths): hits is a (parts, segments)
+# bool array, vertices the hull in world coordinates and
+# depths[part, vertex, segment] how far each vertex is below each segment.
+def hullContacts(hull, x, y, angle, points, segmentNormals, segmentOffsets):
+    # the test is done with the hull at the origin (so only its rotation matters,
+    # and that comes from a cache) and the polyline moved instead
+    vertices, normals = rotatedHull(hull, angle)
+    position = numpy.array((x, y))
+
+    # the axis normal to each segment: the hull has to straddle the segment's line
+    depths = (segmentOffsets - segmentNormals @ position) - vertices @ segmentNormals.T # [part, vertex, segment]
+    hits = (depths.max(axis=1) >= 0) & (depths.min(axis=1) <= 0)
+
+    # axes from the hull's own edges, only needed if that found anything
+    # (which it rarely does, so most ticks stop here)
+    if (hits.any()):
+        projections = normals @ (points - position).T # [part, axis, point]
+        startProjections = projections[..., :-1]
+        endProjections = projections[..., 1:]
+        hits &= ((numpy.maximum(startProjections, endProjections) >= hull.projectionMin[..., None]) &
+                 (numpy.minimum(startProjections, endProjections) <= hull.projectionMax[..., None])).all(axis=1)
+
+    return hits, vertices + position, depths
+
+# (vertices, normals) of a hull rotated by angle degrees. Rotations are normally
+# whole degrees, so there are at most 360 of these per hull, kept in rotatedHulls.
+rotatedHulls = {}
+
+def rotatedHull(hull, angle):
+    key = (id(hull), angle)
+    rotated = rotatedHulls.get(key)
+    if rotated is None:
+        sin, cos = sinCos(angle)
+        rotation = numpy.array(((cos, sin), (-sin, cos)))
+        rotated = (hull.vertices @ rotation, hull.normals @ rotation)
+        if (angle == int(angle)):
+            rotatedHulls[key] = rotated
+    return rotated
+
+# Sweep and prune broadphase: sorts the boxes along x (like the terrain) and
+# pairs each with the ones after it that start before it ends, then drops the
+# pairs that don't overlap in y. Returns the pairs as two index arrays.
+def sweepAndPrune(minX, maxX, minY, maxY):
+    order = numpy.argsort(minX, kind='stable')
+    sortedMinX = minX[order]
+    ends = sortedMinX.searchsorted(maxX[order], 'right')
+    counts = numpy.maximum(ends - numpy.arange(1, len(order) + 1), 0)
+
+    # (i, j) for every j in i+1 .. ends[i]-1, without a python loop
+    starts = numpy.cumsum(counts) - counts
+    first = numpy.repeat(numpy.arange(len(order)), counts)
+    second = first + 1 + numpy.arange(counts.sum()) - numpy.repeat(starts, counts)
+
+    a = order[first]
+    b = order[second]
+    overlapY = (minY[a] <= maxY[b]) & (minY[b] <= maxY[a])
+    return a[overlapY], b[overlapY]
+
+# separating axis test between pairs of copies of a hull, one placed at
+# positionsA[i] rotated by anglesA[i] degrees, the other at positionsB[i] and
+# anglesB[i]. Returns a bool per pair.
+def hullsOverlap(hull, positionsA, anglesA, positionsB, anglesB):
+    def separatedOnAxesOf(positions, angles, otherVertices):
+        # the other hull's vertices projected onto this hull's edge normals,
+        # relative to its position: [pair, part, axis, other part, other vertex]
+        normals = transformPoints(0, 0, angles, hull.normals[None])
+        projections = numpy.einsum('npai,nqvi->npaqv', normals, otherVertices - positions[:, None, None, :])
+        return ((projections.min(axis=4) > hull.projectionMax[None, :, :, None]) |
+                (projections.max(axis=4) < hull.projectionMin[None, :, :, None])).any(axis=2) # [pair, part, other part]
+
+    verticesA = transformPoints(positionsA[:, 0], positionsA[:, 1], anglesA, hull.vertices[None])
+    verticesB = transformPoints(positionsB[:, 0], positionsB[:, 1], anglesB, hull.vertices[None])
+    separated = (separatedOnAxesOf(positionsA, anglesA, verticesB) |
+                 separatedOnAxesOf(positionsB, anglesB, verticesA).transpose(0, 2, 1))
+    # overlapping if any pair of parts isn't separated on any axis
+    return ~separated.all(axis=(1, 2))
+
+# flattened game state layout used by the rewind buffer:
+# [simulationTick, postGameState, lastFuelParticle,
+#  Lander.state,
+#  RNG state (high and low 32 bits), numParticles,
+#  8 values per particle]
+landerStateSize = Lander.stateSize
+rngStateSize = 2
+particleStateSize = 8
+
+particleStateOffset = 3 + landerStateSize + rngStateSize + 1
+
+# fills state (by default the shared stateBuffer) in place and returns it,
+# so recording a tick doesn't need any new arrays
+def captureState(state=None):
+    if state is None:
+        state = stateBuffer
+
+    size = particleStateOffset + particleStateSize * len(fuelParticles)
+    if (len(state) < size):
+        state.frombytes(bytes(state.itemsize * (size - len(state))))
+    elif (len(state) > size):
+        del state[size:]
+
+    state[0] = simulationTick
+    state[1] = postGameState.value
+    state[2] = lastFuelParticle
+    state[3:3 + landerStateSize] = lander.state
+
+    rngState = simulationRandom.getstate()
+    state[3 + landerStateSize] = rngState >> 32
+    state[4 + landerStateSize] = rngState & 0xFFFFFFFF
+
+    state[particleStateOffset - 1] = len(fuelParticles)
+    if (len(fuelParticles)):
+        # the view has to go before the array can be resized again
+        view = numpy.frombuffer(state, dtype=numpy.float64)
+        view[particleStateOffset:] = fuelParticles.live().ravel()
+        del view
+    return state
+
+def restoreState(state):
+    global simulationTick, postGameState, lastFuelParticle
+    simulationTick = int(state[0])
+    postGameState = PostGameState(int(state[1]))
+    lastFuelParticle = state[2]
+
+    lander.state[:] = state[3:3 + landerStateSize]
+    global landerContact
+    if (not lander.hitGround):
+        landerContact = None
+
+    simulationRandom.setstate((int(state[3 + landerStateSize]) << 32) | int(state[4 + landerStateSize]))
+
+    count = int(state[particleStateOffset - 1])
+    view = numpy.frombuffer(state, dtype=numpy.float64)
+    fuelParticles.load(view[particleStateOffset:particleStateOffset + particleStateSize * count].reshape(count, particleStateSize))
+    del view
+
+# delta between two flattened states: (length, changed indices, changed values)
+def diffStates(previous, current):
+    previousView = numpy.frombuffer(previous, dtype=numpy.float64)
+    currentView = numpy.frombuffer(current, dtype=numpy.float64)
+    n = min(len(previousView), len(currentView))
+    changed = numpy.flatnonzero(previousView[:n] != currentView[:n])
+    # anything past the end of the previous state is new
+    indices = numpy.concatenate((changed, numpy.arange(n, len(currentView)))).astype(numpy.uint32)
+    return (len(current), indices, currentView[indices])
+
+def applyDelta(previous, delta):
+    length, indices, values = delta
+    state = previous[:length]
+    if (length > len(state)):
+        state.frombytes(bytes(state.itemsize * (length - len(state))))
+    if (len(indices)):
+        # the view has to go before the array can be resized again
+        view = numpy.frombuffer(state, dtype=numpy.float64)
+        view[indices] = values
+        del view
+    return state
 
 def createStars():
     del stars[:]
     for i in range(numStars):
         # Stars are stored as [x, y, opacity]
         # I don't use world coordinates for stars since they are just a static background
-        stars.append([random.randint(-2000, 2000), random.randint(-2000, 2000), random.randint(0, 100)])
+        stars.append([simulationRandom.randint(-2000, 2000), simulationRandom.randint(-2000, 2000), simulationRandom.randint(0, 100)])
+
+    global starsSnapshot
+    starsSnapshot = numpy.array(stars, dtype=float).reshape(-1, 3) / (1, 1, 100)
 
 def createTerrain():
+    global terrain, terrainSnapshot, terrainHeights, landingAreaPosition, landingAreaWidth
+    terrain = generateTerrain(simulationRandom)
+    # the terrain rasterized to one height per x unit, so anything can look up
+    # the ground under it by indexing rather than searching the segments
+    terrainX = terrain.points[:, 0]
+    terrainHeights = numpy.interp(numpy.arange(int(terrainX[-1]) + 1), terrainX, terrain.points[:, 1])
+    terrainSnapshot = tuple(map(tuple, terrain.points.tolist()))
+    terrainPoints[:] = [Vector2(x, y) for x, y in terrainSnapshot]
+    landingAreaPosition = Vector2(terrain.landingX, terrain.landingY)
+    landingAreaWidth = terrain.landingWidth
+
+# a new random terrain, drawing from rng (a random.Random)
+def generateTerrain(rng):
     # terrain is created as a series of points on the surface
-    # first, clear previous terrain
-    del terrainPoints[:]
+    points = []
 
     # start with the first point on the far left of the screen
-    firstPoint = Vector2(0, random.randint(terrainMinHeight, (terrainMaxStartingHeight + terrainMinHeight)/2))
-    terrainPoints.append(firstPoint)
+    firstPoint = Vector2(0, rng.randint(terrainMinHeight, (terrainMaxStartingHeight + terrainMinHeight)/2))
+    points.append(firstPoint)
     
-    global landingAreaPosition
-    global landingAreaWidth
     # randomize landing area width to an extent
-    landingAreaWidth = Lander.size.x + random.randint(landingAreaMinAdditionalWidth, landingAreaMaxAdditionalWidth)
+    landingAreaWidth = Lander.size.x + rng.randint(landingAreaMinAdditionalWidth, landingAreaMaxAdditionalWidth)
     # pick a random x position for the landing area
-    landingAreaPosition = Vector2(random.randint(0, glutGet(GLUT_WINDOW_WIDTH) - landingAreaWidth), 0)
+    landingAreaPosition = Vector2(rng.randint(0, WINDOW_WIDTH - landingAreaWidth), 0)
 
     doneLandingArea = False
-    while (terrainPoints[-1].x < WINDOW_WIDTH):
-        prevPoint = terrainPoints[-1]
+    while (points[-1].x < WINDOW_WIDTH):
+        prevPoint = points[-1]
         point = copy(prevPoint)
 
         # slightly randomize x position of next point
-        point.x += random.randint(terrainMinXSpacing, terrainMaxXSpacing)
+        point.x += rng.randint(terrainMinXSpacing, terrainMaxXSpacing)
         
         # sometimes, create a y position with a much higher variation (adds more variety to terrain)
         # but not too close to the left of the screen (to avoid overlapping the UI)
         # otherwise just create a point with a normal amount of variation
         variation = terrainVariationY
-        if not random.randrange(5) and point.x > 100:
+        if not rng.randrange(5) and point.x > 100:
             variation *= 5
         
-        point.y = random.randint(max(terrainMinHeight, prevPoint.y - variation), min(terrainMaxHeight, prevPoint.y + variation))
+        point.y = rng.randint(max(terrainMinHeight, prevPoint.y - variation), min(terrainMaxHeight, prevPoint.y + variation))
 
         # create landing area
         if(point.x >= landingAreaPosition.x and not doneLandingArea):
             # move the point to exactly where the landing area was chosen
             point.x = landingAreaPosition.x
-            terrainPoints.append(copy(point))
+            points.append(copy(point))
             # create right side of landing area horizontally to the right
-            terrainPoints.append(Vector2(point.x + landingAreaWidth, point.y))
+            points.append(Vector2(point.x + landingAreaWidth, point.y))
 
             # we now know the y position of the landing area
             landingAreaPosition.y = point.y
@@ -193,71 +1630,88 @@ def createTerrain():
             
         # create normal terrain point
         else:
-            terrainPoints.append(copy(point))
+            points.append(copy(point))
+
+    return buildTerrain([(point.x, point.y) for point in points],
+                        landingAreaPosition.x, landingAreaPosition.y, landingAreaWidth)
+
+def buildTerrain(points, landingX, landingY, landingWidth):
+    points = numpy.array(points, dtype=float)
+    # upward normal of every segment (they run left to right), and its
+    # projection of the segment, used by hullContacts()
+    directions = numpy.diff(points, axis=0)
+    normals = numpy.stack((-directions[:, 1], directions[:, 0]), -1)
+    offsets = (points[:-1] * normals).sum(axis=1)
+    return Terrain(points, normals, offsets, landingX, landingY, landingWidth, 0)
+
+# Lays terrains end to end, stride units apart, so that landers on all of them
+# can be simulated in one LanderBatch (see LanderBatch.terrainIndex). The
+# segments joining one terrain to the next get a zero normal and a negative
+# offset, which no vertex is ever below.
+def stackTerrains(terrains, stride=None):
+    if stride is None:
+        stride = WINDOW_WIDTH * 2
+    shifts = numpy.arange(len(terrains)) * stride
+    points = numpy.concatenate([terrain.points + (shift, 0) for terrain, shift in zip(terrains, shifts)])
+    normals = numpy.concatenate([numpy.vstack((terrain.normals, (0, 0))) for terrain in terrains])[:-1]
+    offsets = numpy.concatenate([numpy.append(terrain.offsets + terrain.normals[:, 0] * shift, -1)
+                                 for terrain, shift in zip(terrains, shifts)])[:-1]
+    return Terrain(points, normals, offsets,
+                   numpy.array([terrain.landingX for terrain in terrains], dtype=float) + shifts,
+                   numpy.array([terrain.landingY for terrain in terrains], dtype=float),
+                   numpy.array([terrain.landingWidth for terrain in terrains], dtype=float),
+                   stride)
 
 def doCollisionDetection():
-    # line intersection helper functions
-    # taken from http://bryceboe.com/2006/10/23/line-segment-intersection-algorithm/
-    def ccw(A, B, C):
-        return (C.y - A.y) * (B.x - A.x) > (B.y - A.y) * (C.x - A.x)
-    
-    def intersect(A, B, C, D):
-        return ccw(A, C, D) != ccw(B, C, D) and ccw(A, B, C) != ccw(A, B, D)
-            
-    landerCorners = [Vector2(lander.position.x - lander.size.x/2, lander.position.y + lander.size.y/2),
-                     Vector2(lander.position.x + lander.size.x/2, lander.position.y + lander.size.y/2),
-                     Vector2(lander.position.x + lander.size.x/2, lander.position.y - lander.size.y/2),
-                     Vector2(lander.position.x - lander.size.x/2, lander.position.y - lander.size.y/2)]
+    # collect the terrain points we need to analyse:
+    # don't need to check for intersections of all terrain lines, just the ones below the lander.
+    # Terrain x coordinates are sorted, so find the segments overlapping the
+    # lander's horizontal extent, whichever way it is rotated
+    terrainX = terrain.points[:, 0]
+    first = max(terrainX.searchsorted(lander.position.x - landerHull.radius, 'right') - 1, 0)
+    last = min(terrainX.searchsorted(lander.position.x + landerHull.radius, 'left') + 1, len(terrainX))
+    if (last - first < 2):
+        return
+
+    # nothing to do while the lander is clear above the highest of those points
+    if (lander.position.y - landerHull.radius > terrain.points[first:last, 1].max()):
+        return
 
     # take rotation of lander into account
-    for i in range(len(landerCorners)):
-        rotateAround(landerCorners[i], lander.position, -lander.rotation)
+    hits, vertices, depths = hullContacts(landerHull, lander.position.x, lander.position.y, -lander.rotation,
+                                          terrain.points[first:last], terrain.normals[first:last - 1],
+                                          terrain.offsets[first:last - 1])
+    if (not hits.any()):
+        return
 
-    # collect the terrain points we need to analyse:
-    # don't need to check for intersections of all terrain lines, just the ones below the lander
-    minTerrainX = lander.position.x - max(lander.size.x, lander.size.y)/2 - max(terrainMaxXSpacing, landingAreaWidth)
-    maxTerrainX = lander.position.x + max(lander.size.x, lander.size.y)/2 + max(terrainMaxXSpacing, landingAreaWidth)
-
-    terrainToCheck = []
-    for point in terrainPoints:
-        # start from the left:
-        # if we havent reached minTerrainX, continue to next point
-        if point.x < minTerrainX: continue
-        # if we have gone too far, break out of the loop
-        if point.x > maxTerrainX: break
-        terrainToCheck.append(point) # found a good point!
-
-    for i in range(len(terrainToCheck) - 1):
-        terrain1 = terrainToCheck[i]
-        terrain2 = terrainToCheck[i+1]
-
-        for j in range(len(landerCorners)):
-            lander1 = landerCorners[j]
-            lander2 = landerCorners[j+1] if j < 3 else landerCorners[0]
-
-            # lander is touching the ground
-            if (intersect(terrain1, terrain2, lander1, lander2)):
-                lander.hitGround = True
-
-                global postGameState
-                # hit the ground too fast
-                if (abs(lander.velocity.y) > Lander.maxLandingVelocity):
-                    explodeLander()
-                    postGameState = PostGameState.tooFast
-                # missed the landing area
-                elif (terrain1.x != landingAreaPosition.x):
-                    explodeLander()
-                    postGameState = PostGameState.missedLandingArea
-                # hit the ground at a steep angle
-                elif (abs(lander.rotation) > Lander.maxLandingRotation):
-                    explodeLander()
-                    postGameState = PostGameState.sideways
-                # successfully landed
-                else:
-                    onSuccessfulLanding()
-                    postGameState = PostGameState.success
-                    
-                return
+    # lander is touching the ground:
+    # the leftmost segment touched decides the outcome (like the terrain scan always has),
+    # and the part of the hull reaching deepest below it is the one that touched
+    segment = hits.any(axis=0).argmax()
+    part = numpy.where(hits[:, segment], depths[:, :, segment].max(axis=1), -numpy.inf).argmax()
+    contactX, contactY = vertices[part, depths[part, :, segment].argmax()]
+
+    global landerContact
+    landerContact = Contact(landerHull.names[part], float(contactX), float(contactY))
+    lander.hitGround = True
+
+    global postGameState
+    # hit the ground too fast
+    if (abs(lander.velocity.y) > Lander.maxLandingVelocity):
+        explodeLander()
+        postGameState = PostGameState.tooFast
+    # missed the landing area
+    elif (terrainX[first + segment] != landingAreaPosition.x):
+        explodeLander()
+        postGameState = PostGameState.missedLandingArea
+    # hit the ground at a steep angle
+    elif (abs(lander.rotation) > Lander.maxLandingRotation):
+        explodeLander()
+        postGameState = PostGameState.sideways
+    # successfully landed
+    else:
+        onSuccessfulLanding()
+        postGameState = PostGameState.success
 
 def onSuccessfulLanding():
     # lock lander onto ground
@@ -271,17 +1725,57 @@ def explodeLander():
     # create explosion particles
     numExplosionParticles = 20
     for i in range(numExplosionParticles):
-        fuelParticle = FuelParticle(lander.position.x, lander.position.y)
-        fuelParticle.velocity.x = -FuelParticle.speed * math.sin(math.radians((i/numExplosionParticles)*360 + random.randint(-25, 25)))
-        fuelParticle.velocity.y = -FuelParticle.speed * math.cos(math.radians((i/numExplosionParticles)*360 + random.randint(-25, 25)))
-        fuelParticle.rotation = random.randint(0, 90)
-        fuelParticle.rotationVelocity = 1 if random.randrange(2) else -1
-        fuelParticle.lifetime = FuelParticle.defaultLifetime*2
-        fuelParticles.append(fuelParticle)
+        velocityX = -FuelParticle.speed * math.sin(math.radians((i/numExplosionParticles)*360 + simulationRandom.randint(-25, 25)))
+        velocityY = -FuelParticle.speed * math.cos(math.radians((i/numExplosionParticles)*360 + simulationRandom.randint(-25, 25)))
+        rotation = simulationRandom.randint(0, 90)
+        rotationVelocity = 1 if simulationRandom.randrange(2) else -1
+        fuelParticles.spawn(lander.position.x, lander.position.y, velocityX, velocityY,
+                            rotation, rotationVelocity, FuelParticle.defaultLifetime*2)
+
+### ARENA ###
+def updateArena(dt):
+    if (not len(landers)):
+        return
+    thrust, turn = arenaController(landers, terrain)
+    landers.step(dt, thrust, turn, terrain)
+    collideLanders()
 
-def createInitialScreen():
+# landers against each other, including the player's, which is the last
+# entry when it is still visible
+def collideLanders():
     global postGameState
+    indices = numpy.flatnonzero(landers.visible)
+    positions = landers.position[indices]
+    angles = -landers.rotation[indices]
+    if (lander.visible):
+        positions = numpy.vstack((positions, (lander.position.x, lander.position.y)))
+        angles = numpy.append(angles, -lander.rotation)
+    if (len(positions) < 2):
+        return
+
+    # bounding boxes of the hull in any rotation
+    radius = landerHull.radius
+    a, b = sweepAndPrune(positions[:, 0] - radius, positions[:, 0] + radius,
+                         positions[:, 1] - radius, positions[:, 1] + radius)
+    # bounding circles, then the hulls themselves
+    close = ((positions[a] - positions[b])**2).sum(axis=1) <= (2 * radius)**2
+    a = a[close]
+    b = b[close]
+    if (not len(a)):
+        return
+    overlapping = hullsOverlap(landerHull, positions[a], angles[a], positions[b], angles[b])
+    collided = numpy.unique(numpy.concatenate((a[overlapping], b[overlapping])))
+
+    if (lander.visible and len(collided) and collided[-1] == len(indices)):
+        collided = collided[:-1]
+        explodeLander()
+        postGameState = PostGameState.collided
+    landers.stop(indices[collided], PostGameState.collided)
+
+def createInitialScreen():
+    global postGameState, runStartTick
     postGameState = PostGameState.starting
+    runStartTick = simulationTick
     createStars()
     createTerrain()
     respawnLander()
@@ -290,48 +1784,138 @@ def createInitialScreen():
     lander.visible = False
             
 def restartGame():
-    global postGameState
+    global postGameState, landers, runStartTick, runSeed
+    # keep the run that just finished, if it was played
+    if (ghostDirectory is not None and postGameState != PostGameState.starting and
+        len(replayRecorder.frames) and lander.hitGround):
+        replayRecorder.save(os.path.join(ghostDirectory, "%s-%d.npz" % (time.strftime("%Y%m%d-%H%M%S"), simulationTick)),
+                            runSeed)
+    replayRecorder.clear()
+    if (telemetryLog is not None):
+        telemetryLog.flush()
+    runStartTick = simulationTick
+
+    # every run starts from a seed of its own, drawing the terrain and the
+    # lander in the same order as episodeStart(), so it can be flown again
+    runSeed = simulationRandom.getrandbits(63)
+    simulationRandom.seed(runSeed)
+
     postGameState = PostGameState.none
-    createStars()
     createTerrain()
     respawnLander()
+    createStars()
+    landers = LanderBatch.spawn(arenaSize, numpy.random.default_rng(simulationRandom.getrandbits(64)),
+                                WINDOW_WIDTH, WINDOW_HEIGHT)
+
+    # terrain isn't part of the recorded state, so there is
+    # nothing sensible to rewind to across a restart
+    rewindBuffer.clear()
+
+def rewind():
+    state = rewindBuffer.stepBack()
+    if (state is not None):
+        restoreState(state)
 
 def respawnLander():
-    global lander
+    global lander, landerContact
     del lander
     lander = Lander()
+    landerContact = None
 
+# GLUT input callbacks run on the main (render) thread, so they only queue
+# the event; the simulation thread applies it in processInput()
 def keyboardDown(keyCode, mouseX, mouseY):
-    # Add key to keys down dictionary
-    keysDown[keyCode] = True
-
-    # quick-fire presses
-    if (keyCode == b'r'):
-        restartGame()
+    inputEvents.append((keyCode, True, time.perf_counter()))
 
 def keyboardUp(keyCode, mouseX, mouseY):
-    keysDown[keyCode] = False
-    del keysDown[keyCode]
+    inputEvents.append((keyCode, False, time.perf_counter()))
 
 def keyboardSpecialDown(keyCode, mouseX, mouseY):
-    keysDown[keyCode] = True
+    inputEvents.append((keyCode, True, time.perf_counter()))
 
 def keyboardSpecialUp(keyCode, mouseX, mouseY):
-    keysDown[keyCode] = False
-    del keysDown[keyCode]
+    inputEvents.append((keyCode, False, time.perf_counter()))
+
+def processInput():
+    while inputEvents:
+        keyCode, isDown, pressTime = inputEvents.popleft()
+        if (isDown):
+            # GLUT auto-repeats held keys, only a fresh press changes the screen
+            if (not keysDown.get(keyCode)):
+                consumedPresses.append(pressTime)
+            # Add key to keys down dictionary
+            keysDown[keyCode] = True
+
+            # quick-fire presses
+            if (keyCode == b'r'):
+                restartGame()
+        else:
+            keysDown.pop(keyCode, None)
+
+# x, y, rotation, currentLifetime, lifetime
+particleSnapshotColumns = [0, 1, 4, 7, 6]
+
+def publishSnapshot():
+    landerSnapshot = LanderSnapshot(lander.position.x, lander.position.y,
+                                    lander.velocity.x, lander.velocity.y,
+                                    lander.rotation, lander.fuel, lander.visible)
+    particleSnapshot = fuelParticles.live()[:, particleSnapshotColumns]
+    visible = landers.visible
+    arenaSnapshot = (landers.position[visible], landers.rotation[visible])
+    snapshots.publish(GameSnapshot(simulationTick, landerSnapshot, particleSnapshot, postGameState,
+                                   terrainSnapshot, (landingAreaPosition.x, landingAreaPosition.y, landingAreaWidth),
+                                   starsSnapshot, landerContact, arenaSnapshot, simulationTick - runStartTick))
+    if (consumedPresses):
+        inputLatency.published(consumedPresses)
+        consumedPresses.clear()
+    if (spectatorServer is not None):
+        spectatorServer.offer(snapshots.latest())
 
-lastUpdateTime = 0
 updateRate = 15 # milliseconds
+simulationRunning = threading.Event()
+
+# runs on its own thread so that a slow frame never delays physics, and a
+# physics catch-up burst never delays a frame
+def simulationLoop():
+    global simulationTick
+    # simulation time advances in fixed steps, independent of the wall clock
+    nextUpdate = time.perf_counter()
+    while simulationRunning.is_set():
+        # Only update the game logic in a fixed interval
+        updated = False
+        while (time.perf_counter() >= nextUpdate):
+            nextUpdate += updateRate / 1000
+            processInput()
+            # holding the rewind key scrubs back one recorded tick per update
+            # (the arena isn't recorded, so there is no rewinding in arena mode)
+            if (keysDown.get(rewindKey) and not len(landers)):
+                rewind()
+            else:
+                simulationTick += 1
+                update(simulationTick * updateRate, updateRate)
+                if (not len(landers)):
+                    rewindBuffer.record(captureState())
+                if (ghostDirectory is not None):
+                    replayRecorder.record(simulationTick - runStartTick, lander, *playerControls())
+                if (telemetryLog is not None):
+                    telemetryLog.record(simulationTick, simulationTick - runStartTick, lander,
+                                        *playerControls(), postGameState)
+            updated = True
+
+        if (updated):
+            publishSnapshot()
+
+        time.sleep(max(0, nextUpdate - time.perf_counter()))
+
+def startSimulation():
+    simulationRunning.set()
+    thread = threading.Thread(target=simulationLoop, name='simulation', daemon=True)
+    thread.start()
+    return thread
+
 def tick():
-    global lastUpdateTime
-    # Only update the game logic in a fixed interval
-    timeSinceLastUpdate = glutGet(GLUT_ELAPSED_TIME) - lastUpdateTime
-    while(timeSinceLastUpdate > updateRate):
-        lastUpdateTime = glutGet(GLUT_ELAPSED_TIME)
-        timeSinceLastUpdate -= updateRate
-        update(lastUpdateTime, updateRate)
-
-    # Draw to the screen as fast as possible
+    # Draw to the screen as fast as possible,
+    # the game logic runs on the simulation thread
     render()
 
 # do game logic updates
@@ -376,15 +1960,9 @@ def update(lastUpdateTime, dt):
         doCollisionDetection()
 
     ### FUEL PARTICLE PHYSICS ###
-    for particle in fuelParticles[:]:
-        particle.position.x += particle.velocity.x
-        particle.position.y += particle.velocity.y
-        particle.rotation += particle.rotationVelocity
-        particle.currentLifetime += dt
+    fuelParticles.step(dt, terrainHeights)
 
-        # remove old particles
-        if (particle.currentLifetime > particle.lifetime):
-            fuelParticles.remove(particle)
+    updateArena(dt)
 
     ### LANDER CONTROLS ###
     # do not accept control if no fuel or touched ground
@@ -401,16 +1979,19 @@ def update(lastUpdateTime, dt):
         lander.acceleration.y = gravity + Lander.thrusterStrength * math.cos(math.radians(lander.rotation))
         lander.fuel -= Lander.fuelConsumptionRate * dt
 
-        # create fuel particles
-        global lastFuelParticle
+        # create fuel particles, as many as the stress test and the governor allow
+        global lastFuelParticle, particleRelease
         if (lastUpdateTime - lastFuelParticle > 20):
-            fuelParticle = FuelParticle(lander.position.x, lander.position.y)
-            fuelParticle.velocity.x = -FuelParticle.speed * math.sin(math.radians(lander.rotation + random.randint(-25, 25)))
-            fuelParticle.velocity.y = -FuelParticle.speed * math.cos(math.radians(lander.rotation + random.randint(-25, 25)))
-            fuelParticle.rotation = random.randint(0, 90)
-            fuelParticle.rotationVelocity = 1 if random.randrange(2) else -1
-            fuelParticle.lifetime = random.uniform(FuelParticle.defaultLifetime, FuelParticle.defaultLifetime + 1)
-            fuelParticles.append(fuelParticle)
+            particleRelease += particlesPerRelease * governor.particleEmission
+            for i in range(int(particleRelease)):
+                velocityX = -FuelParticle.speed * math.sin(math.radians(lander.rotation + simulationRandom.randint(-25, 25)))
+                velocityY = -FuelParticle.speed * math.cos(math.radians(lander.rotation + simulationRandom.randint(-25, 25)))
+                rotation = simulationRandom.randint(0, 90)
+                rotationVelocity = 1 if simulationRandom.randrange(2) else -1
+                lifetime = simulationRandom.uniform(FuelParticle.defaultLifetime, FuelParticle.defaultLifetime + 1)
+                fuelParticles.spawn(lander.position.x, lander.position.y, velocityX, velocityY,
+                                    rotation, rotationVelocity, lifetime)
+            particleRelease -= int(particleRelease)
             
             lastFuelParticle = lastUpdateTime
 
@@ -422,6 +2003,259 @@ def update(lastUpdateTime, dt):
         lander.rotationVelocity = Lander.sideThrusterStrength
         lander.fuel -= Lander.fuelConsumptionRate * dt * 0.5
 
+# (thrust, turn) the player is holding, as a controller would give them
+def playerControls():
+    turn = -1 if keysDown.get(SpecialKey.left) else (1 if keysDown.get(SpecialKey.right) else 0)
+    return int(bool(keysDown.get(SpecialKey.up))), turn
+
+### AUTOPILOT OPTIMIZER ###
+# Cross-entropy search over PDController gains: every generation samples a
+# population of parameter vectors from a normal distribution, flies each of
+# them on the same set of freshly seeded terrains, and refits the distribution
+# to the best (elite) fraction. Each generation is one batched rollout, split
+# over a process pool by population.
+
+# starting conditions of an episode, drawn from a SimulationRandom seeded with
+# seed the same way a new game draws them: (terrain, x, velocityX, rotation)
+def episodeStart(seed):
+    rng = SimulationRandom(seed)
+    terrain = generateTerrain(rng)
+    return terrain, rng.randint(0, WINDOW_WIDTH), rng.randint(-20, 20), rng.randint(-20, 20)
+
+# a LanderBatch with repeats landers starting each episode in seeds (all of
+# the episodes, then all of them again, ...), and the stacked terrain for it
+def episodeBatch(seeds, repeats=1):
+    starts = [episodeStart(seed) for seed in seeds]
+    terrain = stackTerrains([start[0] for start in starts])
+    x, velocityX, rotation = numpy.array([start[1:] for start in starts], dtype=float).reshape(-1, 3).T
+
+    batch = LanderBatch(repeats * len(seeds))
+    batch.terrainIndex[:] = numpy.tile(numpy.arange(len(seeds)), repeats)
+    batch.position[:, 0] = x[batch.terrainIndex]
+    batch.position[:, 1] = WINDOW_HEIGHT-20
+    batch.velocity[:, 0] = velocityX[batch.terrainIndex]
+    batch.rotation[:] = rotation[batch.terrainIndex]
+    return batch, terrain
+
+# flies a batch with controller until every lander has stopped or maxTicks
+# have gone by. Returns how many ticks each lander flew for.
+def flyEpisodes(batch, terrain, controller, maxTicks=4000, dt=updateRate):
+    ticks = numpy.full(len(batch), maxTicks)
+    for tick in range(maxTicks):
+        flying = batch.flying
+        if (not flying.any()):
+            break
+        thrust, turn = controller(batch, terrain)
+        batch.step(dt / 1000, thrust, turn, terrain)
+        ticks[flying & ~batch.flying] = tick + 1
+    return ticks
+
+# one lander per (controller, seed) pair, all in one LanderBatch. Returns the
+# finished batch and the stacked terrain it was flown on
+def rolloutControllers(parameters, seeds, maxTicks=4000):
+    batch, terrain = episodeBatch(seeds, len(parameters))
+    controller = PDController.fromParameters(numpy.repeat(parameters, len(seeds), axis=0))
+    flyEpisodes(batch, terrain, controller, maxTicks)
+    return batch, terrain
+
+# higher is better: landing scores 100 plus the fuel left, the other outcomes
+# score less the further from the landing area they ended up
+def episodeScores(batch, terrain):
+    outcome = batch.outcome
+    landed = outcome == PostGameState.success.value
+    scores = numpy.select((landed, outcome == PostGameState.sideways.value, outcome == PostGameState.tooFast.value),
+                          (100 + batch.fuel, 20, 10), 0)
+    centre = (numpy.take(terrain.landingX, batch.terrainIndex) + numpy.take(terrain.landingWidth, batch.terrainIndex)/2 -
+              batch.terrainIndex * terrain.stride)
+    distance = numpy.abs(batch.position[:, 0] - centre) / WINDOW_WIDTH
+    scores = scores - numpy.where(landed, 0, 20 * distance)
+    scores[batch.flying] -= 50 # ran out of time
+    return scores
+
+# mean score of each parameter vector over the episodes (run in the pool's workers)
+def evaluateControllers(parameters, seeds):
+    batch, terrain = rolloutControllers(parameters, seeds)
+    return episodeScores(batch, terrain).reshape(len(parameters), len(seeds)).mean(axis=1)
+
+def optimizeController(generations=20, population=64, episodes=32, eliteFraction=0.2, workers=None, seed=None,
+                       report=None):
+    rng = numpy.random.default_rng(seed)
+    parameterMin = PDController.parameterMin
+    parameterMax = PDController.parameterMax
+    span = parameterMax - parameterMin
+    mean = PDController().parameters()
+    deviation = span / 4
+    eliteCount = max(2, int(population * eliteFraction))
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(workers) as pool:
+        for generation in range(generations):
+            candidates = numpy.clip(rng.normal(mean, deviation, (population, len(mean))), parameterMin, parameterMax)
+            # new terrains every generation, so the gains don't overfit a few of them
+            seeds = rng.integers(1, 2**63, episodes).tolist()
+            chunks = numpy.array_split(candidates, min(workers, population))
+            scores = numpy.concatenate(list(pool.map(evaluateControllers, chunks, [seeds] * len(chunks))))
+
+            elite = candidates[numpy.argsort(scores)[-eliteCount:]]
+            # smoothed refit, with a floor on the spread so the search doesn't stall
+            mean = 0.7 * elite.mean(axis=0) + 0.3 * mean
+            deviation = numpy.maximum(0.7 * elite.std(axis=0) + 0.3 * deviation, span * 0.01)
+            if (report is not None):
+                report(generation, scores, mean)
+
+    return PDController.fromParameters(mean)
+
+# Solves the PolicyController table by value iteration. Each step of the
+# iteration holds an action for ticksPerStep ticks, using the game's gravity,
+# thruster strengths and fuel use. Touching down (height reaching 0) ends an
+# episode, and is worth 1 plus a bonus for the fuel left if it is within the
+# landing limits and close enough to the centre to be on even the narrowest
+# landing area, 0 otherwise. Later landings are discounted, so the fastest safe
+# approach wins.
+#
+# Between grid points the value is interpolated over the simplex containing
+# the state (Kuhn triangulation: 6 grid points for the 5 continuous axes rather
+# than 32 for multilinear), so that slow movements that stay near one grid
+# point aren't lost. Rotation changes by exactly one grid step per turning step.
+def solvePolicy(iterations=400, tolerance=1e-5, discount=0.995, ticksPerStep=5, report=None):
+    axes = PolicyController.axes
+    shape = PolicyController.shape
+    strides = numpy.cumprod((1,) + shape[:0:-1])[::-1]
+    dt = ticksPerStep * updateRate / 1000
+    padTolerance = (Lander.size.x + landingAreaMinAdditionalWidth) / 2 - Lander.size.x / 2
+    # the table is looked up at the nearest rotation, so landing has to be safe
+    # anywhere within half a grid step of it
+    rotationLimit = Lander.maxLandingRotation - (axes[4][1] - axes[4][0]) / 2
+    height, offset, velocityX, velocityY, rotation, fuel = numpy.meshgrid(*axes, indexing='ij', sparse=True)
+
+    transitions = []
+    for thrust, turn in PolicyController.actions:
+        # nothing works without fuel
+        powered = fuel > 0
+        thrusting = thrust & powered
+        newRotation = numpy.clip(rotation + turn * powered * Lander.sideThrusterStrength * ticksPerStep,
+                                 axes[4][0], axes[4][-1])
+        sin, cos = sinCos((rotation + newRotation) / 2)
+        newVelocityX = velocityX + Lander.thrusterStrength * sin * thrusting * dt
+        newVelocityY = velocityY + (gravity + Lander.thrusterStrength * cos * thrusting) * dt
+        newOffset = offset + (velocityX + newVelocityX) / 2 * dt
+        newHeight = height + (velocityY + newVelocityY) / 2 * dt
+        newFuel = numpy.maximum(fuel - Lander.fuelConsumptionRate * dt * (thrusting + 0.5 * (turn != 0) * powered), 0)
+
+        newState = [numpy.broadcast_to(values, shape).ravel()
+                    for values in (newHeight, newOffset, newVelocityX, newVelocityY, newFuel)]
+        terminal = newState[0] <= 0
+        landed = (terminal & (numpy.abs(newState[3]) <= Lander.maxLandingVelocity) &
+                  (numpy.abs(numpy.broadcast_to(newRotation, shape).ravel()) <= rotationLimit) &
+                  (numpy.abs(newState[1]) <= padTolerance))
+        terminalValue = numpy.where(landed, 1 + 0.5 * newState[4] / Lander.startingFuel, 0).astype(numpy.float32)
+
+        # the simplex: lower grid point and fraction of the way to the next along each axis,
+        # then step along the axes in order of decreasing fraction
+        continuousAxes = (0, 1, 2, 3, 5)
+        lower = numpy.empty((len(terminal), 5), dtype=numpy.intp)
+        fraction = numpy.empty((len(terminal), 5))
+        for i, (axis, values) in enumerate(zip(continuousAxes, newState)):
+            grid = axes[axis]
+            lower[:, i] = numpy.clip(grid.searchsorted(values, 'right') - 1, 0, len(grid) - 2)
+            fraction[:, i] = numpy.clip((values - grid[lower[:, i]]) / numpy.diff(grid)[lower[:, i]], 0, 1)
+        rotationIndex = numpy.broadcast_to(numpy.rint((newRotation - axes[4][0]) / (axes[4][1] - axes[4][0])).astype(numpy.intp),
+                                           shape).ravel()
+        order = numpy.argsort(-fraction, axis=1)
+        fraction = numpy.take_along_axis(fraction, order, axis=1)
+        base = lower @ strides[list(continuousAxes)] + rotationIndex * strides[4]
+        corners = numpy.empty((len(terminal), 6), dtype=numpy.int32)
+        corners[:, 0] = base
+        corners[:, 1:] = base[:, None] + numpy.cumsum(strides[list(continuousAxes)][order], axis=1)
+        weights = numpy.empty((len(terminal), 6), dtype=numpy.float32)
+        weights[:, 0] = 1 - fraction[:, 0]
+        weights[:, 1:5] = fraction[:, :4] - fraction[:, 1:]
+        weights[:, 5] = fraction[:, 4]
+        transitions.append((terminal, terminalValue, corners, weights))
+
+    values = numpy.zeros(numpy.prod(shape), dtype=numpy.float32)
+    actionValues = numpy.empty((len(transitions), len(values)), dtype=numpy.float32)
+    for iteration in range(iterations):
+        for action, (terminal, terminalValue, corners, weights) in enumerate(transitions):
+            expected = (weights * values[corners]).sum(axis=1) * discount
+            actionValues[action] = numpy.where(terminal, terminalValue, expected)
+        newValues = actionValues.max(axis=0)
+        change = float(numpy.abs(newValues - values).max())
+        values = newValues
+        if (report is not None):
+            report(iteration, change)
+        if (change < tolerance):
+            break
+
+    return PolicyController(actionValues.argmax(axis=0).astype(numpy.uint8).reshape(shape))
+
+### BATCH EVALUATION ###
+# Runs episodes with no window: every seed in seeds is one episode, flown by a
+# controller of the given kind (see evaluationControllers), split into chunks
+# over a process pool. Results are columns with one entry per episode.
+evaluationControllers = ('scripted', 'policy', 'replay')
+evaluationColumns = ('seed', 'outcome', 'fuelUsed', 'ticks')
+
+# path is the policy table or replay file, for the kinds that need one
+def createController(kind, path=None):
+    if (kind == 'scripted'):
+        return PDController()
+    elif (kind == 'policy'):
+        return PolicyController.load(path)
+    elif (kind == 'replay'):
+        return ReplayController.load(path)
+    raise ValueError("unknown controller %r, expected one of %s" % (kind, ", ".join(evaluationControllers)))
+
+# one chunk of episodes (run in the pool's workers)
+def evaluateEpisodes(kind, path, seeds, maxTicks, dt):
+    batch, terrain = episodeBatch(seeds)
+    ticks = flyEpisodes(batch, terrain, createController(kind, path), maxTicks, dt)
+    return numpy.array(seeds, dtype=numpy.int64), batch.outcome.copy(), Lander.startingFuel - batch.fuel, ticks
+
+def evaluateController(kind, path, seeds, maxTicks=4000, dt=updateRate, workers=None, chunkSize=256, progress=None):
+    chunks = [seeds[i:i + chunkSize] for i in range(0, len(seeds), chunkSize)]
+    results = [None] * len(chunks)
+    done = 0
+    with ProcessPoolExecutor(workers) as pool:
+        futures = {pool.submit(evaluateEpisodes, kind, path, chunk, maxTicks, dt): i for i, chunk in enumerate(chunks)}
+        for future in as_completed(futures):
+            index = futures[future]
+            results[index] = future.result()
+            done += len(chunks[index])
+            if (progress is not None):
+                progress(done, len(seeds))
+    return {name: numpy.concatenate([result[i] for result in results]) for i, name in enumerate(evaluationColumns)}
+
+# .csv (with outcomes by name) or anything else as .npz
+def saveEvaluation(results, path):
+    if (path.endswith('.csv')):
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(evaluationColumns)
+            for seed, outcome, fuelUsed, ticks in zip(*(results[name].tolist() for name in evaluationColumns)):
+                writer.writerow((seed, PostGameState(outcome).name, "%.3f" % fuelUsed, ticks))
+    else:
+        numpy.savez(path, **results)
+
+# "START:STOP" for a range of seeds, or a single seed
+def parseSeeds(text):
+    start, separator, stop = text.partition(':')
+    if (not separator):
+        return [int(start)]
+    if (int(stop) <= int(start)):
+        raise argparse.ArgumentTypeError("empty seed range %s, STOP has to be after START" % text)
+    return list(range(int(start), int(stop)))
+
+def printEvaluationProgress(done, total):
+    print("\r%d/%d episodes (%d%%)" % (done, total, 100 * done // total), end="\n" if done == total else "",
+          file=sys.stderr, flush=True)
+
+def printOptimizerProgress(generation, scores, mean):
+    print("generation %d: best %.1f, mean %.1f" % (generation + 1, scores.max(), scores.mean()), flush=True)
+
+def printPolicyProgress(iteration, change):
+    print("iteration %d: largest value change %.2g" % (iteration + 1, change), flush=True)
+
 ### DRAWING FUNCTIONS ###
 # heavy usage of OpenGL henceforth
 def drawText(position, font, text, r, g, b):
@@ -432,13 +2266,13 @@ def drawText(position, font, text, r, g, b):
     for ch in text:
         glutBitmapCharacter(font, ctypes.c_int(ord(ch)))
         
-def drawTerrain():
+def drawTerrain(terrain):
     glBegin(GL_TRIANGLES)
     glColor(0.65, 0.7, 0.7) # greyish
     
-    for i in range(len(terrainPoints)-1):
-        firstCoordinates = w2r(terrainPoints[i])
-        secondCoordinates = w2r(terrainPoints[i+1])
+    for i in range(len(terrain)-1):
+        firstCoordinates = w2r(Vector2(*terrain[i]))
+        secondCoordinates = w2r(Vector2(*terrain[i+1]))
 
         # Terrain is a concave polygon, so it must be
         # split into triangles to be drawn:
@@ -455,15 +2289,13 @@ def drawTerrain():
             
     glEnd()
 
-def drawLandingArea():
+def drawLandingArea(landingArea):
     glBegin(GL_POLYGON) # simple rectangle
     glColor(1.0, 1.0, 0.0)
 
-    left = w2r(landingAreaPosition)
-
-    landingAreaPositionRight = copy(landingAreaPosition)
-    landingAreaPositionRight.x += landingAreaWidth
-    right = w2r(landingAreaPositionRight)
+    x, y, width = landingArea
+    left = w2r(Vector2(x, y))
+    right = w2r(Vector2(x + width, y))
 
     # draw first two points on surface
     glVertex2f(left.x, left.y)
@@ -478,70 +2310,206 @@ def drawLandingArea():
     
     glEnd()
 
-def drawLander():
+def drawLander(lander):
     if not lander.visible: return
     # establish corners before rotation
-    landerCorners = [Vector2(lander.position.x - lander.size.x/2, lander.position.y + lander.size.y/2),
-                     Vector2(lander.position.x + lander.size.x/2, lander.position.y + lander.size.y/2),
-                     Vector2(lander.position.x + lander.size.x/2, lander.position.y - lander.size.y/2),
-                     Vector2(lander.position.x - lander.size.x/2, lander.position.y - lander.size.y/2)]
-
-    for i in range(len(landerCorners)):
-        # take rotation into account
-        rotateAround(landerCorners[i], lander.position, -lander.rotation)
-        # convert coordinates to render coordinates
-        landerCorners[i] = w2r(landerCorners[i])
-
-    # draw the rectangle
+    # take rotation into account and convert coordinates to render coordinates
+    body, leftLeg, rightLeg = w2rArray(transformPoints(lander.x, lander.y, -lander.rotation,
+                                                        landerHull.vertices[None]))[0].tolist()
+
+    # draw the body
     glBegin(GL_POLYGON)
     glColor(1.0, 1.0, 1.0, 1.0)
-    glVertex2f(landerCorners[0].x, landerCorners[0].y)
-    glVertex2f(landerCorners[1].x, landerCorners[1].y)
+    glVertex2f(*body[0])
+    glVertex2f(*body[1])
     glColor(0.7, 0.7, 0.7, 1.0) # slight vertical gradient
-    glVertex2f(landerCorners[2].x, landerCorners[2].y)
-    glVertex2f(landerCorners[3].x, landerCorners[3].y)
-    glEnd()
-
-def drawStars():
-    glBegin(GL_POINTS)
-    for i in range(numStars):
-        opacity = stars[i][2]/100
-        glColor(1.0, 1.0, 1.0, opacity)
-        glVertex2f(aspectRatio*stars[i][0]/2000, stars[i][1]/2000)
+    glVertex2f(*body[2])
+    glVertex2f(*body[3])
     glEnd()
 
-# this function is very similar to the drawLander function
-# if i could be bothered I would abstract some of this out to
-# a generic drawRectangle function
-def drawFuelParticles():
-    for particle in fuelParticles:
-
-        # randomize size every frame + get larger towards end of life
-        particle.size = random.uniform(FuelParticle.defaultSize -1, FuelParticle.defaultSize + 1) + (particle.currentLifetime/particle.lifetime)*10
-        
-        fuelParticleCorners = [Vector2(particle.position.x - particle.size, particle.position.y + particle.size),
-                               Vector2(particle.position.x + particle.size, particle.position.y + particle.size),
-                               Vector2(particle.position.x + particle.size, particle.position.y - particle.size),
-                               Vector2(particle.position.x - particle.size, particle.position.y - particle.size)]
-
-        for i in range(len(fuelParticleCorners)):
-            rotateAround(fuelParticleCorners[i], particle.position, particle.rotation)
-            fuelParticleCorners[i] = w2r(fuelParticleCorners[i])
-
-        # flicker colour every frame - cool, fiery effect
-        redFlicker = random.uniform(0.6, 0.9)
-        greenFlicker = random.uniform(0.3, 0.6)
-            
-        glBegin(GL_POLYGON)        
-        glColor4f(redFlicker, greenFlicker, 0, 0.7 * (particle.lifetime - particle.currentLifetime)/particle.lifetime)
-
-        for i in range(len(fuelParticleCorners)):
-            glVertex2f(fuelParticleCorners[i].x, fuelParticleCorners[i].y)
+    # and the legs
+    for leg in (leftLeg, rightLeg):
+        glBegin(GL_POLYGON)
+        glColor(0.6, 0.6, 0.6, 1.0)
+        for corner in leg:
+            glVertex2f(*corner)
         glEnd()
 
+# any number of landers in one flat colour, with one glDrawArrays call
+def drawHulls(positions, rotations, colour):
+    if not len(positions): return
+
+    # each hull part as a triangle fan
+    vertices = transformPoints(positions[:, 0], positions[:, 1], -rotations, landerHull.vertices[None])
+    triangles = numpy.ascontiguousarray(w2rArray(vertices[:, :, hullFanIndices]).reshape(-1, 2))
+
+    glColor(*colour)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(2, GL_DOUBLE, 0, triangles)
+    glDrawArrays(GL_TRIANGLES, 0, len(triangles))
+    glDisableClientState(GL_VERTEX_ARRAY)
+
+arenaColour = (0.6, 0.8, 1.0, 0.6)
+ghostColour = (1.0, 1.0, 1.0, 0.15)
+
+def drawArena(arena):
+    positions, rotations = arena
+    drawHulls(positions, rotations, arenaColour)
+
+# Draws every ghost with one glDrawArraysInstanced call: the hull triangles are
+# uploaded once, and each frame only the ghosts' poses are, into a texture
+# buffer the vertex shader reads with gl_InstanceID. Needs OpenGL 3.1, see
+# createGhostRenderer() for what happens without it.
+class GhostRenderer:
+    vertexShader = """
+        #version 140
+        uniform samplerBuffer poses;
+        uniform vec2 scale;
+        uniform vec2 offset;
+        in vec2 vertex;
+        void main() {
+            vec4 pose = texelFetch(poses, gl_InstanceID);
+            if (isnan(pose.x)) {
+                gl_Position = vec4(2.0, 2.0, 2.0, 1.0); // exploded, put it outside the view
+                return;
+            }
+            float angle = radians(-pose.z);
+            vec2 world = pose.xy + mat2(cos(angle), sin(angle), -sin(angle), cos(angle)) * vertex;
+            gl_Position = vec4(world * scale - offset, 0.0, 1.0);
+        }
+    """
+    fragmentShader = """
+        #version 140
+        uniform vec4 colour;
+        out vec4 fragmentColour;
+        void main() {
+            fragmentColour = colour;
+        }
+    """
 
-def drawFuelBar():
-    fuelPercentage = lander.fuel / lander.startingFuel
+    def __init__(self):
+        self.program = shaders.compileProgram(shaders.compileShader(self.vertexShader, GL_VERTEX_SHADER),
+                                              shaders.compileShader(self.fragmentShader, GL_FRAGMENT_SHADER))
+        self.vertexLocation = glGetAttribLocation(self.program, "vertex")
+        self.posesLocation = glGetUniformLocation(self.program, "poses")
+        self.scaleLocation = glGetUniformLocation(self.program, "scale")
+        self.offsetLocation = glGetUniformLocation(self.program, "offset")
+        self.colourLocation = glGetUniformLocation(self.program, "colour")
+
+        triangles = numpy.ascontiguousarray(landerHull.vertices[:, hullFanIndices].reshape(-1, 2), dtype=numpy.float32)
+        self.vertexCount = len(triangles)
+        self.vertexBuffer = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertexBuffer)
+        glBufferData(GL_ARRAY_BUFFER, triangles.nbytes, triangles, GL_STATIC_DRAW)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+        # RGBA32F, texture buffers can't be RGB before OpenGL 4.0
+        self.poseBuffer = glGenBuffers(1)
+        self.poseTexture = glGenTextures(1)
+        glBindBuffer(GL_TEXTURE_BUFFER, self.poseBuffer)
+        glBindTexture(GL_TEXTURE_BUFFER, self.poseTexture)
+        glTexBuffer(GL_TEXTURE_BUFFER, GL_RGBA32F, self.poseBuffer)
+        glBindTexture(GL_TEXTURE_BUFFER, 0)
+        glBindBuffer(GL_TEXTURE_BUFFER, 0)
+
+    # poses is a (ghosts, 4) float32 array, see GhostReplays
+    def draw(self, poses, colour):
+        if not len(poses): return
+        glBindBuffer(GL_TEXTURE_BUFFER, self.poseBuffer)
+        glBufferData(GL_TEXTURE_BUFFER, poses.nbytes, poses, GL_STREAM_DRAW)
+        glBindBuffer(GL_TEXTURE_BUFFER, 0)
+
+        windowWidth = glutGet(GLUT_WINDOW_WIDTH)
+        windowHeight = glutGet(GLUT_WINDOW_HEIGHT)
+        glUseProgram(self.program)
+        # straight to clip space, the gluOrtho2D projection doesn't apply to shaders
+        glUniform2f(self.scaleLocation, 2 / windowWidth, 2 / windowHeight)
+        glUniform2f(self.offsetLocation, 1, 1)
+        glUniform4f(self.colourLocation, *colour)
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_BUFFER, self.poseTexture)
+        glUniform1i(self.posesLocation, 0)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.vertexBuffer)
+        glEnableVertexAttribArray(self.vertexLocation)
+        glVertexAttribPointer(self.vertexLocation, 2, GL_FLOAT, GL_FALSE, 0, None)
+        glDrawArraysInstanced(GL_TRIANGLES, 0, self.vertexCount, len(poses))
+        glDisableVertexAttribArray(self.vertexLocation)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+        glBindTexture(GL_TEXTURE_BUFFER, 0)
+        glUseProgram(0)
+
+# a GhostRenderer if the context can do instancing, otherwise None and
+# drawGhosts() falls back to drawHulls()
+def createGhostRenderer():
+    if (not bool(glDrawArraysInstanced) or not bool(glTexBuffer)):
+        return None
+    try:
+        return GhostRenderer()
+    except (RuntimeError, GLError):
+        return None
+
+def drawGhosts(runTick):
+    if not len(ghostReplays): return
+    poses = ghostReplays.posesAt(runTick)
+    if (ghostRenderer is not None):
+        ghostRenderer.draw(poses, ghostColour)
+    else:
+        shown = ~numpy.isnan(poses[:, 0])
+        drawHulls(poses[shown, :2], poses[shown, 2], ghostColour)
+
+# stars is a (count, 3) array of (x, y, opacity), density the share of them to draw
+def drawStars(stars, density=1.0):
+    stars = stars[:int(len(stars) * density)]
+    if not len(stars): return
+    vertices = stars[:, :2] * (aspectRatio/2000, 1/2000)
+    colours = numpy.ones((len(stars), 4))
+    colours[:, 3] = stars[:, 2]
+
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glEnableClientState(GL_COLOR_ARRAY)
+    glVertexPointer(2, GL_DOUBLE, 0, vertices)
+    glColorPointer(4, GL_DOUBLE, 0, colours)
+    glDrawArrays(GL_POINTS, 0, len(vertices))
+    glDisableClientState(GL_COLOR_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
+
+# corners of each particle's square making up its two triangles
+particleTriangleIndices = [0, 1, 2, 0, 2, 3]
+
+# all particle corners are transformed in a single call to transformRectangles(),
+# the same kernel drawLander and the collision detection use
+def drawFuelParticles(particles):
+    if not len(particles): return
+    x, y, rotation, currentLifetime, lifetime = particles.T
+    count = len(x)
+
+    # randomize size every frame + get larger towards end of life
+    size = renderRandom.uniform(FuelParticle.defaultSize -1, FuelParticle.defaultSize + 1, count) + (currentLifetime/lifetime)*10
+    corners = w2rArray(transformRectangles(x, y, size, size, rotation))
+    vertices = numpy.ascontiguousarray(corners[:, particleTriangleIndices].reshape(-1, 2))
+
+    # flicker colour every frame - cool, fiery effect
+    colours = numpy.empty((count, 4))
+    colours[:, 0] = renderRandom.uniform(0.6, 0.9, count)
+    colours[:, 1] = renderRandom.uniform(0.3, 0.6, count)
+    colours[:, 2] = 0
+    colours[:, 3] = 0.7 * (lifetime - currentLifetime)/lifetime
+    colours = numpy.repeat(colours, len(particleTriangleIndices), axis=0)
+
+    # all of them in one call
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glEnableClientState(GL_COLOR_ARRAY)
+    glVertexPointer(2, GL_DOUBLE, 0, vertices)
+    glColorPointer(4, GL_DOUBLE, 0, colours)
+    glDrawArrays(GL_TRIANGLES, 0, len(vertices))
+    glDisableClientState(GL_COLOR_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
+
+
+def drawFuelBar(lander):
+    fuelPercentage = lander.fuel / Lander.startingFuel
     # draw bg
     glBegin(GL_POLYGON)
     glColor(0.5, 0.5, 0.5)
@@ -582,10 +2550,10 @@ def drawFuelBar():
 
 ### TEXT DRAWING FUNCTIONS ###
 
-def drawStatsText():
-    velocityTxt = "Velocity: " + str(-math.floor(lander.velocity.y))
+def drawStatsText(lander):
+    velocityTxt = "Velocity: " + str(-math.floor(lander.vy))
     angleTxt = "Rotation: " + str(math.floor(lander.rotation))
-    velocityColor = [1.0, 0.0, 0.0] if -lander.velocity.y > Lander.maxLandingVelocity else [0.0, 1.0, 0.0]
+    velocityColor = [1.0, 0.0, 0.0] if -lander.vy > Lander.maxLandingVelocity else [0.0, 1.0, 0.0]
     angleColor = [1.0, 0.0, 0.0] if abs(lander.rotation) > Lander.maxLandingRotation else [0.0, 1.0, 0.0]
     drawText(Vector2(20, WINDOW_HEIGHT - 45 - fuelBarHeight), GLUT_BITMAP_9_BY_15, velocityTxt, *velocityColor)
     drawText(Vector2(20, WINDOW_HEIGHT - 65 - fuelBarHeight), GLUT_BITMAP_9_BY_15, angleTxt, *angleColor)
@@ -593,6 +2561,7 @@ def drawStatsText():
 def drawControls():
     drawText(Vector2(WINDOW_WIDTH - 180, WINDOW_HEIGHT - 22), GLUT_BITMAP_9_BY_15, "Arrow keys to move", 1.0, 1.0, 1.0)
     drawText(Vector2(WINDOW_WIDTH - 125, WINDOW_HEIGHT - 40), GLUT_BITMAP_9_BY_15, "R to restart", 1.0, 1.0, 1.0)
+    drawText(Vector2(WINDOW_WIDTH - 144, WINDOW_HEIGHT - 58), GLUT_BITMAP_9_BY_15, "Hold Z to rewind", 1.0, 1.0, 1.0)
 
 def drawStartingText():
     drawText(Vector2(WINDOW_WIDTH / 2 - (len(TITLE)*9+len(TITLE))/2, WINDOW_HEIGHT - 40), GLUT_BITMAP_9_BY_15, TITLE, 1.0, 1.0, 0.0)
@@ -616,20 +2585,78 @@ def drawFailMissedLandingAreaText():
     drawText(Vector2(WINDOW_WIDTH / 2 - (32*9+32)/2, WINDOW_HEIGHT / 2 + 70), GLUT_BITMAP_9_BY_15, "FAILED! Missed the landing area!", 1.0, 0.0, 0.0)
     drawText(Vector2(WINDOW_WIDTH / 2 - (20*9+20)/2, WINDOW_HEIGHT / 2 + 50), GLUT_BITMAP_9_BY_15, "Press R to try again", 1.0, 1.0, 1.0)    
 
+def drawFailCollidedText():
+    drawText(Vector2(WINDOW_WIDTH / 2 - (29*9+29)/2, WINDOW_HEIGHT / 2 + 70), GLUT_BITMAP_9_BY_15, "CRASHED! Hit another lander!", 1.0, 0.0, 0.0)
+    drawText(Vector2(WINDOW_WIDTH / 2 - (20*9+20)/2, WINDOW_HEIGHT / 2 + 50), GLUT_BITMAP_9_BY_15, "Press R to try again", 1.0, 1.0, 1.0)
+
+def drawContactText(contact):
+    contactTxt = "Touched down on the " + contact.part
+    drawText(Vector2(WINDOW_WIDTH / 2 - (len(contactTxt)*9+len(contactTxt))/2, WINDOW_HEIGHT / 2 + 30), GLUT_BITMAP_9_BY_15, contactTxt, 0.7, 0.7, 0.7)
+
 # called as fast as possible
+# only reads the latest published snapshot, never the live simulation state
 def render():
+    frameStart = time.perf_counter()
+    snapshot = snapshots.latest()
+    postGameState = snapshot.postGameState
+
     glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
     
-    drawStars()
-    drawFuelParticles()
-    drawTerrain()
-    drawLandingArea()
-    drawLander()
+    drawStars(snapshot.stars, governor.starDensity)
+    drawFuelParticles(snapshot.particles)
+    drawTerrain(snapshot.terrain)
+    drawLandingArea(snapshot.landingArea)
+    if (postGameState != PostGameState.starting):
+        drawGhosts(snapshot.runTick)
+    drawArena(snapshot.arena)
+    drawLander(snapshot.lander)
+    drawCachedHud(snapshot)
+        
+    glutSwapBuffers()
+
+    now = time.perf_counter()
+    inputLatency.presented(frameStart, now)
+    governor.frameFinished(now)
+    if (stressMode):
+        reportStress(snapshot, now)
+    if (latencyReport):
+        reportLatency(now)
+
+# The HUD is compiled into a display list as it is drawn, and the list is
+# replayed instead while the governor asks for the text to be refreshed less
+# often (GLUT bitmap text is slow to draw). A change of game state always
+# redraws it. Until the governor steps in, the HUD is drawn directly.
+hudList = None
+hudAge = 0
+hudState = None
+
+def drawCachedHud(snapshot):
+    global hudList, hudAge, hudState
+    if (governor.textRefreshInterval == 1):
+        drawHud(snapshot)
+        # the list is out of date by the time it is next needed
+        hudState = None
+        return
+
+    if (hudList is None):
+        hudList = glGenLists(1)
+    elif (hudState == snapshot.postGameState and hudAge + 1 < governor.textRefreshInterval):
+        glCallList(hudList)
+        hudAge += 1
+        return
+
+    glNewList(hudList, GL_COMPILE_AND_EXECUTE)
+    drawHud(snapshot)
+    glEndList()
+    hudAge = 0
+    hudState = snapshot.postGameState
 
+def drawHud(snapshot):
+    postGameState = snapshot.postGameState
     if (postGameState != PostGameState.starting):
-        drawFuelBar()
+        drawFuelBar(snapshot.lander)
         drawControls()
-        drawStatsText()
+        drawStatsText(snapshot.lander)
 
     if postGameState == PostGameState.success:
         drawSuccessText()
@@ -639,16 +2666,35 @@ def render():
         drawFailCrashSidewaysText()
     elif postGameState == PostGameState.missedLandingArea:
         drawFailMissedLandingAreaText()
+    elif postGameState == PostGameState.collided:
+        drawFailCollidedText()
     elif postGameState == PostGameState.starting:
         drawStartingText()
-        
-    glutSwapBuffers()
 
-# Initialise OpenGL window
-glutInit(sys.argv)
-glutInitDisplayMode(GLUT_RGBA | GLUT_DOUBLE | GLUT_DEPTH | GLUT_MULTISAMPLE)
-glutInitWindowSize(DEFAULT_WINDOW_WIDTH, DEFAULT_WINDOW_HEIGHT)
-glutCreateWindow(TITLE) # window title
+    if (snapshot.contact is not None and postGameState != PostGameState.starting):
+        drawContactText(snapshot.contact)
+
+# stress test mode prints what is being drawn and how long frames are taking
+def reportStress(snapshot, now):
+    global lastStressReport
+    if (now - lastStressReport < stressReportInterval):
+        return
+    lastStressReport = now
+    print("frame %.1f ms (target %.1f ms): %d stars, %d particles, %d landers, %d terrain points" %
+          (governor.rollingFrameTime() * 1000, governor.targetFrameTime * 1000, int(len(snapshot.stars) * governor.starDensity),
+           len(snapshot.particles), len(snapshot.arena[0]) + snapshot.lander.visible, len(snapshot.terrain)), flush=True)
+
+def reportLatency(now):
+    global lastLatencyReport
+    if (now - lastLatencyReport < latencyReportInterval or inputLatency.samples == inputLatency.reported):
+        return
+    lastLatencyReport = now
+    inputLatency.reported = inputLatency.samples
+    print(inputLatency.report(), flush=True)
+
+def printIntervention(intervention):
+    print("governor: %s -> %g (rolling frame time %.1f ms)" %
+          (intervention.setting, intervention.value, intervention.frameTime * 1000), flush=True)
 
 # when the window is resized, expand the render coordinate grid,
 # don't stretch it!
@@ -666,28 +2712,200 @@ def onWindowResize(width, height):
     WINDOW_WIDTH = width
     WINDOW_HEIGHT = height
 
-# Set GLUT function hooks
-glutKeyboardFunc(keyboardDown)
-glutKeyboardUpFunc(keyboardUp)
-glutSpecialFunc(keyboardSpecialDown)
-glutSpecialUpFunc(keyboardSpecialUp)
-
-glutDisplayFunc(render)
-glutIdleFunc(tick) # main loop function
-glutReshapeFunc(onWindowResize)
+lander = None
 
-# enable opacity
-glEnable(GL_BLEND)
-glBlendFunc (GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA);
+def startStressTest(options):
+    global stressMode, numStars, particlesPerRelease, terrainMinXSpacing, terrainMaxXSpacing, arenaSize
+    stressMode = True
+    governor.report = printIntervention
+
+    def multiple(name):
+        value = getattr(options, 'stress_' + name)
+        if (value is None):
+            value = options.stress if options.stress is not None else 1
+        return value
+
+    numStars = int(numStars * multiple('stars'))
+    particlesPerRelease *= multiple('particles')
+    # more terrain points across the same screen
+    terrainMinXSpacing = max(1, int(terrainMinXSpacing / multiple('terrain')))
+    terrainMaxXSpacing = max(terrainMinXSpacing, int(terrainMaxXSpacing / multiple('terrain')))
+    arenaSize += int(stressLandersPerMultiple * multiple('landers'))
+    print("stress test: %d stars, %g particles per release, terrain spacing %d-%d, %d arena landers" %
+          (numStars, particlesPerRelease, terrainMinXSpacing, terrainMaxXSpacing, arenaSize), flush=True)
+
+def glFunctionsUsed():
+    """Names of the GL, GLU and GLUT functions this module's code refers to"""
+    codes = []
+    for value in list(globals().values()):
+        if (isinstance(value, type) and value.__module__ == __name__):
+            codes.extend(member.__code__ for member in vars(value).values()
+                         if isinstance(member, types.FunctionType))
+        elif (isinstance(value, types.FunctionType) and value.__module__ == __name__):
+            codes.append(value.__code__)
+    names = set()
+    while (codes):
+        code = codes.pop()
+        names.update(code.co_names)
+        codes.extend(const for const in code.co_consts if isinstance(const, types.CodeType))
+    return sorted(name for name in names if name.startswith('gl') and name in globals())
+
+def main():
+    global arenaSize, arenaController, ghostDirectory, ghostReplays, ghostRenderer, spectatorServer, telemetryLog
+    global latencyReport
+    # our own options, anything else is left for GLUT
+    parser = argparse.ArgumentParser(description=TITLE)
+    parser.add_argument('--arena', type=int, default=0, metavar='N',
+                        help="fly alongside N autopilot landers")
+    parser.add_argument('--ghosts', metavar='DIRECTORY',
+                        help="save every run to DIRECTORY, and replay the runs in it as ghosts")
+    parser.add_argument('--optimize', type=int, metavar='GENERATIONS',
+                        help="tune the autopilot gains for GENERATIONS generations and print them, without a window")
+    parser.add_argument('--population', type=int, default=64, help="autopilots per generation (default 64)")
+    parser.add_argument('--episodes', type=int, default=32, help="terrains per generation (default 32)")
+    parser.add_argument('--workers', type=int, help="worker processes (default one per CPU)")
+    parser.add_argument('--solve-policy', metavar='PATH',
+                        help="solve the lookup table autopilot and save it to PATH (.npy), without a window")
+    parser.add_argument('--policy', metavar='PATH',
+                        help="fly the arena landers with the lookup table autopilot saved at PATH")
+    parser.add_argument('--target-frame-time', type=float, metavar='MS',
+                        help="frame time the quality governor aims for (default %.1f)" % (targetFrameTime * 1000))
+    parser.add_argument('--stress', type=float, metavar='MULTIPLE',
+                        help="stress test: scale stars, particles, terrain detail and landers by MULTIPLE, "
+                             "and report frame times")
+    for name, description in (('stars', "stars"), ('particles', "particles released"),
+                              ('terrain', "terrain points"), ('landers', "arena landers (%d per multiple)" % stressLandersPerMultiple)):
+        parser.add_argument('--stress-' + name, type=float, metavar='MULTIPLE',
+                            help="stress test multiple for the number of %s (default --stress)" % description)
+    parser.add_argument('--evaluate', choices=evaluationControllers,
+                        help="fly episodes with this controller and save the results, without a window "
+                             "(policy uses --policy, replay uses --replay)")
+    parser.add_argument('--replay', metavar='PATH', help="replay file (.npz from --ghosts) for --evaluate replay")
+    parser.add_argument('--seeds', type=parseSeeds, metavar='START:STOP',
+                        help="seeds of the episodes to evaluate (default 0:1000, or the replay's own seed)")
+    parser.add_argument('--timestep', type=float, default=updateRate, metavar='MS',
+                        help="simulation timestep for --evaluate (default %d)" % updateRate)
+    parser.add_argument('--max-ticks', type=int, default=4000, help="longest episode for --evaluate (default 4000)")
+    parser.add_argument('--output', default='evaluation.npz', metavar='PATH',
+                        help="where --evaluate saves its results, .npz or .csv (default evaluation.npz)")
+    parser.add_argument('--spectate', type=parseSpectatorAddress, metavar='ADDRESS',
+                        help="stream the game to spectators at ADDRESS: PORT or HOST:PORT, or the path of a Unix socket")
+    parser.add_argument('--watch', type=parseSpectatorAddress, metavar='ADDRESS',
+                        help="watch the game streamed at ADDRESS (see --spectate) instead of playing")
+    parser.add_argument('--latency', action='store_true',
+                        help="print a histogram of the key press to screen latency every %d seconds" % latencyReportInterval)
+    parser.add_argument('--telemetry', metavar='PATH',
+                        help="append a record of the lander to PATH every tick (read it with "
+                             "numpy.memmap(PATH, main.telemetryRecord, mode='r'))")
+    options, glutArguments = parser.parse_known_args()
+
+    if (options.evaluate is not None):
+        path = options.replay if options.evaluate == 'replay' else options.policy
+        if (path is None and options.evaluate != 'scripted'):
+            parser.error("--evaluate %s needs --%s" % (options.evaluate, options.evaluate))
+        seeds = options.seeds
+        if (seeds is None):
+            seeds = [createController('replay', path).seed] if options.evaluate == 'replay' else list(range(1000))
+        start = time.perf_counter()
+        results = evaluateController(options.evaluate, path, seeds, options.max_ticks, options.timestep,
+                                     options.workers, progress=printEvaluationProgress)
+        saveEvaluation(results, options.output)
+        outcomes = Counter(PostGameState(outcome).name for outcome in results['outcome'].tolist())
+        print("%d episodes in %.1f s: %s, saved to %s" % (len(seeds), time.perf_counter() - start,
+              ", ".join("%d %s" % (count, name) for name, count in outcomes.most_common()), options.output))
+        return
 
-# background not quite black, slightly blueish
-glClearColor(0.0, 0.0, 0.05, 1.0)
+    if (options.target_frame_time is not None):
+        governor.targetFrameTime = options.target_frame_time / 1000
+    if (options.stress is not None or
+        any(getattr(options, 'stress_' + name) is not None for name in ('stars', 'particles', 'terrain', 'landers'))):
+        startStressTest(options)
 
-# initialize the first game
-lander = None
-createInitialScreen()
+    if (options.solve_policy is not None):
+        solvePolicy(report=printPolicyProgress).save(options.solve_policy)
+        return
 
-# GLUT handles the main loop for me
-glutMainLoop()
+    if (options.optimize is not None):
+        controller = optimizeController(options.optimize, options.population, options.episodes,
+                                        workers=options.workers, report=printOptimizerProgress)
+        print("PDController(%s)" % ", ".join("%s=%.4g" % (name, value)
+                                            for name, value in zip(PDController.parameterNames, controller.parameters())))
+        return
 
-# we made it!
+    arenaSize += options.arena
+    if (options.policy is not None):
+        arenaController = PolicyController.load(options.policy)
+    if (options.ghosts is not None):
+        ghostDirectory = options.ghosts
+        os.makedirs(ghostDirectory, exist_ok=True)
+        ghostReplays = GhostReplays.load(ghostDirectory)
+    latencyReport = options.latency
+    if (options.telemetry is not None):
+        telemetryLog = TelemetryLog(options.telemetry)
+    if (options.watch is not None):
+        try:
+            connection = connectSpectator(options.watch)
+        except OSError as error:
+            parser.error("can't watch %s: %s" % (options.watch, error))
+    elif (options.spectate is not None):
+        spectatorServer = SpectatorServer(options.spectate)
+        try:
+            spectatorServer.start()
+        except OSError as error:
+            parser.error("can't stream to %s: %s" % (options.spectate, error))
+
+    # Initialise OpenGL window
+    glutInit([sys.argv[0]] + glutArguments)
+    glutInitDisplayMode(GLUT_RGBA | GLUT_DOUBLE | GLUT_DEPTH | GLUT_MULTISAMPLE)
+    glutInitWindowSize(DEFAULT_WINDOW_WIDTH, DEFAULT_WINDOW_HEIGHT)
+    # have freeglut return from glutMainLoop() when the window is closed,
+    # so the shutdown below gets to run
+    if (bool(glutSetOption)):
+        glutSetOption(GLUT_ACTION_ON_WINDOW_CLOSE, GLUT_ACTION_GLUTMAINLOOP_RETURNS)
+    glutCreateWindow(TITLE) # window title
+    # finalise every GL function we use now, while the context is current,
+    # instead of stalling the first frame that happens to need each one
+    OpenGL.warmup(glFunctionsUsed(), background=False, namespace=sys.modules[__name__])
+
+    # Set GLUT function hooks
+    glutKeyboardFunc(keyboardDown)
+    glutKeyboardUpFunc(keyboardUp)
+    glutSpecialFunc(keyboardSpecialDown)
+    glutSpecialUpFunc(keyboardSpecialUp)
+
+    glutDisplayFunc(render)
+    glutIdleFunc(tick) # main loop function
+    glutReshapeFunc(onWindowResize)
+
+    # enable opacity
+    glEnable(GL_BLEND)
+    glBlendFunc (GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA);
+
+    # background not quite black, slightly blueish
+    glClearColor(0.0, 0.0, 0.05, 1.0)
+
+    if (len(ghostReplays)):
+        ghostRenderer = createGhostRenderer()
+
+    # initialize the first game, and publish it before the
+    # first frame is drawn
+    createInitialScreen()
+    publishSnapshot()
+    if (options.watch is not None):
+        threading.Thread(target=watchSpectatorStream, args=(connection, SpectatorDecoder(starsSnapshot)),
+                         name='spectator', daemon=True).start()
+    else:
+        simulationThread = startSimulation()
+
+    # GLUT handles the main loop for me
+    glutMainLoop()
+
+    # we made it! stop the simulation before closing what it writes to
+    if (simulationRunning.is_set()):
+        simulationRunning.clear()
+        simulationThread.join()
+    if (telemetryLog is not None):
+        telemetryLog.close()
+
+if __name__ == "__main__":
+    main()